@@ -1,35 +1,373 @@
 import icontract
-from typing import List, Optional, Tuple
-from noArvoreB import NoArvoreB
+from array import array
+from bisect import bisect_left
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
+from chaves import instalarChave
+from noArvoreB import Chave, NoArvoreB, NoArvoreBCompacto
+from contratos import CONTRATOS_HABILITADOS
+from filtros import CacheLRU, FiltroBloom
+from metricas import MetricasArvoreB, instalarMetricas, removerMetricas
+from serializacao import carregarDeArquivo, gravarArvore, lerCabecalho
+from validacao import RelatorioValidacao, validarArvore, validarCaminho
+
+# Marcador para chaves ausentes, distinto de qualquer valor armazenado (inclusive None).
+_AUSENTE = object()
+
+# Até quantas chaves de um lote são inseridas uma a uma em uma folha, em vez de intercaladas.
+_LOTE_PEQUENO = 8
+
+# A partir de quantas chaves consecutivas um trecho de `remover_muitos` é removido como
+# intervalo; trechos menores saem mais barato chave por chave.
+_TRECHO_MINIMO = 8
+
+
+def _comoLista(itens: Iterable[Any]) -> List[Any]:
+    """
+    Converte um lote em lista. Arrays do NumPy (e `array.array`) são convertidos com
+    `tolist()`, que produz inteiros do Python, comparáveis às chaves já armazenadas.
+    """
+    if hasattr(itens, "tolist"):
+        return itens.tolist()
+    return list(itens)
 
 
 class ArvoreB:
     """
-    Implementação de uma Árvore B.
+    Implementação de uma Árvore B. Cada chave pode ter um valor associado, de modo que a
+    árvore também funciona como um mapa ordenado (`get`, `put`, `pop`, `arvore[chave]`).
 
     Atributos:
         raiz (NoArvoreB): O nó raiz da árvore, inicia com None.
         ordem (int): A ordem da Árvore B (número mínimo de chaves em um nó não raiz).
+        compacto (bool): Indica se os nós usam a representação compacta `NoArvoreBCompacto`.
+        validacaoIncremental (bool): Indica se cada operação de escrita valida os nós que alterou.
+        metricas (Optional[MetricasArvoreB]): As métricas de desempenho, se estiverem ativadas.
+        key (Optional[Callable[[Any], Chave]]): A função aplicada às chaves, se houver.
+        dedo (bool): Indica se a árvore guarda o caminho da última folha visitada.
+        insercaoCrescente (bool): Indica se as divisões na borda direita mantêm cheio o nó
+                                  da esquerda.
+        filtro (Optional[FiltroBloom]): O filtro de Bloom consultado antes das buscas, se houver.
+        cache (Optional[CacheLRU]): O cache das posições das últimas chaves encontradas, se houver.
     """
 
-    def __init__(self, ordem: int):
+    def __init__(self, ordem: int, compacto: bool = False, validacao_incremental: bool = False,
+                 key: Optional[Callable[[Any], Chave]] = None, dedo: bool = False,
+                 insercao_crescente: bool = False, filtro: bool = False, cache: int = 0):
         """
         Inicializa a Árvore B.
 
         Argumentos:
             ordem (int): A ordem da árvore B.
+            compacto (bool): Se verdadeiro, os nós são criados com `NoArvoreBCompacto`
+                             (`__slots__` e chaves em `array('q')`), que ocupa menos memória
+                             por chave mas só aceita inteiros de 64 bits.
+            validacao_incremental (bool): Se verdadeiro, cada escrita valida, em O(t log n),
+                                          o caminho que alterou (veja `validarCaminho`) e
+                                          lança `ErroDeValidacao` se encontrar um problema.
+            key (Optional[Callable[[Any], Chave]]): Se informada, a árvore é ordenada por
+                                                   `key(chave)`, calculada uma única vez por
+                                                   operação e guardada nos nós no lugar da
+                                                   chave (veja `instalarChave`). Com
+                                                   `codificarChave` ou `empacotarInteiros`,
+                                                   chaves compostas são comparadas como bytes
+                                                   ou inteiros.
+            dedo (bool): Se verdadeiro, a árvore guarda o caminho até a última folha em que
+                         buscou ou inseriu (um "dedo") e os separadores que a delimitam;
+                         buscas e inserções de chaves que caem entre eles vão direto à
+                         folha, sem descer a partir da raiz.
+            insercao_crescente (bool): Se verdadeiro, quando uma chave maior que todas as da
+                                       árvore chega a um nó cheio da borda direita, o nó é
+                                       dividido deixando a esquerda cheia, em vez de ao
+                                       meio. Em cargas em ordem crescente, os nós ficam
+                                       quase cheios em vez de pela metade.
+            filtro (bool): Se verdadeiro, um filtro de Bloom mantido pelas inserções e
+                           remoções responde às buscas (e às remoções) de chaves ausentes
+                           sem descer a árvore. As chaves precisam ser hasheáveis.
+            cache (int): Se positivo, guarda as posições das últimas `cache` chaves
+                         encontradas por `buscar`, respondendo às buscas repetidas sem
+                         descer a árvore.
         """
         if ordem < 2:
             raise ValueError("A ordem da Árvore B deve ser pelo menos 2.")
         self.ordem = ordem
+        self.compacto = compacto
+        self.validacaoIncremental = validacao_incremental
+        self.metricas: Optional[MetricasArvoreB] = None
         self.raiz: Optional[NoArvoreB] = None
+        self._tamanho = 0
+        # Profundidade das folhas, mantida pelas operações que mudam a altura da árvore.
+        self._altura = 0
+        self.dedo = dedo
+        self.insercaoCrescente = insercao_crescente
+        # O dedo: os nós do caminho até a última folha visitada e os separadores que a
+        # delimitam, exclusivos (None se não há limite). Toda mudança de estrutura o apaga.
+        self._dedo: Optional[Tuple[List[NoArvoreB], Any, Any]] = None
+        # Buscas respondidas na folha do dedo, sem descer a partir da raiz.
+        self._dedoAcertos = 0
+        # Indica se a borda direita tem nós abaixo do mínimo, deixados pelas divisões da
+        # inserção crescente e corrigidos por `_fecharEspinha` antes de quem precisa do mínimo.
+        self._espinhaAberta = False
+        self.filtro: Optional[FiltroBloom] = FiltroBloom() if filtro else None
+        self.cache: Optional[CacheLRU] = CacheLRU(cache) if cache else None
+        self.key = key
+        if key is not None:
+            instalarChave(self, key)
+
+    def _novoNo(self, folha: bool) -> NoArvoreB:
+        """
+        Cria um nó vazio com a representação escolhida para a árvore.
+
+        Argumentos:
+            folha (bool): Especifica se o nó a ser criado é uma folha.
+
+        Retorna:
+            NoArvoreB: O novo nó (`NoArvoreBCompacto` se a árvore for compacta).
+        """
+        if self.compacto:
+            return NoArvoreBCompacto(folha=folha)
+        return NoArvoreB(folha=folha)
+
+    def _filhoMutavel(self, no: NoArvoreB, indice: int) -> NoArvoreB:
+        """
+        Obtém o filho de um nó que está prestes a ser modificado. Na árvore comum é o
+        próprio filho; subclasses que não alteram nós já publicados o substituem por uma
+        cópia (veja `ArvoreBConcorrente`).
+
+        Argumentos:
+            no (NoArvoreB): O nó pai, que já pode ser modificado.
+            indice (int): O índice do filho em `no.filhos`.
+
+        Retorna:
+            NoArvoreB: O filho, pronto para ser modificado.
+        """
+        return no.filhos[indice]
+
+    @classmethod
+    def from_sorted(cls, chaves: Iterable[Any], ordem: int, fill_factor: float = 1.0,
+                    com_valores: bool = False, compacto: bool = False,
+                    key: Optional[Callable[[Any], Chave]] = None) -> 'ArvoreB':
+        """
+        Constrói uma Árvore B a partir de uma sequência de chaves estritamente crescente.
+
+        Os nós são montados de baixo para cima em uma única passada: cada nível mantém
+        apenas o nó que está sendo preenchido (a "espinha" direita da árvore), de modo que
+        a entrada pode ser um gerador e nunca é materializada por inteiro. Ao final, a
+        espinha direita é rebalanceada com os irmãos à esquerda.
+
+        Argumentos:
+            chaves (Iterable[Any]): As chaves, em ordem estritamente crescente, ou pares
+                                    (chave, valor) se `com_valores` for verdadeiro.
+            ordem (int): A ordem da árvore B.
+            fill_factor (float): Fração de ocupação (0 < fill_factor <= 1) dos nós montados.
+                                 A capacidade resultante é limitada ao intervalo [t-1, 2t-1].
+            com_valores (bool): Indica se a entrada é formada por pares (chave, valor).
+            compacto (bool): Indica se os nós usam a representação compacta.
+            key (Optional[Callable[[Any], Chave]]): A função aplicada às chaves (veja
+                                                   `__init__`); a entrada deve estar em
+                                                   ordem estritamente crescente de `key`.
+
+        Retorna:
+            ArvoreB: A árvore construída.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("O fill_factor deve estar no intervalo (0, 1].")
+        arvore = cls(ordem, compacto=compacto, key=key)
+        arvore._montarOrdenadas(chaves, fill_factor, com_valores)
+        return arvore
 
-    def buscar(self, chaveProcurada: int) -> Optional[Tuple['NoArvoreB', int]]:
+    def _montarOrdenadas(self, chaves: Iterable[Any], fill_factor: float, com_valores: bool) -> None:
+        """
+        Método auxiliar de `from_sorted` que monta os nós de uma árvore vazia a partir das
+        chaves em ordem estritamente crescente.
+
+        Argumentos:
+            chaves (Iterable[Any]): As chaves, ou pares (chave, valor) se `com_valores` for
+                                    verdadeiro.
+            fill_factor (float): Fração de ocupação dos nós montados.
+            com_valores (bool): Indica se a entrada é formada por pares (chave, valor).
+        """
+        key = self.key
+        if key is not None:
+            pares = chaves if com_valores else ((chave, None) for chave in chaves)
+            chaves = ((key(chave), (chave, valor)) for chave, valor in pares)
+            com_valores = True
+
+        capacidade = max(self.ordem - 1, min(2 * self.ordem - 1, int(fill_factor * (2 * self.ordem - 1))))
+
+        # niveis[0] é a folha aberta; niveis[n] é o nó aberto do nível n, cujo
+        # último filho é sempre niveis[n - 1].
+        niveis: List[NoArvoreB] = []
+        anterior: Optional[Chave] = None
+
+        for item in chaves:
+            chave, valor = item if com_valores else (item, None)
+            if anterior is not None and chave <= anterior:
+                raise ValueError(f"As chaves devem estar em ordem estritamente crescente ({chave} após {anterior}).")
+            anterior = chave
+
+            if not niveis:
+                niveis.append(self._novoNo(folha=True))
+
+            folha = niveis[0]
+            if len(folha.chaves) < capacidade:
+                folha.chaves.append(chave)
+                folha.valores.append(valor)
+            else:
+                # A folha está cheia: a chave sobe como separador e uma nova folha é aberta.
+                nova_folha = self._novoNo(folha=True)
+                self._promoverSeparador(niveis, 1, chave, valor, nova_folha, capacidade)
+            self._tamanho += 1
+
+        if not niveis:
+            return
+
+        self.raiz = niveis[-1]
+        self._altura = len(niveis) - 1
+        self._ajustarEspinhaDireita()
+        self._recalcularTotais()
+
+    @classmethod
+    def from_unsorted(cls, chaves: Iterable[Any], ordem: int, fill_factor: float = 1.0,
+                      com_valores: bool = False, compacto: bool = False,
+                      key: Optional[Callable[[Any], Chave]] = None) -> 'ArvoreB':
+        """
+        Constrói uma Árvore B a partir de chaves em qualquer ordem, descartando repetições.
+
+        Diferente de `from_sorted`, a entrada precisa ser materializada para ser ordenada.
+
+        Argumentos:
+            chaves (Iterable[Any]): As chaves, em qualquer ordem e possivelmente repetidas, ou
+                                    pares (chave, valor) se `com_valores` for verdadeiro. Para
+                                    chaves repetidas, prevalece o último valor.
+            ordem (int): A ordem da árvore B.
+            fill_factor (float): Fração de ocupação dos nós montados (veja `from_sorted`).
+            com_valores (bool): Indica se a entrada é formada por pares (chave, valor).
+            compacto (bool): Indica se os nós usam a representação compacta.
+            key (Optional[Callable[[Any], Chave]]): A função aplicada às chaves. Chaves com
+                                                   o mesmo `key` são repetições.
+
+        Retorna:
+            ArvoreB: A árvore construída.
+        """
+        if key is not None:
+            pares = chaves if com_valores else ((chave, None) for chave in chaves)
+            unicas = {key(chave): (chave, valor) for chave, valor in pares}
+            return cls.from_sorted((unicas[traduzida] for traduzida in sorted(unicas)), ordem, fill_factor,
+                                   com_valores=True, compacto=compacto, key=key)
+        if com_valores:
+            return cls.from_sorted(sorted(dict(chaves).items()), ordem, fill_factor, com_valores=True, compacto=compacto)
+        return cls.from_sorted(sorted(set(chaves)), ordem, fill_factor, compacto=compacto)
+
+    @classmethod
+    def load(cls, caminho: str, compacto: Optional[bool] = None,
+             key: Optional[Callable[[Any], Chave]] = None) -> 'ArvoreB':
+        """
+        Carrega uma árvore gravada com `dump`.
+
+        O arquivo é mapeado em memória e cada seção (o tamanho dos nós, as chaves e os
+        valores) é lida de uma só vez; os nós são remontados diretamente, nível a nível,
+        sem inserir chave por chave e sem recursão.
+
+        Os valores, e as chaves que não são inteiros de 64 bits, são lidos com pickle, que
+        pode executar código arbitrário: carregue apenas arquivos de origem confiável.
+
+        Argumentos:
+            caminho (str): O caminho do arquivo.
+            compacto (Optional[bool]): Se os nós carregados usam a representação compacta.
+                                       Por padrão, a mesma da árvore gravada.
+            key (Optional[Callable[[Any], Chave]]): A mesma função `key` da árvore gravada,
+                                                   se houver; ela não é gravada no arquivo.
+
+        Retorna:
+            ArvoreB: A árvore carregada, com a ordem da gravada.
+        """
+        with open(caminho, "rb") as arquivo:
+            ordem, compacto_gravado = lerCabecalho(arquivo.read(64))
+        arvore = cls(ordem, compacto=compacto_gravado if compacto is None else compacto, key=key)
+        carregarDeArquivo(caminho, arvore)
+        return arvore
+
+    def dump(self, caminho: str) -> None:
+        """
+        Grava a árvore em um arquivo binário compacto e versionado (veja `serializacao.py`),
+        que pode ser carregado com `ArvoreB.load`.
+
+        Argumentos:
+            caminho (str): O caminho do arquivo, que é substituído se já existir.
+        """
+        self._fecharEspinha()
+        with open(caminho, "wb") as arquivo:
+            gravarArvore(self, arquivo)
+
+    def _promoverSeparador(self, niveis: List[NoArvoreB], nivel: int, separador: Chave, valor: Any,
+                           novo_filho: NoArvoreB, capacidade: int) -> None:
+        """
+        Método auxiliar da carga em lote que acrescenta um separador e o nó aberto à
+        sua direita no nível indicado, subindo para o nível de cima quando o nó enche.
+
+        Argumentos:
+            niveis (List[NoArvoreB]): Os nós abertos de cada nível.
+            nivel (int): O nível que recebe o separador.
+            separador (Chave): A chave que separa o nó fechado de `novo_filho`.
+            valor (Any): O valor associado ao separador.
+            novo_filho (NoArvoreB): O novo nó aberto do nível `nivel - 1`.
+            capacidade (int): Número máximo de chaves por nó montado.
+        """
+        if nivel == len(niveis):
+            nova_raiz = self._novoNo(folha=False)
+            nova_raiz.filhos.append(niveis[nivel - 1])
+            niveis.append(nova_raiz)
+
+        no = niveis[nivel]
+        if len(no.chaves) < capacidade:
+            no.chaves.append(separador)
+            no.valores.append(valor)
+            no.filhos.append(novo_filho)
+        else:
+            novo_no = self._novoNo(folha=False)
+            novo_no.filhos.append(novo_filho)
+            self._promoverSeparador(niveis, nivel + 1, separador, valor, novo_no, capacidade)
+            niveis[nivel] = novo_no
+        niveis[nivel - 1] = novo_filho
+
+    def _ajustarEspinhaDireita(self) -> None:
+        """
+        Corrige os nós da espinha direita após a carga em lote, que podem ter ficado com
+        menos chaves que o mínimo, pegando chaves emprestadas do irmão anterior ou fundindo.
+
+        A correção desce a partir da raiz como na remoção: nós internos ficam com pelo
+        menos `ordem` chaves, de forma que uma fusão no nível de baixo não os deixe abaixo
+        do mínimo.
+        """
+        while not self.raiz.folha and len(self.raiz.chaves) == 0:
+            self.raiz = self.raiz.filhos[0]
+            self._altura -= 1
+
+        no = self.raiz
+        while not no.folha:
+            indice = len(no.filhos) - 1
+            filho = no.filhos[indice]
+            minimo = self.ordem - 1 if filho.folha else self.ordem
+
+            while len(filho.chaves) < minimo:
+                if len(no.filhos[indice - 1].chaves) >= self.ordem:
+                    self._pegarEmprestadoDoAnterior(no, indice)
+                else:
+                    self._fundir(no, indice - 1)
+                    filho = no.filhos[indice - 1]
+                    if no is self.raiz and len(no.chaves) == 0:
+                        self.raiz = filho
+                        self._altura -= 1
+                    break
+
+            no = filho
+
+    def buscar(self, chaveProcurada: Chave) -> Optional[Tuple['NoArvoreB', int]]:
         """
         Busca uma chave na árvore B.
 
         Argumentos:
-            chaveProcurada (int): A chave a ser buscada.
+            chaveProcurada (Chave): A chave a ser buscada.
 
         Retorna:
             Optional[Tuple['NoArvoreB', int]]: Uma tupla contendo o nó e o índice onde a
@@ -37,102 +375,1022 @@ class ArvoreB:
         """
         if self.raiz is None:
             return None
-        
+        filtro = self.filtro
+        if filtro is not None and not filtro.talvezContenha(chaveProcurada):
+            return None
+        if filtro is not None or self.cache is not None:
+            return self._buscarComCache(chaveProcurada)
+        if self.dedo:
+            return self._buscarComDedo(chaveProcurada)
         return self.raiz.buscar(chaveProcurada)
 
+    def _buscarComCache(self, chaveProcurada: Chave) -> Optional[Tuple['NoArvoreB', int]]:
+        """
+        Busca uma chave aprovada pelo filtro de Bloom (se houver) consultando antes o cache
+        das últimas posições encontradas; só desce a árvore se o cache não responder, e
+        guarda nele a posição encontrada. Uma chave aprovada pelo filtro e não encontrada
+        conta como falso positivo.
+        """
+        filtro = self.filtro
+        cache = self.cache
+        if cache is not None:
+            if cache.raiz is not self.raiz:
+                # A raiz foi trocada, e as posições guardadas podem ser de nós desligados.
+                cache.limpar(self.raiz)
+            resultado = cache.obter(chaveProcurada)
+            if resultado is not None:
+                return resultado
+
+        if self.dedo:
+            resultado = self._buscarComDedo(chaveProcurada)
+        else:
+            resultado = self.raiz.buscar(chaveProcurada)
+        if resultado is None:
+            if filtro is not None:
+                filtro.falsosPositivos += 1
+        elif cache is not None:
+            cache.guardar(chaveProcurada, resultado)
+        return resultado
+
+    def _naFolhaDoDedo(self, chave: Chave) -> Optional[List[NoArvoreB]]:
+        """
+        Verifica se a chave cai entre os separadores que delimitam a folha do dedo.
+
+        Retorna:
+            Optional[List[NoArvoreB]]: O caminho até a folha do dedo, ou None se não há
+                                       dedo ou a chave está fora dela.
+        """
+        dedo = self._dedo
+        if dedo is None:
+            return None
+        caminho, minimo, maximo = dedo
+        if caminho[0] is not self.raiz or (minimo is not None and chave <= minimo) or (maximo is not None and chave >= maximo):
+            return None
+        return caminho
+
+    def _buscarComDedo(self, chaveProcurada: Chave) -> Optional[Tuple['NoArvoreB', int]]:
+        """
+        Busca uma chave começando pela folha do dedo, se ela está entre os seus
+        separadores, ou descendo a partir da raiz e guardando o caminho como novo dedo.
+        """
+        caminho = self._naFolhaDoDedo(chaveProcurada)
+        if caminho is not None:
+            self._dedoAcertos += 1
+            folha = caminho[-1]
+            i = folha._posicao(chaveProcurada)
+            if i < len(folha.chaves) and folha.chaves[i] == chaveProcurada:
+                return (folha, i)
+            return None
+
+        caminho = []
+        minimo = maximo = None
+        no = self.raiz
+        while True:
+            i = no._posicao(chaveProcurada)
+            encontrada = i < len(no.chaves) and no.chaves[i] == chaveProcurada
+            if no.folha:
+                caminho.append(no)
+                self._dedo = (caminho, minimo, maximo)
+                return (no, i) if encontrada else None
+            if encontrada:
+                return (no, i)
+            caminho.append(no)
+            if i > 0:
+                minimo = no.chaves[i - 1]
+            if i < len(no.chaves):
+                maximo = no.chaves[i]
+            no = no.filhos[i]
+
+    def get(self, chave: Chave, padrao: Any = None) -> Any:
+        """
+        Obtém o valor associado a uma chave.
+
+        Argumentos:
+            chave (Chave): A chave procurada.
+            padrao (Any): O valor retornado se a chave não estiver na árvore.
+
+        Retorna:
+            Any: O valor associado à chave, ou `padrao` se ela não existir.
+        """
+        resultado = self.buscar(chave)
+        if resultado is None:
+            return padrao
+        no, indice = resultado
+        return no.valores[indice]
+
+    def put(self, chave: Chave, valor: Any = None) -> bool:
+        """
+        Associa um valor a uma chave, inserindo a chave ou substituindo o valor existente.
+
+        Diferente de `inserir`, não há busca prévia: a chave existente é detectada
+        durante a própria descida da inserção.
+
+        Argumentos:
+            chave (Chave): A chave a ser inserida ou atualizada.
+            valor (Any): O valor associado à chave.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se apenas o valor foi substituído.
+        """
+        inserida = self._inserir(chave, valor)
+        if inserida:
+            self._tamanho += 1
+            if self.filtro is not None:
+                self._adicionarAoFiltro(chave)
+        if self.validacaoIncremental:
+            validarCaminho(self, chave)
+        return inserida
+
+    def pop(self, chave: Chave, *padrao: Any) -> Any:
+        """
+        Remove uma chave e retorna o valor associado a ela.
+
+        Argumentos:
+            chave (Chave): A chave a ser removida.
+            padrao (Any): Opcional. O valor retornado se a chave não estiver na árvore.
+
+        Retorna:
+            Any: O valor que estava associado à chave, ou `padrao` se ela não existir.
+
+        Exceções:
+            KeyError: Se a chave não existir e nenhum valor padrão for informado.
+        """
+        if len(padrao) > 1:
+            raise TypeError(f"pop esperava no máximo 2 argumentos, recebeu {len(padrao) + 1}.")
+
+        valor = self._remover(chave)
+        if valor is _AUSENTE:
+            if padrao:
+                return padrao[0]
+            raise KeyError(chave)
+
+        self._tamanho -= 1
+        if self.filtro is not None:
+            self._contarRemocoes(1)
+        if self.validacaoIncremental:
+            validarCaminho(self, chave)
+        return valor
+
+    def __getitem__(self, chave: Chave) -> Any:
+        valor = self.get(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(chave)
+        return valor
+
+    def __setitem__(self, chave: Chave, valor: Any) -> None:
+        self.put(chave, valor)
+
+    def __delitem__(self, chave: Chave) -> None:
+        self.pop(chave)
+
+    def __contains__(self, chave: Chave) -> bool:
+        return self.buscar(chave) is not None
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self) -> Iterator[Chave]:
+        if self.key is not None:
+            # Com `key`, a chave original é guardada com o valor, em um par.
+            return (no.valores[indice][0] for no, indice in self._percorrer(None))
+        return (no.chaves[indice] for no, indice in self._percorrer(None))
+
+    def __reversed__(self) -> Iterator[Chave]:
+        if self.key is not None:
+            return (no.valores[indice][0] for no, indice in self._percorrerReverso(None))
+        return (no.chaves[indice] for no, indice in self._percorrerReverso(None))
+
+    def intervalo(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None,
+                  com_valores: bool = False) -> Iterator[Any]:
+        """
+        Percorre, em ordem crescente, as chaves no intervalo [inicio, fim).
+
+        A árvore é descida uma única vez até a primeira chave do intervalo e as chaves
+        seguintes são produzidas sob demanda, de modo que interromper a iteração cedo custa
+        apenas O(log n) mais o número de chaves consumidas. A árvore não deve ser
+        modificada enquanto a iteração estiver em andamento.
+
+        Argumentos:
+            inicio (Optional[Chave]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica sem limite.
+            com_valores (bool): Se verdadeiro, produz pares (chave, valor) em vez de chaves.
+
+        Retorna:
+            Iterator[Any]: As chaves (ou pares) do intervalo, em ordem crescente.
+        """
+        for no, indice in self._percorrer(inicio):
+            chave = no.chaves[indice]
+            if fim is not None and chave >= fim:
+                return
+            yield (chave, no.valores[indice]) if com_valores else chave
+
+    def seek(self, chave: Chave, com_valores: bool = False) -> Iterator[Any]:
+        """
+        Posiciona um cursor na primeira chave maior ou igual a `chave` e percorre as
+        seguintes em ordem crescente, sob demanda.
+
+        Por exemplo, `itertools.islice(arvore.seek(k), 10)` obtém as 10 chaves a partir de `k`.
+
+        Argumentos:
+            chave (Chave): A chave onde o cursor é posicionado.
+            com_valores (bool): Se verdadeiro, produz pares (chave, valor) em vez de chaves.
+
+        Retorna:
+            Iterator[Any]: As chaves (ou pares) a partir da posição do cursor.
+        """
+        return self.intervalo(chave, None, com_valores)
+
+    def rank(self, chave: Chave) -> int:
+        """
+        Conta as chaves da árvore menores que `chave`, isto é, a posição que ela ocupa (ou
+        ocuparia) na sequência ordenada das chaves.
+
+        Usa o número de chaves guardado em cada subárvore, de modo que apenas o caminho da
+        raiz até a chave é percorrido: O(t log n).
+
+        Argumentos:
+            chave (Chave): A chave de referência, que não precisa estar na árvore.
+
+        Retorna:
+            int: O número de chaves menores que `chave`.
+        """
+        posicao = 0
+        no = self.raiz
+        while no is not None:
+            i = no._posicao(chave)
+            posicao += i
+            encontrada = i < len(no.chaves) and no.chaves[i] == chave
+            if no.folha:
+                return posicao
+            # Os filhos à esquerda de i (e, se a chave está no nó, o próprio filho i)
+            # contêm apenas chaves menores.
+            filhos = no.filhos
+            for j in range(i + 1 if encontrada else i):
+                posicao += filhos[j].total
+            if encontrada:
+                return posicao
+            no = filhos[i]
+        return posicao
+
+    def select(self, indice: int) -> Chave:
+        """
+        Obtém a chave de uma posição da sequência ordenada das chaves, como `list(arvore)[indice]`,
+        descendo apenas pelo caminho até ela: O(t log n).
+
+        Argumentos:
+            indice (int): A posição da chave, a partir de 0. Índices negativos contam a
+                          partir da maior chave.
 
-    @icontract.require(lambda self, chave: self.buscar(chave) is None, "A chave a ser inserida não deve existir na árvore (pré-condição violada).")
-    def inserir(self, chave: int) -> None:
+        Retorna:
+            Chave: A chave na posição indicada.
+
+        Exceções:
+            IndexError: Se a posição estiver fora do intervalo [-len, len).
+        """
+        if indice < 0:
+            indice += self._tamanho
+        if not 0 <= indice < self._tamanho:
+            raise IndexError("Posição fora da árvore.")
+
+        no = self.raiz
+        while not no.folha:
+            for i, filho in enumerate(no.filhos):
+                if indice < filho.total:
+                    break
+                indice -= filho.total
+                # A posição é a do separador logo após este filho.
+                if indice == 0:
+                    return no.chaves[i]
+                indice -= 1
+            no = filho
+        return no.chaves[indice]
+
+    def count_range(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
+        """
+        Conta as chaves no intervalo [inicio, fim) sem percorrê-las, como
+        `len(list(arvore.intervalo(inicio, fim)))`, em O(t log n).
+
+        Argumentos:
+            inicio (Optional[Chave]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica sem limite.
+
+        Retorna:
+            int: O número de chaves no intervalo.
+        """
+        acima = self._tamanho if fim is None else self.rank(fim)
+        abaixo = 0 if inicio is None else self.rank(inicio)
+        return max(0, acima - abaixo)
+
+    def _percorrer(self, inicio: Optional[Chave]) -> Iterator[Tuple[NoArvoreB, int]]:
+        """
+        Percorre a árvore em ordem crescente a partir da primeira chave maior ou igual a
+        `inicio`, usando uma pilha explícita em vez de recursão.
+
+        Cada elemento da pilha é um par (nó, índice) que indica a próxima chave do nó a ser
+        produzida, depois que a subárvore `no.filhos[indice]` tiver sido percorrida.
+
+        Argumentos:
+            inicio (Optional[Chave]): A chave inicial. None indica a menor chave da árvore.
+
+        Retorna:
+            Iterator[Tuple[NoArvoreB, int]]: O nó e o índice de cada chave, em ordem crescente.
+        """
+        if self.raiz is None:
+            return
+
+        pilha: List[Tuple[NoArvoreB, int]] = []
+        no = self.raiz
+        while True:
+            i = 0 if inicio is None else no._posicao(inicio)
+            pilha.append((no, i))
+            # As chaves de no.filhos[i] são menores que `inicio` se ela está neste nó.
+            if no.folha or (i < len(no.chaves) and no.chaves[i] == inicio):
+                break
+            no = no.filhos[i]
+
+        while pilha:
+            no, i = pilha.pop()
+            if i < len(no.chaves):
+                yield no, i
+                pilha.append((no, i + 1))
+                if not no.folha:
+                    filho = no.filhos[i + 1]
+                    pilha.append((filho, 0))
+                    while not filho.folha:
+                        filho = filho.filhos[0]
+                        pilha.append((filho, 0))
+
+    def _percorrerReverso(self, fim: Optional[Chave]) -> Iterator[Tuple[NoArvoreB, int]]:
+        """
+        Percorre a árvore em ordem decrescente a partir da maior chave menor que `fim`,
+        usando uma pilha explícita em vez de recursão.
+
+        Cada elemento da pilha é um par (nó, índice) que indica que a próxima chave do nó
+        a ser produzida é a de posição `indice - 1`.
+
+        Argumentos:
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica a maior chave da árvore.
+
+        Retorna:
+            Iterator[Tuple[NoArvoreB, int]]: O nó e o índice de cada chave, em ordem decrescente.
+        """
+        if self.raiz is None:
+            return
+
+        pilha: List[Tuple[NoArvoreB, int]] = []
+        no = self.raiz
+        while True:
+            i = len(no.chaves) if fim is None else no._posicao(fim)
+            pilha.append((no, i))
+            if no.folha:
+                break
+            no = no.filhos[i]
+
+        while pilha:
+            no, i = pilha.pop()
+            if i > 0:
+                yield no, i - 1
+                pilha.append((no, i - 1))
+                if not no.folha:
+                    filho = no.filhos[i - 1]
+                    pilha.append((filho, len(filho.chaves)))
+                    while not filho.folha:
+                        filho = filho.filhos[-1]
+                        pilha.append((filho, len(filho.chaves)))
+
+    @icontract.require(lambda self, chave: self.buscar(chave) is None, "A chave a ser inserida não deve existir na árvore (pré-condição violada).", enabled=CONTRATOS_HABILITADOS)
+    def inserir(self, chave: Chave, valor: Any = None) -> None:
         """
         Insere uma chave na Árvore B.
 
+        Com os contratos desligados, inserir uma chave existente apenas substitui seu valor.
+
         Argumentos:
-            chave (int): A chave a ser inserida.
+            chave (Chave): A chave a ser inserida.
+            valor (Any): O valor associado à chave. Por padrão, None.
+        """
+        if self._inserir(chave, valor):
+            self._tamanho += 1
+            if self.filtro is not None:
+                self._adicionarAoFiltro(chave)
+        if self.validacaoIncremental:
+            validarCaminho(self, chave)
+
+    def _inserir(self, chave: Chave, valor: Any) -> bool:
         """
+        Insere uma chave com uma única descida a partir da raiz, dividindo os nós cheios
+        no caminho. Se a chave já existir, apenas substitui o valor.
+
+        Argumentos:
+            chave (Chave): A chave a ser inserida.
+            valor (Any): O valor associado à chave.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se já existia.
+        """
+        if self._dedo is not None:
+            inserida = self._inserirPeloDedo(chave, valor)
+            if inserida is not None:
+                return inserida
+
         if self.raiz is None:
-            self.raiz = NoArvoreB(folha=True)
+            self.raiz = self._novoNo(folha=True)
             self.raiz.chaves.append(chave)
-            return
+            self.raiz.valores.append(valor)
+            self.raiz.total = 1
+            return True
 
         raiz_atual = self.raiz
 
         if len(raiz_atual.chaves) == (2 * self.ordem) - 1:
-            nova_raiz = NoArvoreB(folha=False)
+            # Evita dividir a raiz quando a chave já está nela.
+            i = raiz_atual._posicao(chave)
+            if i < len(raiz_atual.chaves) and raiz_atual.chaves[i] == chave:
+                raiz_atual.valores[i] = valor
+                return False
+
+            nova_raiz = self._novoNo(folha=False)
             nova_raiz.filhos.append(raiz_atual)
+            nova_raiz.total = raiz_atual.total
             self.raiz = nova_raiz
-            self._dividirFilho(nova_raiz, 0)
-            self._inserirEmNaoCheio(nova_raiz, chave)
+            self._altura += 1
+            self._dividirParaInserir(nova_raiz, 0, chave, True)
+            return self._inserirEmNaoCheio(nova_raiz, chave, valor)
         else:
-            self._inserirEmNaoCheio(raiz_atual, chave)
+            return self._inserirEmNaoCheio(raiz_atual, chave, valor)
+
+    def _inserirPeloDedo(self, chave: Chave, valor: Any) -> Optional[bool]:
+        """
+        Insere a chave diretamente na folha do dedo, sem descer a partir da raiz, se ela
+        cai entre os separadores da folha e a folha não está cheia.
+
+        Retorna:
+            Optional[bool]: Como em `_inserir`, ou None se a chave não pôde ser inserida
+                            pelo dedo e deve seguir pelo caminho normal.
+        """
+        caminho = self._naFolhaDoDedo(chave)
+        if caminho is None:
+            return None
+        folha = caminho[-1]
+        i = folha._posicao(chave)
+        if i < len(folha.chaves) and folha.chaves[i] == chave:
+            folha.valores[i] = valor
+            return False
+        if len(folha.chaves) == 2 * self.ordem - 1:
+            return None
+        folha.chaves.insert(i, chave)
+        folha.valores.insert(i, valor)
+        for no in caminho:
+            no.total += 1
+        return True
+
+    def _dividirParaInserir(self, pai: NoArvoreB, indice: int, chave: Chave, na_espinha: bool) -> None:
+        """
+        Divide o filho cheio antes de descer a ele durante uma inserção. Com a inserção
+        crescente, se o filho está na borda direita e a chave é maior que todas as dele, a
+        divisão sobe a sua última chave e deixa o novo nó da direita vazio, à espera das
+        próximas chaves, em vez de dividi-lo ao meio.
 
-    def _inserirEmNaoCheio(self, no: NoArvoreB, chave: int) -> None:
+        Argumentos:
+            pai (NoArvoreB): O nó pai do filho cheio.
+            indice (int): O índice do filho cheio.
+            chave (Chave): A chave sendo inserida.
+            na_espinha (bool): Se `pai` está na borda direita da árvore.
+        """
+        filho = pai.filhos[indice]
+        if (na_espinha and self.insercaoCrescente and not self.validacaoIncremental
+                and indice == len(pai.chaves) and chave > filho.chaves[-1]):
+            self._dividirFilho(pai, indice, len(filho.chaves) - 1)
+            self._espinhaAberta = True
+        else:
+            self._dividirFilho(pai, indice)
+
+    def _fecharEspinha(self) -> None:
+        """
+        Leva os nós da borda direita deixados abaixo do mínimo pela inserção crescente de
+        volta ao mínimo de chaves. Chamado antes das operações que dependem do mínimo
+        (remoções, junções, inserção em lote, validação e gravação).
+        """
+        if self._espinhaAberta:
+            self._espinhaAberta = False
+            if self.raiz is not None and not self.raiz.folha:
+                self._ajustarEspinhaDireita()
+
+    def _descartarPosicoes(self) -> None:
+        """
+        Descarta o dedo e as posições do cache. Chamado pelas operações que desligam nós da
+        árvore (fusões, remoções de intervalo, inserções em lote e junções), porque um nó
+        desligado continua com as chaves que tinha e a conferência do cache o aceitaria.
+        """
+        self._dedo = None
+        if self.cache is not None:
+            self.cache.limpar(self.raiz)
+
+    def _adicionarAoFiltro(self, chave: Chave) -> None:
+        """
+        Adiciona ao filtro de Bloom uma chave inserida, reconstruindo-o com o dobro do
+        tamanho da árvore se ele passou da capacidade.
+        """
+        filtro = self.filtro
+        filtro.adicionar(chave)
+        if filtro.quantidade > filtro.capacidade:
+            self._reconstruirFiltro()
+
+    def _contarRemocoes(self, quantidade: int) -> None:
+        """
+        Conta chaves removidas, que continuam marcadas no filtro de Bloom, e o reconstrói
+        quando elas passam da metade das adicionadas, o que também acontece logo depois das
+        remoções em lote ou por intervalo que levam boa parte da árvore.
+        """
+        filtro = self.filtro
+        filtro.removidas += quantidade
+        if filtro.removidas > filtro.quantidade // 2:
+            self._reconstruirFiltro()
+
+    def _reconstruirFiltro(self) -> None:
+        """
+        Reconstrói o filtro de Bloom a partir das chaves atuais da árvore, com capacidade
+        para o dobro delas. Como cada reconstrução só acontece depois de um número de
+        inserções ou remoções proporcional ao tamanho da árvore, o custo por operação é
+        constante, amortizado.
+        """
+        self.filtro.reconstruir((no.chaves[indice] for no, indice in self._percorrer(None)), 2 * self._tamanho)
+
+    def _inserirEmNaoCheio(self, no: NoArvoreB, chave: Chave, valor: Any) -> bool:
         """
         Método auxiliar para inserir uma chave em um nó que não está cheio.
 
         Argumentos:
             no (NoArvoreB): O nó onde a chave será inserida.
-            chave (int): A chave a ser inserida.
+            chave (Chave): A chave a ser inserida.
+            valor (Any): O valor associado à chave.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se já existia e o valor foi substituído.
         """
-        i = len(no.chaves) - 1
-        if no.folha:
-            # Encontra a posição correta para a chave e insere
-            while i >= 0 and chave < no.chaves[i]:
-                i -= 1
-            no.chaves.insert(i + 1, chave)
-        else:
-            # Encontra o filho correto para descer
-            while i >= 0 and chave < no.chaves[i]:
-                i -= 1
-            i += 1
+        # Nós do caminho, cuja contagem de chaves aumenta se a chave for inserida.
+        caminho: List[NoArvoreB] = []
+        # Se o nó está na borda direita, e os separadores que delimitam a sua subárvore.
+        na_espinha = no is self.raiz
+        minimo = maximo = None
+        while True:
+            i = no._posicao(chave)
+            if i < len(no.chaves) and no.chaves[i] == chave:
+                no.valores[i] = valor
+                return False
+
+            if no.folha:
+                # Insere a chave na posição encontrada da folha
+                no.chaves.insert(i, chave)
+                no.valores.insert(i, valor)
+                no.total += 1
+                for ancestral in caminho:
+                    ancestral.total += 1
+                if self.dedo:
+                    caminho.append(no)
+                    self._dedo = (caminho, minimo, maximo)
+                return True
+
+            # Divide o filho antes de descer, se ele estiver cheio
             if len(no.filhos[i].chaves) == (2 * self.ordem) - 1:
-                self._dividirFilho(no, i)
+                self._dividirParaInserir(no, i, chave, na_espinha)
+                if chave == no.chaves[i]:
+                    no.valores[i] = valor
+                    return False
                 if chave > no.chaves[i]:
                     i += 1
-            self._inserirEmNaoCheio(no.filhos[i], chave)
+            na_espinha = na_espinha and i == len(no.chaves)
+            if i > 0:
+                minimo = no.chaves[i - 1]
+            if i < len(no.chaves):
+                maximo = no.chaves[i]
+            caminho.append(no)
+            no = self._filhoMutavel(no, i)
+
+    def inserir_se_ausente(self, chave: Chave, valor: Any = None) -> bool:
+        """
+        Insere uma chave apenas se ela ainda não estiver na árvore, com uma única descida.
+
+        Diferente de `inserir`, não há a busca prévia do contrato, e diferente de `put`, uma
+        chave existente não tem o valor substituído nem provoca divisões: a descida apenas
+        registra o caminho, e os nós que transbordarem com a nova chave são divididos depois,
+        de baixo para cima. Em fluxos com muitas chaves repetidas, as repetidas custam
+        apenas uma busca.
+
+        Argumentos:
+            chave (Chave): A chave a ser inserida.
+            valor (Any): O valor associado à chave, se ela for inserida.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se ela já existia.
+        """
+        inserida = self._inserirSeAusente(chave, valor)
+        if inserida:
+            self._tamanho += 1
+            if self.filtro is not None:
+                self._adicionarAoFiltro(chave)
+            if self.validacaoIncremental:
+                validarCaminho(self, chave)
+        return inserida
+
+    def _inserirSeAusente(self, chave: Chave, valor: Any) -> bool:
+        """
+        Desce uma vez até a folha da chave, registrando o índice seguido em cada nó, sem
+        alterar nada. Se a chave não foi encontrada, insere-a na folha e divide, de baixo
+        para cima, os nós do caminho que ficaram com 2t chaves.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se já existia.
+        """
+        if self.raiz is None:
+            self.raiz = self._novoNo(folha=True)
+
+        indices: List[int] = []
+        no = self.raiz
+        while True:
+            i = no._posicao(chave)
+            if i < len(no.chaves) and no.chaves[i] == chave:
+                return False
+            if no.folha:
+                posicao = i
+                break
+            indices.append(i)
+            no = no.filhos[i]
+
+        # Refaz o caminho pelos índices registrados, sem comparações, obtendo nós que podem
+        # ser modificados (cópias, na árvore concorrente).
+        caminho = [self.raiz]
+        for i in indices:
+            caminho.append(self._filhoMutavel(caminho[-1], i))
+        for ancestral in caminho:
+            ancestral.total += 1
+        folha = caminho[-1]
+        folha.chaves.insert(posicao, chave)
+        folha.valores.insert(posicao, valor)
 
-    @icontract.require(lambda self, chave: self.buscar(chave) is not None, "A chave a ser removida deve existir na árvore (pré-condição violada).")
-    def remover(self, chave: int) -> None:
+        # Divisão preguiçosa: só os nós que transbordaram, do mais profundo para a raiz.
+        nivel = len(indices)
+        while len(caminho[nivel].chaves) > 2 * self.ordem - 1:
+            if nivel == 0:
+                nova_raiz = self._novoNo(folha=False)
+                nova_raiz.filhos.append(self.raiz)
+                nova_raiz.total = self.raiz.total
+                self.raiz = nova_raiz
+                self._altura += 1
+                self._dividirFilho(nova_raiz, 0)
+                break
+            self._dividirFilho(caminho[nivel - 1], indices[nivel - 1])
+            nivel -= 1
+        return True
+
+    def buscar_muitos(self, chaves: Iterable[Chave]) -> List[Optional[Tuple[NoArvoreB, int]]]:
+        """
+        Busca um lote de chaves de uma só vez.
+
+        O lote é ordenado uma única vez e percorre a árvore cooperativamente: cada nó é
+        visitado uma vez por lote e repassa a cada filho apenas o trecho do lote que cai
+        naquela subárvore, de modo que chaves vizinhas compartilham a descida.
+
+        Argumentos:
+            chaves (Iterable[Chave]): As chaves procuradas. Aceita qualquer iterável, inclusive
+                                    arrays do NumPy.
+
+        Retorna:
+            List[Optional[Tuple[NoArvoreB, int]]]: O resultado de `buscar` para cada chave,
+                                                   na ordem original do lote.
+        """
+        lista = _comoLista(chaves)
+        resultados: List[Optional[Tuple[NoArvoreB, int]]] = [None] * len(lista)
+        if self.raiz is None or not lista:
+            return resultados
+
+        posicoes = sorted(range(len(lista)), key=lista.__getitem__)
+        ordenadas = [lista[posicao] for posicao in posicoes]
+
+        # Cada elemento da pilha é um nó e o trecho [inicio, fim) do lote ordenado que cai nele.
+        pilha = [(self.raiz, 0, len(ordenadas))]
+        while pilha:
+            no, inicio, fim = pilha.pop()
+            chaves_no = no.chaves
+            i = 0
+            if no.folha:
+                for j in range(inicio, fim):
+                    i = bisect_left(chaves_no, ordenadas[j], i)
+                    if i < len(chaves_no) and chaves_no[i] == ordenadas[j]:
+                        resultados[posicoes[j]] = (no, i)
+                continue
+
+            grupo = inicio
+            while grupo < fim:
+                i = bisect_left(chaves_no, ordenadas[grupo], i)
+                if i == len(chaves_no):
+                    pilha.append((no.filhos[i], grupo, fim))
+                    break
+
+                # As chaves do lote menores que o separador i descem para o filho i.
+                limite = chaves_no[i]
+                proximo = bisect_left(ordenadas, limite, grupo, fim)
+                if proximo > grupo:
+                    pilha.append((no.filhos[i], grupo, proximo))
+                # As chaves iguais ao separador foram encontradas neste nó.
+                while proximo < fim and ordenadas[proximo] == limite:
+                    resultados[posicoes[proximo]] = (no, i)
+                    proximo += 1
+                grupo = proximo
+
+        return resultados
+
+    def inserir_muitos(self, chaves: Iterable[Chave], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        """
+        Insere um lote de chaves de uma só vez, substituindo o valor das que já existem.
+
+        O lote é ordenado uma única vez e distribuído pela árvore como em `buscar_muitos`.
+        Cada folha recebe de uma vez todas as suas chaves novas e os nós que transbordam
+        são divididos de baixo para cima, no máximo uma vez por lote, em quantos pedaços
+        forem necessários. O resultado equivale a chamar `put` para cada chave, na ordem.
+
+        O lote inteiro é ordenado e conferido por `_conferirLote` antes de a árvore ser
+        alterada, de modo que uma chave incomparável ou que os nós não aceitam (um inteiro
+        fora de 64 bits em uma árvore compacta, por exemplo) faz o lote falhar sem inserir
+        nenhuma chave.
+
+        Argumentos:
+            chaves (Iterable[Chave]): As chaves a serem inseridas. Aceita qualquer iterável,
+                                    inclusive arrays do NumPy.
+            valores (Optional[Iterable[Any]]): Os valores de cada chave, na mesma ordem.
+                                               Por padrão, None para todas.
+
+        Retorna:
+            List[bool]: Para cada chave, na ordem original, True se ela foi inserida e False
+                        se já existia (na árvore ou antes no próprio lote).
+        """
+        lista = _comoLista(chaves)
+        lista_valores = [None] * len(lista) if valores is None else _comoLista(valores)
+        if len(lista_valores) != len(lista):
+            raise ValueError("O lote deve ter um valor para cada chave.")
+
+        resultados = [False] * len(lista)
+        if not lista:
+            return resultados
+
+        # Ordenação estável: entre chaves repetidas, vale o último valor e só a primeira
+        # ocorrência pode ser uma inserção, como em chamadas sucessivas de `put`.
+        posicoes = sorted(range(len(lista)), key=lista.__getitem__)
+        ordenadas: List[Chave] = []
+        valores_ordenados: List[Any] = []
+        primeiras: List[Chave] = []
+        for posicao in posicoes:
+            chave = lista[posicao]
+            if ordenadas and ordenadas[-1] == chave:
+                valores_ordenados[-1] = lista_valores[posicao]
+            else:
+                ordenadas.append(chave)
+                valores_ordenados.append(lista_valores[posicao])
+                primeiras.append(posicao)
+
+        inseridas = [True] * len(ordenadas)
+
+        self._conferirLote(ordenadas)
+        self._fecharEspinha()
+        self._descartarPosicoes()
+        if self.raiz is None:
+            self.raiz = self._novoNo(folha=True)
+        pedacos = self._inserirLote(self.raiz, ordenadas, valores_ordenados, inseridas, 0, len(ordenadas))
+
+        # A raiz transbordou: os pedaços passam a ser filhos de uma nova raiz, que também
+        # pode precisar ser dividida se o lote for grande em relação à árvore.
+        while pedacos:
+            nova_raiz = self._novoNo(folha=False)
+            nova_raiz.filhos.append(self.raiz)
+            nova_raiz.total = self.raiz.total
+            for separador, valor, pedaco in pedacos:
+                nova_raiz.chaves.append(separador)
+                nova_raiz.valores.append(valor)
+                nova_raiz.filhos.append(pedaco)
+                nova_raiz.total += 1 + pedaco.total
+            self.raiz = nova_raiz
+            self._altura += 1
+            pedacos = self._dividirEmPedacos(nova_raiz)
+
+        for indice, posicao in enumerate(primeiras):
+            resultados[posicao] = inseridas[indice]
+        self._tamanho += sum(inseridas)
+        if self.filtro is not None:
+            for chave, inserida in zip(ordenadas, inseridas):
+                if inserida:
+                    self._adicionarAoFiltro(chave)
+        if self.validacaoIncremental:
+            for chave in ordenadas:
+                validarCaminho(self, chave)
+        return resultados
+
+    def _conferirLote(self, chaves: List[Chave]) -> None:
+        """
+        Verifica se os nós aceitam todas as chaves de um lote, antes de alterar a árvore.
+        Os nós compactos guardam as chaves em um array('q'), que recusa o que não for um
+        inteiro de 64 bits; a conversão do lote inteiro falha com o mesmo erro.
+
+        Argumentos:
+            chaves (List[Chave]): As chaves do lote.
+        """
+        if self.compacto:
+            array("q", chaves)
+
+    def _inserirLote(self, no: NoArvoreB, chaves: List[Chave], valores: List[Any], inseridas: List[bool],
+                     inicio: int, fim: int) -> List[Tuple[Chave, Any, NoArvoreB]]:
+        """
+        Insere na subárvore de `no` o trecho [inicio, fim) de um lote ordenado e sem repetições.
+
+        Argumentos:
+            no (NoArvoreB): A raiz da subárvore.
+            chaves (List[Chave]): As chaves do lote, em ordem crescente.
+            valores (List[Any]): Os valores de cada chave do lote.
+            inseridas (List[bool]): Marcada como False para as chaves que já existiam.
+            inicio (int): O início do trecho do lote que cai nesta subárvore.
+            fim (int): O fim (exclusivo) do trecho.
+
+        Retorna:
+            List[Tuple[Chave, Any, NoArvoreB]]: Os separadores e os novos nós à direita de `no`,
+                                              se ele transbordou e foi dividido.
+        """
+        if no.folha and fim - inicio <= _LOTE_PEQUENO:
+            # Poucas chaves: insere cada uma no próprio lugar, como em `_inserirEmNaoCheio`.
+            i = 0
+            for j in range(inicio, fim):
+                i = bisect_left(no.chaves, chaves[j], i)
+                if i < len(no.chaves) and no.chaves[i] == chaves[j]:
+                    no.valores[i] = valores[j]
+                    inseridas[j] = False
+                else:
+                    no.chaves.insert(i, chaves[j])
+                    no.valores.insert(i, valores[j])
+                i += 1
+            no.total = len(no.chaves)
+            return self._dividirEmPedacos(no)
+
+        if no.folha:
+            # Intercala as chaves da folha com as do lote em novas listas do mesmo tipo,
+            # copiando por fatias os trechos da folha entre chaves consecutivas do lote.
+            novas_chaves = no.chaves[:0]
+            novos_valores = no.valores[:0]
+            i = 0
+            for j in range(inicio, fim):
+                chave = chaves[j]
+                posicao = bisect_left(no.chaves, chave, i)
+                novas_chaves.extend(no.chaves[i:posicao])
+                novos_valores.extend(no.valores[i:posicao])
+                i = posicao
+                if i < len(no.chaves) and no.chaves[i] == chave:
+                    inseridas[j] = False
+                    i += 1
+                novas_chaves.append(chave)
+                novos_valores.append(valores[j])
+            novas_chaves.extend(no.chaves[i:])
+            novos_valores.extend(no.valores[i:])
+            no.chaves = novas_chaves
+            no.valores = novos_valores
+            no.total = len(novas_chaves)
+            return self._dividirEmPedacos(no)
+
+        # Agrupa o trecho do lote pelo filho onde cada chave deve ser inserida.
+        grupos = []
+        i = 0
+        grupo = inicio
+        while grupo < fim:
+            i = bisect_left(no.chaves, chaves[grupo], i)
+            if i < len(no.chaves) and no.chaves[i] == chaves[grupo]:
+                no.valores[i] = valores[grupo]
+                inseridas[grupo] = False
+                grupo += 1
+                continue
+            proximo = fim if i == len(no.chaves) else bisect_left(chaves, no.chaves[i], grupo, fim)
+            grupos.append((i, grupo, proximo))
+            grupo = proximo
+
+        # Da direita para a esquerda, para que os índices dos filhos restantes não mudem.
+        for i, grupo, proximo in reversed(grupos):
+            pedacos = self._inserirLote(self._filhoMutavel(no, i), chaves, valores, inseridas, grupo, proximo)
+            for deslocamento, (separador, valor, pedaco) in enumerate(pedacos):
+                no.chaves.insert(i + deslocamento, separador)
+                no.valores.insert(i + deslocamento, valor)
+                no.filhos.insert(i + deslocamento + 1, pedaco)
+
+        no.total += sum(inseridas[inicio:fim])
+        return self._dividirEmPedacos(no)
+
+    def _dividirEmPedacos(self, no: NoArvoreB) -> List[Tuple[Chave, Any, NoArvoreB]]:
+        """
+        Divide um nó que transbordou em quantos pedaços forem necessários para que cada um
+        tenha entre t-1 e 2t-1 chaves. O primeiro pedaço permanece em `no`.
+
+        Argumentos:
+            no (NoArvoreB): O nó a ser dividido.
+
+        Retorna:
+            List[Tuple[Chave, Any, NoArvoreB]]: Para cada pedaço além do primeiro, o separador
+                                              que o antecede, o valor do separador e o nó.
+                                              Vazia se o nó não transbordou.
+        """
+        total = len(no.chaves)
+        if total <= 2 * self.ordem - 1:
+            return []
+
+        # Menor número de pedaços k tal que k * (2t - 1) + (k - 1) separadores >= total.
+        quantidade = -(-(total + 1) // (2 * self.ordem))
+        base, resto = divmod(total - (quantidade - 1), quantidade)
+        tamanhos = [base + 1 if indice < resto else base for indice in range(quantidade)]
+
+        pedacos = []
+        inicio = tamanhos[0]
+        for tamanho in tamanhos[1:]:
+            pedaco = self._novoNo(folha=no.folha)
+            pedaco.chaves = no.chaves[inicio + 1:inicio + 1 + tamanho]
+            pedaco.valores = no.valores[inicio + 1:inicio + 1 + tamanho]
+            if not no.folha:
+                pedaco.filhos = no.filhos[inicio + 1:inicio + 2 + tamanho]
+            pedaco.total = self._contarSubarvore(pedaco)
+            no.total -= 1 + pedaco.total
+            pedacos.append((no.chaves[inicio], no.valores[inicio], pedaco))
+            inicio += tamanho + 1
+
+        del no.chaves[tamanhos[0]:]
+        del no.valores[tamanhos[0]:]
+        if not no.folha:
+            del no.filhos[tamanhos[0] + 1:]
+        return pedacos
+
+    @icontract.require(lambda self, chave: self.buscar(chave) is not None, "A chave a ser removida deve existir na árvore (pré-condição violada).", enabled=CONTRATOS_HABILITADOS)
+    def remover(self, chave: Chave) -> None:
         """
         Remove uma chave da Árvore B.
 
         Argumentos:
-            chave (int): A chave a ser removida.
+            chave (Chave): A chave a ser removida.
         """
         if not self.raiz:
             print("Erro: Árvore está vazia.")
             return
 
-        self._removerRecursivo(self.raiz, chave)
+        if self._remover(chave) is _AUSENTE:
+            print(f"Erro: Chave {chave} não encontrada na árvore.")
+        else:
+            self._tamanho -= 1
+            if self.filtro is not None:
+                self._contarRemocoes(1)
+            if self.validacaoIncremental:
+                validarCaminho(self, chave)
+
+    def _remover(self, chave: Chave) -> Any:
+        """
+        Remove uma chave com uma única descida a partir da raiz.
+
+        Argumentos:
+            chave (Chave): A chave a ser removida.
+
+        Retorna:
+            Any: O valor que estava associado à chave, ou `_AUSENTE` se ela não existia.
+        """
+        self._fecharEspinha()
+        if self.raiz is None:
+            return _AUSENTE
+        if self.filtro is not None and not self.filtro.talvezContenha(chave):
+            return _AUSENTE
+
+        valor = self._removerRecursivo(self.raiz, chave)
 
         # Se a remoção esvaziou a raiz e ela não é uma folha,
         # o primeiro filho se torna a nova raiz, diminuindo a altura da árvore.
         if len(self.raiz.chaves) == 0 and not self.raiz.folha:
             self.raiz = self.raiz.filhos[0]
+            self._altura -= 1
+
+        return valor
 
-    def _removerRecursivo(self, no: NoArvoreB, chave: int) -> None:
+    def _removerRecursivo(self, no: NoArvoreB, chave: Chave) -> Any:
         """
         Método recursivo para percorrer a árvore e remover a chave.
+
+        Retorna:
+            Any: O valor que estava associado à chave, ou `_AUSENTE` se ela não foi encontrada.
         """
         # Encontra a posição da chave ou a subárvore onde ela pode estar.
-        i = 0
-        while i < len(no.chaves) and chave > no.chaves[i]:
-            i += 1
+        i = no._posicao(chave)
 
         # Caso 1: A chave está neste nó.
         if i < len(no.chaves) and no.chaves[i] == chave:
             if no.folha:
                 # Caso 1a: Se o nó for uma folha, simplesmente remove a chave.
                 no.chaves.pop(i)
+                valor = no.valores.pop(i)
             else:
                 # Caso 1b: Se o nó for interno, a lógica é mais complexa.
-                self._removerDeNoInterno(no, i)
+                valor = self._removerDeNoInterno(no, i)
         
         # Caso 2: A chave não está neste nó.
         else:
             # Se o nó é uma folha, a chave não está na árvore.
             if no.folha:
-                print(f"Erro: Chave {chave} não encontrada na árvore.")
-                return
+                return _AUSENTE
 
             # Antes de descer para o filho, garante que ele tenha chaves suficientes.
             # Esta é a lógica de rebalanceamento preventivo.
@@ -144,52 +1402,444 @@ class ArvoreB:
             # Após o possível rebalanceamento, a recursão continua.
             # Se a fusão ocorreu, a chave pode ter se movido.
             if i > len(no.chaves):
-                self._removerRecursivo(no.filhos[i-1], chave)
+                valor = self._removerRecursivo(self._filhoMutavel(no, i - 1), chave)
             else:
-                self._removerRecursivo(no.filhos[i], chave)
+                valor = self._removerRecursivo(self._filhoMutavel(no, i), chave)
 
-    def _removerDeNoInterno(self, no: NoArvoreB, indice: int) -> None:
+        # A subárvore deste nó perdeu uma chave se ela foi encontrada.
+        if valor is not _AUSENTE:
+            no.total -= 1
+        return valor
+
+    def _removerDeNoInterno(self, no: NoArvoreB, indice: int) -> Any:
         """
         Lida com a remoção de uma chave que está em um nó interno.
+
+        Retorna:
+            Any: O valor que estava associado à chave removida.
         """
+        self._dedo = None
         chave = no.chaves[indice]
+        valor = no.valores[indice]
         filho_anterior = no.filhos[indice]
         filho_seguinte = no.filhos[indice + 1]
 
         # Caso 2a: Se o filho à esquerda (anterior) tem chaves suficientes,
         # encontramos o predecessor da chave, o substituímos e removemos o predecessor.
         if len(filho_anterior.chaves) >= self.ordem:
-            predecessor = self._encontrarPredecessor(filho_anterior)
+            predecessor, valor_predecessor = self._encontrarPredecessor(filho_anterior)
             no.chaves[indice] = predecessor
-            self._removerRecursivo(filho_anterior, predecessor)
+            no.valores[indice] = valor_predecessor
+            self._removerRecursivo(self._filhoMutavel(no, indice), predecessor)
         # Caso 2b: Se o filho à direita (seguinte) tem chaves suficientes,
         # fazemos o mesmo com o sucessor.
         elif len(filho_seguinte.chaves) >= self.ordem:
-            sucessor = self._encontrarSucessor(filho_seguinte)
+            sucessor, valor_sucessor = self._encontrarSucessor(filho_seguinte)
             no.chaves[indice] = sucessor
-            self._removerRecursivo(filho_seguinte, sucessor)
+            no.valores[indice] = valor_sucessor
+            self._removerRecursivo(self._filhoMutavel(no, indice + 1), sucessor)
         # Caso 2c: Se ambos os filhos têm o mínimo de chaves, os fundimos.
         else:
             self._fundir(no, indice)
-            self._removerRecursivo(filho_anterior, chave)
+            self._removerRecursivo(no.filhos[indice], chave)
 
-    def _encontrarPredecessor(self, no: NoArvoreB) -> int:
+        return valor
+
+    def remover_intervalo(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
         """
-        Encontra a maior chave na subárvore (predecessor).
+        Remove todas as chaves no intervalo [inicio, fim).
+
+        Em vez de remover chave por chave, as subárvores inteiramente contidas no intervalo
+        são desligadas da árvore de uma vez, os nós das duas bordas são aparados e o
+        rebalanceamento é feito uma única vez, de baixo para cima, ao longo dos dois
+        caminhos de borda. O custo é proporcional à altura e ao número de nós afetados,
+        não ao número de chaves removidas.
+
+        Argumentos:
+            inicio (Optional[Chave]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica sem limite.
+
+        Retorna:
+            int: O número de chaves removidas.
+        """
+        quantidade = self._removerIntervalo(inicio, fim)
+        self._tamanho -= quantidade
+        if self.filtro is not None and quantidade:
+            self._contarRemocoes(quantidade)
+        if self.validacaoIncremental and quantidade:
+            for limite in (inicio, fim):
+                if limite is not None:
+                    validarCaminho(self, limite)
+        return quantidade
+
+    def remover_muitos(self, chaves: Iterable[Chave]) -> List[bool]:
+        """
+        Remove um lote de chaves de uma só vez.
+
+        O lote é buscado e ordenado de uma só vez e dividido em trechos de chaves
+        consecutivas na árvore, isto é, sem nenhuma chave fora do lote entre elas. Cada
+        trecho com pelo menos `_TRECHO_MINIMO` (8) chaves é removido como um intervalo, como
+        em `remover_intervalo`; os menores são removidos chave por chave, já que localizar o
+        fim do intervalo (`rank` e `select`) e aparar as duas bordas custa mais que algumas
+        remoções individuais.
+
+        Com a validação incremental, um trecho removido como intervalo é validado ao longo
+        dos caminhos das duas bordas, como em `remover_intervalo`, e um trecho removido
+        chave por chave, ao longo do caminho de cada chave.
+
+        Argumentos:
+            chaves (Iterable[Chave]): As chaves a serem removidas. Aceita qualquer iterável,
+                                    inclusive arrays do NumPy.
+
+        Retorna:
+            List[bool]: Para cada chave, na ordem original, True se ela foi removida e False
+                        se não existia (ou já havia aparecido antes no próprio lote).
+        """
+        lista = _comoLista(chaves)
+        resultados = [False] * len(lista)
+        if self.raiz is None or not lista:
+            return resultados
+
+        # Cada trecho é uma lista de chaves consecutivas na árvore. Uma chave continua o
+        # trecho anterior se for a sucessora imediata, na árvore, da última chave dele.
+        trechos: List[List[Any]] = []
+        anterior: Optional[Tuple[NoArvoreB, int]] = None
+        encontradas = self.buscar_muitos(lista)
+        for posicao in sorted(range(len(lista)), key=lista.__getitem__):
+            encontrada = encontradas[posicao]
+            chave = lista[posicao]
+            if encontrada is None:
+                anterior = None
+                continue
+            if trechos and chave == trechos[-1][-1]:
+                continue
+            resultados[posicao] = True
+
+            if anterior is not None and self._saoVizinhas(anterior, encontrada, trechos[-1][-1], chave):
+                trechos[-1].append(chave)
+            else:
+                trechos.append([chave])
+            anterior = encontrada
+
+        for trecho in trechos:
+            if len(trecho) < _TRECHO_MINIMO:
+                for chave in trecho:
+                    self._remover(chave)
+                    self._tamanho -= 1
+                    if self.validacaoIncremental:
+                        validarCaminho(self, chave)
+            else:
+                posicao = self.rank(trecho[-1]) + 1
+                self._removerIntervalo(trecho[0], self.select(posicao) if posicao < len(self) else None)
+                self._tamanho -= len(trecho)
+                if self.validacaoIncremental:
+                    validarCaminho(self, trecho[0])
+                    validarCaminho(self, trecho[-1])
+        if self.filtro is not None and trechos:
+            self._contarRemocoes(sum(len(trecho) for trecho in trechos))
+        return resultados
+
+    def _saoVizinhas(self, anterior: Tuple[NoArvoreB, int], seguinte: Tuple[NoArvoreB, int],
+                     chave_anterior: Chave, chave_seguinte: Chave) -> bool:
+        """
+        Verifica se `chave_seguinte` vem imediatamente depois de `chave_anterior` na árvore,
+        a partir das posições (nó, índice) em que `buscar` encontrou as duas.
+
+        Dentro de uma folha, a sucessora é apenas a chave seguinte do mesmo nó; só quando
+        as duas estão nas pontas de nós diferentes é preciso comparar as posições na
+        sequência ordenada (`rank`).
+        """
+        no, indice = anterior
+        if no.folha and indice + 1 < len(no.chaves):
+            return seguinte[0] is no and seguinte[1] == indice + 1
+        if seguinte[0].folha and seguinte[1] > 0:
+            return seguinte[0] is no and seguinte[1] == indice + 1
+        return self.rank(chave_seguinte) == self.rank(chave_anterior) + 1
+
+    def _removerIntervalo(self, inicio: Optional[Chave], fim: Optional[Chave]) -> int:
+        """
+        Remove as chaves no intervalo [inicio, fim) sem alterar o tamanho registrado.
+
+        Retorna:
+            int: O número de chaves removidas.
+        """
+        self._fecharEspinha()
+        self._descartarPosicoes()
+        if self.raiz is None:
+            return 0
+        quantidade = self.count_range(inicio, fim)
+        if quantidade == 0:
+            return 0
+
+        if quantidade == self.raiz.total:
+            self._descartarSubarvore(self.raiz)
+            self.raiz = self._novoNo(folha=True)
+            self._altura = 0
+            return quantidade
+
+        self._removerIntervaloNo(self.raiz, inicio, fim)
+
+        # Raízes esvaziadas dão lugar ao seu único filho, diminuindo a altura da árvore.
+        while not self.raiz.folha and len(self.raiz.chaves) == 0:
+            raiz_anterior = self.raiz
+            self.raiz = self.raiz.filhos[0]
+            self._altura -= 1
+            self._descartarNo(raiz_anterior)
+        return quantidade
+
+    def _removerIntervaloNo(self, no: NoArvoreB, inicio: Optional[Chave], fim: Optional[Chave]) -> None:
+        """
+        Remove da subárvore de `no` as chaves no intervalo [inicio, fim).
+
+        Ao final, os descendentes de `no` respeitam o número mínimo de chaves, exceto, em
+        cadeia, o único filho de um nó que tenha ficado sem chaves. O próprio `no` pode ficar
+        com menos chaves que o mínimo; quem o chamou deve repará-lo com `_repararFilho`.
+
+        Argumentos:
+            no (NoArvoreB): A raiz da subárvore, que já pode ser modificada.
+            inicio (Optional[Chave]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica sem limite.
+        """
+        i = 0 if inicio is None else no._posicao(inicio)
+        j = len(no.chaves) if fim is None else no._posicao(fim)
+
+        if no.folha:
+            del no.chaves[i:j]
+            del no.valores[i:j]
+            no.total = len(no.chaves)
+            return
+
+        if i == j:
+            # Nenhuma chave deste nó está no intervalo: ele cai inteiro em um único filho.
+            self._removerIntervaloNo(self._filhoMutavel(no, i), inicio, fim)
+            no.total = self._contarSubarvore(no)
+            self._repararFilho(no, i)
+            return
+
+        # Os filhos entre as chaves removidas estão inteiros no intervalo. Os das bordas
+        # são aparados: o da esquerda perde as chaves a partir de `inicio` e o da direita,
+        # as anteriores a `fim`. Sem um limite, o filho daquela borda sai inteiro.
+        primeiro_desligado = i + 1 if inicio is not None else i
+        ultimo_desligado = j - 1 if fim is not None else j
+        for indice in range(primeiro_desligado, ultimo_desligado + 1):
+            self._descartarSubarvore(no.filhos[indice])
+
+        esquerdo = None
+        direito = None
+        if inicio is not None:
+            esquerdo = self._filhoMutavel(no, i)
+            self._removerIntervaloNo(esquerdo, inicio, None)
+        if fim is not None:
+            direito = self._filhoMutavel(no, j)
+            self._removerIntervaloNo(direito, None, fim)
+
+        del no.chaves[i:j]
+        del no.valores[i:j]
+        if esquerdo is not None and direito is not None:
+            # Sem separador entre as bordas, as duas são unidas ao longo da costura.
+            del no.filhos[i + 1:j + 1]
+            pedacos = self._unirSemSeparador(esquerdo, direito)
+            for deslocamento, (separador, valor, pedaco) in enumerate(pedacos):
+                no.chaves.insert(i + deslocamento, separador)
+                no.valores.insert(i + deslocamento, valor)
+                no.filhos.insert(i + deslocamento + 1, pedaco)
+        elif esquerdo is not None:
+            del no.filhos[i + 1:]
+        else:
+            del no.filhos[i:j]
+
+        no.total = self._contarSubarvore(no)
+        self._repararFilho(no, i)
+
+    def _unirSemSeparador(self, esquerdo: NoArvoreB, direito: NoArvoreB) -> List[Tuple[Chave, Any, NoArvoreB]]:
+        """
+        Une dois nós vizinhos de mesma altura que não têm um separador entre si, porque
+        ele foi removido. As folhas são simplesmente concatenadas; nos nós internos, o
+        último filho de `esquerdo` é unido, recursivamente, ao primeiro de `direito`.
+
+        Argumentos:
+            esquerdo (NoArvoreB): O nó da esquerda, que recebe o conteúdo de `direito`.
+            direito (NoArvoreB): O nó da direita, descartado após a união.
+
+        Retorna:
+            List[Tuple[Chave, Any, NoArvoreB]]: Os pedaços de `esquerdo` além do primeiro, se
+                                              a união transbordou (veja `_dividirEmPedacos`).
+        """
+        if not esquerdo.folha:
+            costura = len(esquerdo.filhos) - 1
+            pedacos = self._unirSemSeparador(self._filhoMutavel(esquerdo, costura), direito.filhos[0])
+            for separador, valor, pedaco in pedacos:
+                esquerdo.chaves.append(separador)
+                esquerdo.valores.append(valor)
+                esquerdo.filhos.append(pedaco)
+            esquerdo.filhos.extend(direito.filhos[1:])
+        esquerdo.chaves.extend(direito.chaves)
+        esquerdo.valores.extend(direito.valores)
+        esquerdo.total = self._contarSubarvore(esquerdo)
+        self._descartarNo(direito)
+
+        if not esquerdo.folha and not pedacos:
+            self._repararFilho(esquerdo, costura)
+        return self._dividirEmPedacos(esquerdo)
+
+    def _repararFilho(self, no: NoArvoreB, indice: int) -> None:
+        """
+        Leva o filho `no.filhos[indice]` de volta ao número mínimo de chaves, pegando chaves
+        emprestadas de um irmão ou fundindo-se a ele. Se o filho não tinha nenhuma chave, o
+        seu único filho também pode estar abaixo do mínimo e é reparado em seguida; como
+        esse reparo pode tirar uma chave do nó resultante, ele é verificado de novo.
+
+        Se `no` não tem chaves, o filho não tem irmãos e fica como está: o próprio `no`
+        será reparado pelo seu pai (ou substituído pelo filho, se for a raiz).
+        """
+        filho = no.filhos[indice]
+        if len(filho.chaves) >= self.ordem - 1 or len(no.chaves) == 0:
+            return
+        vazio = not filho.folha and len(filho.chaves) == 0
+        # O único filho de um nó vazio termina na ponta do nó resultante voltada para ele.
+        ponta_direita = indice > 0
+
+        irmao = no.filhos[indice - 1] if indice > 0 else no.filhos[indice + 1]
+        if len(filho.chaves) + len(irmao.chaves) + 1 <= 2 * self.ordem - 1:
+            if indice > 0:
+                indice -= 1
+            self._fundir(no, indice)
+        else:
+            while len(no.filhos[indice].chaves) < self.ordem - 1:
+                if indice > 0:
+                    self._pegarEmprestadoDoAnterior(no, indice)
+                else:
+                    self._pegarEmprestadoDoProximo(no, indice)
+
+        if vazio:
+            resultante = no.filhos[indice]
+            self._repararFilho(resultante, len(resultante.filhos) - 1 if ponta_direita else 0)
+            self._repararFilho(no, indice)
+
+    def _concatenar(self, separador: Chave, valor: Any, outra: 'ArvoreB') -> None:
+        """
+        Junta a esta árvore o separador e todas as chaves de `outra`, que é esvaziada. Todas
+        as chaves desta árvore devem ser menores que o separador, e as de `outra`, maiores.
+
+        A árvore mais baixa é pendurada, com o separador, na borda da mais alta, no nível
+        em que as alturas coincidem (ou as duas raízes passam a ser filhas de uma nova
+        raiz, se tiverem a mesma altura); a raiz pendurada é levada ao mínimo de chaves com
+        um empréstimo ou uma fusão com o irmão, e os nós que transbordarem são divididos de
+        baixo para cima. O custo é O(t · |altura desta - altura de outra| + t log n).
+
+        Argumentos:
+            separador (Chave): A chave entre as duas árvores.
+            valor (Any): O valor associado ao separador.
+            outra (ArvoreB): A árvore com as chaves maiores, de mesma ordem e representação.
+        """
+        self._fecharEspinha()
+        outra._fecharEspinha()
+        self._descartarPosicoes()
+        if outra.raiz is None or not outra.raiz.chaves:
+            self.put(separador, valor)
+            return
+        if self.raiz is None or not self.raiz.chaves:
+            outra.put(separador, valor)
+            self.raiz, self._tamanho, self._altura = outra.raiz, outra._tamanho, outra._altura
+            outra.raiz, outra._tamanho, outra._altura = None, 0, 0
+            return
+
+        diferenca = self._altura - outra._altura
+        acrescimo = 1 + outra.raiz.total if diferenca >= 0 else 1 + self.raiz.total
+        if diferenca == 0:
+            nova_raiz = self._novoNo(folha=False)
+            nova_raiz.chaves.append(separador)
+            nova_raiz.valores.append(valor)
+            nova_raiz.filhos.extend((self.raiz, outra.raiz))
+            nova_raiz.total = self.raiz.total + acrescimo
+            self.raiz = nova_raiz
+            self._altura += 1
+            caminho, indices = [nova_raiz], []
+            pendurada = 1
+        else:
+            # Desce pela borda da árvore mais alta (a direita desta ou a esquerda de outra)
+            # até o nó cujos filhos têm a altura da mais baixa.
+            if diferenca < 0:
+                self.raiz, outra.raiz = outra.raiz, self.raiz
+                self._altura = outra._altura
+            caminho, indices = [self.raiz], []
+            for _ in range(abs(diferenca) - 1):
+                indice = len(caminho[-1].filhos) - 1 if diferenca > 0 else 0
+                indices.append(indice)
+                caminho.append(self._filhoMutavel(caminho[-1], indice))
+            for ancestral in caminho:
+                ancestral.total += acrescimo
+            no = caminho[-1]
+            if diferenca > 0:
+                no.chaves.append(separador)
+                no.valores.append(valor)
+                no.filhos.append(outra.raiz)
+                pendurada = len(no.filhos) - 1
+            else:
+                no.chaves.insert(0, separador)
+                no.valores.insert(0, valor)
+                no.filhos.insert(0, outra.raiz)
+                pendurada = 0
+        self._tamanho += 1 + outra._tamanho
+        outra.raiz, outra._tamanho, outra._altura = None, 0, 0
+        if self.filtro is not None:
+            self._reconstruirFiltro()
+
+        no = caminho[-1]
+        self._repararFilho(no, pendurada)
+        if diferenca == 0:
+            # A raiz nova pode ter perdido o separador em uma fusão das duas raízes.
+            if no.chaves:
+                self._repararFilho(no, 1 - pendurada if len(no.filhos) > 1 else 0)
+            if not no.chaves:
+                self.raiz = no.filhos[0]
+                self._altura -= 1
+            return
+
+        # Divisão de baixo para cima dos nós que transbordaram, como em `_inserirSeAusente`.
+        nivel = len(indices)
+        while len(caminho[nivel].chaves) > 2 * self.ordem - 1:
+            if nivel == 0:
+                nova_raiz = self._novoNo(folha=False)
+                nova_raiz.filhos.append(self.raiz)
+                nova_raiz.total = self.raiz.total
+                self.raiz = nova_raiz
+                self._altura += 1
+                self._dividirFilho(nova_raiz, 0)
+                break
+            self._dividirFilho(caminho[nivel - 1], indices[nivel - 1])
+            nivel -= 1
+
+    def _descartarNo(self, no: NoArvoreB) -> None:
+        """
+        Chamado para um nó que deixou a árvore. Na árvore em memória não há nada a fazer;
+        subclasses com armazenamento próprio liberam o espaço do nó.
+        """
+
+    def _descartarSubarvore(self, no: NoArvoreB) -> None:
+        """
+        Chamado para uma subárvore inteira desligada da árvore. Na árvore em memória ela é
+        apenas abandonada, sem ser percorrida; subclasses com armazenamento próprio liberam
+        o espaço de todos os seus nós.
+        """
+
+    def _encontrarPredecessor(self, no: NoArvoreB) -> Tuple[Chave, Any]:
+        """
+        Encontra a maior chave na subárvore (predecessor) e o valor associado a ela.
         """
         while not no.folha:
             no = no.filhos[-1]
 
-        return no.chaves[-1]
+        return no.chaves[-1], no.valores[-1]
 
-    def _encontrarSucessor(self, no: NoArvoreB) -> int:
+    def _encontrarSucessor(self, no: NoArvoreB) -> Tuple[Chave, Any]:
         """
-        Encontra a menor chave na subárvore (sucessor).
+        Encontra a menor chave na subárvore (sucessor) e o valor associado a ela.
         """
         while not no.folha:
             no = no.filhos[0]
         
-        return no.chaves[0]
+        return no.chaves[0], no.valores[0]
 
     def _preencherFilho(self, no: NoArvoreB, indice: int) -> None:
         """
@@ -211,71 +1861,177 @@ class ArvoreB:
 
     def _pegarEmprestadoDoAnterior(self, no: NoArvoreB, indice: int) -> None:
         """
-        Pega uma chave do irmão anterior.
+        Pega uma chave (e seu valor) do irmão anterior.
         """
-        filho = no.filhos[indice]
-        irmao = no.filhos[indice - 1]
+        self._dedo = None
+        filho = self._filhoMutavel(no, indice)
+        irmao = self._filhoMutavel(no, indice - 1)
 
         filho.chaves.insert(0, no.chaves[indice - 1])
+        filho.valores.insert(0, no.valores[indice - 1])
         no.chaves[indice - 1] = irmao.chaves.pop()
+        no.valores[indice - 1] = irmao.valores.pop()
 
+        movidas = 1
         if not irmao.folha:
-            filho.filhos.insert(0, irmao.filhos.pop())
+            neto = irmao.filhos.pop()
+            filho.filhos.insert(0, neto)
+            movidas += neto.total
+        filho.total += movidas
+        irmao.total -= movidas
 
     def _pegarEmprestadoDoProximo(self, no: NoArvoreB, indice: int) -> None:
         """
-        Pega uma chave do irmão seguinte.
+        Pega uma chave (e seu valor) do irmão seguinte.
         """
-        filho = no.filhos[indice]
-        irmao = no.filhos[indice + 1]
+        self._dedo = None
+        filho = self._filhoMutavel(no, indice)
+        irmao = self._filhoMutavel(no, indice + 1)
 
         filho.chaves.append(no.chaves[indice])
+        filho.valores.append(no.valores[indice])
         no.chaves[indice] = irmao.chaves.pop(0)
+        no.valores[indice] = irmao.valores.pop(0)
 
+        movidas = 1
         if not irmao.folha:
-            filho.filhos.append(irmao.filhos.pop(0))
+            neto = irmao.filhos.pop(0)
+            filho.filhos.append(neto)
+            movidas += neto.total
+        filho.total += movidas
+        irmao.total -= movidas
 
     def _fundir(self, no: NoArvoreB, indice: int) -> None:
         """
         Funde o filho `no.filhos[indice]` com `no.filhos[indice+1]`.
         """
-        filho_a_fundir = no.filhos[indice]
+        self._descartarPosicoes()
+        filho_a_fundir = self._filhoMutavel(no, indice)
         irmao = no.filhos[indice + 1]
 
-        # Puxa uma chave do nó pai para o filho.
+        # Puxa uma chave (e seu valor) do nó pai para o filho.
         filho_a_fundir.chaves.append(no.chaves.pop(indice))
+        filho_a_fundir.valores.append(no.valores.pop(indice))
         
-        # Move todas as chaves e filhos do irmão para o filho.
+        # Move todas as chaves, valores e filhos do irmão para o filho.
         filho_a_fundir.chaves.extend(irmao.chaves)
+        filho_a_fundir.valores.extend(irmao.valores)
         if not irmao.folha:
             filho_a_fundir.filhos.extend(irmao.filhos)
+        filho_a_fundir.total += 1 + irmao.total
         
         # Remove o irmão da lista de filhos do pai.
         no.filhos.pop(indice + 1)
 
-    def _dividirFilho(self, pai: NoArvoreB, indice_filho: int) -> None:
+    def _dividirFilho(self, pai: NoArvoreB, indice_filho: int, mediana: Optional[int] = None) -> None:
         """
         Divide o filho cheio do nó pai.
 
         Argumentos:
             pai (NoArvoreB): O nó pai do filho a ser dividido.
             indice_filho (int): O índice do filho a ser dividido na lista de filhos do pai.
+            mediana (Optional[int]): O índice, no filho, da chave que sobe para o pai. Por
+                                     padrão, `ordem - 1`, que divide o filho ao meio.
         """
-        filho_cheio = pai.filhos[indice_filho]
-        novo_filho = NoArvoreB(folha=filho_cheio.folha)
+        self._dedo = None
+        if mediana is None:
+            mediana = self.ordem - 1
+        filho_cheio = self._filhoMutavel(pai, indice_filho)
+        novo_filho = self._novoNo(folha=filho_cheio.folha)
 
-        # Move a chave mediana para o pai
-        chave_mediana = filho_cheio.chaves[self.ordem - 1]
+        # Move a chave mediana (e seu valor) para o pai
+        chave_mediana = filho_cheio.chaves[mediana]
         pai.chaves.insert(indice_filho, chave_mediana)
+        pai.valores.insert(indice_filho, filho_cheio.valores[mediana])
         pai.filhos.insert(indice_filho + 1, novo_filho)
 
-        # Move as chaves e filhos para o novo_filho
-        novo_filho.chaves = filho_cheio.chaves[self.ordem:]
-        filho_cheio.chaves = filho_cheio.chaves[:self.ordem - 1]
+        # Copia a metade direita para o novo_filho e trunca o filho cheio no próprio lugar
+        novo_filho.chaves = filho_cheio.chaves[mediana + 1:]
+        del filho_cheio.chaves[mediana:]
+        novo_filho.valores = filho_cheio.valores[mediana + 1:]
+        del filho_cheio.valores[mediana:]
 
         if not filho_cheio.folha:
-            novo_filho.filhos = filho_cheio.filhos[self.ordem:]
-            filho_cheio.filhos = filho_cheio.filhos[:self.ordem]
+            novo_filho.filhos = filho_cheio.filhos[mediana + 1:]
+            del filho_cheio.filhos[mediana + 1:]
+
+        novo_filho.total = self._contarSubarvore(novo_filho)
+        filho_cheio.total -= 1 + novo_filho.total
+
+    def _calcularAltura(self) -> int:
+        """
+        Calcula a altura descendo pelos primeiros filhos, para árvores cuja raiz foi
+        carregada de um arquivo em vez de construída pelas operações.
+        """
+        altura = 0
+        no = self.raiz
+        while no is not None and not no.folha:
+            no = no.filhos[0]
+            altura += 1
+        return altura
+
+    def _contarSubarvore(self, no: NoArvoreB) -> int:
+        """
+        Calcula o número de chaves da subárvore de um nó a partir das suas chaves e do
+        total já mantido em cada filho.
+        """
+        if no.folha:
+            return len(no.chaves)
+        return len(no.chaves) + sum(filho.total for filho in no.filhos)
+
+    def _recalcularTotais(self) -> None:
+        """
+        Recalcula o total de chaves de todas as subárvores, dos nós mais profundos para a
+        raiz, sem recursão. Usado após montar a árvore sem as operações que mantêm os totais.
+        """
+        if self.raiz is None:
+            return
+        nos = [self.raiz]
+        for no in nos:
+            if not no.folha:
+                nos.extend(no.filhos)
+        for no in reversed(nos):
+            no.total = self._contarSubarvore(no)
+
+    def validar(self) -> RelatorioValidacao:
+        """
+        Valida a árvore inteira em uma única passada, sem recursão e sem imprimir nada,
+        para auditorias completas (veja `validarArvore`).
+
+        Retorna:
+            RelatorioValidacao: O relatório com as propriedades violadas e as contagens.
+        """
+        self._fecharEspinha()
+        return validarArvore(self)
+
+    def ativarMetricas(self, metricas: Optional[MetricasArvoreB] = None) -> MetricasArvoreB:
+        """
+        Passa a medir as divisões, fusões e empréstimos, os nós visitados por busca e a
+        duração de cada operação pública. As medidas podem ser lidas com
+        `metricas.instantaneo()` ou acompanhadas com `metricas.assinar(ouvinte)`.
+
+        Enquanto as métricas estão desativadas (o padrão), os métodos da árvore são os
+        originais, sem nenhum custo adicional.
+
+        Argumentos:
+            metricas (Optional[MetricasArvoreB]): Onde acumular as medidas, por exemplo
+                                                  para somar as de várias árvores. Por
+                                                  padrão, um objeto novo.
+
+        Retorna:
+            MetricasArvoreB: As métricas da árvore.
+        """
+        self.metricas = metricas if metricas is not None else MetricasArvoreB()
+        instalarMetricas(self, self.metricas)
+        return self.metricas
+
+    def desativarMetricas(self) -> None:
+        """
+        Deixa de medir a árvore, voltando aos métodos originais. As métricas acumuladas
+        continuam disponíveis no objeto retornado por `ativarMetricas`.
+        """
+        removerMetricas(self)
+        self.metricas = None
 
     def imprimirArvore(self, no: Optional[NoArvoreB] = None, nivel: int = 0) -> None:
         """
@@ -321,7 +2077,7 @@ class ArvoreB:
             return False
 
         # Propriedade 4: Todas as chaves em um nó são ordenadas
-        if no.chaves != sorted(no.chaves):
+        if list(no.chaves) != sorted(no.chaves):
             print(f"Erro: Chaves em {no.chaves} não estão ordenadas.")
             return False
 
@@ -0,0 +1,228 @@
+import threading
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Set, Tuple
+from arvoreB import ArvoreB
+from noArvoreB import Chave, NoArvoreB
+
+
+class InstantaneoArvoreB(ArvoreB):
+    """
+    Versão imutável de uma `ArvoreBConcorrente` em um instante. Oferece todas as operações
+    de leitura da `ArvoreB` (busca, iteração, intervalos, `len`) e rejeita as de escrita.
+
+    Como a árvore concorrente nunca altera nós já publicados, o instantâneo compartilha os
+    nós com ela e com os demais instantâneos: obtê-lo custa O(1) e ele continua consistente
+    enquanto a árvore é modificada.
+    """
+
+    def __init__(self, ordem: int, compacto: bool = False, raiz: Optional[NoArvoreB] = None, tamanho: int = 0,
+                 altura: int = 0, key: Optional[Callable[[Any], Chave]] = None):
+        """
+        Cria o instantâneo a partir da raiz de uma versão da árvore.
+
+        Argumentos:
+            ordem (int): A ordem da árvore B.
+            compacto (bool): Se os nós usam a representação compacta.
+            raiz (Optional[NoArvoreB]): A raiz da versão, que não será mais alterada.
+            tamanho (int): O número de chaves da versão.
+            altura (int): A altura da versão.
+            key (Optional[Callable[[Any], Chave]]): A função `key` da árvore, se houver.
+        """
+        super().__init__(ordem, compacto=compacto, key=key)
+        self.raiz = raiz
+        self._tamanho = tamanho
+        self._altura = altura
+
+    def _inserir(self, chave: Chave, valor: Any) -> bool:
+        raise TypeError("Um instantâneo da árvore é somente leitura.")
+
+    def inserir_muitos(self, chaves: Iterable[Chave], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        raise TypeError("Um instantâneo da árvore é somente leitura.")
+
+    def _inserirSeAusente(self, chave: Chave, valor: Any) -> bool:
+        raise TypeError("Um instantâneo da árvore é somente leitura.")
+
+    def _remover(self, chave: Chave) -> Any:
+        raise TypeError("Um instantâneo da árvore é somente leitura.")
+
+    def _removerIntervalo(self, inicio: Optional[Chave], fim: Optional[Chave]) -> int:
+        raise TypeError("Um instantâneo da árvore é somente leitura.")
+
+
+class ArvoreBConcorrente(ArvoreB):
+    """
+    Árvore B para muitas threads leitoras e um escritor por vez, com cópia na escrita
+    (path copying).
+
+    Uma escrita nunca altera um nó que os leitores possam estar vendo: a raiz e cada nó do
+    caminho modificado são copiados antes da alteração, e a nova versão só é publicada, com
+    uma única atribuição, ao final da operação. As leituras (`buscar`, `get`, `in`, iteração,
+    `intervalo`, `len`) usam a versão publicada no momento em que começam, sem travas, e
+    nunca veem um nó dividido ou fundido pela metade. Os escritores são serializados por
+    uma trava, e uma escrita interrompida por uma exceção é descartada por inteiro.
+
+    Atributos:
+        raiz (NoArvoreB): A raiz de trabalho do escritor; fora de uma escrita, é a publicada.
+    """
+
+    def __init__(self, ordem: int, compacto: bool = False, validacao_incremental: bool = False,
+                 key: Optional[Callable[[Any], Chave]] = None):
+        """
+        Inicializa a árvore concorrente vazia.
+
+        Argumentos:
+            ordem (int): A ordem da árvore B.
+            compacto (bool): Se os nós usam a representação compacta.
+            validacao_incremental (bool): Se cada escrita valida os nós que alterou.
+            key (Optional[Callable[[Any], Chave]]): A função aplicada às chaves (veja `ArvoreB`).
+        """
+        super().__init__(ordem, compacto=compacto, validacao_incremental=validacao_incremental, key=key)
+        self._trava = threading.RLock()
+        # Identificadores dos nós criados pela escrita em andamento, que ainda não foram
+        # publicados e podem ser alterados no próprio lugar. None fora de uma escrita.
+        self._copiados: Optional[Set[int]] = None
+        self._versao = InstantaneoArvoreB(ordem, compacto)
+
+    @classmethod
+    def from_sorted(cls, *argumentos: Any, **opcoes: Any) -> 'ArvoreBConcorrente':
+        arvore = super().from_sorted(*argumentos, **opcoes)
+        arvore._publicar()
+        return arvore
+
+    @classmethod
+    def load(cls, *argumentos: Any, **opcoes: Any) -> 'ArvoreBConcorrente':
+        arvore = super().load(*argumentos, **opcoes)
+        arvore._publicar()
+        return arvore
+
+    def dump(self, caminho: str) -> None:
+        # Grava a versão publicada, que não muda durante a gravação.
+        self._versao.dump(caminho)
+
+    def instantaneo(self) -> InstantaneoArvoreB:
+        """
+        Obtém a versão atual da árvore, que não muda mesmo que a árvore seja modificada.
+
+        Retorna:
+            InstantaneoArvoreB: O instantâneo somente leitura da versão publicada.
+        """
+        versao = self._versao
+        if self.key is None:
+            return versao
+        # A versão publicada é lida pelas operações já traduzidas desta árvore; quem recebe
+        # o instantâneo precisa de um com a mesma `key`.
+        return InstantaneoArvoreB(versao.ordem, versao.compacto, versao.raiz, versao._tamanho, versao._altura, self.key)
+
+    def _publicar(self) -> None:
+        """
+        Torna a raiz de trabalho a versão vista pelos leitores.
+        """
+        self._versao = InstantaneoArvoreB(self.ordem, self.compacto, self.raiz, self._tamanho, self._altura)
+
+    def _escrever(self, operacao: Callable[..., Any], *argumentos: Any) -> Any:
+        """
+        Executa uma operação de escrita sobre uma cópia da raiz e publica o resultado.
+
+        Argumentos:
+            operacao (Callable[..., Any]): A operação da `ArvoreB` a ser executada.
+            argumentos (Any): Os argumentos da operação.
+
+        Retorna:
+            Any: O retorno da operação.
+        """
+        with self._trava:
+            # Operações de escrita chamadas por outra já fazem parte da mesma versão.
+            if self._copiados is not None:
+                return operacao(*argumentos)
+
+            self._copiados = set()
+            try:
+                if self.raiz is not None:
+                    self.raiz = self._copiar(self.raiz)
+                resultado = operacao(*argumentos)
+            except BaseException:
+                self.raiz = self._versao.raiz
+                self._tamanho = self._versao._tamanho
+                self._altura = self._versao._altura
+                raise
+            finally:
+                self._copiados = None
+            self._publicar()
+            return resultado
+
+    def _novoNo(self, folha: bool) -> NoArvoreB:
+        no = super()._novoNo(folha)
+        if self._copiados is not None:
+            self._copiados.add(id(no))
+        return no
+
+    def _copiar(self, no: NoArvoreB) -> NoArvoreB:
+        """
+        Cria uma cópia rasa de um nó, que compartilha os filhos com o original.
+        """
+        copia = self._novoNo(no.folha)
+        copia.chaves = no.chaves[:]
+        copia.valores = no.valores[:]
+        copia.total = no.total
+        if not no.folha:
+            copia.filhos = no.filhos[:]
+        return copia
+
+    def _filhoMutavel(self, no: NoArvoreB, indice: int) -> NoArvoreB:
+        filho = no.filhos[indice]
+        if self._copiados is None or id(filho) in self._copiados:
+            return filho
+        copia = self._copiar(filho)
+        no.filhos[indice] = copia
+        return copia
+
+    # --- Escritas: executadas sob a trava, sobre uma nova versão ---
+
+    def inserir(self, chave: Chave, valor: Any = None) -> None:
+        self._escrever(super().inserir, chave, valor)
+
+    def put(self, chave: Chave, valor: Any = None) -> bool:
+        return self._escrever(super().put, chave, valor)
+
+    def inserir_muitos(self, chaves: Iterable[Chave], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        return self._escrever(super().inserir_muitos, chaves, valores)
+
+    def remover(self, chave: Chave) -> None:
+        self._escrever(super().remover, chave)
+
+    def pop(self, chave: Chave, *padrao: Any) -> Any:
+        return self._escrever(super().pop, chave, *padrao)
+
+    def inserir_se_ausente(self, chave: Chave, valor: Any = None) -> bool:
+        return self._escrever(super().inserir_se_ausente, chave, valor)
+
+    def remover_intervalo(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
+        return self._escrever(super().remover_intervalo, inicio, fim)
+
+    def remover_muitos(self, chaves: Iterable[Chave]) -> List[bool]:
+        return self._escrever(super().remover_muitos, chaves)
+
+    # --- Leituras: sempre sobre a versão publicada, sem travas ---
+
+    def buscar(self, chaveProcurada: Chave) -> Optional[Tuple[NoArvoreB, int]]:
+        return self._versao.buscar(chaveProcurada)
+
+    def buscar_muitos(self, chaves: Iterable[Chave]) -> List[Optional[Tuple[NoArvoreB, int]]]:
+        return self._versao.buscar_muitos(chaves)
+
+    def rank(self, chave: Chave) -> int:
+        return self._versao.rank(chave)
+
+    def select(self, indice: int) -> Chave:
+        return self._versao.select(indice)
+
+    def count_range(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
+        return self._versao.count_range(inicio, fim)
+
+    def _percorrer(self, inicio: Optional[Chave]) -> Iterator[Tuple[NoArvoreB, int]]:
+        return self._versao._percorrer(inicio)
+
+    def _percorrerReverso(self, fim: Optional[Chave]) -> Iterator[Tuple[NoArvoreB, int]]:
+        return self._versao._percorrerReverso(fim)
+
+    def __len__(self) -> int:
+        return len(self._versao)
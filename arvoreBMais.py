@@ -0,0 +1,524 @@
+import icontract
+from bisect import bisect_right
+from typing import Any, Iterable, Iterator, List, Optional, Tuple
+from noArvoreB import _NoBase
+from contratos import CONTRATOS_HABILITADOS
+
+# Marcador para chaves ausentes, distinto de qualquer valor armazenado (inclusive None).
+_AUSENTE = object()
+
+
+@icontract.invariant(lambda self: list(self.chaves) == sorted(self.chaves), "As chaves devem estar sempre ordenadas", enabled=CONTRATOS_HABILITADOS)
+class NoArvoreBMais(_NoBase):
+    """
+    Nó de uma Árvore B+, com a mesma interface de `NoArvoreB`. As folhas guardam todas as
+    chaves e seus valores e são encadeadas pelo atributo `proximo`; os nós internos guardam
+    apenas separadores, sem valores.
+
+    Atributos:
+        folha (bool): Verdadeiro se o nó é uma folha.
+        chaves (List[int]): As chaves da folha, ou os separadores do nó interno.
+        valores (List[Any]): Os valores de cada chave da folha. Vazia nos nós internos.
+        filhos (List['NoArvoreBMais']): Os filhos do nó interno.
+        proximo (Optional['NoArvoreBMais']): A folha seguinte, em ordem crescente.
+    """
+    __slots__ = ("folha", "chaves", "valores", "filhos", "proximo")
+
+    def __init__(self, folha: bool = False):
+        """
+        Construtor da classe.
+
+        Argumentos:
+            folha (bool): Especifica se o nó a ser criado é uma folha.
+                          Por padrão, é inicializado como Falso.
+        """
+        self.folha = folha
+        self.chaves: List[int] = []
+        self.valores: List[Any] = []
+        self.filhos: List['NoArvoreBMais'] = []
+        self.proximo: Optional['NoArvoreBMais'] = None
+
+    def buscar(self, chaveProcurada: int) -> Optional[Tuple['NoArvoreBMais', int]]:
+        """
+        Busca uma chave a partir deste nó. Como toda chave está em uma folha, a descida
+        sempre vai até ela, mesmo que a chave seja igual a um separador.
+
+        Argumentos:
+            chaveProcurada (int): A chave que está sendo buscada.
+
+        Retorna:
+            Optional[Tuple['NoArvoreBMais', int]]: A folha e o índice da chave, ou None se
+                                                   a chave não estiver na subárvore.
+        """
+        no = self
+        while not no.folha:
+            no = no.filhos[no._posicaoFilho(chaveProcurada)]
+        i = no._posicao(chaveProcurada)
+        if i < len(no.chaves) and no.chaves[i] == chaveProcurada:
+            return (no, i)
+        return None
+
+    def _posicaoFilho(self, chave: int) -> int:
+        """
+        Encontra o filho de um nó interno onde a chave deve estar. Chaves iguais a um
+        separador ficam no filho à direita dele.
+        """
+        return bisect_right(self.chaves, chave)
+
+
+class ArvoreBMais:
+    """
+    Implementação de uma Árvore B+, variante da `ArvoreB` voltada a leituras sequenciais.
+
+    Todas as chaves e valores ficam nas folhas, encadeadas em ordem crescente, e os nós
+    internos guardam apenas cópias das chaves como separadores (as chaves maiores ou iguais
+    a um separador ficam à direita dele). Uma varredura desce uma única vez até a primeira
+    folha do intervalo e depois apenas segue a lista encadeada, e a remoção nunca precisa
+    procurar predecessores ou sucessores em nós internos.
+
+    Atributos:
+        raiz (NoArvoreBMais): O nó raiz da árvore, inicia com None.
+        ordem (int): A ordem da árvore (número mínimo de chaves em um nó não raiz, mais um).
+    """
+
+    def __init__(self, ordem: int):
+        """
+        Inicializa a Árvore B+.
+
+        Argumentos:
+            ordem (int): A ordem da árvore.
+        """
+        if ordem < 2:
+            raise ValueError("A ordem da Árvore B+ deve ser pelo menos 2.")
+        self.ordem = ordem
+        self.raiz: Optional[NoArvoreBMais] = None
+        self._tamanho = 0
+
+    @classmethod
+    def from_sorted(cls, chaves: Iterable[Any], ordem: int, fill_factor: float = 1.0,
+                    com_valores: bool = False) -> 'ArvoreBMais':
+        """
+        Constrói uma Árvore B+ a partir de uma sequência de chaves estritamente crescente,
+        montando as folhas encadeadas e depois cada nível de separadores, de baixo para cima.
+
+        Argumentos:
+            chaves (Iterable[Any]): As chaves, em ordem estritamente crescente, ou pares
+                                    (chave, valor) se `com_valores` for verdadeiro.
+            ordem (int): A ordem da árvore.
+            fill_factor (float): Fração de ocupação (0 < fill_factor <= 1) dos nós montados.
+            com_valores (bool): Indica se a entrada é formada por pares (chave, valor).
+
+        Retorna:
+            ArvoreBMais: A árvore construída.
+        """
+        arvore = cls(ordem)
+        if not 0 < fill_factor <= 1:
+            raise ValueError("O fill_factor deve estar no intervalo (0, 1].")
+        capacidade = max(ordem - 1, min(2 * ordem - 1, int(fill_factor * (2 * ordem - 1))))
+
+        lista_chaves: List[int] = []
+        lista_valores: List[Any] = []
+        for item in chaves:
+            chave, valor = item if com_valores else (item, None)
+            if lista_chaves and chave <= lista_chaves[-1]:
+                raise ValueError(f"As chaves devem estar em ordem estritamente crescente ({chave} após {lista_chaves[-1]}).")
+            lista_chaves.append(chave)
+            lista_valores.append(valor)
+        if not lista_chaves:
+            return arvore
+
+        # Cada nível é uma lista de pares (menor chave da subárvore, nó).
+        nivel: List[Tuple[int, NoArvoreBMais]] = []
+        anterior: Optional[NoArvoreBMais] = None
+        inicio = 0
+        for tamanho in arvore._tamanhosDosGrupos(len(lista_chaves), capacidade, ordem - 1, 2 * ordem - 1):
+            folha = NoArvoreBMais(folha=True)
+            folha.chaves = lista_chaves[inicio:inicio + tamanho]
+            folha.valores = lista_valores[inicio:inicio + tamanho]
+            if anterior is not None:
+                anterior.proximo = folha
+            anterior = folha
+            nivel.append((folha.chaves[0], folha))
+            inicio += tamanho
+
+        while len(nivel) > 1:
+            acima: List[Tuple[int, NoArvoreBMais]] = []
+            inicio = 0
+            for tamanho in arvore._tamanhosDosGrupos(len(nivel), capacidade + 1, ordem, 2 * ordem):
+                no = NoArvoreBMais(folha=False)
+                grupo = nivel[inicio:inicio + tamanho]
+                no.filhos = [filho for _, filho in grupo]
+                no.chaves = [menor for menor, _ in grupo[1:]]
+                acima.append((grupo[0][0], no))
+                inicio += tamanho
+            nivel = acima
+
+        arvore.raiz = nivel[0][1]
+        arvore._tamanho = len(lista_chaves)
+        return arvore
+
+    @staticmethod
+    def _tamanhosDosGrupos(quantidade: int, capacidade: int, minimo: int, maximo: int) -> List[int]:
+        """
+        Divide `quantidade` itens em grupos de `capacidade` itens. Se o último grupo ficar
+        com menos que `minimo`, ele é unido ao penúltimo e, se necessário, os dois são
+        redivididos ao meio, respeitando `maximo`.
+        """
+        tamanhos = [capacidade] * (quantidade // capacidade)
+        if quantidade % capacidade:
+            tamanhos.append(quantidade % capacidade)
+        if len(tamanhos) > 1 and tamanhos[-1] < minimo:
+            juntos = tamanhos.pop() + tamanhos.pop()
+            if juntos <= maximo:
+                tamanhos.append(juntos)
+            else:
+                tamanhos.extend([juntos - juntos // 2, juntos // 2])
+        return tamanhos
+
+    def buscar(self, chaveProcurada: int) -> Optional[Tuple[NoArvoreBMais, int]]:
+        """
+        Busca uma chave na Árvore B+.
+
+        Argumentos:
+            chaveProcurada (int): A chave a ser buscada.
+
+        Retorna:
+            Optional[Tuple[NoArvoreBMais, int]]: A folha e o índice onde a chave foi
+                                                 encontrada, ou None se ela não existir.
+        """
+        if self.raiz is None:
+            return None
+        return self.raiz.buscar(chaveProcurada)
+
+    def get(self, chave: int, padrao: Any = None) -> Any:
+        """
+        Obtém o valor associado a uma chave, ou `padrao` se ela não existir.
+        """
+        resultado = self.buscar(chave)
+        if resultado is None:
+            return padrao
+        no, indice = resultado
+        return no.valores[indice]
+
+    def put(self, chave: int, valor: Any = None) -> bool:
+        """
+        Associa um valor a uma chave, inserindo a chave ou substituindo o valor existente.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se apenas o valor foi substituído.
+        """
+        inserida = self._inserir(chave, valor)
+        if inserida:
+            self._tamanho += 1
+        return inserida
+
+    def pop(self, chave: int, *padrao: Any) -> Any:
+        """
+        Remove uma chave e retorna o valor associado a ela, ou `padrao` se ela não existir.
+
+        Exceções:
+            KeyError: Se a chave não existir e nenhum valor padrão for informado.
+        """
+        if len(padrao) > 1:
+            raise TypeError(f"pop esperava no máximo 2 argumentos, recebeu {len(padrao) + 1}.")
+
+        valor = self._remover(chave)
+        if valor is _AUSENTE:
+            if padrao:
+                return padrao[0]
+            raise KeyError(chave)
+
+        self._tamanho -= 1
+        return valor
+
+    def __getitem__(self, chave: int) -> Any:
+        valor = self.get(chave, _AUSENTE)
+        if valor is _AUSENTE:
+            raise KeyError(chave)
+        return valor
+
+    def __setitem__(self, chave: int, valor: Any) -> None:
+        self.put(chave, valor)
+
+    def __delitem__(self, chave: int) -> None:
+        self.pop(chave)
+
+    def __contains__(self, chave: int) -> bool:
+        return self.buscar(chave) is not None
+
+    def __len__(self) -> int:
+        return self._tamanho
+
+    def __iter__(self) -> Iterator[int]:
+        return self.intervalo()
+
+    def intervalo(self, inicio: Optional[int] = None, fim: Optional[int] = None,
+                  com_valores: bool = False) -> Iterator[Any]:
+        """
+        Percorre, em ordem crescente, as chaves no intervalo [inicio, fim).
+
+        A árvore é descida uma única vez até a folha da primeira chave do intervalo; as
+        seguintes são lidas seguindo o encadeamento das folhas, sem voltar aos nós internos.
+
+        Argumentos:
+            inicio (Optional[int]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[int]): O limite superior, exclusivo. None indica sem limite.
+            com_valores (bool): Se verdadeiro, produz pares (chave, valor) em vez de chaves.
+
+        Retorna:
+            Iterator[Any]: As chaves (ou pares) do intervalo, em ordem crescente.
+        """
+        if self.raiz is None:
+            return
+
+        folha = self.raiz
+        while not folha.folha:
+            folha = folha.filhos[0 if inicio is None else folha._posicaoFilho(inicio)]
+        i = 0 if inicio is None else folha._posicao(inicio)
+
+        while folha is not None:
+            chaves = folha.chaves
+            if fim is not None and chaves and chaves[-1] >= fim:
+                # Última folha do intervalo.
+                for j in range(i, folha._posicao(fim)):
+                    yield (chaves[j], folha.valores[j]) if com_valores else chaves[j]
+                return
+            if com_valores:
+                yield from zip(chaves[i:], folha.valores[i:])
+            else:
+                yield from chaves[i:]
+            folha = folha.proximo
+            i = 0
+
+    def seek(self, chave: int, com_valores: bool = False) -> Iterator[Any]:
+        """
+        Percorre as chaves a partir da primeira maior ou igual a `chave`, sob demanda.
+        """
+        return self.intervalo(chave, None, com_valores)
+
+    @icontract.require(lambda self, chave: self.buscar(chave) is None, "A chave a ser inserida não deve existir na árvore (pré-condição violada).", enabled=CONTRATOS_HABILITADOS)
+    def inserir(self, chave: int, valor: Any = None) -> None:
+        """
+        Insere uma chave na Árvore B+.
+
+        Argumentos:
+            chave (int): A chave a ser inserida.
+            valor (Any): O valor associado à chave. Por padrão, None.
+        """
+        if self._inserir(chave, valor):
+            self._tamanho += 1
+
+    def _inserir(self, chave: int, valor: Any) -> bool:
+        """
+        Insere uma chave com uma única descida a partir da raiz, dividindo os nós cheios no
+        caminho. Se a chave já existir, apenas substitui o valor.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se já existia.
+        """
+        if self.raiz is None:
+            self.raiz = NoArvoreBMais(folha=True)
+
+        if len(self.raiz.chaves) == 2 * self.ordem - 1:
+            nova_raiz = NoArvoreBMais(folha=False)
+            nova_raiz.filhos.append(self.raiz)
+            self.raiz = nova_raiz
+            self._dividirFilho(nova_raiz, 0)
+
+        no = self.raiz
+        while not no.folha:
+            i = no._posicaoFilho(chave)
+            if len(no.filhos[i].chaves) == 2 * self.ordem - 1:
+                self._dividirFilho(no, i)
+                if chave >= no.chaves[i]:
+                    i += 1
+            no = no.filhos[i]
+
+        i = no._posicao(chave)
+        if i < len(no.chaves) and no.chaves[i] == chave:
+            no.valores[i] = valor
+            return False
+        no.chaves.insert(i, chave)
+        no.valores.insert(i, valor)
+        return True
+
+    def _dividirFilho(self, pai: NoArvoreBMais, indice_filho: int) -> None:
+        """
+        Divide o filho cheio do nó pai. Uma folha é dividida copiando a primeira chave da
+        metade direita para o pai; um nó interno, movendo sua chave mediana para o pai.
+        """
+        filho_cheio = pai.filhos[indice_filho]
+        novo_filho = NoArvoreBMais(folha=filho_cheio.folha)
+
+        if filho_cheio.folha:
+            novo_filho.chaves = filho_cheio.chaves[self.ordem:]
+            novo_filho.valores = filho_cheio.valores[self.ordem:]
+            del filho_cheio.chaves[self.ordem:]
+            del filho_cheio.valores[self.ordem:]
+            novo_filho.proximo = filho_cheio.proximo
+            filho_cheio.proximo = novo_filho
+            separador = novo_filho.chaves[0]
+        else:
+            separador = filho_cheio.chaves[self.ordem - 1]
+            novo_filho.chaves = filho_cheio.chaves[self.ordem:]
+            novo_filho.filhos = filho_cheio.filhos[self.ordem:]
+            del filho_cheio.chaves[self.ordem - 1:]
+            del filho_cheio.filhos[self.ordem:]
+
+        pai.chaves.insert(indice_filho, separador)
+        pai.filhos.insert(indice_filho + 1, novo_filho)
+
+    @icontract.require(lambda self, chave: self.buscar(chave) is not None, "A chave a ser removida deve existir na árvore (pré-condição violada).", enabled=CONTRATOS_HABILITADOS)
+    def remover(self, chave: int) -> None:
+        """
+        Remove uma chave da Árvore B+.
+
+        Argumentos:
+            chave (int): A chave a ser removida.
+        """
+        if self._remover(chave) is _AUSENTE:
+            print(f"Erro: Chave {chave} não encontrada na árvore.")
+        else:
+            self._tamanho -= 1
+
+    def _remover(self, chave: int) -> Any:
+        """
+        Remove uma chave com uma única descida até a folha, garantindo antes de descer que
+        cada filho tenha pelo menos `ordem` chaves. Os separadores iguais à chave removida
+        continuam válidos como limites e não precisam ser trocados.
+
+        Retorna:
+            Any: O valor que estava associado à chave, ou `_AUSENTE` se ela não existia.
+        """
+        if self.raiz is None:
+            return _AUSENTE
+
+        no = self.raiz
+        while not no.folha:
+            i = no._posicaoFilho(chave)
+            if len(no.filhos[i].chaves) < self.ordem:
+                i = self._preencherFilho(no, i)
+            no = no.filhos[i]
+
+        # Uma fusão na raiz pode tê-la esvaziado, diminuindo a altura da árvore.
+        if not self.raiz.folha and len(self.raiz.chaves) == 0:
+            self.raiz = self.raiz.filhos[0]
+
+        i = no._posicao(chave)
+        if i == len(no.chaves) or no.chaves[i] != chave:
+            return _AUSENTE
+        no.chaves.pop(i)
+        return no.valores.pop(i)
+
+    def _preencherFilho(self, no: NoArvoreBMais, indice: int) -> int:
+        """
+        Garante que o filho `no.filhos[indice]` tenha pelo menos `ordem` chaves, pegando
+        emprestado de um irmão ou fundindo.
+
+        Retorna:
+            int: O índice do filho que passou a conter o trecho de `no.filhos[indice]`.
+        """
+        if indice > 0 and len(no.filhos[indice - 1].chaves) >= self.ordem:
+            self._pegarEmprestadoDoAnterior(no, indice)
+        elif indice < len(no.chaves) and len(no.filhos[indice + 1].chaves) >= self.ordem:
+            self._pegarEmprestadoDoProximo(no, indice)
+        elif indice < len(no.chaves):
+            self._fundir(no, indice)
+        else:
+            self._fundir(no, indice - 1)
+            return indice - 1
+        return indice
+
+    def _pegarEmprestadoDoAnterior(self, no: NoArvoreBMais, indice: int) -> None:
+        """
+        Passa a última chave do irmão anterior para o filho, atualizando o separador.
+        """
+        filho = no.filhos[indice]
+        irmao = no.filhos[indice - 1]
+        if filho.folha:
+            filho.chaves.insert(0, irmao.chaves.pop())
+            filho.valores.insert(0, irmao.valores.pop())
+            no.chaves[indice - 1] = filho.chaves[0]
+        else:
+            filho.chaves.insert(0, no.chaves[indice - 1])
+            no.chaves[indice - 1] = irmao.chaves.pop()
+            filho.filhos.insert(0, irmao.filhos.pop())
+
+    def _pegarEmprestadoDoProximo(self, no: NoArvoreBMais, indice: int) -> None:
+        """
+        Passa a primeira chave do irmão seguinte para o filho, atualizando o separador.
+        """
+        filho = no.filhos[indice]
+        irmao = no.filhos[indice + 1]
+        if filho.folha:
+            filho.chaves.append(irmao.chaves.pop(0))
+            filho.valores.append(irmao.valores.pop(0))
+            no.chaves[indice] = irmao.chaves[0]
+        else:
+            filho.chaves.append(no.chaves[indice])
+            no.chaves[indice] = irmao.chaves.pop(0)
+            filho.filhos.append(irmao.filhos.pop(0))
+
+    def _fundir(self, no: NoArvoreBMais, indice: int) -> None:
+        """
+        Funde o filho `no.filhos[indice]` com `no.filhos[indice+1]`. Em folhas, o separador
+        é descartado e o encadeamento pula a folha removida; em nós internos, ele desce.
+        """
+        filho = no.filhos[indice]
+        irmao = no.filhos.pop(indice + 1)
+        separador = no.chaves.pop(indice)
+        if filho.folha:
+            filho.chaves.extend(irmao.chaves)
+            filho.valores.extend(irmao.valores)
+            filho.proximo = irmao.proximo
+        else:
+            filho.chaves.append(separador)
+            filho.chaves.extend(irmao.chaves)
+            filho.filhos.extend(irmao.filhos)
+
+    def _verificarPropriedades(self) -> bool:
+        """
+        Verifica, sem recursão, as propriedades da Árvore B+: limites de ocupação, ordem das
+        chaves em relação aos separadores, folhas na mesma profundidade e encadeamento das
+        folhas na mesma ordem em que aparecem na árvore.
+
+        Retorna:
+            bool: True se as propriedades forem satisfeitas, False caso contrário.
+        """
+        if self.raiz is None:
+            return self._tamanho == 0
+
+        folhas: List[NoArvoreBMais] = []
+        profundidades = set()
+        pilha = [(self.raiz, 0, None, None)]
+        while pilha:
+            no, profundidade, inferior, superior = pilha.pop()
+            if len(no.chaves) > 2 * self.ordem - 1:
+                return False
+            if no is not self.raiz and len(no.chaves) < self.ordem - 1:
+                return False
+            if list(no.chaves) != sorted(set(no.chaves)):
+                return False
+            if no.chaves and ((inferior is not None and no.chaves[0] < inferior)
+                              or (superior is not None and no.chaves[-1] >= superior)):
+                return False
+            if no.folha:
+                if len(no.valores) != len(no.chaves):
+                    return False
+                folhas.append(no)
+                profundidades.add(profundidade)
+                continue
+            if len(no.filhos) != len(no.chaves) + 1:
+                return False
+            for i in range(len(no.filhos) - 1, -1, -1):
+                pilha.append((no.filhos[i], profundidade + 1,
+                              no.chaves[i - 1] if i > 0 else inferior,
+                              no.chaves[i] if i < len(no.chaves) else superior))
+
+        encadeadas = []
+        folha = folhas[0]
+        while folha is not None:
+            encadeadas.append(folha)
+            folha = folha.proximo
+        return (len(profundidades) == 1 and encadeadas == folhas
+                and sum(len(folha.chaves) for folha in folhas) == self._tamanho)
@@ -0,0 +1,588 @@
+import icontract
+import mmap
+import os
+import struct
+from array import array
+from collections import OrderedDict
+from typing import Any, Iterable, Iterator, List, Optional, Union
+from arvoreB import ArvoreB
+from noArvoreB import ValoresNulos, _NoBase
+from contratos import CONTRATOS_HABILITADOS
+
+# Cabeçalho do arquivo (página 0): assinatura, versão, ordem, tamanho da página, página da
+# raiz, número de páginas, número de chaves e início da lista de páginas livres.
+_CABECALHO = struct.Struct("<4sHxxIIQQQQ")
+_ASSINATURA = b"ARVB"
+_VERSAO = 2
+
+# Cabeçalho de cada página de nó: indicador de folha, número de chaves e número de chaves
+# da subárvore.
+_CABECALHO_NO = struct.Struct("<BxxxIQ")
+
+# Ponteiro para a próxima página livre, gravado no início de uma página liberada.
+_PROXIMA_LIVRE = struct.Struct("<Q")
+
+# Número de páginas acrescentadas ao arquivo de uma vez quando ele precisa crescer.
+_CRESCIMENTO_MINIMO = 64
+
+
+def tamanhoDaPagina(ordem: int) -> int:
+    """
+    Calcula o tamanho, em bytes, da página que comporta um nó cheio da ordem dada.
+
+    Argumentos:
+        ordem (int): A ordem da árvore B.
+
+    Retorna:
+        int: O cabeçalho do nó mais 2t-1 chaves e 2t filhos de 8 bytes cada.
+    """
+    return max(_CABECALHO.size, _CABECALHO_NO.size + (2 * ordem - 1) * 8 + 2 * ordem * 8)
+
+
+class ListaFilhosPaginada:
+    """
+    Lista de filhos de um `NoPaginado`. Guarda apenas os números das páginas dos filhos e
+    carrega cada nó do `ArmazenamentoPaginado` somente quando ele é acessado, de modo que
+    uma descida lê apenas as páginas do caminho percorrido.
+
+    Atributos:
+        paginas (array): Os números das páginas dos filhos.
+    """
+    __slots__ = ("_armazenamento", "paginas")
+
+    def __init__(self, armazenamento: 'ArmazenamentoPaginado', paginas: Optional[array] = None):
+        self._armazenamento = armazenamento
+        self.paginas = paginas if paginas is not None else array("Q")
+
+    def __len__(self) -> int:
+        return len(self.paginas)
+
+    def __getitem__(self, indice: Union[int, slice]) -> Any:
+        if isinstance(indice, slice):
+            return ListaFilhosPaginada(self._armazenamento, self.paginas[indice])
+        return self._armazenamento.obter(self.paginas[indice])
+
+    def __setitem__(self, indice: int, no: 'NoPaginado') -> None:
+        self.paginas[indice] = no.pagina
+
+    def __delitem__(self, indice: Union[int, slice]) -> None:
+        del self.paginas[indice]
+
+    def __iter__(self) -> Iterator['NoPaginado']:
+        for pagina in self.paginas:
+            yield self._armazenamento.obter(pagina)
+
+    def __repr__(self) -> str:
+        return f"ListaFilhosPaginada({self.paginas.tolist()})"
+
+    def append(self, no: 'NoPaginado') -> None:
+        self.paginas.append(no.pagina)
+
+    def insert(self, indice: int, no: 'NoPaginado') -> None:
+        self.paginas.insert(indice, no.pagina)
+
+    def extend(self, nos: Iterable['NoPaginado']) -> None:
+        # Copia os números das páginas sem carregar os nós.
+        if isinstance(nos, ListaFilhosPaginada):
+            self.paginas.extend(nos.paginas)
+        else:
+            for no in nos:
+                self.paginas.append(no.pagina)
+
+    def pop(self, indice: int = -1) -> 'NoPaginado':
+        return self._armazenamento.obter(self.paginas.pop(indice))
+
+
+@icontract.invariant(lambda self: self.chaves.tolist() == sorted(self.chaves), "As chaves devem estar sempre ordenadas", enabled=CONTRATOS_HABILITADOS)
+@icontract.invariant(lambda self: len(self.valores) == len(self.chaves), "Cada chave deve ter um valor associado", enabled=CONTRATOS_HABILITADOS)
+class NoPaginado(_NoBase):
+    """
+    Nó da Árvore B armazenado em uma página do arquivo. Tem a mesma interface de
+    `NoArvoreB`, com as chaves em um `array('q')` e os filhos carregados sob demanda.
+
+    Atributos:
+        folha (bool): Verdadeiro se o nó é uma folha.
+        chaves (array): As chaves do nó, inteiros de 64 bits.
+        valores (ValoresNulos): Sempre None; o armazenamento paginado guarda apenas chaves.
+        filhos (ListaFilhosPaginada): Os filhos do nó, carregados sob demanda.
+        total (int): O número de chaves na subárvore deste nó, incluindo as dele.
+        pagina (int): O número da página do nó no arquivo.
+    """
+    __slots__ = ("folha", "chaves", "valores", "filhos", "total", "pagina")
+
+    def __init__(self, armazenamento: 'ArmazenamentoPaginado', pagina: int, folha: bool = False):
+        """
+        Construtor da classe.
+
+        Argumentos:
+            armazenamento (ArmazenamentoPaginado): O armazenamento que contém o nó.
+            pagina (int): O número da página do nó.
+            folha (bool): Especifica se o nó é uma folha.
+        """
+        self.folha = folha
+        self.pagina = pagina
+        self.chaves = array("q")
+        self.valores = ValoresNulos()
+        self.filhos = ListaFilhosPaginada(armazenamento)
+        self.total = 0
+
+
+class ArmazenamentoPaginado:
+    """
+    Arquivo de páginas de tamanho fixo acessado por `mmap`, com um cache LRU dos nós já
+    decodificados (buffer pool).
+
+    A página 0 guarda o cabeçalho do arquivo e cada página seguinte guarda um nó. Os nós
+    modificados ficam marcados como sujos no cache e só são gravados no arquivo quando
+    saem do cache ou em `flush()`. Durante uma operação de escrita (`iniciarEscrita` /
+    `terminarEscrita`), todo nó obtido é marcado como sujo e nenhum nó sai do cache, já
+    que a árvore ainda pode estar segurando referências para ele.
+
+    Atributos:
+        ordem (int): A ordem da árvore armazenada.
+        tamanhoPagina (int): O tamanho de cada página, em bytes.
+        paginaRaiz (int): A página da raiz, ou 0 se a árvore estiver vazia.
+        tamanho (int): O número de chaves da árvore.
+        capacidadeCache (int): O número máximo de nós mantidos no cache fora das escritas.
+        acertos (int): Quantos acessos encontraram o nó no cache.
+        faltas (int): Quantos acessos precisaram ler o nó do arquivo.
+    """
+
+    def __init__(self, caminho: str, ordem: Optional[int] = None, capacidade_cache: int = 1024):
+        """
+        Abre o arquivo de páginas, criando-o se ele não existir.
+
+        Argumentos:
+            caminho (str): O caminho do arquivo.
+            ordem (Optional[int]): A ordem da árvore. Obrigatória para criar o arquivo; ao
+                                   abrir um arquivo existente, deve coincidir com a gravada.
+            capacidade_cache (int): O número máximo de nós mantidos no cache.
+        """
+        if capacidade_cache < 1:
+            raise ValueError("A capacidade do cache deve ser pelo menos 1.")
+
+        self.capacidadeCache = capacidade_cache
+        self.acertos = 0
+        self.faltas = 0
+        self._cache: 'OrderedDict[int, NoPaginado]' = OrderedDict()
+        self._sujos: set = set()
+        self._escrevendo = False
+
+        novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+        if novo:
+            if ordem is None:
+                raise ValueError("A ordem é obrigatória para criar um novo arquivo de páginas.")
+            if ordem < 2:
+                raise ValueError("A ordem da Árvore B deve ser pelo menos 2.")
+            self.ordem = ordem
+            self.tamanhoPagina = tamanhoDaPagina(ordem)
+            self.paginaRaiz = 0
+            self.tamanho = 0
+            self._numeroPaginas = 1
+            self._listaLivre = 0
+            self._arquivo = open(caminho, "w+b")
+            self._arquivo.truncate(self.tamanhoPagina)
+        else:
+            self._arquivo = open(caminho, "r+b")
+
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0)
+
+        if novo:
+            self._gravarCabecalho()
+        else:
+            self._lerCabecalho()
+            if ordem is not None and ordem != self.ordem:
+                raise ValueError(f"O arquivo foi criado com ordem {self.ordem}, não {ordem}.")
+
+    def _lerCabecalho(self) -> None:
+        """
+        Lê o cabeçalho do arquivo para os atributos do armazenamento.
+        """
+        (assinatura, versao, self.ordem, self.tamanhoPagina, self.paginaRaiz,
+         self._numeroPaginas, self.tamanho, self._listaLivre) = _CABECALHO.unpack_from(self._mapa, 0)
+        if assinatura != _ASSINATURA:
+            raise ValueError("O arquivo não é um arquivo de páginas de Árvore B.")
+        if versao != _VERSAO:
+            raise ValueError(f"Versão {versao} do arquivo de páginas não suportada.")
+
+    def _gravarCabecalho(self) -> None:
+        """
+        Grava os atributos do armazenamento no cabeçalho do arquivo.
+        """
+        _CABECALHO.pack_into(self._mapa, 0, _ASSINATURA, _VERSAO, self.ordem, self.tamanhoPagina,
+                             self.paginaRaiz, self._numeroPaginas, self.tamanho, self._listaLivre)
+
+    def obter(self, pagina: int) -> NoPaginado:
+        """
+        Obtém o nó de uma página, lendo-o do arquivo se ele não estiver no cache.
+
+        Argumentos:
+            pagina (int): O número da página.
+
+        Retorna:
+            NoPaginado: O nó armazenado na página.
+        """
+        no = self._cache.get(pagina)
+        if no is not None:
+            self.acertos += 1
+            self._cache.move_to_end(pagina)
+        else:
+            self.faltas += 1
+            no = self._decodificar(pagina)
+            self._cache[pagina] = no
+            self._reduzirCache()
+
+        if self._escrevendo:
+            self._sujos.add(pagina)
+        return no
+
+    def novoNo(self, folha: bool) -> NoPaginado:
+        """
+        Aloca uma página e cria nela um nó vazio, já marcado como sujo.
+
+        Argumentos:
+            folha (bool): Especifica se o nó é uma folha.
+
+        Retorna:
+            NoPaginado: O novo nó.
+        """
+        if self._listaLivre:
+            pagina = self._listaLivre
+            (self._listaLivre,) = _PROXIMA_LIVRE.unpack_from(self._mapa, pagina * self.tamanhoPagina)
+        else:
+            pagina = self._numeroPaginas
+            self._numeroPaginas += 1
+            self._garantirTamanho(self._numeroPaginas)
+
+        no = NoPaginado(self, pagina, folha=folha)
+        self._cache[pagina] = no
+        self._sujos.add(pagina)
+        self._reduzirCache()
+        return no
+
+    def liberar(self, pagina: int) -> None:
+        """
+        Devolve uma página à lista de páginas livres, descartando o nó que ela continha.
+
+        Argumentos:
+            pagina (int): O número da página.
+        """
+        self._cache.pop(pagina, None)
+        self._sujos.discard(pagina)
+        _PROXIMA_LIVRE.pack_into(self._mapa, pagina * self.tamanhoPagina, self._listaLivre)
+        self._listaLivre = pagina
+
+    def liberarSubarvore(self, pagina: int) -> None:
+        """
+        Libera as páginas de uma subárvore inteira. Os nós que não estão no cache não são
+        decodificados: de cada página é lido apenas o cabeçalho e, se for um nó interno, os
+        números das páginas dos filhos.
+
+        Argumentos:
+            pagina (int): A página da raiz da subárvore.
+        """
+        pilha = [pagina]
+        while pilha:
+            pagina = pilha.pop()
+            no = self._cache.get(pagina)
+            if no is not None:
+                if not no.folha:
+                    pilha.extend(no.filhos.paginas)
+            else:
+                inicio = pagina * self.tamanhoPagina
+                folha, quantidade, _ = _CABECALHO_NO.unpack_from(self._mapa, inicio)
+                if not folha:
+                    posicao = inicio + _CABECALHO_NO.size + 8 * quantidade
+                    filhos = array("Q")
+                    filhos.frombytes(self._mapa[posicao:posicao + 8 * (quantidade + 1)])
+                    pilha.extend(filhos)
+            self.liberar(pagina)
+
+    def iniciarEscrita(self) -> None:
+        """
+        Marca o início de uma operação de escrita: os nós obtidos passam a ser marcados
+        como sujos e nenhum nó sai do cache até `terminarEscrita`.
+        """
+        self._escrevendo = True
+
+    def terminarEscrita(self) -> None:
+        """
+        Marca o fim de uma operação de escrita e reduz o cache à sua capacidade.
+        """
+        self._escrevendo = False
+        self._reduzirCache()
+
+    def flush(self) -> None:
+        """
+        Grava no arquivo todos os nós sujos e o cabeçalho e sincroniza o mapeamento.
+        """
+        for pagina in self._sujos:
+            self._codificar(self._cache[pagina])
+        self._sujos.clear()
+        self._gravarCabecalho()
+        self._mapa.flush()
+
+    def close(self) -> None:
+        """
+        Grava as alterações pendentes e fecha o arquivo.
+        """
+        if self._mapa.closed:
+            return
+        self.flush()
+        self._cache.clear()
+        self._mapa.close()
+        self._arquivo.close()
+
+    def _reduzirCache(self) -> None:
+        """
+        Remove do cache os nós usados há mais tempo, gravando os sujos, até que ele volte à
+        capacidade. A raiz nunca é removida e nada é removido durante uma escrita.
+        """
+        if self._escrevendo:
+            return
+        while len(self._cache) > self.capacidadeCache:
+            pagina, no = self._cache.popitem(last=False)
+            if pagina == self.paginaRaiz:
+                self._cache[pagina] = no
+                continue
+            if pagina in self._sujos:
+                self._codificar(no)
+                self._sujos.discard(pagina)
+
+    def _garantirTamanho(self, paginas: int) -> None:
+        """
+        Aumenta o arquivo, se necessário, para que ele comporte o número de páginas dado.
+        """
+        necessario = paginas * self.tamanhoPagina
+        if necessario <= len(self._mapa):
+            return
+        atual = len(self._mapa) // self.tamanhoPagina
+        novo_tamanho = max(paginas, 2 * atual, atual + _CRESCIMENTO_MINIMO) * self.tamanhoPagina
+        self._mapa.close()
+        self._arquivo.truncate(novo_tamanho)
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0)
+
+    def _codificar(self, no: NoPaginado) -> None:
+        """
+        Grava um nó na sua página do arquivo.
+        """
+        inicio = no.pagina * self.tamanhoPagina
+        quantidade = len(no.chaves)
+        _CABECALHO_NO.pack_into(self._mapa, inicio, 1 if no.folha else 0, quantidade, no.total)
+
+        posicao = inicio + _CABECALHO_NO.size
+        dados = no.chaves.tobytes()
+        self._mapa[posicao:posicao + len(dados)] = dados
+        if not no.folha:
+            posicao += len(dados)
+            dados = no.filhos.paginas.tobytes()
+            self._mapa[posicao:posicao + len(dados)] = dados
+
+    def _decodificar(self, pagina: int) -> NoPaginado:
+        """
+        Lê o nó armazenado em uma página do arquivo.
+        """
+        inicio = pagina * self.tamanhoPagina
+        folha, quantidade, total = _CABECALHO_NO.unpack_from(self._mapa, inicio)
+        no = NoPaginado(self, pagina, folha=bool(folha))
+        no.total = total
+
+        posicao = inicio + _CABECALHO_NO.size
+        no.chaves.frombytes(self._mapa[posicao:posicao + 8 * quantidade])
+        no.valores = ValoresNulos(quantidade)
+        if not no.folha:
+            posicao += 8 * quantidade
+            no.filhos.paginas.frombytes(self._mapa[posicao:posicao + 8 * (quantidade + 1)])
+        return no
+
+
+class ArvoreBPaginada(ArvoreB):
+    """
+    Árvore B persistente, com cada nó em uma página de um `ArmazenamentoPaginado`.
+
+    `buscar`, `inserir`, `remover` e as demais operações de `ArvoreB` funcionam sem
+    alterações: os filhos de cada nó são carregados sob demanda, de modo que apenas as
+    páginas do caminho percorrido são lidas. Só são aceitas chaves inteiras de 64 bits,
+    sem valores associados. As alterações são gravadas no arquivo por `flush()` e `close()`.
+
+    Atributos:
+        armazenamento (ArmazenamentoPaginado): O arquivo de páginas e o cache de nós.
+    """
+
+    def __init__(self, caminho: str, ordem: Optional[int] = None, capacidade_cache: int = 1024):
+        """
+        Abre a árvore armazenada em um arquivo, criando-o se ele não existir.
+
+        Argumentos:
+            caminho (str): O caminho do arquivo de páginas.
+            ordem (Optional[int]): A ordem da árvore. Obrigatória para criar o arquivo.
+            capacidade_cache (int): O número máximo de nós mantidos em memória.
+        """
+        self.armazenamento = ArmazenamentoPaginado(caminho, ordem, capacidade_cache)
+        super().__init__(self.armazenamento.ordem)
+        self._tamanho = self.armazenamento.tamanho
+        if self.armazenamento.paginaRaiz:
+            self.raiz = self.armazenamento.obter(self.armazenamento.paginaRaiz)
+            self._altura = self._calcularAltura()
+
+    @classmethod
+    def from_sorted(cls, caminho: str, chaves: Iterable[int], ordem: int, fill_factor: float = 1.0,
+                    capacidade_cache: int = 1024) -> 'ArvoreBPaginada':
+        """
+        Constrói uma Árvore B paginada a partir de uma sequência de chaves estritamente
+        crescente, montando os nós diretamente nas páginas, como `ArvoreB.from_sorted`.
+
+        A carga é uma única operação de escrita: os nós montados ficam no cache até o fim
+        dela, quando os excedentes são gravados no arquivo e saem do cache.
+
+        Argumentos:
+            caminho (str): O caminho do arquivo de páginas, que não pode conter uma árvore
+                           com chaves.
+            chaves (Iterable[int]): As chaves, inteiros de 64 bits em ordem estritamente
+                                    crescente.
+            ordem (int): A ordem da árvore B.
+            fill_factor (float): Fração de ocupação dos nós montados (veja
+                                 `ArvoreB.from_sorted`).
+            capacidade_cache (int): O número máximo de nós mantidos em memória.
+
+        Retorna:
+            ArvoreBPaginada: A árvore construída, aberta sobre o arquivo.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("O fill_factor deve estar no intervalo (0, 1].")
+        arvore = cls(caminho, ordem, capacidade_cache)
+        try:
+            if len(arvore):
+                raise ValueError("A carga em lote exige um arquivo de páginas sem chaves.")
+            arvore._iniciarEscrita()
+            try:
+                arvore._montarOrdenadas(chaves, fill_factor, com_valores=False)
+            finally:
+                arvore._terminarEscrita()
+        except BaseException:
+            arvore.close()
+            raise
+        return arvore
+
+    @classmethod
+    def from_unsorted(cls, caminho: str, chaves: Iterable[int], ordem: int, fill_factor: float = 1.0,
+                      capacidade_cache: int = 1024) -> 'ArvoreBPaginada':
+        """
+        Constrói uma Árvore B paginada a partir de chaves em qualquer ordem, descartando
+        repetições (veja `from_sorted`).
+        """
+        return cls.from_sorted(caminho, sorted(set(chaves)), ordem, fill_factor, capacidade_cache)
+
+    @classmethod
+    def load(cls, *argumentos: Any, **opcoes: Any) -> 'ArvoreBPaginada':
+        raise TypeError("A Árvore B paginada já é persistente: abra o arquivo com ArvoreBPaginada(caminho).")
+
+    def __enter__(self) -> 'ArvoreBPaginada':
+        return self
+
+    def __exit__(self, *excecao: Any) -> None:
+        self.close()
+
+    def flush(self) -> None:
+        """
+        Grava no arquivo todos os nós modificados e o cabeçalho.
+        """
+        self.armazenamento.tamanho = self._tamanho
+        self.armazenamento.flush()
+
+    def close(self) -> None:
+        """
+        Grava as alterações pendentes e fecha o arquivo.
+        """
+        self.armazenamento.tamanho = self._tamanho
+        self.armazenamento.close()
+
+    def _novoNo(self, folha: bool) -> NoPaginado:
+        return self.armazenamento.novoNo(folha)
+
+    def _inserir(self, chave: int, valor: Any) -> bool:
+        if valor is not None:
+            raise TypeError("A Árvore B paginada armazena apenas chaves, sem valores associados.")
+        self._iniciarEscrita()
+        try:
+            return super()._inserir(chave, valor)
+        finally:
+            self._terminarEscrita()
+
+    def _inserirSeAusente(self, chave: int, valor: Any) -> bool:
+        if valor is not None:
+            raise TypeError("A Árvore B paginada armazena apenas chaves, sem valores associados.")
+        self._iniciarEscrita()
+        try:
+            return super()._inserirSeAusente(chave, valor)
+        finally:
+            self._terminarEscrita()
+
+    def inserir_muitos(self, chaves: Iterable[int], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        if valores is not None:
+            raise TypeError("A Árvore B paginada armazena apenas chaves, sem valores associados.")
+        self._iniciarEscrita()
+        try:
+            return super().inserir_muitos(chaves)
+        finally:
+            self._terminarEscrita()
+
+    def _conferirLote(self, chaves: List[int]) -> None:
+        # Os nós paginados também guardam as chaves em um array('q').
+        array("q", chaves)
+
+    def _remover(self, chave: int) -> Any:
+        self._iniciarEscrita()
+        try:
+            raiz_anterior = self.raiz
+            valor = super()._remover(chave)
+            # A raiz esvaziada foi substituída pelo seu único filho.
+            if self.raiz is not raiz_anterior:
+                self.armazenamento.liberar(raiz_anterior.pagina)
+            return valor
+        finally:
+            self._terminarEscrita()
+
+    def _removerIntervalo(self, inicio: Optional[int], fim: Optional[int]) -> int:
+        self._iniciarEscrita()
+        try:
+            return super()._removerIntervalo(inicio, fim)
+        finally:
+            self._terminarEscrita()
+
+    def _ajustarEspinhaDireita(self) -> None:
+        raiz_anterior = self.raiz
+        super()._ajustarEspinhaDireita()
+        # Cada raiz substituída ficou com um único filho, o primeiro; as páginas delas são
+        # liberadas até a raiz nova.
+        no = raiz_anterior
+        while no is not self.raiz:
+            filho = no.filhos[0]
+            self.armazenamento.liberar(no.pagina)
+            no = filho
+
+    def _descartarNo(self, no: NoPaginado) -> None:
+        self.armazenamento.liberar(no.pagina)
+
+    def _descartarSubarvore(self, no: NoPaginado) -> None:
+        self.armazenamento.liberarSubarvore(no.pagina)
+
+    def _fundir(self, no: NoPaginado, indice: int) -> None:
+        irmao = no.filhos[indice + 1]
+        super()._fundir(no, indice)
+        self.armazenamento.liberar(irmao.pagina)
+
+    def _iniciarEscrita(self) -> None:
+        """
+        Inicia uma operação de escrita, marcando a raiz atual como modificada.
+        """
+        self.armazenamento.iniciarEscrita()
+        if self.raiz is not None:
+            self.armazenamento.obter(self.raiz.pagina)
+
+    def _terminarEscrita(self) -> None:
+        """
+        Termina uma operação de escrita, registrando a nova raiz no armazenamento.
+        """
+        self.armazenamento.paginaRaiz = self.raiz.pagina if self.raiz is not None else 0
+        self.armazenamento.terminarEscrita()
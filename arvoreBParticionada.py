@@ -0,0 +1,433 @@
+import io
+import random
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, repeat
+from operator import itemgetter
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+from arvoreB import ArvoreB
+from noArvoreB import Chave, NoArvoreB
+from serializacao import carregarDeBuffer, gravarArvore
+
+# Quantas chaves da entrada são sorteadas por partição para escolher os limites quando a
+# entrada, fora de ordem, é ordenada pelos processos do pool.
+_AMOSTRA_POR_PARTICAO = 1_000
+
+
+def _ordenarFatia(itens: List[Any], limites: List[Chave], com_valores: bool) -> List[List[Any]]:
+    """
+    Primeira etapa da construção em paralelo: ordena, em um processo do pool, uma fatia
+    contígua da entrada, sem repetições, e a corta nos trechos de cada partição.
+    """
+    if com_valores:
+        itens = sorted(dict(itens).items())
+        chaves = [item[0] for item in itens]
+    else:
+        itens = chaves = sorted(set(itens))
+    cortes = [0, *(bisect_left(chaves, limite) for limite in limites), len(itens)]
+    return [itens[inicio:fim] for inicio, fim in zip(cortes, cortes[1:])]
+
+
+def _construirParticao(trechos: List[List[Any]], ordem: int, fill_factor: float, com_valores: bool,
+                       compacto: bool) -> bytes:
+    """
+    Segunda etapa da construção em paralelo: intercala, em um processo do pool, os trechos
+    ordenados de uma partição (na ordem da entrada, de modo que prevalece o último valor
+    de uma chave repetida), monta a árvore dela com a carga em lote e a devolve no formato
+    de `ArvoreB.dump`, muito mais barato de transferir entre processos que os nós.
+    """
+    if len(trechos) == 1:
+        itens = trechos[0]
+    elif com_valores:
+        itens = list(dict(sorted(chain.from_iterable(trechos), key=itemgetter(0))).items())
+    else:
+        itens = list(dict.fromkeys(sorted(chain.from_iterable(trechos))))
+    arvore = ArvoreB(ordem, compacto=compacto)
+    arvore._montarOrdenadas(itens, fill_factor, com_valores)
+    arquivo = io.BytesIO()
+    gravarArvore(arvore, arquivo)
+    return arquivo.getvalue()
+
+
+class ArvoreBParticionada:
+    """
+    Conjunto de Árvores B que particiona as chaves por intervalos: a partição `i` guarda as
+    chaves em [limites[i - 1], limites[i]), a primeira as menores que `limites[0]` e a
+    última as maiores ou iguais ao último limite.
+
+    Cada partição é uma `ArvoreB` independente. As operações sobre uma chave são
+    encaminhadas à partição dela, e as de intervalo percorrem apenas as partições que o
+    intervalo alcança, em ordem e sob demanda. `construir` monta as partições a partir de
+    fatias contíguas da entrada ordenada, no próprio processo ou em paralelo, uma por
+    processo, contornando o GIL; `costurar` junta as partições em uma única `ArvoreB`.
+
+    Atributos:
+        limites (List[Chave]): Os limites entre as partições, em ordem crescente.
+        particoes (List[ArvoreB]): As árvores de cada partição, uma a mais que os limites.
+        ordem (int): A ordem das árvores das partições.
+    """
+
+    def __init__(self, limites: Sequence[Chave], ordem: int, compacto: bool = False):
+        """
+        Cria as partições vazias.
+
+        Argumentos:
+            limites (Sequence[Chave]): Os limites entre as partições, estritamente crescentes.
+            ordem (int): A ordem das árvores das partições.
+            compacto (bool): Se as partições usam a representação compacta dos nós.
+        """
+        limites = list(limites)
+        if any(anterior >= seguinte for anterior, seguinte in zip(limites, limites[1:])):
+            raise ValueError("Os limites das partições devem estar em ordem estritamente crescente.")
+        self.limites = limites
+        self.ordem = ordem
+        self.compacto = compacto
+        self.particoes = [ArvoreB(ordem, compacto=compacto) for _ in range(len(limites) + 1)]
+
+    @classmethod
+    def construir(cls, chaves: Iterable[Any], ordem: int, particoes: int, fill_factor: float = 1.0,
+                  com_valores: bool = False, compacto: bool = False,
+                  ordenadas: bool = False, processos: int = 1) -> 'ArvoreBParticionada':
+        """
+        Constrói as partições a partir das chaves.
+
+        Com um único processo, a entrada é ordenada uma única vez (a menos que já venha
+        ordenada) e cortada, pelas posições, em `particoes` fatias contíguas de tamanhos
+        iguais; os limites são as primeiras chaves das fatias, sem nenhuma busca por chave,
+        e cada fatia é montada com a carga em lote de `ArvoreB.from_sorted`.
+
+        Com mais processos, as partições são montadas em um `ProcessPoolExecutor`, e cada
+        processo devolve a sua no formato de `dump`, carregado sem inserções. Uma entrada
+        ordenada é cortada como acima, e cada fatia vai para um processo. Uma entrada fora
+        de ordem não é ordenada pelo processo principal: os limites são os quantis de uma
+        amostra dela, cada processo ordena uma fatia contígua da entrada e a corta pelos
+        limites, e os trechos de cada partição são intercalados e montados por outro
+        processo. As partições têm então tamanhos apenas parecidos. O processo principal
+        ainda transfere as chaves entre os processos e carrega as partições, de modo que o
+        ganho depende do número de núcleos e do custo das comparações das chaves.
+
+        Argumentos:
+            chaves (Iterable[Any]): As chaves, ou pares (chave, valor) se `com_valores` for
+                                    verdadeiro. Repetições são descartadas, prevalecendo o
+                                    último valor.
+            ordem (int): A ordem das árvores das partições.
+            particoes (int): O número de partições. Com menos chaves que partições, as
+                             fatias vazias são omitidas.
+            fill_factor (float): Fração de ocupação dos nós montados (veja `from_sorted`).
+            com_valores (bool): Indica se a entrada é formada por pares (chave, valor).
+            compacto (bool): Se as partições usam a representação compacta dos nós.
+            ordenadas (bool): Indica se a entrada já está em ordem estritamente crescente,
+                              dispensando a ordenação.
+            processos (int): O número de processos do pool. Com 1 (o padrão), as partições
+                             são montadas no próprio processo, sem pool.
+
+        Retorna:
+            ArvoreBParticionada: As partições construídas.
+        """
+        if particoes < 1:
+            raise ValueError("O número de partições deve ser pelo menos 1.")
+        if not 0 < fill_factor <= 1:
+            raise ValueError("O fill_factor deve estar no intervalo (0, 1].")
+        if processos < 1:
+            raise ValueError("O número de processos deve ser pelo menos 1.")
+        if processos > 1 and not ordenadas:
+            return cls._construirEmParalelo(list(chaves), ordem, particoes, fill_factor, com_valores,
+                                            compacto, processos)
+        if ordenadas:
+            itens = list(chaves)
+        elif com_valores:
+            itens = sorted(dict(chaves).items())
+        else:
+            itens = sorted(set(chaves))
+        chaves_ordenadas = [item[0] for item in itens] if com_valores else itens
+
+        cortes = sorted({len(itens) * indice // particoes for indice in range(1, particoes)} - {0})
+        for corte in cortes:
+            if chaves_ordenadas[corte - 1] >= chaves_ordenadas[corte]:
+                raise ValueError("As chaves devem estar em ordem estritamente crescente.")
+        arvore = cls([chaves_ordenadas[corte] for corte in cortes], ordem, compacto)
+        fatias = [itens[inicio:fim] for inicio, fim in zip([0, *cortes], [*cortes, len(itens)])]
+        if processos == 1:
+            for particao, fatia in zip(arvore.particoes, fatias):
+                particao._montarOrdenadas(fatia, fill_factor, com_valores)
+        else:
+            del itens, chaves_ordenadas
+            with ProcessPoolExecutor(processos) as pool:
+                arvore._carregarParticoes(pool, [[fatia] if fatia else [] for fatia in fatias], fill_factor, com_valores)
+        return arvore
+
+    @classmethod
+    def _construirEmParalelo(cls, itens: List[Any], ordem: int, particoes: int, fill_factor: float,
+                             com_valores: bool, compacto: bool, processos: int) -> 'ArvoreBParticionada':
+        """
+        Constrói as partições de uma entrada fora de ordem em duas etapas no pool: a
+        ordenação de fatias contíguas da entrada (`_ordenarFatia`) e a montagem de cada
+        partição a partir dos seus trechos (`_construirParticao`).
+        """
+        if not itens:
+            return cls([], ordem, compacto)
+        amostra = random.Random(0).sample(itens, min(len(itens), _AMOSTRA_POR_PARTICAO * particoes))
+        if com_valores:
+            amostra = [chave for chave, _ in amostra]
+        amostra.sort()
+        limites = sorted({amostra[len(amostra) * indice // particoes] for indice in range(1, particoes)})
+        arvore = cls(limites, ordem, compacto)
+
+        tamanho = -(-len(itens) // processos)
+        fatias = [itens[inicio:inicio + tamanho] for inicio in range(0, len(itens), tamanho)]
+        del itens
+        with ProcessPoolExecutor(processos) as pool:
+            cortadas = list(pool.map(_ordenarFatia, fatias, repeat(limites), repeat(com_valores)))
+            del fatias
+            trechos = [[cortada[indice] for cortada in cortadas if cortada[indice]]
+                       for indice in range(len(arvore.particoes))]
+            del cortadas
+            arvore._carregarParticoes(pool, trechos, fill_factor, com_valores)
+        return arvore
+
+    def _carregarParticoes(self, pool: ProcessPoolExecutor, trechos: List[List[List[Any]]], fill_factor: float,
+                           com_valores: bool) -> None:
+        """
+        Monta no pool as partições que têm chaves, cada uma a partir dos seus trechos
+        ordenados, e carrega nelas as árvores devolvidas pelos processos.
+        """
+        indices = [indice for indice, trechos_da_particao in enumerate(trechos) if trechos_da_particao]
+        gravadas = pool.map(_construirParticao, [trechos[indice] for indice in indices], repeat(self.ordem),
+                            repeat(fill_factor), repeat(com_valores), repeat(self.compacto))
+        for indice, gravada in zip(indices, gravadas):
+            carregarDeBuffer(gravada, self.particoes[indice])
+
+    def _particao(self, chave: Chave) -> ArvoreB:
+        return self.particoes[bisect_right(self.limites, chave)]
+
+    def buscar(self, chave: Chave) -> Optional[Tuple[NoArvoreB, int]]:
+        """
+        Busca uma chave na partição dela (veja `ArvoreB.buscar`).
+
+        Retorna:
+            Optional[Tuple[NoArvoreB, int]]: O nó e o índice da chave na partição, ou None.
+        """
+        return self._particao(chave).buscar(chave)
+
+    def get(self, chave: Chave, padrao: Any = None) -> Any:
+        """
+        Obtém o valor associado a uma chave, ou `padrao` se ela não estiver em nenhuma
+        partição.
+        """
+        return self._particao(chave).get(chave, padrao)
+
+    def put(self, chave: Chave, valor: Any = None) -> bool:
+        """
+        Associa um valor a uma chave na partição dela (veja `ArvoreB.put`).
+
+        Retorna:
+            bool: True se a chave foi inserida, False se apenas o valor foi substituído.
+        """
+        return self._particao(chave).put(chave, valor)
+
+    def pop(self, chave: Chave, *padrao: Any) -> Any:
+        """
+        Remove uma chave da partição dela e retorna o valor associado (veja `ArvoreB.pop`).
+        """
+        return self._particao(chave).pop(chave, *padrao)
+
+    def inserir(self, chave: Chave, valor: Any = None) -> None:
+        """
+        Insere uma chave ausente na partição dela, com os contratos de `ArvoreB.inserir`.
+        """
+        self._particao(chave).inserir(chave, valor)
+
+    def inserir_se_ausente(self, chave: Chave, valor: Any = None) -> bool:
+        """
+        Insere a chave na partição dela apenas se ela ainda não existir (veja
+        `ArvoreB.inserir_se_ausente`).
+
+        Retorna:
+            bool: True se a chave foi inserida, False se já existia.
+        """
+        return self._particao(chave).inserir_se_ausente(chave, valor)
+
+    def remover(self, chave: Chave) -> None:
+        """
+        Remove uma chave existente da partição dela, com os contratos de `ArvoreB.remover`.
+        """
+        self._particao(chave).remover(chave)
+
+    def __getitem__(self, chave: Chave) -> Any:
+        return self._particao(chave)[chave]
+
+    def __setitem__(self, chave: Chave, valor: Any) -> None:
+        self._particao(chave)[chave] = valor
+
+    def __delitem__(self, chave: Chave) -> None:
+        del self._particao(chave)[chave]
+
+    def __contains__(self, chave: Chave) -> bool:
+        return chave in self._particao(chave)
+
+    def __len__(self) -> int:
+        return sum(len(particao) for particao in self.particoes)
+
+    def __iter__(self) -> Iterator[Chave]:
+        return self.intervalo()
+
+    def __reversed__(self) -> Iterator[Chave]:
+        for particao in reversed(self.particoes):
+            yield from reversed(particao)
+
+    def _alcance(self, inicio: Optional[Chave], fim: Optional[Chave]) -> range:
+        """
+        Os índices das partições que podem ter chaves em [inicio, fim).
+        """
+        primeira = 0 if inicio is None else bisect_right(self.limites, inicio)
+        ultima = len(self.limites) if fim is None else bisect_left(self.limites, fim)
+        return range(primeira, ultima + 1)
+
+    def intervalo(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None,
+                  com_valores: bool = False) -> Iterator[Any]:
+        """
+        Percorre, em ordem crescente, as chaves no intervalo [inicio, fim) de todas as
+        partições. Como as partições não se sobrepõem, a ordem global é a concatenação das
+        partições em ordem; cada uma só é descida quando a anterior se esgota.
+
+        Argumentos:
+            inicio (Optional[Chave]): O limite inferior, inclusivo. None indica sem limite.
+            fim (Optional[Chave]): O limite superior, exclusivo. None indica sem limite.
+            com_valores (bool): Se verdadeiro, produz pares (chave, valor) em vez de chaves.
+
+        Retorna:
+            Iterator[Any]: As chaves (ou pares) do intervalo, em ordem crescente.
+        """
+        for indice in self._alcance(inicio, fim):
+            yield from self.particoes[indice].intervalo(inicio, fim, com_valores)
+
+    def count_range(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
+        """
+        Conta as chaves no intervalo [inicio, fim), somando as contagens apenas das
+        partições que o intervalo alcança.
+        """
+        return sum(self.particoes[indice].count_range(inicio, fim) for indice in self._alcance(inicio, fim))
+
+    def rank(self, chave: Chave) -> int:
+        """
+        Conta as chaves menores que `chave`: os tamanhos das partições anteriores à dela
+        mais a posição da chave na sua partição.
+        """
+        indice = bisect_right(self.limites, chave)
+        return sum(len(particao) for particao in self.particoes[:indice]) + self.particoes[indice].rank(chave)
+
+    def select(self, indice: int) -> Chave:
+        """
+        Obtém a chave de uma posição da sequência ordenada de todas as partições, pulando
+        as partições inteiras que ficam antes dela.
+
+        Argumentos:
+            indice (int): A posição da chave, a partir de 0. Índices negativos contam a
+                          partir do fim.
+
+        Retorna:
+            Chave: A chave da posição.
+        """
+        tamanho = len(self)
+        if indice < 0:
+            indice += tamanho
+        if not 0 <= indice < tamanho:
+            raise IndexError("Índice fora do intervalo da árvore.")
+        for particao in self.particoes:
+            if indice < len(particao):
+                return particao.select(indice)
+            indice -= len(particao)
+
+    def remover_intervalo(self, inicio: Optional[Chave] = None, fim: Optional[Chave] = None) -> int:
+        """
+        Remove as chaves no intervalo [inicio, fim) das partições que ele alcança (veja
+        `ArvoreB.remover_intervalo`).
+
+        Retorna:
+            int: O número de chaves removidas.
+        """
+        return sum(self.particoes[indice].remover_intervalo(inicio, fim) for indice in self._alcance(inicio, fim))
+
+    def _distribuir(self, chaves: List[Chave]) -> List[List[int]]:
+        """
+        Agrupa as posições de um lote pela partição de cada chave.
+        """
+        grupos: List[List[int]] = [[] for _ in self.particoes]
+        for posicao, chave in enumerate(chaves):
+            grupos[bisect_right(self.limites, chave)].append(posicao)
+        return grupos
+
+    def buscar_muitos(self, chaves: Iterable[Chave]) -> List[Optional[Tuple[NoArvoreB, int]]]:
+        """
+        Busca um lote de chaves, com uma chamada de `ArvoreB.buscar_muitos` por partição.
+
+        Retorna:
+            List[Optional[Tuple[NoArvoreB, int]]]: O resultado de cada chave, na ordem
+                                                   original.
+        """
+        lista = list(chaves)
+        resultados: List[Optional[Tuple[NoArvoreB, int]]] = [None] * len(lista)
+        for particao, posicoes in zip(self.particoes, self._distribuir(lista)):
+            if posicoes:
+                for posicao, resultado in zip(posicoes, particao.buscar_muitos([lista[p] for p in posicoes])):
+                    resultados[posicao] = resultado
+        return resultados
+
+    def inserir_muitos(self, chaves: Iterable[Chave], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        """
+        Insere um lote de chaves, com uma chamada de `ArvoreB.inserir_muitos` por partição.
+
+        Retorna:
+            List[bool]: Para cada chave, na ordem original, True se ela foi inserida.
+        """
+        lista = list(chaves)
+        valores = [None] * len(lista) if valores is None else list(valores)
+        if len(valores) != len(lista):
+            raise ValueError("O número de valores deve ser igual ao de chaves.")
+        inseridas = [False] * len(lista)
+        for particao, posicoes in zip(self.particoes, self._distribuir(lista)):
+            if posicoes:
+                resultado = particao.inserir_muitos([lista[p] for p in posicoes], [valores[p] for p in posicoes])
+                for posicao, inserida in zip(posicoes, resultado):
+                    inseridas[posicao] = inserida
+        return inseridas
+
+    def remover_muitos(self, chaves: Iterable[Chave]) -> List[bool]:
+        """
+        Remove um lote de chaves, com uma chamada de `ArvoreB.remover_muitos` por partição.
+
+        Retorna:
+            List[bool]: Para cada chave, na ordem original, True se ela foi removida.
+        """
+        lista = list(chaves)
+        removidas = [False] * len(lista)
+        for particao, posicoes in zip(self.particoes, self._distribuir(lista)):
+            if posicoes:
+                for posicao, removida in zip(posicoes, particao.remover_muitos([lista[p] for p in posicoes])):
+                    removidas[posicao] = removida
+        return removidas
+
+    def costurar(self) -> ArvoreB:
+        """
+        Junta as partições, em ordem, em uma única `ArvoreB`, sem inserir chave por chave:
+        a menor chave de cada partição é retirada e usada como separador para pendurar a
+        partição na borda direita da árvore já costurada (veja `ArvoreB._concatenar`). Com
+        partições de mesma altura, elas viram as filhas de novos níveis acima das raízes.
+
+        Os nós passam para a árvore resultante, e as partições ficam vazias.
+
+        Retorna:
+            ArvoreB: A árvore com todas as chaves das partições.
+        """
+        resultado = ArvoreB(self.ordem, compacto=self.compacto)
+        for particao in self.particoes:
+            if len(particao) == 0:
+                continue
+            if resultado.raiz is None:
+                resultado.raiz, resultado._tamanho, resultado._altura = particao.raiz, particao._tamanho, particao._altura
+                particao.raiz, particao._tamanho, particao._altura = None, 0, 0
+                continue
+            separador = particao.select(0)
+            valor = particao.pop(separador)
+            resultado._concatenar(separador, valor, particao)
+        return resultado
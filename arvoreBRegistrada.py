@@ -0,0 +1,324 @@
+import os
+import pickle
+import re
+import struct
+import time
+import zlib
+from typing import Any, Iterable, List, Optional, Tuple
+from arvoreB import ArvoreB, _AUSENTE, _comoLista
+from serializacao import carregarArvore, gravarArvore
+
+# Operações gravadas no registro.
+_OP_INSERIR = 1
+_OP_REMOVER = 2
+# Remoção de intervalo: a chave não é usada e o valor é o par (inicio, fim).
+_OP_REMOVER_INTERVALO = 3
+
+# Registro de uma operação: CRC32 do corpo, seguido do corpo com a operação, a chave e o
+# tamanho do valor serializado (0xFFFFFFFF quando o valor é None), e então o valor.
+_CRC = struct.Struct("<I")
+_CORPO = struct.Struct("<BqI")
+_SEM_VALOR = 0xFFFFFFFF
+
+_PADRAO_ARQUIVO = re.compile(r"^(instantaneo|registro)-(\d{12})\.(arvs|wal)$")
+
+
+class ArvoreBRegistrada(ArvoreB):
+    """
+    Árvore B com registro de escrita antecipada (write-ahead log) e instantâneos, para que
+    o estado possa ser recuperado após o término inesperado do processo.
+
+    Cada `inserir`/`put` e `remover`/`pop` bem-sucedido é acrescentado a um registro binário
+    (apenas acréscimos, com CRC32 por operação). As operações são acumuladas e gravadas com
+    um único `fsync` por grupo (group commit): o grupo é sincronizado pela operação que o
+    completa (`tamanho_grupo` operações) ou pela primeira operação feita depois de passados
+    `intervalo_sincronizacao` segundos da última sincronização. O intervalo só é conferido
+    a cada operação, sem nenhuma thread ou temporizador: se as escritas param, as últimas
+    operações de um grupo incompleto continuam pendentes até a próxima operação,
+    `sincronizar()` ou `close()`. Um instantâneo grava a estrutura de nós inteira e inicia
+    um novo segmento do registro; a recuperação carrega o último instantâneo e reaplica
+    apenas o segmento seguinte a ele.
+
+    Operações ainda não sincronizadas podem ser perdidas se o processo terminar; use
+    `sincronizar()` para garantir que tudo o que foi feito até ali está no disco, por
+    exemplo ao fim de uma rajada de escritas.
+
+    Atributos:
+        diretorio (str): O diretório com os instantâneos e segmentos do registro.
+        tamanhoGrupo (int): Número de operações acumuladas antes de um `fsync`.
+        intervaloSincronizacao (float): Tempo, em segundos, a partir do qual a próxima
+                                        operação sincroniza o grupo, mesmo incompleto.
+        instantaneoACada (Optional[int]): Se definido, grava um instantâneo a cada tantas operações.
+    """
+
+    def __init__(self, diretorio: str, ordem: int, compacto: bool = False, tamanho_grupo: int = 64,
+                 intervalo_sincronizacao: float = 0.05, instantaneo_a_cada: Optional[int] = None):
+        """
+        Abre a árvore registrada no diretório, recuperando o estado gravado, se houver.
+
+        Argumentos:
+            diretorio (str): O diretório dos arquivos, criado se não existir.
+            ordem (int): A ordem da árvore B.
+            compacto (bool): Se os nós usam a representação compacta.
+            tamanho_grupo (int): Operações por `fsync`. Use 1 para sincronizar cada operação.
+            intervalo_sincronizacao (float): Tempo, em segundos, depois da última
+                                             sincronização a partir do qual a próxima
+                                             operação sincroniza o grupo. Conferido apenas
+                                             nas operações; não sincroniza sozinho.
+            instantaneo_a_cada (Optional[int]): Operações entre instantâneos automáticos.
+        """
+        super().__init__(ordem, compacto=compacto)
+        if tamanho_grupo < 1:
+            raise ValueError("O tamanho do grupo deve ser pelo menos 1.")
+
+        self.diretorio = diretorio
+        self.tamanhoGrupo = tamanho_grupo
+        self.intervaloSincronizacao = intervalo_sincronizacao
+        self.instantaneoACada = instantaneo_a_cada
+        self._pendentes = bytearray()
+        self._quantidadePendente = 0
+        self._ultimaSincronizacao = time.monotonic()
+        self._operacoesDesdeInstantaneo = 0
+        self._recuperando = False
+
+        os.makedirs(diretorio, exist_ok=True)
+        self._sequencia = self._recuperar()
+        self._registro = self._abrirSegmento(self._sequencia)
+
+    def _caminho(self, tipo: str, sequencia: int) -> str:
+        extensao = "arvs" if tipo == "instantaneo" else "wal"
+        return os.path.join(self.diretorio, f"{tipo}-{sequencia:012d}.{extensao}")
+
+    def _abrirSegmento(self, sequencia: int) -> int:
+        """
+        Abre (ou cria) o segmento do registro para acréscimos.
+        """
+        return os.open(self._caminho("registro", sequencia), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def _recuperar(self) -> int:
+        """
+        Carrega o instantâneo mais recente e reaplica os segmentos do registro a partir dele.
+
+        Retorna:
+            int: A sequência do segmento onde as próximas operações serão acrescentadas.
+        """
+        instantaneos: List[int] = []
+        segmentos: List[int] = []
+        for nome in os.listdir(self.diretorio):
+            # Instantâneo cuja gravação foi interrompida antes da renomeação.
+            if nome.endswith(".tmp"):
+                os.remove(os.path.join(self.diretorio, nome))
+                continue
+            encontrado = _PADRAO_ARQUIVO.match(nome)
+            if encontrado:
+                (instantaneos if encontrado.group(1) == "instantaneo" else segmentos).append(int(encontrado.group(2)))
+
+        base = max(instantaneos, default=0)
+        if instantaneos:
+            with open(self._caminho("instantaneo", base), "rb") as arquivo:
+                carregarArvore(arquivo, self)
+
+        self._recuperando = True
+        try:
+            for sequencia in sorted(segmento for segmento in segmentos if segmento >= base):
+                caminho = self._caminho("registro", sequencia)
+                operacoes, fim_valido = self._lerSegmento(caminho)
+                self._reaplicar(operacoes)
+                # Descarta o final de uma gravação interrompida, para que os próximos
+                # acréscimos não fiquem depois de um registro inválido.
+                if fim_valido < os.path.getsize(caminho):
+                    os.truncate(caminho, fim_valido)
+        finally:
+            self._recuperando = False
+
+        return max([base, *segmentos])
+
+    def _reaplicar(self, operacoes: List[Tuple[int, int, Any]]) -> None:
+        """
+        Reaplica as operações lidas do registro. Inserções consecutivas são aplicadas com
+        uma única `inserir_muitos`, que equivale a chamar `put` para cada uma, em ordem.
+        """
+        chaves: List[int] = []
+        valores: List[Any] = []
+        for operacao, chave, valor in operacoes:
+            if operacao == _OP_INSERIR:
+                chaves.append(chave)
+                valores.append(valor)
+                continue
+            if chaves:
+                self.inserir_muitos(chaves, valores)
+                chaves, valores = [], []
+            if operacao == _OP_REMOVER_INTERVALO:
+                self.remover_intervalo(*valor)
+            else:
+                self.pop(chave, None)
+        if chaves:
+            self.inserir_muitos(chaves, valores)
+
+    @staticmethod
+    def _lerSegmento(caminho: str) -> Tuple[List[Tuple[int, int, Any]], int]:
+        """
+        Lê as operações de um segmento do registro, parando no primeiro registro incompleto
+        ou corrompido (o final de uma gravação interrompida).
+
+        Retorna:
+            Tuple[List[Tuple[int, int, Any]], int]: As operações válidas, como trincas
+                                                    (operação, chave, valor), e a posição
+                                                    do arquivo onde elas terminam.
+        """
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read()
+
+        operacoes = []
+        posicao = 0
+        while posicao + _CRC.size + _CORPO.size <= len(dados):
+            (crc,) = _CRC.unpack_from(dados, posicao)
+            operacao, chave, tamanho = _CORPO.unpack_from(dados, posicao + _CRC.size)
+            fim = posicao + _CRC.size + _CORPO.size + (0 if tamanho == _SEM_VALOR else tamanho)
+            if fim > len(dados) or zlib.crc32(dados[posicao + _CRC.size:fim]) != crc:
+                break
+            valor = None
+            if tamanho != _SEM_VALOR:
+                valor = pickle.loads(dados[posicao + _CRC.size + _CORPO.size:fim])
+            operacoes.append((operacao, chave, valor))
+            posicao = fim
+
+        return operacoes, posicao
+
+    @staticmethod
+    def _codificar(operacao: int, chave: int, valor: Any) -> bytes:
+        """
+        Codifica uma operação como um registro do segmento, com o CRC32 do corpo.
+        """
+        serializado = b"" if valor is None else pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        corpo = _CORPO.pack(operacao, chave, _SEM_VALOR if valor is None else len(serializado)) + serializado
+        return _CRC.pack(zlib.crc32(corpo)) + corpo
+
+    def _registrar(self, registro: bytes) -> None:
+        """
+        Acrescenta um registro codificado ao grupo pendente, sincronizando-o se ele estiver
+        completo ou se o intervalo desde a última sincronização já passou, e gravando um
+        instantâneo, se for a hora.
+        """
+        self._pendentes += registro
+        self._quantidadePendente += 1
+        self._operacoesDesdeInstantaneo += 1
+
+        if (self._quantidadePendente >= self.tamanhoGrupo
+                or time.monotonic() - self._ultimaSincronizacao >= self.intervaloSincronizacao):
+            self.sincronizar()
+        if self.instantaneoACada is not None and self._operacoesDesdeInstantaneo >= self.instantaneoACada:
+            self.instantaneo()
+
+    def sincronizar(self) -> None:
+        """
+        Grava o grupo de operações pendentes no registro e o sincroniza com o disco.
+        """
+        if self._pendentes:
+            os.write(self._registro, self._pendentes)
+            os.fsync(self._registro)
+            self._pendentes.clear()
+            self._quantidadePendente = 0
+        self._ultimaSincronizacao = time.monotonic()
+
+    def instantaneo(self) -> None:
+        """
+        Grava um instantâneo da árvore e inicia um novo segmento do registro, removendo os
+        instantâneos e segmentos anteriores, que deixam de ser necessários.
+        """
+        self.sincronizar()
+        nova_sequencia = self._sequencia + 1
+
+        # Grava em um arquivo temporário e renomeia, para que um instantâneo incompleto
+        # nunca seja confundido com um válido.
+        caminho = self._caminho("instantaneo", nova_sequencia)
+        with open(caminho + ".tmp", "wb") as arquivo:
+            gravarArvore(self, arquivo)
+            arquivo.flush()
+            os.fsync(arquivo.fileno())
+        os.replace(caminho + ".tmp", caminho)
+
+        os.close(self._registro)
+        self._registro = self._abrirSegmento(nova_sequencia)
+        self._sincronizarDiretorio()
+
+        for nome in os.listdir(self.diretorio):
+            encontrado = _PADRAO_ARQUIVO.match(nome)
+            if encontrado and int(encontrado.group(2)) < nova_sequencia:
+                os.remove(os.path.join(self.diretorio, nome))
+        self._sequencia = nova_sequencia
+        self._operacoesDesdeInstantaneo = 0
+
+    def _sincronizarDiretorio(self) -> None:
+        """
+        Sincroniza as entradas do diretório (criação e renomeação de arquivos), onde suportado.
+        """
+        if hasattr(os, "O_DIRECTORY"):
+            descritor = os.open(self.diretorio, os.O_RDONLY | os.O_DIRECTORY)
+            try:
+                os.fsync(descritor)
+            finally:
+                os.close(descritor)
+
+    def close(self) -> None:
+        """
+        Sincroniza as operações pendentes e fecha o registro.
+        """
+        if self._registro is not None:
+            self.sincronizar()
+            os.close(self._registro)
+            self._registro = None
+
+    def __enter__(self) -> 'ArvoreBRegistrada':
+        return self
+
+    def __exit__(self, *excecao: Any) -> None:
+        self.close()
+
+    def _inserir(self, chave: int, valor: Any) -> bool:
+        if self._recuperando:
+            return super()._inserir(chave, valor)
+        # Codifica antes de alterar a árvore, para que uma chave ou valor que não possa ser
+        # registrado não deixe a árvore à frente do registro.
+        registro = self._codificar(_OP_INSERIR, chave, valor)
+        inserida = super()._inserir(chave, valor)
+        self._registrar(registro)
+        return inserida
+
+    def _inserirSeAusente(self, chave: int, valor: Any) -> bool:
+        if self._recuperando:
+            return super()._inserirSeAusente(chave, valor)
+        registro = self._codificar(_OP_INSERIR, chave, valor)
+        inserida = super()._inserirSeAusente(chave, valor)
+        if inserida:
+            self._registrar(registro)
+        return inserida
+
+    def inserir_muitos(self, chaves: Iterable[int], valores: Optional[Iterable[Any]] = None) -> List[bool]:
+        if self._recuperando:
+            return super().inserir_muitos(chaves, valores)
+        lista = _comoLista(chaves)
+        lista_valores = [None] * len(lista) if valores is None else _comoLista(valores)
+        registros = [self._codificar(_OP_INSERIR, chave, valor) for chave, valor in zip(lista, lista_valores)]
+        resultados = super().inserir_muitos(lista, lista_valores)
+        for registro in registros:
+            self._registrar(registro)
+        return resultados
+
+    def _remover(self, chave: int) -> Any:
+        if self._recuperando:
+            return super()._remover(chave)
+        registro = self._codificar(_OP_REMOVER, chave, None)
+        valor = super()._remover(chave)
+        if valor is not _AUSENTE:
+            self._registrar(registro)
+        return valor
+
+    def _removerIntervalo(self, inicio: Optional[int], fim: Optional[int]) -> int:
+        if self._recuperando:
+            return super()._removerIntervalo(inicio, fim)
+        registro = self._codificar(_OP_REMOVER_INTERVALO, 0, (inicio, fim))
+        quantidade = super()._removerIntervalo(inicio, fim)
+        if quantidade:
+            self._registrar(registro)
+        return quantidade
@@ -0,0 +1,4 @@
+"""
+Benchmarks da Árvore B. Cada módulo pode ser executado a partir da raiz do repositório,
+por exemplo: `python3 -m benchmarks.bench_busca`.
+"""
@@ -0,0 +1,61 @@
+"""
+Compara a `ArvoreB` clássica com a `ArvoreBMais` em buscas pontuais, inserções
+aleatórias e varreduras longas de intervalo.
+"""
+import argparse
+import random
+import time
+
+from arvoreB import ArvoreB
+from arvoreBMais import ArvoreBMais
+from benchmarks.comum import imprimirTabela, medirVazao
+
+
+def medirVarredura(arvore, intervalos, repeticoes: int = 3) -> float:
+    """
+    Mede quantas chaves por segundo as varreduras dos intervalos produzem.
+    """
+    melhor = float("inf")
+    total = 0
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        total = 0
+        for limite_inferior, limite_superior in intervalos:
+            for _ in arvore.intervalo(limite_inferior, limite_superior):
+                total += 1
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return total / melhor
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=500_000)
+    parser.add_argument("--operacoes", type=int, default=100_000)
+    parser.add_argument("--ordens", type=int, nargs="+", default=[16, 64])
+    parser.add_argument("--largura", type=float, default=0.1, help="Fração das chaves em cada varredura.")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    universo = 2 * args.chaves
+    consultas = [aleatorio.randrange(universo) for _ in range(args.operacoes)]
+    novas = [2 * aleatorio.randrange(args.chaves) + 1 for _ in range(args.operacoes)]
+    largura = int(args.largura * universo)
+    intervalos = [(inicio, inicio + largura) for inicio in (aleatorio.randrange(universo - largura) for _ in range(10))]
+
+    linhas = []
+    for ordem in args.ordens:
+        for nome, classe in (("ArvoreB", ArvoreB), ("ArvoreBMais", ArvoreBMais)):
+            arvore = classe.from_sorted(range(0, universo, 2), ordem)
+            buscas = medirVazao(arvore.buscar, consultas)
+            varredura = medirVarredura(arvore, intervalos)
+            inicio = time.perf_counter()
+            for chave in novas:
+                arvore.put(chave)
+            insercoes = len(novas) / (time.perf_counter() - inicio)
+            linhas.append([nome, ordem, buscas, insercoes, varredura])
+
+    imprimirTabela(["árvore", "ordem", "buscas/s", "inserções/s", "chaves varridas/s"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""
+Compara a vazão de buscas com a busca linear recursiva original e com a busca binária
+iterativa de `NoArvoreB.buscar`, variando a ordem da árvore.
+
+As duas buscas são medidas sem a verificação da invariante de `NoArvoreB`, para que a
+comparação reflita apenas o algoritmo de busca.
+"""
+import argparse
+import random
+from typing import Optional, Tuple
+
+from arvoreB import ArvoreB
+from noArvoreB import NoArvoreB
+from benchmarks.comum import imprimirTabela, medirVazao
+
+
+def buscaLinear(no: NoArvoreB, chaveProcurada: int) -> Optional[Tuple[NoArvoreB, int]]:
+    """
+    Reprodução da busca original: varredura linear em cada nó e recursão nos filhos.
+    """
+    i = 0
+    while i < len(no.chaves) and chaveProcurada > no.chaves[i]:
+        i += 1
+    if i < len(no.chaves) and chaveProcurada == no.chaves[i]:
+        return (no, i)
+    if no.folha:
+        return None
+    return buscaLinear(no.filhos[i], chaveProcurada)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000, help="Número de chaves na árvore.")
+    parser.add_argument("--buscas", type=int, default=50_000, help="Número de buscas medidas.")
+    parser.add_argument("--ordens", type=int, nargs="+", default=[2, 8, 32, 64, 128, 256, 512])
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    consultas = [aleatorio.randrange(2 * args.chaves) for _ in range(args.buscas)]
+
+    # Método sem o invólucro do icontract que verifica a invariante a cada chamada.
+    buscaBinaria = getattr(NoArvoreB.buscar, "__wrapped__", NoArvoreB.buscar)
+
+    linhas = []
+    for ordem in args.ordens:
+        arvore = ArvoreB.from_sorted(range(0, 2 * args.chaves, 2), ordem)
+        antes = medirVazao(lambda chave: buscaLinear(arvore.raiz, chave), consultas)
+        depois = medirVazao(lambda chave: buscaBinaria(arvore.raiz, chave), consultas)
+        linhas.append([ordem, antes, depois, f"{depois / antes:.2f}x"])
+
+    imprimirTabela(["ordem", "linear (busca/s)", "binária (busca/s)", "ganho"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compara a vazão de buscas e inserções com chaves inteiras, de texto e tuplas, guardadas
+como estão ou traduzidas por `key`: tuplas codificadas em bytes com `codificarChave` ou
+empacotadas em um inteiro com `empacotarInteiros`. As tuplas pré-codificadas separam o
+custo das comparações nos nós do custo da tradução a cada operação. Execute com
+ARVOREB_CONTRATOS=0 para não medir as verificações dos contratos.
+"""
+import argparse
+import random
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela, medirVazao
+from chaves import codificarChave, empacotarInteiros
+
+
+def gerarChaves(tipo: str, quantidade: int, aleatorio: random.Random) -> list:
+    """
+    Gera chaves distintas do tipo pedido, em ordem aleatória.
+    """
+    numeros = aleatorio.sample(range(1 << 30), quantidade)
+    if tipo == "int":
+        return numeros
+    if tipo == "str":
+        return [f"cliente:{numero:010}" for numero in numeros]
+    tuplas = [(f"regiao-{numero % 16:02}", numero >> 4, numero & 7) for numero in numeros]
+    if tipo == "bytes":
+        # Tuplas já codificadas pelo chamador: mede só o custo das comparações nos nós.
+        return [codificarChave(tupla) for tupla in tuplas]
+    return tuplas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=100_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    empacotar = empacotarInteiros((8, 26, 3))
+    # A região é traduzida para um número antes do empacotamento.
+    empacotada = lambda chave: empacotar((int(chave[0][7:]), chave[1], chave[2]))
+    cenarios = [
+        ("int", None, "-"),
+        ("str", None, "-"),
+        ("tupla", None, "-"),
+        ("bytes", None, "- (tuplas pré-codificadas)"),
+        ("tupla", codificarChave, "codificarChave"),
+        ("tupla", empacotada, "empacotarInteiros"),
+    ]
+
+    linhas = []
+    base = None
+    for tipo, key, nome in cenarios:
+        chaves = gerarChaves(tipo, args.chaves, random.Random(42))
+        arvore = ArvoreB(args.ordem, key=key)
+        insercoes = medirVazao(lambda chave: arvore.put(chave, None), chaves, repeticoes=1)
+        buscas = medirVazao(arvore.buscar, chaves)
+        if base is None:
+            base = buscas
+        linhas.append([tipo, nome, insercoes, buscas, f"{buscas / base:.2f}x"])
+
+    imprimirTabela(["chaves", "key", "inserções/s", "buscas/s", "buscas (relativo)"], linhas)
+
+
+if __name__ == "__main__":
+    main()
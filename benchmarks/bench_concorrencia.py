@@ -0,0 +1,97 @@
+"""
+Mede a vazão de leitores concorrentes com um escritor ativo, comparando a `ArvoreB` comum
+protegida por uma trava única (a alternativa segura sem cópia na escrita) com a
+`ArvoreBConcorrente`, em que os leitores não usam trava.
+"""
+import argparse
+import random
+import threading
+import time
+
+from arvoreB import ArvoreB
+from arvoreBConcorrente import ArvoreBConcorrente
+from benchmarks.comum import imprimirTabela
+
+
+class ArvoreComTrava:
+    """
+    Envolve uma `ArvoreB` comum com uma trava usada por leitores e escritores.
+    """
+
+    def __init__(self, arvore: ArvoreB):
+        self.arvore = arvore
+        self.trava = threading.Lock()
+
+    def buscar(self, chave: int):
+        with self.trava:
+            return self.arvore.buscar(chave)
+
+    def put(self, chave: int, valor=None) -> bool:
+        with self.trava:
+            return self.arvore.put(chave, valor)
+
+
+def medir(arvore, leitores: int, duracao: float, universo: int):
+    """
+    Executa os leitores e um escritor ao mesmo tempo durante `duracao` segundos.
+
+    Retorna:
+        Tuple[float, float]: As buscas por segundo (somando os leitores) e as escritas por segundo.
+    """
+    parar = threading.Event()
+    contagens = [0] * (leitores + 1)
+
+    def leitor(indice):
+        aleatorio = random.Random(indice)
+        chaves = [aleatorio.randrange(universo) for _ in range(1_000)]
+        while not parar.is_set():
+            for chave in chaves:
+                arvore.buscar(chave)
+            contagens[indice] += len(chaves)
+
+    def escritor():
+        aleatorio = random.Random(-1)
+        while not parar.is_set():
+            arvore.put(aleatorio.randrange(universo))
+            contagens[leitores] += 1
+
+    threads = [threading.Thread(target=leitor, args=(indice,)) for indice in range(leitores)]
+    threads.append(threading.Thread(target=escritor))
+    for thread in threads:
+        thread.start()
+    time.sleep(duracao)
+    parar.set()
+    for thread in threads:
+        thread.join()
+    return sum(contagens[:leitores]) / duracao, contagens[leitores] / duracao
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    parser.add_argument("--leitores", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--duracao", type=float, default=2.0, help="Segundos por medição.")
+    args = parser.parse_args()
+
+    universo = 2 * args.chaves
+    linhas = []
+    for leitores in args.leitores:
+        com_trava = ArvoreComTrava(ArvoreB.from_sorted(range(0, universo, 2), args.ordem))
+        concorrente = ArvoreBConcorrente.from_sorted(range(0, universo, 2), args.ordem)
+        for nome, arvore in (("trava única", com_trava), ("cópia na escrita", concorrente)):
+            buscas, escritas = medir(arvore, leitores, args.duracao, universo)
+            linhas.append([nome, leitores, buscas, escritas])
+
+    imprimirTabela(["árvore", "leitores", "buscas/s", "escritas/s"], linhas)
+
+    # Obter um instantâneo custa O(1), independentemente do tamanho da árvore.
+    concorrente = ArvoreBConcorrente.from_sorted(range(args.chaves), args.ordem)
+    inicio = time.perf_counter()
+    for _ in range(100_000):
+        concorrente.instantaneo()
+    print(f"\ninstantâneo: {(time.perf_counter() - inicio) / 100_000 * 1e9:,.0f} ns por chamada")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Mede o custo por operação de `inserir`, `buscar` e `remover` com os contratos do icontract
+ligados (modo verificado) e desligados (modo de produção, ARVOREB_CONTRATOS=0).
+
+Como os contratos são resolvidos na importação dos módulos, cada modo é medido em um
+subprocesso próprio.
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+from benchmarks.comum import imprimirTabela
+from contratos import VARIAVEL_CONTRATOS
+
+
+def medir(chaves: int, ordem: int) -> dict:
+    """
+    Mede o tempo médio, em microssegundos, de cada operação no processo atual.
+    """
+    from arvoreB import ArvoreB
+
+    aleatorio = random.Random(42)
+    valores = aleatorio.sample(range(10 * chaves), chaves)
+    arvore = ArvoreB(ordem)
+    resultado = {}
+
+    inicio = time.perf_counter()
+    for chave in valores:
+        arvore.inserir(chave)
+    resultado["inserir"] = (time.perf_counter() - inicio) / chaves * 1e6
+
+    inicio = time.perf_counter()
+    for chave in valores:
+        arvore.buscar(chave)
+    resultado["buscar"] = (time.perf_counter() - inicio) / chaves * 1e6
+
+    inicio = time.perf_counter()
+    for chave in valores:
+        arvore.remover(chave)
+    resultado["remover"] = (time.perf_counter() - inicio) / chaves * 1e6
+
+    return resultado
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=50_000)
+    parser.add_argument("--ordem", type=int, default=16)
+    parser.add_argument("--medir", action="store_true", help="Uso interno: mede no processo atual e imprime JSON.")
+    args = parser.parse_args()
+
+    if args.medir:
+        print(json.dumps(medir(args.chaves, args.ordem)))
+        return
+
+    resultados = {}
+    for modo, valor in (("verificado", "1"), ("produção", "0")):
+        ambiente = dict(os.environ, **{VARIAVEL_CONTRATOS: valor})
+        saida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_contratos", "--medir",
+             "--chaves", str(args.chaves), "--ordem", str(args.ordem)],
+            env=ambiente, capture_output=True, text=True, check=True,
+        )
+        resultados[modo] = json.loads(saida.stdout)
+
+    linhas = []
+    for operacao in ("inserir", "buscar", "remover"):
+        verificado = resultados["verificado"][operacao]
+        producao = resultados["produção"][operacao]
+        linhas.append([operacao, f"{verificado:.2f}", f"{producao:.2f}", f"{verificado / producao:.2f}x"])
+
+    print(f"Tempo médio por operação (µs), {args.chaves} chaves, ordem {args.ordem}:")
+    imprimirTabela(["operação", "verificado", "produção", "sobrecusto"], linhas)
+
+
+if __name__ == "__main__":
+    main()
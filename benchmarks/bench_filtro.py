@@ -0,0 +1,84 @@
+"""
+Mede a vazão de `buscar` na árvore padrão, com o filtro de Bloom, com o cache das últimas
+posições encontradas e com os dois, variando a fração de chaves ausentes entre as
+consultas. As chaves presentes consultadas se concentram em poucas chaves quentes, para
+que o cache tenha o que guardar. Informa também as consultas descartadas pelo filtro, a
+taxa de falsos positivos e a taxa de acertos do cache. Execute com ARVOREB_CONTRATOS=0
+para não medir as verificações dos contratos.
+"""
+import argparse
+import random
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela, medirVazao
+
+MODOS = [
+    ("padrão", {}),
+    ("filtro", {"filtro": True}),
+    ("cache", {"cache": 1_024}),
+    ("filtro + cache", {"filtro": True, "cache": 1_024}),
+]
+
+
+def gerarConsultas(presentes: list, quantidade: int, ausentes: float, aleatorio: random.Random) -> list:
+    """
+    Sorteia as consultas: uma fração `ausentes` de chaves que não estão na árvore (ímpares,
+    já que as presentes são pares) e, entre as presentes, 80% de um grupo de 512 chaves
+    quentes.
+    """
+    quentes = aleatorio.sample(presentes, min(512, len(presentes)))
+    consultas = []
+    for _ in range(quantidade):
+        if aleatorio.random() < ausentes:
+            consultas.append(2 * aleatorio.randrange(len(presentes)) + 1)
+        elif aleatorio.random() < 0.8:
+            consultas.append(aleatorio.choice(quentes))
+        else:
+            consultas.append(aleatorio.choice(presentes))
+    return consultas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--consultas", type=int, default=200_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    parser.add_argument("--ausentes", type=float, nargs="+", default=[0.0, 0.25, 0.5, 0.75, 0.9, 0.99])
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    presentes = [2 * chave for chave in range(args.chaves)]
+    aleatorio.shuffle(presentes)
+
+    arvores = []
+    for nome, opcoes in MODOS:
+        arvore = ArvoreB(args.ordem, **opcoes)
+        for chave in presentes:
+            arvore.put(chave, None)
+        arvores.append((nome, arvore))
+
+    linhas = []
+    for ausentes in args.ausentes:
+        consultas = gerarConsultas(presentes, args.consultas, ausentes, aleatorio)
+        base = None
+        for nome, arvore in arvores:
+            filtro, cache = arvore.filtro, arvore.cache
+            for camada in (filtro, cache):
+                if camada is not None:
+                    camada.zerar()
+            buscas = medirVazao(arvore.buscar, consultas)
+            if base is None:
+                base = buscas
+            linhas.append([
+                f"{ausentes:.0%}", nome, buscas, f"{buscas / base:.2f}x",
+                f"{filtro.descartadas / filtro.consultas:.1%}" if filtro is not None else "-",
+                f"{filtro.instantaneo()['taxa_falsos_positivos']:.2%}" if filtro is not None else "-",
+                f"{cache.instantaneo()['taxa_acertos']:.1%}" if cache is not None else "-",
+            ])
+
+    imprimirTabela(["ausentes", "modo", "buscas/s", "relativo", "descartadas", "falsos positivos",
+                    "acertos do cache"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Compara a inserção de fluxos em ordem crescente, quase ordenados (poucas chaves fora do
+lugar) e aleatórios na árvore padrão, com o dedo, com a inserção crescente e com os dois,
+e informa a vazão das inserções, a das buscas pelas mesmas chaves e a ocupação dos nós
+(chaves / (nós * (2t - 1))). Execute com ARVOREB_CONTRATOS=0 para não medir as
+verificações dos contratos.
+"""
+import argparse
+import random
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela, medirVazao
+
+MODOS = [
+    ("padrão", {}),
+    ("dedo", {"dedo": True}),
+    ("inserção crescente", {"insercao_crescente": True}),
+    ("dedo + crescente", {"dedo": True, "insercao_crescente": True}),
+]
+
+
+def gerarFluxo(tipo: str, quantidade: int, aleatorio: random.Random) -> list:
+    """
+    Gera as chaves do fluxo: em ordem, em ordem com 5% das chaves trocadas com uma vizinha
+    próxima, ou embaralhadas.
+    """
+    chaves = list(range(quantidade))
+    if tipo == "quase ordenado":
+        for _ in range(quantidade // 20):
+            i = aleatorio.randrange(quantidade)
+            j = min(quantidade - 1, i + aleatorio.randrange(1, 64))
+            chaves[i], chaves[j] = chaves[j], chaves[i]
+    elif tipo == "aleatório":
+        aleatorio.shuffle(chaves)
+    return chaves
+
+
+def contarNos(arvore: ArvoreB) -> int:
+    nos, pendentes = 0, [arvore.raiz]
+    while pendentes:
+        no = pendentes.pop()
+        nos += 1
+        if not no.folha:
+            pendentes.extend(no.filhos)
+    return nos
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    linhas = []
+    for tipo in ("crescente", "quase ordenado", "aleatório"):
+        fluxo = gerarFluxo(tipo, args.chaves, random.Random(42))
+        for nome, opcoes in MODOS:
+            arvore = ArvoreB(args.ordem, **opcoes)
+            inicio = time.perf_counter()
+            for chave in fluxo:
+                arvore.put(chave, None)
+            insercoes = len(fluxo) / (time.perf_counter() - inicio)
+            buscas = medirVazao(arvore.buscar, fluxo)
+            # Fecha a borda direita deixada aberta pela inserção crescente antes de contar os nós.
+            arvore.validar()
+            nos = contarNos(arvore)
+            ocupacao = len(arvore) / (nos * (2 * args.ordem - 1))
+            linhas.append([tipo, nome, insercoes, buscas, nos, f"{ocupacao:.0%}"])
+
+    imprimirTabela(["fluxo", "modo", "inserções/s", "buscas/s", "nós", "ocupação"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""
+Compara, em fluxos com muitas chaves repetidas, a inserção só das chaves ausentes com
+`inserir_se_ausente` (uma descida) e com `buscar` seguido de `inserir` (duas descidas,
+além da busca feita pelo contrato de `inserir`), e com `put`, que divide preventivamente
+os nós cheios mesmo quando a chave já existe.
+"""
+import argparse
+import random
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+
+def buscarEInserir(arvore: ArvoreB, chave: int) -> None:
+    if arvore.buscar(chave) is None:
+        arvore.inserir(chave)
+
+
+def medir(ordem: int, fluxo: list, modo: str) -> tuple:
+    """
+    Insere o fluxo em uma árvore vazia e retorna a vazão e o número de divisões feitas.
+    """
+    arvore = ArvoreB(ordem)
+    metricas = arvore.ativarMetricas()
+    # Apenas os contadores estruturais interessam; as operações não são cronometradas.
+    for nome in ("buscar", "inserir", "put", "inserir_se_ausente"):
+        arvore.__dict__.pop(nome, None)
+    if modo == "inserir_se_ausente":
+        operacao = arvore.inserir_se_ausente
+    elif modo == "put":
+        operacao = lambda chave: arvore.put(chave, None)
+    else:
+        operacao = lambda chave: buscarEInserir(arvore, chave)
+    inicio = time.perf_counter()
+    for chave in fluxo:
+        operacao(chave)
+    duracao = time.perf_counter() - inicio
+    return len(fluxo) / duracao, metricas.divisoes, len(arvore)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--operacoes", type=int, default=200_000)
+    parser.add_argument("--universos", type=int, nargs="+", default=[1_000, 20_000, 200_000])
+    parser.add_argument("--ordem", type=int, default=16)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    linhas = []
+    for universo in args.universos:
+        fluxo = [aleatorio.randrange(universo) for _ in range(args.operacoes)]
+        repetidas = 1 - len(set(fluxo)) / len(fluxo)
+        base = None
+        for modo in ("buscar + inserir", "put", "inserir_se_ausente"):
+            vazao, divisoes, tamanho = medir(args.ordem, fluxo, modo)
+            if base is None:
+                base = vazao
+            linhas.append([universo, f"{repetidas:.0%}", modo, vazao, divisoes, tamanho, f"{vazao / base:.2f}x"])
+
+    imprimirTabela(["universo", "repetidas", "modo", "ops/s", "divisões", "chaves", "relativo"], linhas)
+
+
+if __name__ == "__main__":
+    main()
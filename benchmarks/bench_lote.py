@@ -0,0 +1,49 @@
+"""
+Compara `buscar_muitos` e `inserir_muitos` com laços que chamam `buscar` e `put` para
+cada chave do lote, para diferentes tamanhos de lote.
+"""
+import argparse
+import random
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+
+def cronometrar(funcao) -> float:
+    """
+    Executa a função uma vez e retorna a duração em segundos.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000, help="Chaves já presentes na árvore.")
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    linhas = []
+    for tamanho in args.lotes:
+        lote = [aleatorio.randrange(4 * args.chaves) for _ in range(tamanho)]
+
+        arvore = ArvoreB.from_sorted(range(0, 4 * args.chaves, 4), args.ordem)
+        laco = cronometrar(lambda: [arvore.buscar(chave) for chave in lote])
+        em_lote = cronometrar(lambda: arvore.buscar_muitos(lote))
+        linhas.append(["buscar", tamanho, tamanho / laco, tamanho / em_lote, f"{laco / em_lote:.2f}x"])
+
+        por_chave = ArvoreB.from_sorted(range(0, 4 * args.chaves, 4), args.ordem)
+        laco = cronometrar(lambda: [por_chave.put(chave) for chave in lote])
+        arvore = ArvoreB.from_sorted(range(0, 4 * args.chaves, 4), args.ordem)
+        em_lote = cronometrar(lambda: arvore.inserir_muitos(lote))
+        linhas.append(["inserir", tamanho, tamanho / laco, tamanho / em_lote, f"{laco / em_lote:.2f}x"])
+
+    imprimirTabela(["operação", "lote", "por chave (op/s)", "em lote (op/s)", "ganho"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compara, com o tracemalloc, os bytes por chave da representação padrão dos nós
+(`NoArvoreB`) e da representação compacta (`NoArvoreBCompacto`).
+"""
+import argparse
+import random
+import tracemalloc
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+
+def medirBytesPorChave(chaves: int, ordem: int, compacto: bool, aleatoria: bool) -> float:
+    """
+    Constrói uma árvore e mede quantos bytes ela ocupa por chave.
+
+    Argumentos:
+        chaves (int): O número de chaves inseridas.
+        ordem (int): A ordem da árvore.
+        compacto (bool): Se a árvore usa a representação compacta.
+        aleatoria (bool): Se verdadeiro, insere as chaves em ordem aleatória com `inserir`;
+                          caso contrário, usa a carga em lote.
+
+    Retorna:
+        float: A memória alocada pela árvore dividida pelo número de chaves.
+    """
+    # Chaves acima do cache de inteiros pequenos, para que a lista padrão pague o objeto int.
+    valores = list(range(1_000, 1_000 + chaves))
+    if aleatoria:
+        random.Random(42).shuffle(valores)
+
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    if aleatoria:
+        arvore = ArvoreB(ordem, compacto=compacto)
+        for chave in valores:
+            arvore.put(chave)
+    else:
+        arvore = ArvoreB.from_sorted(iter(valores), ordem, compacto=compacto)
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # A lista de entrada foi alocada antes da medição; as chaves do layout padrão
+    # compartilham esses objetos int, então o custo deles é somado à parte.
+    bytes_arvore = depois - antes
+    if not compacto:
+        bytes_arvore += sum(chave.__sizeof__() for chave in valores)
+    return bytes_arvore / chaves
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--ordens", type=int, nargs="+", default=[16, 64, 256])
+    args = parser.parse_args()
+
+    linhas = []
+    for ordem in args.ordens:
+        for aleatoria in (False, True):
+            padrao = medirBytesPorChave(args.chaves, ordem, False, aleatoria)
+            compacto = medirBytesPorChave(args.chaves, ordem, True, aleatoria)
+            construcao = "inserir aleatório" if aleatoria else "carga em lote"
+            linhas.append([ordem, construcao, f"{padrao:.1f}", f"{compacto:.1f}", f"{padrao / compacto:.2f}x"])
+
+    print(f"Bytes por chave, {args.chaves} chaves:")
+    imprimirTabela(["ordem", "construção", "padrão", "compacto", "redução"], linhas)
+
+
+if __name__ == "__main__":
+    main()
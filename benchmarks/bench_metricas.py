@@ -0,0 +1,53 @@
+"""
+Mede o custo das métricas: a vazão de buscas, inserções e remoções em uma árvore sem
+métricas, com as métricas ativadas e com um ouvinte assinado, e depois de desativá-las.
+"""
+import argparse
+import random
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela, medirVazao
+
+
+def prepararArvore(chaves: int, ordem: int, modo: str) -> ArvoreB:
+    """
+    Constrói a árvore com as chaves pares e configura as métricas conforme o modo.
+    """
+    arvore = ArvoreB.from_sorted(range(0, 2 * chaves, 2), ordem)
+    if modo != "sem métricas":
+        metricas = arvore.ativarMetricas()
+        if modo == "com ouvinte":
+            eventos = []
+            metricas.assinar(lambda tipo, nome, valor: eventos.append(valor))
+        elif modo == "desativadas":
+            arvore.desativarMetricas()
+    return arvore
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--operacoes", type=int, default=100_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    consultas = [aleatorio.randrange(2 * args.chaves) for _ in range(args.operacoes)]
+    novas = [2 * aleatorio.randrange(args.chaves) + 1 for _ in range(args.operacoes)]
+
+    linhas = []
+    base = None
+    for modo in ("sem métricas", "ativadas", "com ouvinte", "desativadas"):
+        arvore = prepararArvore(args.chaves, args.ordem, modo)
+        buscas = medirVazao(arvore.buscar, consultas)
+        insercoes = medirVazao(arvore.put, novas, repeticoes=1)
+        remocoes = medirVazao(lambda chave: arvore.pop(chave, None), novas, repeticoes=1)
+        if base is None:
+            base = buscas
+        linhas.append([modo, buscas, insercoes, remocoes, f"{buscas / base:.2f}x"])
+
+    imprimirTabela(["métricas", "buscas/s", "inserções/s", "remoções/s", "buscas (relativo)"], linhas)
+
+
+if __name__ == "__main__":
+    main()
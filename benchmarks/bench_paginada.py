@@ -0,0 +1,49 @@
+"""
+Mede buscas aleatórias na Árvore B paginada com o cache de nós frio (logo após abrir o
+arquivo) e quente (repetindo as mesmas buscas), para diferentes capacidades de cache.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from arvoreBPaginada import ArvoreBPaginada
+from benchmarks.comum import imprimirTabela
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=200_000)
+    parser.add_argument("--buscas", type=int, default=20_000)
+    parser.add_argument("--ordem", type=int, default=64)
+    parser.add_argument("--caches", type=int, nargs="+", default=[16, 256, 100_000])
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    consultas = [aleatorio.randrange(args.chaves) for _ in range(args.buscas)]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "arvore.arvb")
+        with ArvoreBPaginada(caminho, ordem=args.ordem) as arvore:
+            for chave in range(args.chaves):
+                arvore.put(chave)
+        print(f"Arquivo com {args.chaves} chaves: {os.path.getsize(caminho) / 1e6:.1f} MB")
+
+        linhas = []
+        for capacidade in args.caches:
+            with ArvoreBPaginada(caminho, capacidade_cache=capacidade) as arvore:
+                for rodada in ("frio", "quente"):
+                    faltas = arvore.armazenamento.faltas
+                    inicio = time.perf_counter()
+                    for chave in consultas:
+                        arvore.buscar(chave)
+                    duracao = time.perf_counter() - inicio
+                    paginas_lidas = (arvore.armazenamento.faltas - faltas) / args.buscas
+                    linhas.append([capacidade, rodada, args.buscas / duracao, f"{paginas_lidas:.2f}"])
+
+    imprimirTabela(["cache (nós)", "cache", "buscas/s", "páginas lidas/busca"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compara a construção de um índice a partir de chaves fora de ordem em uma única árvore
+(inserindo chave por chave com `inserir` e com `from_unsorted`) com a construção
+particionada (`ArvoreBParticionada.construir`), no próprio processo e em um pool com
+vários processos, e mede a vazão de buscas em cada resultado e o custo de costurar as
+partições em uma única árvore. O ganho do pool depende do número de núcleos da máquina.
+Execute com ARVOREB_CONTRATOS=0 para não medir as verificações dos contratos.
+"""
+import argparse
+import os
+import random
+import time
+
+from arvoreB import ArvoreB
+from arvoreBParticionada import ArvoreBParticionada
+from benchmarks.comum import imprimirTabela, medirVazao
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=1_000_000)
+    parser.add_argument("--ordem", type=int, default=64)
+    parser.add_argument("--particoes", type=int, default=8)
+    parser.add_argument("--processos", type=int, nargs="+",
+                        default=sorted({1, 2, 4, os.cpu_count() or 1}))
+    parser.add_argument("--compacto", action="store_true", help="Usa os nós compactos.")
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    chaves = aleatorio.sample(range(10 * args.chaves), args.chaves)
+    consultas = aleatorio.sample(chaves, min(len(chaves), 100_000))
+    print(f"{os.cpu_count()} CPUs; {args.chaves:,} chaves fora de ordem, {args.particoes} partições")
+
+    linhas = []
+    inicio = time.perf_counter()
+    arvore = ArvoreB(args.ordem, compacto=args.compacto)
+    for chave in chaves:
+        arvore.inserir(chave)
+    linhas.append(["única, inserir", "-", time.perf_counter() - inicio, "-", medirVazao(arvore.buscar, consultas)])
+
+    inicio = time.perf_counter()
+    arvore = ArvoreB.from_unsorted(chaves, args.ordem, compacto=args.compacto)
+    linhas.append(["única, from_unsorted", "-", time.perf_counter() - inicio, "-",
+                   medirVazao(arvore.buscar, consultas)])
+    del arvore
+
+    for processos in args.processos:
+        inicio = time.perf_counter()
+        particionada = ArvoreBParticionada.construir(chaves, args.ordem, args.particoes, compacto=args.compacto,
+                                                     processos=processos)
+        construcao = time.perf_counter() - inicio
+        buscas = medirVazao(particionada.buscar, consultas)
+        inicio = time.perf_counter()
+        particionada.costurar()
+        costura = time.perf_counter() - inicio
+        linhas.append(["particionada", processos, construcao, f"{costura * 1e3:.1f}", buscas])
+
+    imprimirTabela(["construção", "processos", "tempo (s)", "costura (ms)", "buscas/s"],
+                   [[nome, processos, f"{tempo:.2f}", costura, buscas]
+                    for nome, processos, tempo, costura, buscas in linhas])
+
+
+if __name__ == "__main__":
+    main()
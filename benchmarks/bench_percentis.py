@@ -0,0 +1,67 @@
+"""
+Compara consultas de percentis e contagens em árvores grandes feitas com as estatísticas
+de ordem (`select`, `rank`, `count_range`) e com a alternativa sem elas, que percorre as
+chaves em ordem até a posição desejada.
+"""
+import argparse
+import itertools
+import random
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+PERCENTIS = [0.5, 0.9, 0.99, 0.999]
+
+
+def cronometrar(funcao, repeticoes: int) -> float:
+    """
+    Executa a função `repeticoes` vezes e retorna a duração média, em segundos.
+    """
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao()
+    return (time.perf_counter() - inicio) / repeticoes
+
+
+def percentisPercorrendo(arvore: ArvoreB):
+    """
+    Obtém os percentis percorrendo as chaves em ordem até cada posição.
+    """
+    return [next(itertools.islice(iter(arvore), int(p * (len(arvore) - 1)), None)) for p in PERCENTIS]
+
+
+def percentisComSelect(arvore: ArvoreB):
+    """
+    Obtém os percentis com `select`, descendo apenas até cada posição.
+    """
+    return [arvore.select(int(p * (len(arvore) - 1))) for p in PERCENTIS]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    linhas = []
+    for tamanho in args.tamanhos:
+        arvore = ArvoreB.from_unsorted(random.Random(tamanho).sample(range(10 * tamanho), tamanho), args.ordem)
+        assert percentisComSelect(arvore) == percentisPercorrendo(arvore)
+
+        percorrendo = cronometrar(lambda: percentisPercorrendo(arvore), 3)
+        com_select = cronometrar(lambda: percentisComSelect(arvore), 1_000)
+        linhas.append(["percentis", tamanho, f"{percorrendo * 1e6:,.0f}", f"{com_select * 1e6:,.1f}",
+                       f"{percorrendo / com_select:,.0f}x"])
+
+        inicio, fim = 2 * tamanho, 8 * tamanho
+        percorrendo = cronometrar(lambda: sum(1 for _ in arvore.intervalo(inicio, fim)), 3)
+        com_rank = cronometrar(lambda: arvore.count_range(inicio, fim), 1_000)
+        linhas.append(["count_range", tamanho, f"{percorrendo * 1e6:,.0f}", f"{com_rank * 1e6:,.1f}",
+                       f"{percorrendo / com_rank:,.0f}x"])
+
+    imprimirTabela(["consulta", "chaves", "percorrendo (µs)", "estatísticas (µs)", "ganho"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Mede o custo do registro de escrita por operação, para diferentes tamanhos de grupo de
+`fsync`, e o tempo de recuperação a partir do registro, de um instantâneo com uma cauda
+do registro e da reconstrução completa com `inserir`.
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from arvoreB import ArvoreB
+from arvoreBRegistrada import ArvoreBRegistrada
+from benchmarks.comum import imprimirTabela
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=100_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    parser.add_argument("--grupos", type=int, nargs="+", default=[1, 64, 1024])
+    args = parser.parse_args()
+
+    chaves = random.Random(42).sample(range(10 * args.chaves), args.chaves)
+
+    inicio = time.perf_counter()
+    arvore = ArvoreB(args.ordem)
+    for chave in chaves:
+        arvore.put(chave, chave)
+    base = (time.perf_counter() - inicio) / args.chaves * 1e6
+
+    linhas = [["sem registro", f"{base:.2f}", "-"]]
+    with tempfile.TemporaryDirectory() as raiz:
+        for grupo in args.grupos:
+            # Com fsync a cada operação, mede uma amostra menor.
+            amostra = chaves if grupo > 1 else chaves[:2_000]
+            diretorio = os.path.join(raiz, f"grupo-{grupo}")
+            with ArvoreBRegistrada(diretorio, args.ordem, tamanho_grupo=grupo, intervalo_sincronizacao=3_600) as registrada:
+                inicio = time.perf_counter()
+                for chave in amostra:
+                    registrada.put(chave, chave)
+                registrada.sincronizar()
+                por_operacao = (time.perf_counter() - inicio) / len(amostra) * 1e6
+            linhas.append([f"grupo de {grupo}", f"{por_operacao:.2f}", f"{por_operacao / base:.2f}x"])
+
+        print(f"Custo por put (µs), {args.chaves} chaves:")
+        imprimirTabela(["registro", "µs/op", "relativo"], linhas)
+
+        # Recuperação: registro completo versus instantâneo com 1% das operações na cauda.
+        so_registro = os.path.join(raiz, f"grupo-{max(args.grupos)}")
+        com_instantaneo = os.path.join(raiz, "instantaneo")
+        with ArvoreBRegistrada(com_instantaneo, args.ordem, tamanho_grupo=1_024) as registrada:
+            cauda = len(chaves) // 100
+            registrada.inserir_muitos(chaves[:-cauda], chaves[:-cauda])
+            registrada.instantaneo()
+            for chave in chaves[-cauda:]:
+                registrada.put(chave, chave)
+
+        linhas = []
+        for nome, diretorio in (("registro completo", so_registro), ("instantâneo + cauda", com_instantaneo)):
+            inicio = time.perf_counter()
+            ArvoreBRegistrada(diretorio, args.ordem).close()
+            linhas.append([nome, f"{time.perf_counter() - inicio:.3f}"])
+
+        inicio = time.perf_counter()
+        reconstruida = ArvoreB(args.ordem)
+        for chave in chaves:
+            reconstruida.inserir(chave, chave)
+        linhas.append(["reconstrução com inserir", f"{time.perf_counter() - inicio:.3f}"])
+
+    print(f"\nTempo de recuperação (s), {args.chaves} chaves:")
+    imprimirTabela(["recuperação", "segundos"], linhas)
+
+
+if __name__ == "__main__":
+    main()
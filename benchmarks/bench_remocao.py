@@ -0,0 +1,57 @@
+"""
+Compara a remoção chave por chave (`pop`) com `remover_intervalo`, para blocos contíguos,
+e com `remover_muitos`, para lotes espalhados e lotes em trechos consecutivos.
+"""
+import argparse
+import random
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+
+def cronometrar(funcao) -> float:
+    """
+    Executa a função uma vez e retorna a duração em segundos.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=500_000, help="Chaves presentes na árvore.")
+    parser.add_argument("--fracoes", type=float, nargs="+", default=[0.01, 0.1, 0.5],
+                        help="Fração das chaves removidas em cada medição.")
+    parser.add_argument("--ordem", type=int, default=32)
+    args = parser.parse_args()
+
+    aleatorio = random.Random(42)
+    linhas = []
+    for fracao in args.fracoes:
+        quantidade = int(fracao * args.chaves)
+        inicio = aleatorio.randrange(args.chaves - quantidade)
+        bloco = list(range(inicio, inicio + quantidade))
+        espalhado = aleatorio.sample(range(args.chaves), quantidade)
+        # Trechos de 100 chaves consecutivas, em posições aleatórias.
+        trechos = sorted({aleatorio.randrange(args.chaves // 100) for _ in range(quantidade // 100)})
+        em_trechos = [100 * trecho + deslocamento for trecho in trechos for deslocamento in range(100)]
+
+        for nome, lote, em_lote in (
+                ("bloco contíguo", bloco, lambda arvore: arvore.remover_intervalo(bloco[0], bloco[-1] + 1)),
+                ("trechos de 100", em_trechos, lambda arvore: arvore.remover_muitos(em_trechos)),
+                ("espalhado", espalhado, lambda arvore: arvore.remover_muitos(espalhado))):
+            arvore = ArvoreB.from_sorted(range(args.chaves), args.ordem)
+            por_chave = cronometrar(lambda: [arvore.pop(chave, None) for chave in lote])
+            arvore = ArvoreB.from_sorted(range(args.chaves), args.ordem)
+            de_uma_vez = cronometrar(lambda: em_lote(arvore))
+            assert len(arvore) == args.chaves - len(lote)
+            linhas.append([nome, len(lote), len(lote) / por_chave, len(lote) / de_uma_vez,
+                           f"{por_chave / de_uma_vez:.2f}x"])
+
+    imprimirTabela(["remoção", "chaves", "pop (chaves/s)", "em lote (chaves/s)", "ganho"], linhas)
+
+
+if __name__ == "__main__":
+    main()
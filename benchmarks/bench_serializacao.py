@@ -0,0 +1,65 @@
+"""
+Compara a gravação e a carga de uma árvore com `dump`/`load` e com o pickle dos objetos
+`NoArvoreB`, em tempo e em tamanho do arquivo, e com a reconstrução por `from_sorted`.
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+
+
+def cronometrar(funcao) -> float:
+    """
+    Executa a função uma vez e retorna a duração em segundos.
+    """
+    inicio = time.perf_counter()
+    funcao()
+    return time.perf_counter() - inicio
+
+
+def gravarComPickle(arvore: ArvoreB, caminho: str) -> None:
+    with open(caminho, "wb") as arquivo:
+        pickle.dump(arvore, arquivo, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def carregarComPickle(caminho: str) -> ArvoreB:
+    with open(caminho, "rb") as arquivo:
+        return pickle.load(arquivo)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--ordem", type=int, default=64)
+    args = parser.parse_args()
+
+    linhas = []
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "arvore")
+        for tamanho in args.tamanhos:
+            for compacto in (False, True):
+                arvore = ArvoreB.from_sorted(range(0, 3 * tamanho, 3), args.ordem, compacto=compacto)
+                representacao = "compacta" if compacto else "padrão"
+
+                gravacao = cronometrar(lambda: arvore.dump(caminho))
+                carga = cronometrar(lambda: ArvoreB.load(caminho))
+                linhas.append(["dump/load", representacao, tamanho, f"{gravacao * 1e3:,.0f}", f"{carga * 1e3:,.0f}",
+                               f"{os.path.getsize(caminho) / tamanho:.1f}"])
+
+                gravacao = cronometrar(lambda: gravarComPickle(arvore, caminho))
+                carga = cronometrar(lambda: carregarComPickle(caminho))
+                linhas.append(["pickle", representacao, tamanho, f"{gravacao * 1e3:,.0f}", f"{carga * 1e3:,.0f}",
+                               f"{os.path.getsize(caminho) / tamanho:.1f}"])
+
+                carga = cronometrar(lambda: ArvoreB.from_sorted(range(0, 3 * tamanho, 3), args.ordem, compacto=compacto))
+                linhas.append(["from_sorted", representacao, tamanho, "-", f"{carga * 1e3:,.0f}", "-"])
+
+    imprimirTabela(["formato", "nós", "chaves", "gravação (ms)", "carga (ms)", "bytes/chave"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Gera carga contra um `ServidorArvoreB` local, executado em outro processo, e mede a vazão
+e a latência vistas pelos clientes com e sem o agrupamento dos pedidos em lotes
+(`lote_maximo` 1 e 256), variando quantas corrotinas fazem pedidos ao mesmo tempo. Cada
+corrotina espera a resposta de um pedido antes de fazer o próximo, e o cliente envia os
+pedidos das várias corrotinas pelas mesmas conexões, sem esperar as respostas (pipelining).
+Informa também o tamanho médio dos lotes executados pelo servidor. Execute com
+ARVOREB_CONTRATOS=0 para não medir as verificações dos contratos.
+"""
+import argparse
+import asyncio
+import multiprocessing
+import random
+import time
+from typing import List, Tuple
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+from cliente import ClienteArvoreB
+from servidor import ServidorArvoreB
+
+
+def executarServidor(chaves: int, ordem: int, lote_maximo: int, saida) -> None:
+    """
+    Processo do servidor: preenche a árvore, envia o endereço pela `saida` e atende até ser
+    encerrado.
+    """
+    async def atender():
+        arvore = ArvoreB(ordem)
+        arvore.inserir_muitos(range(0, 2 * chaves, 2))
+        servidor = ServidorArvoreB(arvore, lote_maximo=lote_maximo)
+        await servidor.iniciar()
+        saida.send(servidor.endereco)
+        await asyncio.Event().wait()
+
+    asyncio.run(atender())
+
+
+async def gerarCarga(endereco: Tuple[str, int], chaves: int, concorrencia: int, pedidos: int,
+                     escritas: float, conexoes: int) -> Tuple[float, List[float], float]:
+    """
+    Faz `pedidos` buscas e inserções de chaves aleatórias, divididos entre `concorrencia`
+    corrotinas.
+
+    Retorna:
+        Tuple[float, List[float], float]: A vazão, as latências ordenadas (em segundos) e o
+                                          tamanho médio dos lotes do servidor.
+    """
+    latencias: List[float] = []
+
+    async def trabalhar(cliente: ClienteArvoreB, semente: int, quantidade: int) -> None:
+        aleatorio = random.Random(semente)
+        for _ in range(quantidade):
+            chave = aleatorio.randrange(2 * chaves)
+            inicio = time.perf_counter()
+            if aleatorio.random() < escritas:
+                await cliente.put(chave, None)
+            else:
+                await cliente.buscar(chave)
+            latencias.append(time.perf_counter() - inicio)
+
+    async with await ClienteArvoreB.conectar(*endereco, conexoes=conexoes) as cliente:
+        antes = await cliente.estatisticas()
+        inicio = time.perf_counter()
+        await asyncio.gather(*(trabalhar(cliente, semente, pedidos // concorrencia)
+                               for semente in range(concorrencia)))
+        duracao = time.perf_counter() - inicio
+        depois = await cliente.estatisticas()
+
+    # Desconta o pedido de estatísticas, executado sozinho em um lote.
+    lote_medio = (depois["pedidos"] - antes["pedidos"] - 1) / max(depois["lotes"] - antes["lotes"] - 1, 1)
+    latencias.sort()
+    return len(latencias) / duracao, latencias, lote_medio
+
+
+def percentil(ordenadas: List[float], p: float) -> float:
+    return ordenadas[min(int(p / 100 * len(ordenadas)), len(ordenadas) - 1)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--chaves", type=int, default=100_000)
+    parser.add_argument("--pedidos", type=int, default=50_000)
+    parser.add_argument("--ordem", type=int, default=32)
+    parser.add_argument("--escritas", type=float, default=0.2, help="Fração de inserções.")
+    parser.add_argument("--conexoes", type=int, default=4)
+    parser.add_argument("--concorrencia", type=int, nargs="+", default=[1, 16, 128, 512])
+    parser.add_argument("--lotes", type=int, nargs="+", default=[1, 256])
+    args = parser.parse_args()
+
+    linhas = []
+    for lote_maximo in args.lotes:
+        receber, enviar = multiprocessing.Pipe(duplex=False)
+        processo = multiprocessing.Process(target=executarServidor,
+                                           args=(args.chaves, args.ordem, lote_maximo, enviar), daemon=True)
+        processo.start()
+        try:
+            endereco = tuple(receber.recv())
+            for concorrencia in args.concorrencia:
+                vazao, latencias, lote_medio = asyncio.run(gerarCarga(
+                    endereco, args.chaves, concorrencia, args.pedidos, args.escritas, args.conexoes))
+                linhas.append([lote_maximo, concorrencia, vazao, f"{percentil(latencias, 50) * 1e6:,.0f}",
+                               f"{percentil(latencias, 99) * 1e6:,.0f}", f"{lote_medio:.1f}"])
+        finally:
+            processo.terminate()
+            processo.join()
+
+    imprimirTabela(["lote_maximo", "concorrência", "pedidos/s", "p50 (µs)", "p99 (µs)", "lote médio"], linhas)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import time
+from typing import Callable, List
+
+
+def medirVazao(operacao: Callable[[int], object], chaves: List[int], repeticoes: int = 3) -> float:
+    """
+    Mede a vazão de uma operação aplicada a cada chave da lista.
+
+    Argumentos:
+        operacao (Callable[[int], object]): A operação a ser medida, chamada uma vez por chave.
+        chaves (List[int]): As chaves usadas como argumento da operação.
+        repeticoes (int): Quantas vezes a medição é repetida; vale a melhor.
+
+    Retorna:
+        float: O número de operações por segundo da melhor repetição.
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for chave in chaves:
+            operacao(chave)
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return len(chaves) / melhor
+
+
+def imprimirTabela(cabecalho: List[str], linhas: List[List[object]]) -> None:
+    """
+    Imprime os resultados de um benchmark como uma tabela alinhada.
+
+    Argumentos:
+        cabecalho (List[str]): Os títulos das colunas.
+        linhas (List[List[object]]): Os valores de cada linha.
+    """
+    textos = [[f"{valor:,.0f}" if isinstance(valor, float) else str(valor) for valor in linha] for linha in linhas]
+    larguras = [max(len(str(coluna)), *(len(linha[i]) for linha in textos)) for i, coluna in enumerate(cabecalho)]
+    print("  ".join(str(coluna).rjust(largura) for coluna, largura in zip(cabecalho, larguras)))
+    for linha in textos:
+        print("  ".join(valor.rjust(largura) for valor, largura in zip(linha, larguras)))
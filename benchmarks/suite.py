@@ -0,0 +1,280 @@
+"""
+Suíte reprodutível de benchmarks da `ArvoreB`.
+
+Mede inserções, buscas, remoções e uma carga mista, com chaves sequenciais, aleatórias ou
+com distribuição de Zipf (poucas chaves muito acessadas), para cada ordem pedida. Para cada
+combinação são registrados a vazão (operações por segundo), os percentis da latência de
+cada operação e o pico de memória alocada. Os resultados podem ser gravados em JSON e
+comparados com os de uma execução anterior, para detectar regressões:
+
+    python3 -m benchmarks.suite --saida atual.json
+    python3 -m benchmarks.suite --comparar atual.json --saida nova.json
+
+A vazão, as latências e a memória são medidas em passadas separadas, sobre árvores
+idênticas, para que o cronômetro de cada operação e o tracemalloc não distorçam a vazão.
+"""
+import argparse
+import bisect
+import itertools
+import json
+import platform
+import random
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from arvoreB import ArvoreB
+from benchmarks.comum import imprimirTabela
+from contratos import CONTRATOS_HABILITADOS
+
+CARGAS = ["inserir", "buscar", "remover", "misto"]
+DISTRIBUICOES = ["sequencial", "aleatoria", "zipf"]
+PERCENTIS = [50, 90, 99, 99.9]
+
+# Proporções da carga mista: buscas, inserções e remoções.
+_PROPORCOES_MISTO = [("buscar", 0.5), ("inserir", 0.25), ("remover", 0.25)]
+
+
+def gerarZipf(quantidade: int, universo: int, expoente: float, aleatorio: random.Random) -> List[int]:
+    """
+    Sorteia chaves de `range(universo)` com distribuição de Zipf: a chave de posição k na
+    popularidade é sorteada com probabilidade proporcional a 1 / k**expoente.
+
+    As posições de popularidade são associadas às chaves por uma permutação aleatória, de
+    modo que as chaves mais acessadas ficam espalhadas pela árvore, e não todas juntas no
+    começo dela.
+
+    Argumentos:
+        quantidade (int): O número de chaves sorteadas.
+        universo (int): O número de chaves distintas possíveis.
+        expoente (float): A concentração da distribuição; 0 equivale à distribuição uniforme.
+        aleatorio (random.Random): O gerador, para que a sequência seja reprodutível.
+
+    Retorna:
+        List[int]: As chaves sorteadas, possivelmente repetidas.
+    """
+    acumulados = list(itertools.accumulate(1 / posicao ** expoente for posicao in range(1, universo + 1)))
+    chaves = list(range(universo))
+    aleatorio.shuffle(chaves)
+    return aleatorio.choices(chaves, cum_weights=acumulados, k=quantidade)
+
+
+def gerarChaves(distribuicao: str, quantidade: int, universo: int, expoente: float,
+                aleatorio: random.Random) -> List[int]:
+    """
+    Gera as chaves das operações de uma carga.
+
+    Argumentos:
+        distribuicao (str): "sequencial", "aleatoria" ou "zipf".
+        quantidade (int): O número de chaves geradas.
+        universo (int): As chaves geradas estão em `range(universo)`.
+        expoente (float): O expoente da distribuição de Zipf.
+        aleatorio (random.Random): O gerador, para que a sequência seja reprodutível.
+
+    Retorna:
+        List[int]: As chaves, na ordem em que as operações serão executadas.
+    """
+    if distribuicao == "sequencial":
+        inicio = aleatorio.randrange(universo)
+        return [(inicio + i) % universo for i in range(quantidade)]
+    if distribuicao == "aleatoria":
+        return [aleatorio.randrange(universo) for _ in range(quantidade)]
+    if distribuicao == "zipf":
+        return gerarZipf(quantidade, universo, expoente, aleatorio)
+    raise ValueError(f"Distribuição desconhecida: {distribuicao!r}")
+
+
+def prepararCarga(carga: str, distribuicao: str, args: argparse.Namespace,
+                  aleatorio: random.Random) -> Tuple[range, List[Tuple[str, int]]]:
+    """
+    Prepara o estado inicial da árvore e a sequência de operações de uma carga.
+
+    A árvore começa com as chaves pares do universo (metade dele), de modo que buscas e
+    remoções encontram a chave em cerca de metade das vezes. Na carga de inserção, a árvore
+    começa vazia.
+
+    Retorna:
+        Tuple[range, List[Tuple[str, int]]]: As chaves iniciais, em ordem crescente, e as
+                                             operações, como pares (operação, chave).
+    """
+    universo = 2 * args.chaves
+    chaves = gerarChaves(distribuicao, args.operacoes, universo, args.expoente_zipf, aleatorio)
+    if carga == "misto":
+        nomes, pesos = zip(*_PROPORCOES_MISTO)
+        operacoes = list(zip(aleatorio.choices(nomes, weights=pesos, k=len(chaves)), chaves))
+    else:
+        operacoes = [(carga, chave) for chave in chaves]
+    iniciais = range(0) if carga == "inserir" else range(0, universo, 2)
+    return iniciais, operacoes
+
+
+def _funcoes(arvore: ArvoreB) -> Dict[str, Callable[[int], Any]]:
+    """
+    Associa o nome de cada operação ao método da árvore que a executa.
+    """
+    return {"inserir": arvore.put, "buscar": arvore.buscar, "remover": lambda chave: arvore.pop(chave, None)}
+
+
+def medirVazao(arvore: ArvoreB, operacoes: List[Tuple[str, int]]) -> float:
+    """
+    Executa as operações e retorna quantas foram executadas por segundo.
+    """
+    funcoes = _funcoes(arvore)
+    chamadas = [(funcoes[nome], chave) for nome, chave in operacoes]
+    inicio = time.perf_counter()
+    for funcao, chave in chamadas:
+        funcao(chave)
+    return len(chamadas) / (time.perf_counter() - inicio)
+
+
+def medirLatencias(arvore: ArvoreB, operacoes: List[Tuple[str, int]]) -> Dict[str, float]:
+    """
+    Executa as operações cronometrando cada uma e retorna os percentis da latência, em
+    nanossegundos. A medida inclui o custo da leitura do relógio.
+    """
+    funcoes = _funcoes(arvore)
+    chamadas = [(funcoes[nome], chave) for nome, chave in operacoes]
+    latencias = []
+    relogio = time.perf_counter_ns
+    for funcao, chave in chamadas:
+        inicio = relogio()
+        funcao(chave)
+        latencias.append(relogio() - inicio)
+    latencias.sort()
+    return {f"p{percentil:g}": latencias[min(len(latencias) - 1, int(percentil / 100 * len(latencias)))]
+            for percentil in PERCENTIS}
+
+
+def medirPicoMemoria(construir: Callable[[], ArvoreB], operacoes: List[Tuple[str, int]]) -> int:
+    """
+    Constrói a árvore e executa as operações sob o tracemalloc, retornando o pico de bytes
+    alocados, que inclui a própria árvore.
+    """
+    tracemalloc.start()
+    try:
+        arvore = construir()
+        funcoes = _funcoes(arvore)
+        for nome, chave in operacoes:
+            funcoes[nome](chave)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def executarSuite(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    """
+    Executa todas as combinações de carga, distribuição e ordem pedidas.
+
+    Retorna:
+        List[Dict[str, Any]]: Um resultado por combinação, na ordem em que foram medidas.
+    """
+    resultados = []
+    for ordem in args.ordens:
+        for distribuicao in args.distribuicoes:
+            for carga in args.cargas:
+                # Cada combinação tem a sua semente, para que o resultado não dependa
+                # de quais outras combinações foram escolhidas.
+                aleatorio = random.Random(f"{args.semente}-{carga}-{distribuicao}")
+                iniciais, operacoes = prepararCarga(carga, distribuicao, args, aleatorio)
+
+                def construir() -> ArvoreB:
+                    return ArvoreB.from_sorted(iniciais, ordem, compacto=args.compacto)
+
+                vazao = max(medirVazao(construir(), operacoes) for _ in range(args.repeticoes))
+                resultados.append({
+                    "carga": carga,
+                    "distribuicao": distribuicao,
+                    "ordem": ordem,
+                    "operacoes": len(operacoes),
+                    "chaves_iniciais": len(iniciais),
+                    "ops_por_segundo": vazao,
+                    "latencia_ns": medirLatencias(construir(), operacoes),
+                    "pico_memoria_bytes": medirPicoMemoria(construir, operacoes),
+                })
+    return resultados
+
+
+def _identificador(resultado: Dict[str, Any]) -> Tuple[str, str, int]:
+    return resultado["carga"], resultado["distribuicao"], resultado["ordem"]
+
+
+def compararResultados(anteriores: List[Dict[str, Any]], atuais: List[Dict[str, Any]],
+                       tolerancia: float) -> List[List[Any]]:
+    """
+    Compara a vazão de cada combinação com a de uma execução anterior.
+
+    Argumentos:
+        anteriores (List[Dict[str, Any]]): Os resultados da execução de referência.
+        atuais (List[Dict[str, Any]]): Os resultados da execução atual.
+        tolerancia (float): A queda relativa de vazão aceita antes de apontar uma regressão.
+
+    Retorna:
+        List[List[Any]]: Uma linha por combinação presente nas duas execuções: carga,
+                         distribuição, ordem, vazão anterior, vazão atual, razão e situação.
+    """
+    por_identificador = {_identificador(resultado): resultado for resultado in anteriores}
+    linhas = []
+    for atual in atuais:
+        anterior = por_identificador.get(_identificador(atual))
+        if anterior is None:
+            continue
+        razao = atual["ops_por_segundo"] / anterior["ops_por_segundo"]
+        situacao = "REGRESSÃO" if razao < 1 - tolerancia else "ok"
+        linhas.append([*_identificador(atual), anterior["ops_por_segundo"], atual["ops_por_segundo"],
+                       f"{razao:.2f}x", situacao])
+    return linhas
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chaves", type=int, default=100_000, help="Chaves iniciais das cargas com árvore pré-carregada.")
+    parser.add_argument("--operacoes", type=int, default=100_000, help="Operações medidas em cada combinação.")
+    parser.add_argument("--ordens", type=int, nargs="+", default=[4, 16, 64, 256])
+    parser.add_argument("--cargas", nargs="+", choices=CARGAS, default=CARGAS)
+    parser.add_argument("--distribuicoes", nargs="+", choices=DISTRIBUICOES, default=DISTRIBUICOES)
+    parser.add_argument("--expoente-zipf", type=float, default=1.1)
+    parser.add_argument("--compacto", action="store_true", help="Usa os nós compactos.")
+    parser.add_argument("--repeticoes", type=int, default=3, help="Passadas de vazão; vale a melhor.")
+    parser.add_argument("--semente", type=int, default=42)
+    parser.add_argument("--saida", help="Arquivo JSON onde os resultados são gravados.")
+    parser.add_argument("--comparar", help="Arquivo JSON de uma execução anterior, para comparação.")
+    parser.add_argument("--tolerancia", type=float, default=0.1,
+                        help="Queda relativa de vazão aceita na comparação (padrão: 10%%).")
+    args = parser.parse_args()
+
+    resultados = executarSuite(args)
+    imprimirTabela(["carga", "distribuição", "ordem", "ops/s", "p50 (ns)", "p99 (ns)", "p99.9 (ns)", "pico (KiB)"],
+                   [[r["carga"], r["distribuicao"], r["ordem"], r["ops_por_segundo"], r["latencia_ns"]["p50"],
+                     r["latencia_ns"]["p99"], r["latencia_ns"]["p99.9"], r["pico_memoria_bytes"] // 1024]
+                    for r in resultados])
+
+    if args.saida:
+        documento = {
+            "metadados": {
+                "data": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+                "python": platform.python_version(),
+                "implementacao": platform.python_implementation(),
+                "plataforma": platform.platform(),
+                "contratos_habilitados": CONTRATOS_HABILITADOS,
+                "parametros": vars(args),
+            },
+            "resultados": resultados,
+        }
+        with open(args.saida, "w", encoding="utf-8") as arquivo:
+            json.dump(documento, arquivo, indent=2, ensure_ascii=False)
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            anteriores = json.load(arquivo)["resultados"]
+        linhas = compararResultados(anteriores, resultados, args.tolerancia)
+        print()
+        imprimirTabela(["carga", "distribuição", "ordem", "antes (ops/s)", "agora (ops/s)", "razão", "situação"],
+                       linhas)
+        if any(linha[-1] != "ok" for linha in linhas):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,301 @@
+import functools
+import struct
+import threading
+from typing import Any, Callable, Iterable, Optional, Sequence
+from noArvoreB import Chave
+
+# Marcador para chaves ausentes, distinto de qualquer valor armazenado (inclusive None).
+_AUSENTE = object()
+
+# Códigos de tipo de `codificarChave`. A ordem dos códigos é a ordem entre os tipos; dentro
+# de um mesmo tipo, a ordem dos bytes codificados é a ordem dos valores.
+_NENHUM = 0x00
+_BYTES = 0x01
+_TEXTO = 0x02
+_TUPLA = 0x05
+_INTEIRO_NEGATIVO_LONGO = 0x0B
+_INTEIRO_ZERO = 0x14
+_INTEIRO_POSITIVO_LONGO = 0x1D
+_REAL = 0x21
+
+# Operações da árvore cujas chaves são traduzidas pela função `key`.
+OPERACOES_COM_CHAVE = ("buscar", "get", "put", "pop", "inserir", "inserir_se_ausente", "remover",
+                       "intervalo", "seek", "rank", "select", "count_range", "buscar_muitos",
+                       "inserir_muitos", "remover_intervalo", "remover_muitos")
+
+
+def codificarChave(chave: Any) -> bytes:
+    """
+    Codifica uma chave em bytes que preservam a ordem: para chaves `a` e `b` do mesmo tipo,
+    `a < b` se e somente se `codificarChave(a) < codificarChave(b)`. Tuplas são comparadas
+    elemento a elemento, como no Python, e uma tupla é menor que as que a estendem.
+
+    Usada como `key` de uma `ArvoreB`, transforma chaves compostas (tuplas de textos,
+    inteiros, bytes...) em `bytes`, de modo que as comparações nos nós passam a ser uma
+    única comparação de memória, em vez de comparações elemento a elemento.
+
+    Argumentos:
+        chave (Any): Um None, inteiro (ou bool), float, str, bytes ou uma tupla desses tipos.
+
+    Retorna:
+        bytes: A chave codificada.
+
+    Exceções:
+        TypeError: Se a chave (ou um elemento dela) for de um tipo não suportado.
+    """
+    codificar = _CODIFICADORES.get(type(chave))
+    if codificar is None:
+        return _codificarSubclasse(chave)
+    return codificar(chave)
+
+
+def _codificarNenhum(chave: None) -> bytes:
+    return _CODIGO_NENHUM
+
+
+def _codificarTexto(chave: str) -> bytes:
+    return _CODIGO_TEXTO + chave.encode("utf-8").replace(b"\x00", b"\x00\xff") + b"\x00"
+
+
+def _codificarBytes(chave: bytes) -> bytes:
+    return _CODIGO_BYTES + bytes(chave).replace(b"\x00", b"\x00\xff") + b"\x00"
+
+
+def _codificarReal(chave: float) -> bytes:
+    bits = _REAL_PARA_BITS(_BITS_PARA_REAL(chave))[0]
+    # Positivos: inverte o bit de sinal; negativos: inverte todos os bits.
+    bits = bits ^ 0xFFFF_FFFF_FFFF_FFFF if bits >> 63 else bits | 1 << 63
+    return _CODIGO_REAL + bits.to_bytes(8, "big")
+
+
+def _codificarTupla(chave: tuple) -> bytes:
+    partes = [_CODIGO_TUPLA]
+    for elemento in chave:
+        if elemento is None:
+            # Dentro de uma tupla, None é seguido de 0xFF para não ser confundido com o fim dela.
+            partes.append(b"\x00\xff")
+        else:
+            codificar = _CODIFICADORES.get(type(elemento))
+            partes.append(_codificarSubclasse(elemento) if codificar is None else codificar(elemento))
+    partes.append(b"\x00")
+    return b"".join(partes)
+
+
+def _codificarSubclasse(chave: Any) -> bytes:
+    """
+    Codifica instâncias de subclasses dos tipos suportados (como `enum.IntEnum`), que não
+    estão na tabela de codificadores.
+    """
+    for tipo, codificar in _CODIFICADORES.items():
+        if tipo is not type(None) and isinstance(chave, tipo):
+            return codificar(chave)
+    raise TypeError(f"Tipo de chave não suportado por codificarChave: {type(chave).__name__}.")
+
+
+def _codificarInteiro(chave: int) -> bytes:
+    """
+    Codifica um inteiro com o código de tipo indicando o sinal e o número de bytes, de modo
+    que inteiros com mais bytes (em valor absoluto) ficam antes (negativos) ou depois
+    (positivos) dos com menos bytes. Negativos são gravados em complemento.
+    """
+    if 0 < chave < 1 << 64:
+        tamanho = (chave.bit_length() + 7) >> 3
+        return _CODIGOS_POSITIVOS[tamanho] + chave.to_bytes(tamanho, "big")
+    if chave == 0:
+        return _CODIGOS_POSITIVOS[0]
+    absoluto = -chave if chave < 0 else chave
+    tamanho = (absoluto.bit_length() + 7) // 8
+    if tamanho > 255:
+        raise ValueError("Inteiro grande demais para codificarChave.")
+    if chave > 0:
+        corpo = absoluto.to_bytes(tamanho, "big")
+        if tamanho <= 8:
+            return bytes((_INTEIRO_ZERO + tamanho,)) + corpo
+        return bytes((_INTEIRO_POSITIVO_LONGO, tamanho)) + corpo
+    corpo = ((1 << 8 * tamanho) - 1 - absoluto).to_bytes(tamanho, "big")
+    if tamanho <= 8:
+        return bytes((_INTEIRO_ZERO - tamanho,)) + corpo
+    return bytes((_INTEIRO_NEGATIVO_LONGO, 255 - tamanho)) + corpo
+
+
+_CODIGO_NENHUM = bytes((_NENHUM,))
+_CODIGO_BYTES = bytes((_BYTES,))
+_CODIGO_TEXTO = bytes((_TEXTO,))
+_CODIGO_TUPLA = bytes((_TUPLA,))
+_CODIGO_REAL = bytes((_REAL,))
+_CODIGOS_POSITIVOS = [bytes((_INTEIRO_ZERO + tamanho,)) for tamanho in range(9)]
+_BITS_PARA_REAL = struct.Struct(">d").pack
+_REAL_PARA_BITS = struct.Struct(">Q").unpack
+
+# O codificador de cada tipo, procurado pelo tipo exato da chave.
+_CODIFICADORES = {
+    type(None): _codificarNenhum,
+    bool: _codificarInteiro,
+    int: _codificarInteiro,
+    str: _codificarTexto,
+    bytes: _codificarBytes,
+    bytearray: _codificarBytes,
+    float: _codificarReal,
+    tuple: _codificarTupla,
+}
+
+
+def empacotarInteiros(larguras: Sequence[int]) -> Callable[[Sequence[int]], int]:
+    """
+    Cria uma função `key` que empacota uma tupla de inteiros não negativos em um único
+    inteiro, cada elemento ocupando o número de bits indicado, com o primeiro nos bits mais
+    significativos. A ordem dos inteiros empacotados é a ordem das tuplas, e as comparações
+    nos nós voltam a ser comparações de inteiros. Se o total for de até 63 bits, a árvore
+    pode usar os nós compactos.
+
+    Argumentos:
+        larguras (Sequence[int]): O número de bits de cada elemento da tupla.
+
+    Retorna:
+        Callable[[Sequence[int]], int]: A função que empacota uma tupla. Ela lança
+                                        ValueError se um elemento não couber na sua largura.
+    """
+    larguras = tuple(larguras)
+    if not larguras or any(largura < 1 for largura in larguras):
+        raise ValueError("Cada elemento deve ocupar pelo menos 1 bit.")
+
+    def empacotar(chave: Sequence[int]) -> int:
+        if len(chave) != len(larguras):
+            raise ValueError(f"A chave deve ter {len(larguras)} elementos: {chave!r}.")
+        resultado = 0
+        for elemento, largura in zip(chave, larguras):
+            if not 0 <= elemento < 1 << largura:
+                raise ValueError(f"O elemento {elemento!r} não cabe em {largura} bits.")
+            resultado = resultado << largura | elemento
+        return resultado
+
+    return empacotar
+
+
+def instalarChave(arvore: Any, key: Callable[[Any], Chave]) -> None:
+    """
+    Instala, como atributos da instância, versões das operações da árvore que aplicam
+    `key` às chaves recebidas. Os nós guardam apenas as chaves traduzidas, calculadas uma
+    única vez por operação; cada valor é guardado junto com a chave original, em um par
+    (chave, valor), e as operações que devolvem chaves ou valores devolvem os originais.
+
+    Assim como em `instalarMetricas`, uma árvore sem `key` não paga nenhum custo. As
+    operações chamadas por outras (como a busca dos contratos de `inserir`) recebem as
+    chaves já traduzidas.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore cujas chaves são traduzidas.
+        key (Callable[[Any], Chave]): A função aplicada a cada chave.
+    """
+    local = threading.local()
+
+    def traduzir(metodo: Callable, traducao: Callable) -> Callable:
+        @functools.wraps(metodo)
+        def traduzida(*args: Any, **kwargs: Any) -> Any:
+            if getattr(local, "profundidade", 0):
+                return metodo(*args, **kwargs)
+            local.profundidade = 1
+            try:
+                return traducao(metodo, *args, **kwargs)
+            finally:
+                local.profundidade = 0
+        return traduzida
+
+    for nome in OPERACOES_COM_CHAVE:
+        setattr(arvore, nome, traduzir(getattr(arvore, nome), _TRADUCOES[nome](arvore, key)))
+
+
+def _limite(key: Callable, chave: Any) -> Any:
+    return None if chave is None else key(chave)
+
+
+def _traduzirBusca(arvore: Any, key: Callable) -> Callable:
+    return lambda metodo, chave: metodo(key(chave))
+
+
+def _traduzirGet(arvore: Any, key: Callable) -> Callable:
+    def get(metodo: Callable, chave: Any, padrao: Any = None) -> Any:
+        par = metodo(key(chave), _AUSENTE)
+        return padrao if par is _AUSENTE else par[1]
+    return get
+
+
+def _traduzirInsercao(arvore: Any, key: Callable) -> Callable:
+    return lambda metodo, chave, valor=None: metodo(key(chave), (chave, valor))
+
+
+def _traduzirPop(arvore: Any, key: Callable) -> Callable:
+    def pop(metodo: Callable, chave: Any, *padrao: Any) -> Any:
+        if len(padrao) > 1:
+            return metodo(key(chave), *padrao)
+        par = metodo(key(chave), _AUSENTE)
+        if par is _AUSENTE:
+            if padrao:
+                return padrao[0]
+            raise KeyError(chave)
+        return par[1]
+    return pop
+
+
+def _traduzirIntervalo(arvore: Any, key: Callable) -> Callable:
+    def intervalo(metodo: Callable, inicio: Any = None, fim: Any = None, com_valores: bool = False) -> Any:
+        pares = metodo(_limite(key, inicio), _limite(key, fim), True)
+        if com_valores:
+            return (par for _, par in pares)
+        return (par[0] for _, par in pares)
+    return intervalo
+
+
+def _traduzirSeek(arvore: Any, key: Callable) -> Callable:
+    def seek(metodo: Callable, chave: Any, com_valores: bool = False) -> Any:
+        pares = metodo(key(chave), True)
+        if com_valores:
+            return (par for _, par in pares)
+        return (par[0] for _, par in pares)
+    return seek
+
+
+def _traduzirSelect(arvore: Any, key: Callable) -> Callable:
+    def select(metodo: Callable, indice: int) -> Any:
+        # A chave traduzida é procurada para obter a original, guardada com o valor.
+        no, posicao = arvore.buscar(metodo(indice))
+        return no.valores[posicao][0]
+    return select
+
+
+def _traduzirIntervaloDeChaves(arvore: Any, key: Callable) -> Callable:
+    return lambda metodo, inicio=None, fim=None: metodo(_limite(key, inicio), _limite(key, fim))
+
+
+def _traduzirLote(arvore: Any, key: Callable) -> Callable:
+    return lambda metodo, chaves: metodo([key(chave) for chave in chaves])
+
+
+def _traduzirInsercaoEmLote(arvore: Any, key: Callable) -> Callable:
+    def inserir_muitos(metodo: Callable, chaves: Iterable[Any], valores: Optional[Iterable[Any]] = None) -> Any:
+        chaves = list(chaves)
+        valores = [None] * len(chaves) if valores is None else list(valores)
+        if len(valores) != len(chaves):
+            return metodo(chaves, valores)
+        return metodo([key(chave) for chave in chaves], list(zip(chaves, valores)))
+    return inserir_muitos
+
+
+_TRADUCOES = {
+    "buscar": _traduzirBusca,
+    "get": _traduzirGet,
+    "put": _traduzirInsercao,
+    "pop": _traduzirPop,
+    "inserir": _traduzirInsercao,
+    "inserir_se_ausente": _traduzirInsercao,
+    "remover": _traduzirBusca,
+    "intervalo": _traduzirIntervalo,
+    "seek": _traduzirSeek,
+    "rank": _traduzirBusca,
+    "select": _traduzirSelect,
+    "count_range": _traduzirIntervaloDeChaves,
+    "buscar_muitos": _traduzirLote,
+    "inserir_muitos": _traduzirInsercaoEmLote,
+    "remover_intervalo": _traduzirIntervaloDeChaves,
+    "remover_muitos": _traduzirLote,
+}
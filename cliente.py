@@ -0,0 +1,230 @@
+import asyncio
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from protocolo import (BUSCAR, ERRO, ESTATISTICAS, INSERIR, INTERVALO, REMOVER, ErroRemoto, codificarQuadro,
+                       decodificarValores, lerQuadro)
+
+# Quantas chaves cada pedido de `intervalo` traz por vez.
+_PAGINA_INTERVALO = 1_000
+
+
+class _ConexaoCliente:
+    """
+    Uma conexão com o servidor, com vários pedidos em andamento: cada pedido recebe um
+    identificador e um futuro, resolvido pela tarefa que lê as respostas.
+    """
+
+    def __init__(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter, em_voo: int):
+        self.leitor = leitor
+        self.escritor = escritor
+        self.vagas = asyncio.Semaphore(em_voo)
+        self.pendentes: Dict[int, asyncio.Future] = {}
+        self._proximo = 0
+        self._leitura = asyncio.create_task(self._receber())
+
+    async def pedir(self, operacao: int, argumentos: Iterable[Any]) -> List[Any]:
+        """
+        Envia um pedido e espera a sua resposta.
+
+        Retorna:
+            List[Any]: Os resultados da operação.
+
+        Exceções:
+            ErroRemoto: Se o servidor respondeu com erro.
+            ConnectionError: Se a conexão caiu antes da resposta.
+        """
+        async with self.vagas:
+            if self._leitura.done():
+                raise ConnectionError("A conexão com o servidor foi fechada.")
+            identificador = self._proximo
+            self._proximo = (identificador + 1) & 0xFFFFFFFF
+            futuro = asyncio.get_running_loop().create_future()
+            self.pendentes[identificador] = futuro
+            try:
+                self.escritor.write(codificarQuadro(identificador, operacao, list(argumentos)))
+                await self.escritor.drain()
+            except BaseException:
+                # Ninguém mais espera a resposta; o futuro não pode receber a exceção da queda.
+                self.pendentes.pop(identificador, None)
+                futuro.cancel()
+                raise
+            return await futuro
+
+    async def _receber(self) -> None:
+        """
+        Lê as respostas e resolve os futuros dos pedidos; se a conexão cair, falha todos os
+        que ainda aguardam resposta.
+        """
+        erro: BaseException = ConnectionError("A conexão com o servidor foi fechada.")
+        try:
+            while True:
+                quadro = await lerQuadro(self.leitor)
+                if quadro is None:
+                    break
+                identificador, estado, conteudo = quadro
+                futuro = self.pendentes.pop(identificador, None)
+                if futuro is None or futuro.done():
+                    continue
+                resultados = decodificarValores(conteudo)
+                if estado == ERRO:
+                    futuro.set_exception(ErroRemoto(*resultados))
+                else:
+                    futuro.set_result(resultados)
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError) as excecao:
+            erro = ConnectionError(f"A conexão com o servidor caiu: {excecao}")
+        finally:
+            for futuro in self.pendentes.values():
+                if not futuro.done():
+                    futuro.set_exception(erro)
+            self.pendentes.clear()
+
+    async def fechar(self) -> None:
+        self.escritor.close()
+        self._leitura.cancel()
+        await asyncio.gather(self._leitura, return_exceptions=True)
+        try:
+            await self.escritor.wait_closed()
+        except ConnectionError:
+            pass
+
+
+class ClienteArvoreB:
+    """
+    Cliente assíncrono de um `ServidorArvoreB`, com um conjunto de conexões.
+
+    Cada operação vai pela conexão com menos pedidos em andamento, e cada conexão envia
+    novos pedidos sem esperar as respostas dos anteriores (pipelining), até
+    `em_voo_por_conexao`; daí em diante as operações esperam uma vaga. Várias corrotinas
+    podem usar o mesmo cliente ao mesmo tempo, e as operações de uma corrotina são vistas
+    pelo servidor na ordem em que ela as fez. Operações disparadas ao mesmo tempo (como as
+    de `buscar_muitos`) não têm ordem entre si.
+
+    As chaves e os valores podem ser None, bool, int, float, str, bytes ou tuplas desses
+    tipos (veja `protocolo.codificarValor`).
+    """
+
+    def __init__(self, conexoes: List[_ConexaoCliente]):
+        self._conexoes = conexoes
+
+    @classmethod
+    async def conectar(cls, host: str = "127.0.0.1", porta: int = 7_070, caminho: Optional[str] = None,
+                       conexoes: int = 4, em_voo_por_conexao: int = 256) -> 'ClienteArvoreB':
+        """
+        Abre as conexões com o servidor.
+
+        Argumentos:
+            host (str): O endereço TCP do servidor.
+            porta (int): A porta TCP do servidor.
+            caminho (Optional[str]): Se informado, conecta a este socket Unix em vez de TCP.
+            conexoes (int): O número de conexões do conjunto.
+            em_voo_por_conexao (int): Quantos pedidos de uma conexão podem aguardar resposta.
+
+        Retorna:
+            ClienteArvoreB: O cliente conectado.
+        """
+        if conexoes < 1 or em_voo_por_conexao < 1:
+            raise ValueError("O cliente precisa de pelo menos uma conexão e uma vaga por conexão.")
+        abertas = []
+        try:
+            for _ in range(conexoes):
+                if caminho is not None:
+                    leitor, escritor = await asyncio.open_unix_connection(caminho)
+                else:
+                    leitor, escritor = await asyncio.open_connection(host, porta)
+                abertas.append(_ConexaoCliente(leitor, escritor, em_voo_por_conexao))
+        except BaseException:
+            await asyncio.gather(*(conexao.fechar() for conexao in abertas))
+            raise
+        return cls(abertas)
+
+    async def fechar(self) -> None:
+        """
+        Fecha todas as conexões; os pedidos que ainda aguardam resposta falham.
+        """
+        await asyncio.gather(*(conexao.fechar() for conexao in self._conexoes))
+
+    async def __aenter__(self) -> 'ClienteArvoreB':
+        return self
+
+    async def __aexit__(self, *excecao: Any) -> None:
+        await self.fechar()
+
+    def _conexao(self) -> _ConexaoCliente:
+        return min(self._conexoes, key=lambda conexao: len(conexao.pendentes))
+
+    async def buscar(self, chave: Any) -> Tuple[bool, Any]:
+        """
+        Busca uma chave.
+
+        Retorna:
+            Tuple[bool, Any]: Se a chave foi encontrada e o valor associado a ela.
+        """
+        encontrada, valor = await self._conexao().pedir(BUSCAR, (chave,))
+        return encontrada, valor
+
+    async def get(self, chave: Any, padrao: Any = None) -> Any:
+        encontrada, valor = await self.buscar(chave)
+        return valor if encontrada else padrao
+
+    async def contem(self, chave: Any) -> bool:
+        return (await self.buscar(chave))[0]
+
+    async def put(self, chave: Any, valor: Any = None) -> bool:
+        """
+        Associa um valor a uma chave, como `ArvoreB.put`.
+
+        Retorna:
+            bool: True se a chave foi inserida, False se apenas o valor foi substituído.
+        """
+        (inserida,) = await self._conexao().pedir(INSERIR, (chave, valor))
+        return inserida
+
+    async def pop(self, chave: Any, padrao: Any = None) -> Any:
+        """
+        Remove uma chave e retorna o valor associado a ela, ou `padrao` se ela não existia.
+        """
+        removida, valor = await self._conexao().pedir(REMOVER, (chave,))
+        return valor if removida else padrao
+
+    async def intervalo(self, inicio: Any = None, fim: Any = None, limite: Optional[int] = None) -> List[Tuple[Any, Any]]:
+        """
+        Obtém os pares (chave, valor) do intervalo [inicio, fim), em ordem crescente. Os
+        pares vêm em páginas, um pedido por página, e cada página continua da última chave
+        da anterior; as páginas não formam uma leitura atômica do intervalo.
+
+        Argumentos:
+            inicio (Any): O limite inferior, inclusivo. None indica sem limite.
+            fim (Any): O limite superior, exclusivo. None indica sem limite.
+            limite (Optional[int]): O número máximo de pares. Por padrão, todos.
+
+        Retorna:
+            List[Tuple[Any, Any]]: Os pares do intervalo.
+        """
+        pares: List[Tuple[Any, Any]] = []
+        pular = 0
+        while limite is None or len(pares) < limite:
+            pedidos = _PAGINA_INTERVALO if limite is None else min(_PAGINA_INTERVALO, limite - len(pares))
+            # A página começa na última chave da anterior, que é pulada.
+            resultados = await self._conexao().pedir(INTERVALO, (inicio, fim, pedidos + pular))
+            pagina = list(zip(resultados[0::2], resultados[1::2]))[pular:]
+            pares += pagina
+            if len(pagina) < pedidos:
+                break
+            inicio, pular = pares[-1][0], 1
+        return pares
+
+    async def buscar_muitos(self, chaves: Iterable[Any]) -> List[Tuple[bool, Any]]:
+        """
+        Busca várias chaves, com todos os pedidos em andamento ao mesmo tempo.
+        """
+        return list(await asyncio.gather(*(self.buscar(chave) for chave in chaves)))
+
+    async def estatisticas(self) -> Dict[str, int]:
+        """
+        Obtém os contadores do servidor.
+
+        Retorna:
+            Dict[str, int]: Os pedidos executados, as rodadas da dona da árvore (lotes) e o
+                            número de conexões abertas.
+        """
+        pedidos, lotes, conexoes = await self._conexao().pedir(ESTATISTICAS, ())
+        return {"pedidos": pedidos, "lotes": lotes, "conexoes": conexoes}
@@ -0,0 +1,12 @@
+import os
+
+# Nome da variável de ambiente que controla a verificação dos contratos.
+VARIAVEL_CONTRATOS = "ARVOREB_CONTRATOS"
+
+# Valores da variável de ambiente que desligam os contratos.
+VALORES_DESLIGADOS = ("0", "false", "falso", "nao", "não", "off")
+
+# Indica se os contratos do icontract (pré-condições e invariantes) são verificados.
+# O valor é lido uma única vez, na importação: com os contratos desligados, os decoradores
+# devolvem as funções e classes originais, sem nenhum custo nas chamadas.
+CONTRATOS_HABILITADOS: bool = os.environ.get(VARIAVEL_CONTRATOS, "1").strip().lower() not in VALORES_DESLIGADOS
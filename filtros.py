@@ -0,0 +1,266 @@
+import math
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+from noArvoreB import Chave, NoArvoreB
+
+# Menor capacidade de um filtro de Bloom, para que árvores pequenas não o reconstruam a
+# cada poucas inserções.
+CAPACIDADE_MINIMA = 1_024
+
+# Constante multiplicativa (a razão áurea em 64 bits) que espalha os bits do `hash` das
+# chaves: o `hash` de um inteiro é o próprio inteiro, e chaves sequenciais cairiam em
+# palavras sequenciais do filtro.
+_MISTURA = 0x9E3779B97F4A7C15
+_MASCARA = (1 << 64) - 1
+
+# Bits marcados por chave, todos na mesma palavra de 64 bits.
+_BITS_POR_CHAVE_MARCADOS = 4
+
+# Máscaras com 2 bits de uma palavra, escolhidos por 12 bits do hash (6 para cada um).
+# Duas consultas à tabela montam a máscara dos 4 bits de uma chave.
+_PARES_DE_BITS = [1 << (indice & 63) | 1 << (indice >> 6) for indice in range(1 << 12)]
+
+
+def _taxaEstimada(bits_por_chave: float) -> float:
+    """
+    Estima a taxa de falsos positivos de um filtro de Bloom em blocos de 64 bits com
+    `bits_por_chave` bits por chave: o número de chaves de cada palavra segue uma
+    distribuição de Poisson, e cada palavra se comporta como um filtro de 64 bits.
+    """
+    media = 64 / bits_por_chave
+    probabilidade = math.exp(-media)
+    taxa = 0.0
+    for chaves in range(int(4 * media) + 20):
+        if chaves:
+            probabilidade *= media / chaves
+        taxa += probabilidade * (1 - (63 / 64) ** (_BITS_POR_CHAVE_MARCADOS * chaves)) ** _BITS_POR_CHAVE_MARCADOS
+    return taxa
+
+
+class FiltroBloom:
+    """
+    Filtro de Bloom que responde, sem descer a árvore, que uma chave certamente não está
+    nela. Uma resposta positiva pode ser falsa, com probabilidade próxima de
+    `taxaFalsosPositivos` enquanto o filtro não recebe mais que `capacidade` chaves.
+
+    O filtro é dividido em blocos de 64 bits: um único `hash` escolhe a palavra da chave e
+    os 4 bits marcados nela, de modo que a consulta lê uma palavra e a compara com uma
+    máscara, sem um laço por função de hash, que no CPython custaria mais que a própria
+    descida da árvore. Em troca, precisa de alguns bits a mais por chave que um filtro de
+    Bloom comum com a mesma taxa.
+
+    Chaves removidas não podem ser retiradas do filtro; a árvore conta as remoções e o
+    reconstrói a partir das chaves atuais quando elas passam da metade das adicionadas, ou
+    quando as adicionadas passam da capacidade (veja `ArvoreB._reconstruirFiltro`). As
+    chaves precisam ser hasheáveis.
+
+    Atributos:
+        taxaFalsosPositivos (float): A taxa de falsos positivos para a qual o filtro é
+                                     dimensionado.
+        capacidade (int): Quantas chaves o filtro comporta com essa taxa.
+        quantidade (int): Chaves adicionadas desde a última reconstrução.
+        removidas (int): Chaves removidas da árvore desde a última reconstrução.
+        consultas (int): Consultas feitas ao filtro.
+        descartadas (int): Consultas respondidas pelo filtro, sem descer a árvore.
+        falsosPositivos (int): Consultas aprovadas pelo filtro de chaves que não estavam
+                               na árvore.
+        reconstrucoes (int): Quantas vezes o filtro foi reconstruído.
+    """
+
+    def __init__(self, capacidade: int = CAPACIDADE_MINIMA, taxa_falsos_positivos: float = 0.01):
+        """
+        Cria um filtro vazio.
+
+        Argumentos:
+            capacidade (int): Quantas chaves o filtro deve comportar.
+            taxa_falsos_positivos (float): A taxa de falsos positivos desejada, entre 0 e 1.
+        """
+        if not 0 < taxa_falsos_positivos < 1:
+            raise ValueError("A taxa de falsos positivos deve estar entre 0 e 1.")
+        self.taxaFalsosPositivos = taxa_falsos_positivos
+        self.zerar()
+        self._dimensionar(capacidade)
+
+    def zerar(self) -> None:
+        """
+        Zera os contadores, mantendo as chaves do filtro.
+        """
+        self.consultas = 0
+        self.descartadas = 0
+        self.falsosPositivos = 0
+        self.reconstrucoes = 0
+
+    def _dimensionar(self, capacidade: int) -> None:
+        """
+        Esvazia o filtro, com o menor número de bits por chave (até 64) que atinge a taxa
+        de falsos positivos com `capacidade` chaves.
+        """
+        self.capacidade = max(capacidade, CAPACIDADE_MINIMA)
+        bits_por_chave = 4
+        while bits_por_chave < 64 and _taxaEstimada(bits_por_chave) > self.taxaFalsosPositivos:
+            bits_por_chave += 1
+        self._palavras = array("Q", bytes(8 * math.ceil(self.capacidade * bits_por_chave / 64)))
+        self.quantidade = 0
+        self.removidas = 0
+
+    def adicionar(self, chave: Chave) -> None:
+        """
+        Marca a chave como (possivelmente) presente.
+        """
+        misturado = (hash(chave) * _MISTURA) & _MASCARA
+        # Os 24 bits baixos escolhem os 4 bits marcados; os altos, a palavra.
+        mascara = _PARES_DE_BITS[misturado & 4095] | _PARES_DE_BITS[misturado >> 12 & 4095]
+        palavras = self._palavras
+        palavras[(misturado >> 24) % len(palavras)] |= mascara
+        self.quantidade += 1
+
+    def talvezContenha(self, chave: Chave) -> bool:
+        """
+        Consulta o filtro.
+
+        Retorna:
+            bool: False se a chave certamente não foi adicionada; True se talvez tenha sido.
+        """
+        self.consultas += 1
+        misturado = (hash(chave) * _MISTURA) & _MASCARA
+        mascara = _PARES_DE_BITS[misturado & 4095] | _PARES_DE_BITS[misturado >> 12 & 4095]
+        palavras = self._palavras
+        if palavras[(misturado >> 24) % len(palavras)] & mascara != mascara:
+            self.descartadas += 1
+            return False
+        return True
+
+    def reconstruir(self, chaves: Iterable[Chave], capacidade: int) -> None:
+        """
+        Esvazia o filtro e adiciona as chaves informadas, mantendo os contadores de
+        consultas.
+
+        Argumentos:
+            chaves (Iterable[Chave]): As chaves atualmente na árvore.
+            capacidade (int): A nova capacidade do filtro.
+        """
+        self._dimensionar(capacidade)
+        for chave in chaves:
+            self.adicionar(chave)
+        self.reconstrucoes += 1
+
+    def instantaneo(self) -> Dict[str, Any]:
+        """
+        Obtém uma cópia dos contadores do filtro.
+
+        Retorna:
+            Dict[str, Any]: As consultas, as descartadas, os falsos positivos e a taxa
+                            observada entre as consultas de chaves ausentes.
+        """
+        ausentes = self.descartadas + self.falsosPositivos
+        return {
+            "consultas": self.consultas,
+            "descartadas": self.descartadas,
+            "falsos_positivos": self.falsosPositivos,
+            "taxa_falsos_positivos": self.falsosPositivos / ausentes if ausentes else 0.0,
+            "capacidade": self.capacidade,
+            "bytes": len(self._palavras) * 8,
+            "reconstrucoes": self.reconstrucoes,
+        }
+
+
+class CacheLRU:
+    """
+    Cache das posições (nó, índice) das últimas chaves encontradas por `ArvoreB.buscar`,
+    que responde às buscas repetidas sem descer a árvore. Guarda no máximo `capacidade`
+    posições e descarta a usada há mais tempo.
+
+    Uma posição guardada é conferida antes de ser devolvida: se a chave não está mais
+    naquela posição do nó (por uma inserção ou remoção no nó, ou uma divisão), a posição é
+    descartada e a busca desce normalmente. As operações que desligam nós da árvore, cujas
+    chaves continuariam conferindo, esvaziam o cache (veja `ArvoreB._descartarPosicoes`).
+
+    Atributos:
+        capacidade (int): O número máximo de posições guardadas.
+        raiz (Optional[NoArvoreB]): A raiz da árvore quando as posições foram guardadas.
+        acertos (int): Buscas respondidas pelo cache.
+        falhas (int): Buscas que não encontraram uma posição válida no cache.
+        invalidadas (int): Posições encontradas no cache, mas descartadas na conferência.
+    """
+
+    def __init__(self, capacidade: int):
+        """
+        Cria um cache vazio.
+
+        Argumentos:
+            capacidade (int): O número máximo de posições guardadas, pelo menos 1.
+        """
+        if capacidade < 1:
+            raise ValueError("A capacidade do cache deve ser pelo menos 1.")
+        self.capacidade = capacidade
+        self.raiz: Optional[NoArvoreB] = None
+        self._posicoes: 'OrderedDict[Chave, Tuple[NoArvoreB, int]]' = OrderedDict()
+        self.zerar()
+
+    def zerar(self) -> None:
+        """
+        Zera os contadores, mantendo as posições guardadas.
+        """
+        self.acertos = 0
+        self.falhas = 0
+        self.invalidadas = 0
+
+    def __len__(self) -> int:
+        return len(self._posicoes)
+
+    def obter(self, chave: Chave) -> Optional[Tuple[NoArvoreB, int]]:
+        """
+        Obtém a posição guardada da chave, se ela ainda for válida.
+
+        Retorna:
+            Optional[Tuple[NoArvoreB, int]]: O nó e o índice da chave, ou None.
+        """
+        posicao = self._posicoes.get(chave)
+        if posicao is not None:
+            no, indice = posicao
+            if indice < len(no.chaves) and no.chaves[indice] == chave:
+                self._posicoes.move_to_end(chave)
+                self.acertos += 1
+                return posicao
+            del self._posicoes[chave]
+            self.invalidadas += 1
+        self.falhas += 1
+        return None
+
+    def guardar(self, chave: Chave, posicao: Tuple[NoArvoreB, int]) -> None:
+        """
+        Guarda a posição de uma chave encontrada, descartando a usada há mais tempo se o
+        cache estiver cheio.
+        """
+        self._posicoes[chave] = posicao
+        self._posicoes.move_to_end(chave)
+        if len(self._posicoes) > self.capacidade:
+            self._posicoes.popitem(last=False)
+
+    def limpar(self, raiz: Optional[NoArvoreB] = None) -> None:
+        """
+        Descarta todas as posições.
+
+        Argumentos:
+            raiz (Optional[NoArvoreB]): A raiz atual da árvore.
+        """
+        self._posicoes.clear()
+        self.raiz = raiz
+
+    def instantaneo(self) -> Dict[str, Any]:
+        """
+        Obtém uma cópia dos contadores do cache.
+
+        Retorna:
+            Dict[str, Any]: Os acertos, as falhas, as posições invalidadas, a taxa de
+                            acertos e o número de posições guardadas.
+        """
+        consultas = self.acertos + self.falhas
+        return {
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "invalidadas": self.invalidadas,
+            "taxa_acertos": self.acertos / consultas if consultas else 0.0,
+            "posicoes": len(self._posicoes),
+        }
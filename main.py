@@ -31,16 +31,16 @@ def gerar_e_exibir_arvore_b(ordem: int, num_chaves: int):
     arvore.imprimirArvore()
     print("-" * 30)
 
-    # Verificação de propriedades após a geração
-    if arvore._verificarPropriedades(arvore.raiz):
-        print("Verificação de Propriedades: A árvore B satisfaz suas propriedades.")
+    # Verificação de propriedades após a geração, em uma única passada pela árvore
+    # (inclui a profundidade das folhas).
+    relatorio = arvore.validar()
+    if relatorio.valida:
+        print(f"Verificação de Propriedades: A árvore B satisfaz suas propriedades "
+              f"({relatorio.quantidadeNos} nós, altura {relatorio.altura}).")
     else:
         print("Verificação de Propriedades: A árvore B NÃO satisfaz suas propriedades (HOUVE UM ERRO).")
-    
-    if arvore._todasFolhasNaMesmaProfundidade():
-        print("Verificação de Profundidade das Folhas: Todas as folhas estão na mesma profundidade.")
-    else:
-        print("Verificação de Profundidade das Folhas: As folhas estão em profundidades diferentes (HOUVE UM ERRO).")
+        for erro in relatorio.erros:
+            print(f"  Nível {erro.profundidade}, nó {erro.chaves}: {erro.mensagem}")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,235 @@
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Métodos estruturais cujas chamadas são contadas, e o nome do contador de cada um.
+ESTRUTURAIS = {
+    "_dividirFilho": "divisoes",
+    "_fundir": "fusoes",
+    "_pegarEmprestadoDoAnterior": "emprestimosDoAnterior",
+    "_pegarEmprestadoDoProximo": "emprestimosDoProximo",
+}
+
+# Operações públicas cronometradas.
+OPERACOES = ("buscar", "get", "put", "pop", "inserir", "inserir_se_ausente", "remover", "buscar_muitos",
+             "inserir_muitos", "remover_intervalo", "remover_muitos", "rank", "select", "count_range")
+
+# Um ouvinte recebe o tipo do evento ("estrutura", "busca" ou "operacao"), o nome (o do
+# contador, "buscar" ou o da operação) e o valor (1, os nós visitados ou a duração em ns).
+Ouvinte = Callable[[str, str, int], None]
+
+
+class MetricasArvoreB:
+    """
+    As métricas de desempenho de uma árvore: quantas divisões, fusões e empréstimos foram
+    feitos, quantos nós cada busca visitou e quanto tempo levou cada operação pública.
+
+    As métricas só existem enquanto estão ativadas (veja `ArvoreB.ativarMetricas`): a
+    ativação instala, na própria instância da árvore, versões instrumentadas dos métodos
+    medidos, e a desativação as remove. Uma árvore sem métricas não paga nenhum custo,
+    nem sequer o de testar se elas estão ligadas.
+
+    Atributos:
+        divisoes (int): Chamadas de `_dividirFilho`.
+        fusoes (int): Chamadas de `_fundir`.
+        emprestimosDoAnterior (int): Chamadas de `_pegarEmprestadoDoAnterior`.
+        emprestimosDoProximo (int): Chamadas de `_pegarEmprestadoDoProximo`.
+        nosVisitados (Dict[int, int]): Histograma das buscas: para cada número de nós
+                                       visitados, quantas buscas visitaram esse número.
+        operacoes (Dict[str, Dict[str, int]]): Para cada operação pública, o número de
+                                               chamadas e as durações total e máxima, em ns.
+    """
+
+    def __init__(self) -> None:
+        self._trava = threading.Lock()
+        # Profundidade de operações públicas em andamento em cada thread. Operações chamadas
+        # por outras (como a busca dos contratos de `inserir`) não são medidas à parte.
+        self._local = threading.local()
+        self._ouvintes: List[Ouvinte] = []
+        self.zerar()
+
+    def zerar(self) -> None:
+        """
+        Zera todas as contagens, mantendo os ouvintes.
+        """
+        with self._trava:
+            self.divisoes = 0
+            self.fusoes = 0
+            self.emprestimosDoAnterior = 0
+            self.emprestimosDoProximo = 0
+            self.nosVisitados: Dict[int, int] = {}
+            self.operacoes: Dict[str, Dict[str, int]] = {}
+
+    def assinar(self, ouvinte: Ouvinte) -> None:
+        """
+        Registra uma função chamada a cada evento medido, por exemplo para repassá-lo a um
+        profiler ou a um exportador de métricas. O ouvinte é chamado na thread que fez a
+        operação, e uma exceção lançada por ele interrompe a operação.
+
+        Argumentos:
+            ouvinte (Ouvinte): A função, chamada com o tipo, o nome e o valor do evento.
+        """
+        self._ouvintes.append(ouvinte)
+
+    def cancelar(self, ouvinte: Ouvinte) -> None:
+        """
+        Remove um ouvinte registrado com `assinar`.
+        """
+        self._ouvintes.remove(ouvinte)
+
+    def instantaneo(self) -> Dict[str, Any]:
+        """
+        Obtém uma cópia das métricas atuais, que não muda com as operações seguintes.
+
+        Retorna:
+            Dict[str, Any]: Os contadores estruturais, o histograma de nós visitados por
+                            busca e as estatísticas de cada operação, com a duração média.
+        """
+        with self._trava:
+            operacoes = {}
+            for nome, estatisticas in self.operacoes.items():
+                operacoes[nome] = dict(estatisticas, media_ns=estatisticas["total_ns"] // estatisticas["chamadas"])
+            return {
+                "divisoes": self.divisoes,
+                "fusoes": self.fusoes,
+                "emprestimos_do_anterior": self.emprestimosDoAnterior,
+                "emprestimos_do_proximo": self.emprestimosDoProximo,
+                "nos_visitados": dict(sorted(self.nosVisitados.items())),
+                "operacoes": operacoes,
+            }
+
+    def _contar(self, contador: str) -> None:
+        with self._trava:
+            setattr(self, contador, getattr(self, contador) + 1)
+        for ouvinte in self._ouvintes:
+            ouvinte("estrutura", contador, 1)
+
+    def _registrarBusca(self, visitados: int) -> None:
+        with self._trava:
+            self.nosVisitados[visitados] = self.nosVisitados.get(visitados, 0) + 1
+        for ouvinte in self._ouvintes:
+            ouvinte("busca", "buscar", visitados)
+
+    def _registrarOperacao(self, nome: str, duracao: int) -> None:
+        with self._trava:
+            estatisticas = self.operacoes.get(nome)
+            if estatisticas is None:
+                estatisticas = self.operacoes[nome] = {"chamadas": 0, "total_ns": 0, "maximo_ns": 0}
+            estatisticas["chamadas"] += 1
+            estatisticas["total_ns"] += duracao
+            if duracao > estatisticas["maximo_ns"]:
+                estatisticas["maximo_ns"] = duracao
+        for ouvinte in self._ouvintes:
+            ouvinte("operacao", nome, duracao)
+
+
+def _nosVisitados(arvore: Any, resultado: Optional[tuple]) -> int:
+    """
+    Calcula quantos nós uma busca visitou a partir do seu resultado, sem repetir a descida:
+    todas as folhas estão na profundidade `arvore._altura`, e uma chave encontrada em um nó
+    interno está tantos níveis acima quanto a altura da subárvore desse nó.
+    """
+    if arvore.raiz is None:
+        return 0
+    if resultado is None:
+        return arvore._altura + 1
+    no = resultado[0]
+    acima_das_folhas = 0
+    while not no.folha:
+        no = no.filhos[0]
+        acima_das_folhas += 1
+    return arvore._altura - acima_das_folhas + 1
+
+
+def _atalhos(arvore: Any) -> Tuple[int, int, int]:
+    """
+    Obtém as buscas descartadas pelo filtro de Bloom, as respondidas pelo cache de
+    posições e as respondidas na folha do dedo até agora; a variação entre antes e depois
+    de uma busca indica se ela foi respondida sem descer a árvore.
+    """
+    filtro, cache = arvore.filtro, arvore.cache
+    return (filtro.descartadas if filtro is not None else 0, cache.acertos if cache is not None else 0,
+            arvore._dedoAcertos)
+
+
+def _instrumentarEstrutural(metodo: Callable, metricas: MetricasArvoreB, contador: str) -> Callable:
+    @functools.wraps(metodo)
+    def instrumentado(*args: Any, **kwargs: Any) -> Any:
+        metricas._contar(contador)
+        return metodo(*args, **kwargs)
+    return instrumentado
+
+
+def _instrumentarOperacao(arvore: Any, metodo: Callable, metricas: MetricasArvoreB, nome: str) -> Callable:
+    local = metricas._local
+    relogio = time.perf_counter_ns
+
+    @functools.wraps(metodo)
+    def instrumentado(*args: Any, **kwargs: Any) -> Any:
+        profundidade = getattr(local, "profundidade", 0)
+        if profundidade:
+            return metodo(*args, **kwargs)
+        local.profundidade = 1
+        if nome == "buscar":
+            atalhos = _atalhos(arvore)
+        inicio = relogio()
+        try:
+            resultado = metodo(*args, **kwargs)
+        finally:
+            duracao = relogio() - inicio
+            local.profundidade = 0
+        metricas._registrarOperacao(nome, duracao)
+        if nome == "buscar":
+            descartadas, acertos, dedo = _atalhos(arvore)
+            if descartadas != atalhos[0]:
+                # Respondida pelo filtro de Bloom, sem visitar nenhum nó.
+                visitados = 0
+            elif acertos != atalhos[1]:
+                # Respondida pelo cache de posições, que confere apenas o nó guardado.
+                visitados = 1
+            elif dedo != atalhos[2]:
+                # Respondida na folha do dedo, sem descer a partir da raiz.
+                visitados = 1
+            else:
+                visitados = _nosVisitados(arvore, resultado)
+            metricas._registrarBusca(visitados)
+        return resultado
+    return instrumentado
+
+
+def instalarMetricas(arvore: Any, metricas: MetricasArvoreB) -> None:
+    """
+    Instala, como atributos da instância, versões instrumentadas dos métodos estruturais e
+    das operações públicas da árvore. Os métodos da classe (e de subclasses, como a árvore
+    paginada) continuam sendo os executados; as versões instaladas apenas os envolvem.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore a ser medida.
+        metricas (MetricasArvoreB): Onde as medidas são acumuladas.
+    """
+    removerMetricas(arvore)
+    instrumentados = {metodo: _instrumentarEstrutural(getattr(arvore, metodo), metricas, contador)
+                      for metodo, contador in ESTRUTURAIS.items()}
+    for nome in OPERACOES:
+        instrumentados[nome] = _instrumentarOperacao(arvore, getattr(arvore, nome), metricas, nome)
+    for nome, instrumentado in instrumentados.items():
+        # Versões já instaladas na instância (como as de `instalarChave`) voltam na remoção.
+        instrumentado._anterior = arvore.__dict__.get(nome)
+        setattr(arvore, nome, instrumentado)
+
+
+def removerMetricas(arvore: Any) -> None:
+    """
+    Remove os métodos instrumentados da instância, voltando aos métodos da classe.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore medida.
+    """
+    for nome in (*ESTRUTURAIS, *OPERACOES):
+        instrumentado = arvore.__dict__.get(nome)
+        if not hasattr(instrumentado, "_anterior"):
+            continue
+        del arvore.__dict__[nome]
+        if instrumentado._anterior is not None:
+            setattr(arvore, nome, instrumentado._anterior)
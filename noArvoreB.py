@@ -1,17 +1,76 @@
 import icontract
-from typing import List, Optional, Tuple
+from array import array
+from bisect import bisect_left
+from itertools import repeat
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+from contratos import CONTRATOS_HABILITADOS
 
+# Tipo das chaves: qualquer tipo com ordem total entre seus valores, como int, str, bytes ou
+# tuplas desses tipos. As comparações nos nós são as do próprio Python (`<`, `==`).
+Chave = Any
 
-@icontract.invariant(lambda self: self.chaves == sorted(self.chaves), "As chaves devem estar sempre ordenadas")
-class NoArvoreB:
+
+class _NoBase:
+    """
+    Operações comuns às representações de nó da Árvore B. As subclasses definem os
+    atributos `folha`, `chaves`, `valores` e `filhos`.
+    """
+    __slots__ = ()
+
+    def buscar(self, chaveProcurada: Chave) -> Optional[Tuple['NoArvoreB', int]]:
+        """
+        Busca uma chave a partir deste nó, descendo iterativamente pelos filhos se necessário.
+
+        Argumentos:
+            chaveProcurada (Chave): A chave que está sendo buscada.
+
+        REtorna:
+            Optional[Tuple['NoArvoreB', int]]: Uma tupla contendo o nó e o índice onde a
+                                               chave foi encontrada. Retorna None se a chave
+                                               não for encontrada na subárvore a partir deste nó.
+        """
+        no = self
+        while True:
+            i = no._posicao(chaveProcurada)
+
+            # Condição de sucesso: Se achou a chave procurada, retorna ela e seu índice.
+            if i < len(no.chaves) and chaveProcurada == no.chaves[i]:
+                return (no, i)
+
+            # Caso base: Se chegou em uma folha e não é a chave, não está nessa subárvore
+            if no.folha:
+                return None
+            # Se não é folha, continua buscando dentro do filho correspondente
+            no = no.filhos[i]
+
+    def _posicao(self, chave: Chave) -> int:
+        """
+        Encontra, por busca binária, a posição da chave neste nó.
+
+        Argumentos:
+            chave (Chave): A chave cuja posição é procurada.
+
+        Retorna:
+            int: O índice da primeira chave do nó maior ou igual a `chave`. Se a chave não
+                 estiver no nó, é também o índice do filho onde ela deve ser procurada.
+        """
+        return bisect_left(self.chaves, chave)
+
+
+@icontract.invariant(lambda self: self.chaves == sorted(self.chaves), "As chaves devem estar sempre ordenadas", enabled=CONTRATOS_HABILITADOS)
+@icontract.invariant(lambda self: len(self.valores) == len(self.chaves), "Cada chave deve ter um valor associado", enabled=CONTRATOS_HABILITADOS)
+class NoArvoreB(_NoBase):
     """
     Cada nó pode ser uma folha ou um nó interno. A classe armazena uma lista ordenada
-    de chaves e, se for um nó interno, uma lista de referências para seus nós filhos.
+    de chaves, a lista paralela dos valores associados a elas e, se for um nó interno,
+    uma lista de referências para seus nós filhos.
 
     Atributos:
         folha (bool): Verdadeiro se o nó é uma folha, ou seja, no um nó da "ponta da árvore".
-        chaves (List[int]): A lista de chaves (valores inteiros) armazenadas no nó.
+        chaves (List[Chave]): A lista de chaves, em ordem crescente, armazenadas no nó.
+        valores (List[Any]): Os valores associados às chaves, na mesma posição de cada chave.
         filhos (List['NoArvoreB']): A lista de referências para os nós filhos.
+        total (int): O número de chaves na subárvore deste nó, incluindo as dele.
     """
     def __init__(self, folha: bool = False):
         """
@@ -22,33 +81,148 @@ class NoArvoreB:
                           Por padrão, é inicializado como Falso.
         """
         self.folha = folha
-        self.chaves: List[int] = []
+        self.chaves: List[Chave] = []
+        self.valores: List[Any] = []
         self.filhos: List['NoArvoreB'] = []
+        self.total = 0
+
+
+class ValoresNulos:
+    """
+    Lista de valores de um nó compacto. Enquanto todos os valores são None, como nas
+    árvores montadas sem valores associados, guarda apenas quantos são; a lista é criada
+    quando o primeiro valor diferente de None é armazenado e, daí em diante, as operações
+    são as da própria lista.
+
+    Atributos:
+        quantidade (int): O número de valores, enquanto todos são None.
+        lista (Optional[List[Any]]): Os valores, depois de criada a lista.
+    """
+    __slots__ = ("quantidade", "lista")
+
+    def __init__(self, quantidade: int = 0):
+        self.quantidade = quantidade
+        self.lista: Optional[List[Any]] = None
+
+    def _materializar(self) -> List[Any]:
+        if self.lista is None:
+            self.lista = [None] * self.quantidade
+        return self.lista
+
+    def _indice(self, indice: int) -> int:
+        if not -self.quantidade <= indice < self.quantidade:
+            raise IndexError("Índice fora da lista de valores.")
+        return indice
+
+    def __len__(self) -> int:
+        return self.quantidade if self.lista is None else len(self.lista)
+
+    def __getitem__(self, indice: Union[int, slice]) -> Any:
+        if self.lista is not None:
+            if isinstance(indice, slice):
+                fatia = ValoresNulos()
+                fatia.lista = self.lista[indice]
+                return fatia
+            return self.lista[indice]
+        if isinstance(indice, slice):
+            return ValoresNulos(len(range(*indice.indices(self.quantidade))))
+        self._indice(indice)
+        return None
 
-    def buscar(self, chaveProcurada: int) -> Optional[Tuple['NoArvoreB', int]]:
+    def __setitem__(self, indice: Union[int, slice], valor: Any) -> None:
+        if self.lista is None and not isinstance(indice, slice) and valor is None:
+            self._indice(indice)
+        else:
+            self._materializar()[indice] = valor
+
+    def __delitem__(self, indice: Union[int, slice]) -> None:
+        if self.lista is not None:
+            del self.lista[indice]
+        elif isinstance(indice, slice):
+            self.quantidade -= len(range(*indice.indices(self.quantidade)))
+        else:
+            self._indice(indice)
+            self.quantidade -= 1
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.lista) if self.lista is not None else repeat(None, self.quantidade)
+
+    def __eq__(self, outra: Any) -> bool:
+        if not isinstance(outra, (ValoresNulos, list)):
+            return NotImplemented
+        return len(self) == len(outra) and list(self) == list(outra)
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"ValoresNulos({list(self)})"
+
+    def append(self, valor: Any) -> None:
+        if self.lista is None and valor is None:
+            self.quantidade += 1
+        else:
+            self._materializar().append(valor)
+
+    def insert(self, indice: int, valor: Any) -> None:
+        if self.lista is None and valor is None:
+            self.quantidade += 1
+        else:
+            self._materializar().insert(indice, valor)
+
+    def extend(self, valores: Iterable[Any]) -> None:
+        if self.lista is None:
+            if isinstance(valores, ValoresNulos) and valores.lista is None:
+                self.quantidade += valores.quantidade
+                return
+            valores = list(valores)
+            if valores.count(None) == len(valores):
+                self.quantidade += len(valores)
+                return
+        self._materializar().extend(valores)
+
+    def pop(self, indice: int = -1) -> Any:
+        if self.lista is not None:
+            return self.lista.pop(indice)
+        self._indice(indice)
+        self.quantidade -= 1
+        return None
+
+    def count(self, valor: Any) -> int:
+        if self.lista is not None:
+            return self.lista.count(valor)
+        return self.quantidade if valor is None else 0
+
+
+@icontract.invariant(lambda self: self.chaves.tolist() == sorted(self.chaves), "As chaves devem estar sempre ordenadas", enabled=CONTRATOS_HABILITADOS)
+@icontract.invariant(lambda self: len(self.valores) == len(self.chaves), "Cada chave deve ter um valor associado", enabled=CONTRATOS_HABILITADOS)
+class NoArvoreBCompacto(_NoBase):
+    """
+    Representação compacta de um nó, com a mesma interface de `NoArvoreB`. Usa `__slots__`
+    em vez de um `__dict__` por instância e guarda as chaves em um `array('q')`, isto é,
+    inteiros de 64 bits contíguos em vez de uma lista de objetos `int`. Os valores ficam em
+    uma `ValoresNulos`, que não ocupa um ponteiro por chave enquanto todos eles são None.
+
+    Só aceita chaves inteiras no intervalo de 64 bits com sinal.
+
+    Atributos:
+        folha (bool): Verdadeiro se o nó é uma folha.
+        chaves (array): As chaves do nó, em um array de inteiros de 64 bits.
+        valores (ValoresNulos): Os valores associados às chaves, na mesma posição de cada chave.
+        filhos (List['NoArvoreBCompacto']): A lista de referências para os nós filhos.
+        total (int): O número de chaves na subárvore deste nó, incluindo as dele.
+    """
+    __slots__ = ("folha", "chaves", "valores", "filhos", "total")
+
+    def __init__(self, folha: bool = False):
         """
-        Busca uma chave a partir deste nó, descendo recursivamente se necessário.
+        Construtor da classe.
 
         Argumentos:
-            chaveProcurada (int): A chave que está sendo buscada.
-
-        REtorna:
-            Optional[Tuple['NoArvoreB', int]]: Uma tupla contendo o nó e o índice onde a
-                                               chave foi encontrada. Retorna None se a chave
-                                               não for encontrada na subárvore a partir deste nó.
+            folha (bool): Especifica se o nó a ser criado é uma folha.
+                          Por padrão, é inicializado como Falso.
         """
-        i = 0
-        # Enquanto a chave for menor que a procurada, continua procurando
-        while i < len(self.chaves) and chaveProcurada > self.chaves[i]:
-            i += 1
-        
-        # Condição de sucesso: Se achou a chave procurada, retorna ela e seu índice.
-        if i < len(self.chaves) and chaveProcurada == self.chaves[i]:
-            return (self, i)
-        
-        # Caso base: Se chegou em um nó e não é a chave, não está nessa subárvore
-        if self.folha:
-            return None
-        # Se não é folha, continua buscando dentro dos filhos do nó
-        else:
-            return self.filhos[i].buscar(chaveProcurada)
\ No newline at end of file
+        self.folha = folha
+        self.chaves = array("q")
+        self.valores = ValoresNulos()
+        self.filhos: List['NoArvoreBCompacto'] = []
+        self.total = 0
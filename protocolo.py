@@ -0,0 +1,209 @@
+import asyncio
+import struct
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Quadro: tamanho do restante do quadro (u32), identificador do pedido (u32) e código (u8),
+# que nos pedidos é a operação e nas respostas é o estado. Em seguida vêm os argumentos (ou
+# os resultados), codificados um após o outro por `codificarValor`.
+CABECALHO = struct.Struct("<IIB")
+
+# Maior quadro aceito, para que um tamanho corrompido não faça o leitor esperar gigabytes.
+TAMANHO_MAXIMO = 16 * 1024 * 1024
+
+# Operações. Argumentos -> resultados de cada uma:
+#   BUSCAR(chave) -> (encontrada, valor)
+#   INSERIR(chave, valor) -> (inserida,)              como `ArvoreB.put`
+#   REMOVER(chave) -> (removida, valor)
+#   INTERVALO(inicio, fim, limite) -> (chave, valor, chave, valor, ...)
+#                                     as até `limite` primeiras chaves em [inicio, fim)
+#   ESTATISTICAS() -> (pedidos, lotes, conexoes)
+BUSCAR = 1
+INSERIR = 2
+REMOVER = 3
+INTERVALO = 4
+ESTATISTICAS = 5
+
+# Número de argumentos de cada operação.
+ARGUMENTOS = {BUSCAR: 1, INSERIR: 2, REMOVER: 1, INTERVALO: 3, ESTATISTICAS: 0}
+
+# Estados das respostas. Com ERRO, o único resultado é a mensagem.
+OK = 0
+ERRO = 1
+
+# Códigos de tipo dos valores.
+_NENHUM = 0
+_FALSO = 1
+_VERDADEIRO = 2
+_INTEIRO = 3
+_INTEIRO_LONGO = 4
+_REAL = 5
+_TEXTO = 6
+_BYTES = 7
+_TUPLA = 8
+
+_INTEIRO_64 = struct.Struct("<q")
+_REAL_64 = struct.Struct("<d")
+_TAMANHO = struct.Struct("<I")
+_LIMITE_64 = 1 << 63
+
+
+class ErroDeProtocolo(ValueError):
+    """
+    Lançada quando um quadro ou valor recebido não segue o protocolo.
+    """
+
+
+class ErroRemoto(Exception):
+    """
+    Lançada pelo cliente quando o servidor responde a um pedido com erro. A mensagem é a
+    da exceção lançada no servidor.
+    """
+
+
+def codificarValor(valor: Any, saida: bytearray) -> None:
+    """
+    Acrescenta um valor à saída: um byte com o tipo seguido do conteúdo. São aceitos None,
+    bool, int, float, str, bytes e tuplas desses tipos; ao contrário do pickle, decodificar
+    um valor recebido pela rede nunca executa código.
+
+    Argumentos:
+        valor (Any): O valor a ser codificado.
+        saida (bytearray): Onde o valor é acrescentado.
+
+    Exceções:
+        TypeError: Se o valor (ou um elemento de uma tupla) for de outro tipo.
+    """
+    tipo = type(valor)
+    if tipo is int:
+        if -_LIMITE_64 <= valor < _LIMITE_64:
+            saida.append(_INTEIRO)
+            saida += _INTEIRO_64.pack(valor)
+        else:
+            conteudo = valor.to_bytes((valor.bit_length() + 8) // 8, "little", signed=True)
+            saida.append(_INTEIRO_LONGO)
+            saida += _TAMANHO.pack(len(conteudo))
+            saida += conteudo
+    elif valor is None:
+        saida.append(_NENHUM)
+    elif tipo is bool:
+        saida.append(_VERDADEIRO if valor else _FALSO)
+    elif tipo is str:
+        conteudo = valor.encode("utf-8")
+        saida.append(_TEXTO)
+        saida += _TAMANHO.pack(len(conteudo))
+        saida += conteudo
+    elif tipo is bytes:
+        saida.append(_BYTES)
+        saida += _TAMANHO.pack(len(valor))
+        saida += valor
+    elif tipo is float:
+        saida.append(_REAL)
+        saida += _REAL_64.pack(valor)
+    elif tipo is tuple:
+        saida.append(_TUPLA)
+        saida += _TAMANHO.pack(len(valor))
+        for elemento in valor:
+            codificarValor(elemento, saida)
+    else:
+        raise TypeError(f"Valores do tipo {tipo.__name__} não podem ser enviados pelo protocolo.")
+
+
+def decodificarValor(dados: bytes, posicao: int) -> Tuple[Any, int]:
+    """
+    Decodifica o valor que começa em `posicao`.
+
+    Retorna:
+        Tuple[Any, int]: O valor e a posição logo depois dele.
+
+    Exceções:
+        ErroDeProtocolo: Se o tipo for desconhecido ou o valor passar do fim dos dados.
+    """
+    try:
+        tipo = dados[posicao]
+        posicao += 1
+        if tipo == _INTEIRO:
+            return _INTEIRO_64.unpack_from(dados, posicao)[0], posicao + 8
+        if tipo == _NENHUM:
+            return None, posicao
+        if tipo == _FALSO or tipo == _VERDADEIRO:
+            return tipo == _VERDADEIRO, posicao
+        if tipo == _REAL:
+            return _REAL_64.unpack_from(dados, posicao)[0], posicao + 8
+        if tipo == _TUPLA:
+            quantidade = _TAMANHO.unpack_from(dados, posicao)[0]
+            posicao += 4
+            elementos = []
+            for _ in range(quantidade):
+                elemento, posicao = decodificarValor(dados, posicao)
+                elementos.append(elemento)
+            return tuple(elementos), posicao
+        if tipo in (_TEXTO, _BYTES, _INTEIRO_LONGO):
+            tamanho = _TAMANHO.unpack_from(dados, posicao)[0]
+            inicio, posicao = posicao + 4, posicao + 4 + tamanho
+            if posicao > len(dados):
+                raise ErroDeProtocolo("Valor truncado.")
+            conteudo = bytes(dados[inicio:posicao])
+            if tipo == _TEXTO:
+                return conteudo.decode("utf-8"), posicao
+            if tipo == _BYTES:
+                return conteudo, posicao
+            return int.from_bytes(conteudo, "little", signed=True), posicao
+    except (IndexError, struct.error, UnicodeDecodeError, RecursionError) as erro:
+        raise ErroDeProtocolo(f"Valor malformado: {erro}") from None
+    raise ErroDeProtocolo(f"Tipo de valor desconhecido: {tipo}.")
+
+
+def codificarQuadro(identificador: int, codigo: int, valores: Sequence[Any]) -> bytearray:
+    """
+    Monta um quadro completo, com o cabeçalho e os valores.
+
+    Argumentos:
+        identificador (int): O identificador do pedido, devolvido na resposta.
+        codigo (int): A operação (nos pedidos) ou o estado (nas respostas).
+        valores (Sequence[Any]): Os argumentos ou os resultados.
+
+    Retorna:
+        bytearray: O quadro, pronto para ser escrito no socket.
+    """
+    quadro = bytearray(CABECALHO.size)
+    for valor in valores:
+        codificarValor(valor, quadro)
+    CABECALHO.pack_into(quadro, 0, len(quadro) - 4, identificador, codigo)
+    return quadro
+
+
+def decodificarValores(dados: bytes) -> List[Any]:
+    """
+    Decodifica todos os valores do conteúdo de um quadro.
+    """
+    valores = []
+    posicao = 0
+    while posicao < len(dados):
+        valor, posicao = decodificarValor(dados, posicao)
+        valores.append(valor)
+    return valores
+
+
+async def lerQuadro(leitor: asyncio.StreamReader) -> Optional[Tuple[int, int, bytes]]:
+    """
+    Lê o próximo quadro de uma conexão.
+
+    Retorna:
+        Optional[Tuple[int, int, bytes]]: O identificador, o código e o conteúdo do quadro,
+                                          ou None se a conexão foi fechada entre quadros.
+
+    Exceções:
+        ErroDeProtocolo: Se o tamanho do quadro for inválido.
+        asyncio.IncompleteReadError: Se a conexão for fechada no meio de um quadro.
+    """
+    try:
+        cabecalho = await leitor.readexactly(CABECALHO.size)
+    except asyncio.IncompleteReadError as erro:
+        if not erro.partial:
+            return None
+        raise
+    tamanho, identificador, codigo = CABECALHO.unpack(cabecalho)
+    if not CABECALHO.size - 4 <= tamanho <= TAMANHO_MAXIMO:
+        raise ErroDeProtocolo(f"Tamanho de quadro inválido: {tamanho}.")
+    conteudo = await leitor.readexactly(tamanho - (CABECALHO.size - 4))
+    return identificador, codigo, conteudo
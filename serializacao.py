@@ -0,0 +1,292 @@
+import gc
+import mmap
+import pickle
+import struct
+import sys
+from array import array
+from collections import deque
+from itertools import repeat
+from typing import Any, BinaryIO, List, Tuple
+
+# Assinatura e versão, no início do arquivo.
+_PREFIXO = struct.Struct("<4sH")
+_ASSINATURA = b"ARVS"
+_VERSAO = 2
+
+# Cabeçalho: assinatura, versão, indicadores (bit 0: nós compactos; bit 1: há
+# valores), largura das chaves em bytes (0 se as chaves estão serializadas com pickle),
+# ordem, altura, número de chaves e número de nós.
+#
+# Em seguida vêm três seções contíguas, que são lidas de uma vez cada uma:
+#   1. O número de chaves de cada nó, em ordem de níveis (inteiros de 32 bits). Como todas
+#      as folhas estão no último nível, a altura basta para saber quais nós são folhas.
+#   2. Todas as chaves, também em ordem de níveis, com a menor largura fixa (1, 2, 4 ou 8
+#      bytes) que comporta todas elas; ou, se alguma não é inteira de 64 bits, a lista
+#      serializada com pickle, precedida do seu tamanho.
+#   3. Se algum valor é diferente de None, a lista de todos os valores, na mesma ordem das
+#      chaves, serializada com pickle e precedida do seu tamanho.
+_CABECALHO = struct.Struct("<4sHBBIIQQ")
+_TAMANHO_SECAO = struct.Struct("<Q")
+_COMPACTO = 1
+_COM_VALORES = 2
+
+# Tipos de `array` de cada largura de chave.
+_TIPOS_CHAVE = {1: "b", 2: "h", 4: "i", 8: "q"}
+
+
+def _codificarChaves(chaves: Any) -> Tuple[int, bytes]:
+    """
+    Codifica as chaves com a menor largura fixa que comporta todas elas ou, se alguma não
+    é um inteiro de 64 bits, com pickle.
+
+    Argumentos:
+        chaves (Any): As chaves, em uma lista ou em um array('q'), que pode ser reaproveitado
+                      (e ter os bytes invertidos, em máquinas big-endian).
+
+    Retorna:
+        Tuple[int, bytes]: A largura em bytes (0 para pickle) e as chaves codificadas.
+    """
+    try:
+        menor = min(chaves, default=0)
+        maior = max(chaves, default=0)
+        for largura, tipo in _TIPOS_CHAVE.items():
+            limite = 1 << (8 * largura - 1)
+            if -limite <= menor and maior < limite:
+                dados = chaves if isinstance(chaves, array) and chaves.typecode == tipo else array(tipo, chaves)
+                return largura, _paraLittleEndian(dados).tobytes()
+    except TypeError:
+        pass
+    return 0, pickle.dumps(list(chaves), protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _paraLittleEndian(dados: array) -> array:
+    """
+    Garante que o array esteja em little-endian, a ordem de bytes do arquivo. Como a
+    conversão é a mesma nos dois sentidos, serve tanto para gravar quanto para ler.
+    """
+    if sys.byteorder != "little":
+        dados.byteswap()
+    return dados
+
+
+def gravarArvore(arvore: Any, arquivo: BinaryIO) -> None:
+    """
+    Grava a estrutura de nós de uma árvore em um arquivo binário compacto.
+
+    Os nós são percorridos nível a nível: os filhos de cada nível aparecem em sequência
+    logo depois dos nós do nível anterior, então a estrutura pode ser remontada apenas com
+    o número de chaves de cada nó, sem guardar referências. As chaves de todos os nós são
+    gravadas juntas, em uma única seção de largura fixa.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore a ser gravada.
+        arquivo (BinaryIO): O arquivo, aberto para escrita binária.
+    """
+    nos: List[Any] = []
+    if arvore.raiz is not None:
+        fila = deque([arvore.raiz])
+        while fila:
+            no = fila.popleft()
+            nos.append(no)
+            if not no.folha:
+                fila.extend(no.filhos)
+
+    # Nós compactos juntam as chaves em um array, sem criar um objeto int para cada uma.
+    chaves: Any = array("q") if arvore.compacto else []
+    valores: List[Any] = []
+    com_valores = False
+    for no in nos:
+        chaves.extend(no.chaves)
+        valores.extend(no.valores)
+        com_valores = com_valores or no.valores.count(None) != len(no.valores)
+    largura, chaves_codificadas = _codificarChaves(chaves)
+
+    indicadores = (_COMPACTO if arvore.compacto else 0) | (_COM_VALORES if com_valores else 0)
+    arquivo.write(_CABECALHO.pack(_ASSINATURA, _VERSAO, indicadores, largura, arvore.ordem,
+                                  arvore._calcularAltura(), len(chaves), len(nos)))
+    arquivo.write(_paraLittleEndian(array("I", (len(no.chaves) for no in nos))).tobytes())
+    if largura:
+        arquivo.write(chaves_codificadas)
+    else:
+        _gravarSecao(arquivo, chaves_codificadas)
+    if com_valores:
+        _gravarSecao(arquivo, pickle.dumps(valores, protocol=pickle.HIGHEST_PROTOCOL))
+
+
+def _gravarSecao(arquivo: BinaryIO, dados: bytes) -> None:
+    arquivo.write(_TAMANHO_SECAO.pack(len(dados)))
+    arquivo.write(dados)
+
+
+def lerCabecalho(dados: Any) -> Tuple[int, bool]:
+    """
+    Lê, do início de um arquivo de árvore, a ordem e se os nós eram compactos.
+
+    Argumentos:
+        dados (Any): O conteúdo do arquivo (ou pelo menos o seu início), como bytes, mmap
+                     ou qualquer objeto com o protocolo de buffer.
+
+    Retorna:
+        Tuple[int, bool]: A ordem da árvore gravada e se ela usava nós compactos.
+    """
+    _verificarPrefixo(dados)
+    _, _, indicadores, _, ordem, _, _, _ = _CABECALHO.unpack_from(dados)
+    return ordem, bool(indicadores & _COMPACTO)
+
+
+def _verificarPrefixo(dados: Any) -> None:
+    if len(dados) < _CABECALHO.size:
+        raise ValueError("Arquivo de árvore truncado.")
+    assinatura, versao = _PREFIXO.unpack_from(dados)
+    if assinatura != _ASSINATURA:
+        raise ValueError("O arquivo não contém uma Árvore B serializada.")
+    if versao != _VERSAO:
+        raise ValueError(f"Versão {versao} do arquivo de árvore não suportada.")
+
+
+def carregarArvore(arquivo: BinaryIO, arvore: Any) -> None:
+    """
+    Lê uma árvore gravada por `gravarArvore` para dentro de uma árvore vazia, recriando os
+    nós diretamente, sem inserir chave por chave. O arquivo é lido com uma única leitura.
+
+    Os valores, e as chaves que não são inteiros de 64 bits, são lidos com pickle, que pode
+    executar código arbitrário: carregue apenas arquivos de origem confiável.
+
+    Argumentos:
+        arquivo (BinaryIO): O arquivo, aberto para leitura binária.
+        arvore (ArvoreB): A árvore que recebe os nós, com a mesma ordem da gravada.
+    """
+    carregarDeBuffer(arquivo.read(), arvore)
+
+
+def carregarDeArquivo(caminho: str, arvore: Any) -> None:
+    """
+    Carrega a árvore gravada em um arquivo mapeando-o em memória (`mmap`), de modo que as
+    seções de chaves são copiadas diretamente do cache de páginas do sistema para os nós.
+
+    Os valores, e as chaves que não são inteiros de 64 bits, são lidos com pickle, que pode
+    executar código arbitrário: carregue apenas arquivos de origem confiável.
+
+    Argumentos:
+        caminho (str): O caminho do arquivo.
+        arvore (ArvoreB): A árvore que recebe os nós, com a mesma ordem da gravada.
+    """
+    with open(caminho, "rb") as arquivo:
+        with mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            carregarDeBuffer(mapa, arvore)
+
+
+def carregarDeBuffer(dados: Any, arvore: Any) -> None:
+    """
+    Remonta, dentro de uma árvore vazia, a árvore gravada por `gravarArvore`.
+
+    Os valores, e as chaves que não são inteiros de 64 bits, são lidos com pickle, que pode
+    executar código arbitrário: carregue apenas arquivos de origem confiável.
+
+    Argumentos:
+        dados (Any): O conteúdo do arquivo, como bytes, mmap ou qualquer objeto com o
+                     protocolo de buffer.
+        arvore (ArvoreB): A árvore que recebe os nós, com a mesma ordem da gravada.
+    """
+    ordem, _ = lerCabecalho(dados)
+    if ordem != arvore.ordem:
+        raise ValueError(f"O arquivo contém uma árvore de ordem {ordem}, não {arvore.ordem}.")
+    # Os nós novos não formam ciclos; sem a coleta de lixo, a criação de milhares deles não
+    # dispara varreduras repetidas sobre os objetos já carregados.
+    coleta_habilitada = gc.isenabled()
+    gc.disable()
+    try:
+        with memoryview(dados) as visao:
+            _remontarNos(visao, arvore)
+    finally:
+        if coleta_habilitada:
+            gc.enable()
+    arvore._recalcularTotais()
+
+
+def _remontarNos(visao: memoryview, arvore: Any) -> None:
+    _, _, indicadores, largura, _, altura, tamanho, quantidade_nos = _CABECALHO.unpack_from(visao)
+    posicao = _CABECALHO.size
+
+    quantidades = array("I")
+    quantidades.frombytes(_fatia(visao, posicao, 4 * quantidade_nos))
+    _paraLittleEndian(quantidades)
+    posicao += 4 * quantidade_nos
+    if sum(quantidades) != tamanho:
+        raise ValueError("Arquivo de árvore corrompido: o número de chaves não confere.")
+
+    if largura:
+        chaves = array(_TIPOS_CHAVE[largura])
+        chaves.frombytes(_fatia(visao, posicao, largura * tamanho))
+        _paraLittleEndian(chaves)
+        posicao += largura * tamanho
+        # Os nós compactos copiam fatias de um array('q'); os demais, de uma lista.
+        todas = chaves if arvore.compacto and largura == 8 else (
+            array("q", chaves) if arvore.compacto else chaves.tolist())
+    else:
+        dados_chaves, posicao = _lerSecao(visao, posicao)
+        todas = pickle.loads(dados_chaves)
+    if indicadores & _COM_VALORES:
+        dados_valores, posicao = _lerSecao(visao, posicao)
+        valores = pickle.loads(dados_valores)
+    else:
+        valores = None
+
+    # Os nós de cada nível; a quantidade de nós do nível seguinte é a soma dos filhos.
+    nos: List[Any] = []
+    inicio_chaves = 0
+    no_nivel = 1 if quantidade_nos else 0
+    for profundidade in range(altura + 1):
+        if len(nos) + no_nivel > quantidade_nos:
+            raise ValueError("Arquivo de árvore corrompido: a estrutura não confere.")
+        folha = profundidade == altura
+        filhos_do_proximo = 0
+        for indice in range(len(nos), len(nos) + no_nivel):
+            quantidade = quantidades[indice]
+            no = arvore._novoNo(folha=folha)
+            fim_chaves = inicio_chaves + quantidade
+            no.chaves = todas[inicio_chaves:fim_chaves]
+            if valores is not None:
+                no.valores.extend(valores[inicio_chaves:fim_chaves])
+            else:
+                no.valores.extend(repeat(None, quantidade))
+            inicio_chaves = fim_chaves
+            filhos_do_proximo += quantidade + 1
+            nos.append(no)
+        no_nivel = filhos_do_proximo
+    if len(nos) != quantidade_nos:
+        raise ValueError("Arquivo de árvore corrompido: a estrutura não confere.")
+
+    _ligarFilhos(nos)
+    arvore.raiz = nos[0] if nos else None
+    arvore._tamanho = tamanho
+    arvore._altura = altura if nos else 0
+
+
+def _ligarFilhos(nos: List[Any]) -> None:
+    """
+    Liga cada nó interno aos seus filhos, que aparecem em sequência na ordem de níveis.
+    """
+    proximo_filho = 1
+    for no in nos:
+        if not no.folha:
+            no.filhos.extend(nos[proximo_filho:proximo_filho + len(no.chaves) + 1])
+            proximo_filho += len(no.chaves) + 1
+
+
+def _fatia(visao: memoryview, posicao: int, tamanho: int) -> memoryview:
+    """
+    Obtém exatamente `tamanho` bytes a partir de `posicao`, falhando se o arquivo terminar antes.
+    """
+    if posicao + tamanho > len(visao):
+        raise ValueError("Arquivo de árvore truncado.")
+    return visao[posicao:posicao + tamanho]
+
+
+def _lerSecao(visao: memoryview, posicao: int) -> Tuple[memoryview, int]:
+    """
+    Lê uma seção precedida do seu tamanho, retornando-a e a posição seguinte a ela.
+    """
+    (tamanho,) = _TAMANHO_SECAO.unpack(_fatia(visao, posicao, _TAMANHO_SECAO.size))
+    posicao += _TAMANHO_SECAO.size
+    return _fatia(visao, posicao, tamanho), posicao + tamanho
@@ -0,0 +1,355 @@
+import argparse
+import asyncio
+from typing import Any, List, Optional, Set, Tuple
+from arvoreB import ArvoreB
+from protocolo import (ARGUMENTOS, BUSCAR, ERRO, ESTATISTICAS, INSERIR, INTERVALO, OK, REMOVER,
+                       ErroDeProtocolo, codificarQuadro, decodificarValores, lerQuadro)
+
+# Marcador para chaves ausentes em `pop`, distinto de qualquer valor armazenado.
+_AUSENTE = object()
+
+# Um pedido na fila do dono da árvore: a conexão, o identificador, a operação e os argumentos.
+Pedido = Tuple['_Conexao', int, int, List[Any]]
+
+
+class _Conexao:
+    """
+    O estado de uma conexão de cliente: as respostas prontas para serem escritas e as vagas
+    de pedidos em andamento, que limitam quantos pedidos da conexão aguardam resposta.
+    """
+
+    def __init__(self, escritor: asyncio.StreamWriter, em_voo: int):
+        self.escritor = escritor
+        self.emVoo = em_voo
+        self.vagas = asyncio.Semaphore(em_voo)
+        self.saida: List[bytes] = []
+        self.pronta = asyncio.Event()
+        self.fechada = False
+
+    def responder(self, identificador: int, estado: int, resultados: List[Any]) -> None:
+        """
+        Enfileira a resposta de um pedido, escrita pela tarefa de escrita da conexão. Se a
+        conexão caiu, a resposta é descartada e a vaga do pedido, devolvida.
+        """
+        if self.fechada:
+            self.vagas.release()
+            return
+        try:
+            quadro = codificarQuadro(identificador, estado, resultados)
+        except TypeError as erro:
+            quadro = codificarQuadro(identificador, ERRO, [str(erro)])
+        self.saida.append(quadro)
+        self.pronta.set()
+
+
+class ServidorArvoreB:
+    """
+    Servidor asyncio que compartilha uma `ArvoreB` entre processos por TCP ou por um socket
+    Unix, com o protocolo binário de `protocolo.py`.
+
+    Cada conexão aceita vários pedidos em andamento (pipelining): uma tarefa lê os quadros e
+    os coloca em uma fila única, e as respostas, identificadas pelo pedido, voltam em
+    qualquer ordem. Uma única tarefa, a dona da árvore, consome a fila: a cada rodada ela
+    retira todos os pedidos já enfileirados (até `loteMaximo`) e executa cada trecho de
+    buscas consecutivas com `buscar_muitos` e cada trecho de inserções consecutivas com
+    `inserir_muitos`, o que equivale a executá-los um a um na ordem de chegada. Como só a
+    dona toca a árvore, nenhuma trava é necessária.
+
+    A contrapressão vem de três limites: cada conexão tem no máximo `emVooPorConexao`
+    pedidos sem resposta (depois disso o servidor para de ler o socket dela, e o cliente,
+    de conseguir escrever); a fila única tem no máximo `pendentesMaximo` pedidos; e as
+    vagas de um pedido só são devolvidas depois que a sua resposta foi escrita, de modo que
+    um cliente que não lê as respostas também para de ser lido.
+
+    Atributos:
+        arvore (ArvoreB): A árvore servida.
+        loteMaximo (int): O maior número de pedidos executados por rodada.
+        pendentesMaximo (int): O tamanho da fila de pedidos.
+        emVooPorConexao (int): Quantos pedidos de uma conexão podem aguardar resposta.
+        pedidos (int): Pedidos executados.
+        lotes (int): Rodadas da dona da árvore; `pedidos / lotes` é o tamanho médio do lote.
+    """
+
+    def __init__(self, arvore: ArvoreB, lote_maximo: int = 256, pendentes_maximo: int = 4_096,
+                 em_voo_por_conexao: int = 256):
+        """
+        Cria o servidor, que só aceita conexões depois de `iniciar`.
+
+        Argumentos:
+            arvore (ArvoreB): A árvore servida.
+            lote_maximo (int): O maior número de pedidos executados por rodada; 1 desliga
+                               o agrupamento em lotes.
+            pendentes_maximo (int): O tamanho da fila de pedidos de todas as conexões.
+            em_voo_por_conexao (int): Quantos pedidos de uma conexão podem aguardar resposta.
+        """
+        if min(lote_maximo, pendentes_maximo, em_voo_por_conexao) < 1:
+            raise ValueError("Os limites do servidor devem ser pelo menos 1.")
+        self.arvore = arvore
+        self.loteMaximo = lote_maximo
+        self.pendentesMaximo = pendentes_maximo
+        self.emVooPorConexao = em_voo_por_conexao
+        self.pedidos = 0
+        self.lotes = 0
+        self._servidor: Optional[asyncio.AbstractServer] = None
+        self._fila: Optional['asyncio.Queue[Pedido]'] = None
+        self._dona: Optional[asyncio.Task] = None
+        self._tarefas: Set[asyncio.Task] = set()
+        self._conexoes: Set[_Conexao] = set()
+        self._fechado = False
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 0, caminho: Optional[str] = None) -> None:
+        """
+        Começa a aceitar conexões.
+
+        Argumentos:
+            host (str): O endereço TCP de escuta.
+            porta (int): A porta TCP; 0 escolhe uma porta livre (veja `endereco`).
+            caminho (Optional[str]): Se informado, escuta neste socket Unix em vez de TCP.
+        """
+        self._fechado = False
+        self._fila = asyncio.Queue(self.pendentesMaximo)
+        self._dona = asyncio.create_task(self._executarPedidos())
+        if caminho is not None:
+            self._servidor = await asyncio.start_unix_server(self._atender, caminho)
+        else:
+            self._servidor = await asyncio.start_server(self._atender, host, porta)
+
+    @property
+    def endereco(self) -> Any:
+        """
+        O endereço em que o servidor escuta: (host, porta) em TCP, o caminho em socket Unix.
+        """
+        return self._servidor.sockets[0].getsockname()
+
+    async def fechar(self) -> None:
+        """
+        Para de aceitar conexões, fecha as abertas e encerra a dona da árvore.
+        """
+        if self._servidor is None:
+            return
+        self._fechado = True
+        self._servidor.close()
+        for conexao in list(self._conexoes):
+            conexao.fechada = True
+            # Sem esperar o envio das respostas pendentes: um cliente que não lê travaria o
+            # fechamento.
+            conexao.escritor.transport.abort()
+        for tarefa in [*self._tarefas, self._dona]:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, self._dona, return_exceptions=True)
+        await self._servidor.wait_closed()
+        self._servidor = None
+
+    async def __aenter__(self) -> 'ServidorArvoreB':
+        return self
+
+    async def __aexit__(self, *excecao: Any) -> None:
+        await self.fechar()
+
+    # --- Conexões ---
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter) -> None:
+        """
+        Lê os pedidos de uma conexão e os coloca na fila, até o cliente fechá-la.
+        """
+        if self._fechado:
+            # Conexão aceita pelo sistema antes de `fechar`, mas atendida só depois.
+            escritor.transport.abort()
+            return
+        tarefa = asyncio.current_task()
+        self._tarefas.add(tarefa)
+        conexao = _Conexao(escritor, self.emVooPorConexao)
+        self._conexoes.add(conexao)
+        escrita = asyncio.create_task(self._escrever(conexao))
+        try:
+            while True:
+                quadro = await lerQuadro(leitor)
+                if quadro is None:
+                    break
+                identificador, operacao, conteudo = quadro
+                await conexao.vagas.acquire()
+                try:
+                    argumentos = decodificarValores(conteudo)
+                    if ARGUMENTOS.get(operacao) != len(argumentos):
+                        raise ErroDeProtocolo(f"Operação {operacao} com {len(argumentos)} argumentos.")
+                except ErroDeProtocolo as erro:
+                    conexao.responder(identificador, ERRO, [str(erro)])
+                    continue
+                await self._fila.put((conexao, identificador, operacao, argumentos))
+            # Espera as respostas dos pedidos em andamento antes de fechar.
+            for _ in range(conexao.emVoo):
+                await conexao.vagas.acquire()
+        except (ConnectionError, asyncio.IncompleteReadError, ErroDeProtocolo):
+            pass
+        except asyncio.CancelledError:
+            # Cancelada por `fechar`; terminar normalmente evita que o asyncio registre o
+            # cancelamento como um erro da conexão.
+            pass
+        finally:
+            conexao.fechada = True
+            escrita.cancel()
+            escritor.close()
+            self._conexoes.discard(conexao)
+            self._tarefas.discard(tarefa)
+
+    async def _escrever(self, conexao: _Conexao) -> None:
+        """
+        Escreve as respostas prontas de uma conexão, todas as acumuladas de uma vez, e só
+        devolve as vagas dos pedidos depois que o socket as aceitou.
+        """
+        try:
+            while True:
+                await conexao.pronta.wait()
+                conexao.pronta.clear()
+                quadros, conexao.saida = conexao.saida, []
+                conexao.escritor.write(b"".join(quadros))
+                await conexao.escritor.drain()
+                for _ in quadros:
+                    conexao.vagas.release()
+        except ConnectionError:
+            conexao.fechada = True
+            for _ in range(len(quadros) + len(conexao.saida)):
+                conexao.vagas.release()
+            conexao.saida.clear()
+
+    # --- A dona da árvore ---
+
+    async def _executarPedidos(self) -> None:
+        """
+        Retira da fila os pedidos já enfileirados, até `loteMaximo`, e os executa.
+        """
+        fila = self._fila
+        while True:
+            lote = [await fila.get()]
+            while len(lote) < self.loteMaximo and not fila.empty():
+                lote.append(fila.get_nowait())
+            self._executarLote(lote)
+            self.pedidos += len(lote)
+            self.lotes += 1
+            # Deixa as conexões lerem e escreverem antes da próxima rodada.
+            await asyncio.sleep(0)
+
+    def _executarLote(self, lote: List[Pedido]) -> None:
+        """
+        Executa um lote na ordem de chegada, agrupando os trechos de buscas e de inserções
+        consecutivas em uma única operação sobre a árvore.
+        """
+        inicio = 0
+        while inicio < len(lote):
+            operacao = lote[inicio][2]
+            fim = inicio + 1
+            if operacao in (BUSCAR, INSERIR):
+                while fim < len(lote) and lote[fim][2] == operacao:
+                    fim += 1
+            trecho = lote[inicio:fim]
+            if operacao == BUSCAR and len(trecho) > 1:
+                try:
+                    self._buscarTrecho(trecho)
+                except Exception:
+                    # A busca não altera a árvore: cada pedido é refeito sozinho para que só
+                    # o culpado (uma chave de tipo incomparável, por exemplo) receba o erro.
+                    for pedido in trecho:
+                        self._executarUm(pedido)
+            elif operacao == INSERIR and len(trecho) > 1:
+                self._inserirTrecho(trecho)
+            else:
+                for pedido in trecho:
+                    self._executarUm(pedido)
+            inicio = fim
+
+    def _valorGuardado(self, no: Any, indice: int) -> Any:
+        valor = no.valores[indice]
+        # Com `key`, a árvore guarda a chave original junto com o valor.
+        return valor if self.arvore.key is None else valor[1]
+
+    def _buscarTrecho(self, trecho: List[Pedido]) -> None:
+        resultados = self.arvore.buscar_muitos([pedido[3][0] for pedido in trecho])
+        for (conexao, identificador, _, _), resultado in zip(trecho, resultados):
+            if resultado is None:
+                conexao.responder(identificador, OK, [False, None])
+            else:
+                conexao.responder(identificador, OK, [True, self._valorGuardado(*resultado)])
+
+    def _inserirTrecho(self, trecho: List[Pedido]) -> None:
+        """
+        Insere um trecho de pedidos com `inserir_muitos`. Se ele falhar (uma chave
+        incomparável com as outras, que a função `key` recusa ou que os nós não aceitam),
+        nenhuma chave foi inserida, e cada pedido é refeito sozinho, para que só o culpado
+        receba o erro.
+        """
+        chaves = [pedido[3][0] for pedido in trecho]
+        try:
+            inseridas = self.arvore.inserir_muitos(chaves, [pedido[3][1] for pedido in trecho])
+        except Exception:
+            for pedido in trecho:
+                self._executarUm(pedido)
+            return
+        for (conexao, identificador, _, _), inserida in zip(trecho, inseridas):
+            conexao.responder(identificador, OK, [inserida])
+
+    def _executarUm(self, pedido: Pedido) -> None:
+        """
+        Executa um pedido sozinho, respondendo com erro se a operação lançar uma exceção.
+        """
+        conexao, identificador, operacao, argumentos = pedido
+        arvore = self.arvore
+        try:
+            if operacao == BUSCAR:
+                resultado = arvore.buscar(argumentos[0])
+                resultados = [False, None] if resultado is None else [True, self._valorGuardado(*resultado)]
+            elif operacao == INSERIR:
+                resultados = [arvore.put(argumentos[0], argumentos[1])]
+            elif operacao == REMOVER:
+                valor = arvore.pop(argumentos[0], _AUSENTE)
+                resultados = [False, None] if valor is _AUSENTE else [True, valor]
+            elif operacao == INTERVALO:
+                inicio, fim, limite = argumentos
+                if type(limite) is not int or limite < 1:
+                    raise ValueError("O limite do intervalo deve ser um inteiro positivo.")
+                resultados = []
+                for chave, valor in arvore.intervalo(inicio, fim, com_valores=True):
+                    if len(resultados) == 2 * limite:
+                        break
+                    resultados += (chave, valor)
+            else:
+                resultados = [self.pedidos, self.lotes, len(self._conexoes)]
+        except Exception as erro:
+            conexao.responder(identificador, ERRO, [f"{type(erro).__name__}: {erro}"])
+            return
+        conexao.responder(identificador, OK, resultados)
+
+
+async def servir(arvore: ArvoreB, host: str = "127.0.0.1", porta: int = 0, caminho: Optional[str] = None,
+                 **opcoes: Any) -> None:
+    """
+    Serve a árvore até a tarefa ser cancelada.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore servida.
+        host (str): O endereço TCP de escuta.
+        porta (int): A porta TCP.
+        caminho (Optional[str]): Se informado, escuta neste socket Unix em vez de TCP.
+        opcoes (Any): Os limites do `ServidorArvoreB`.
+    """
+    async with ServidorArvoreB(arvore, **opcoes) as servidor:
+        await servidor.iniciar(host, porta, caminho)
+        print(f"Servindo a árvore em {servidor.endereco}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve uma ArvoreB pela rede.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=7_070)
+    parser.add_argument("--unix", help="Caminho de um socket Unix, em vez de TCP.")
+    parser.add_argument("--ordem", type=int, default=64)
+    parser.add_argument("--lote", type=int, default=256)
+    args = parser.parse_args()
+    try:
+        asyncio.run(servir(ArvoreB(args.ordem), args.host, args.porta, args.unix, lote_maximo=args.lote))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,20 @@
+import itertools
+import os
+import random
+import struct
+import subprocess
+import sys
 import pytest
 import icontract
+from array import array
 from arvoreB import ArvoreB
+from chaves import codificarChave, empacotarInteiros
+from contratos import CONTRATOS_HABILITADOS
+from noArvoreB import NoArvoreBCompacto
+from validacao import ErroDeValidacao
+
+# Marca os testes que dependem da verificação dos contratos, desligada por ARVOREB_CONTRATOS=0.
+requerContratos = pytest.mark.skipif(not CONTRATOS_HABILITADOS, reason="Contratos desligados por ARVOREB_CONTRATOS.")
 
 # --- Fixtures dos estado base dos testes ---
 
@@ -42,6 +56,7 @@ def test_invariantes_de_propriedades_dos_nos(arvore_preenchida_ordem_3):
 
 # --- Testes para as Pré-condições ---
 
+@requerContratos
 def test_precondicao_inserir_chave_inexistente(arvore_preenchida_ordem_3):
     """
     Garante que inserção de chave existente viola o contrato.
@@ -62,6 +77,7 @@ def test_precondicao_inserir_chave_inexistente(arvore_preenchida_ordem_3):
     assert "A chave a ser inserida não deve existir na árvore" in str(e.value)
 
 
+@requerContratos
 def test_precondicao_remover_chave_existente(arvore_preenchida_ordem_3):
     """
     Testa a Pré-condição: "Chave a ser removida existe na árvore".
@@ -116,4 +132,875 @@ def test_poscondicao_fusao_diminui_altura():
     # Verificar redução de altura
     profundidades = []
     arvore._obterProfundidadesFolhas(arvore.raiz, 0, profundidades)
-    assert all(d == profundidades[0] for d in profundidades)
\ No newline at end of file
+    assert all(d == profundidades[0] for d in profundidades)
+
+# --- Testes para a carga em lote ---
+
+@pytest.mark.parametrize("ordem", [2, 3, 5])
+@pytest.mark.parametrize("fill_factor", [0.5, 0.75, 1.0])
+@pytest.mark.parametrize("quantidade", [1, 2, 7, 40, 333])
+def test_carga_em_lote_ordenada(ordem, fill_factor, quantidade):
+    """
+    Verifica se a árvore montada de baixo para cima a partir de um gerador
+    respeita todas as propriedades e contém todas as chaves.
+    """
+    arvore = ArvoreB.from_sorted((chave * 3 for chave in range(quantidade)), ordem, fill_factor)
+
+    assert arvore._verificarPropriedades(arvore.raiz)
+    assert arvore._todasFolhasNaMesmaProfundidade()
+    assert all(arvore.buscar(chave * 3) is not None for chave in range(quantidade))
+    assert arvore.buscar(1) is None
+
+def test_carga_em_lote_permite_insercoes_posteriores():
+    """
+    Garante que uma árvore carregada em lote continua aceitando inserções e remoções.
+    """
+    arvore = ArvoreB.from_sorted(range(0, 200, 2), ordem=3)
+
+    for chave in range(1, 200, 2):
+        arvore.inserir(chave)
+    for chave in range(0, 200, 4):
+        arvore.remover(chave)
+
+    assert arvore._verificarPropriedades(arvore.raiz)
+    assert arvore._todasFolhasNaMesmaProfundidade()
+
+def test_carga_em_lote_desordenada_remove_repeticoes():
+    """
+    Verifica se a variante desordenada ordena e descarta chaves repetidas.
+    """
+    arvore = ArvoreB.from_unsorted([5, 1, 9, 1, 5, 3, 7, 9], ordem=2)
+
+    assert arvore._verificarPropriedades(arvore.raiz)
+    assert all(arvore.buscar(chave) is not None for chave in [1, 3, 5, 7, 9])
+
+def test_carga_em_lote_rejeita_chaves_fora_de_ordem():
+    """
+    Verifica se a carga ordenada rejeita entradas fora de ordem ou repetidas.
+    """
+    with pytest.raises(ValueError):
+        ArvoreB.from_sorted([1, 3, 2], ordem=2)
+    with pytest.raises(ValueError):
+        ArvoreB.from_sorted([1, 1], ordem=2)
+
+
+# --- Testes para a busca binária nos nós ---
+
+@pytest.mark.parametrize("ordem", [2, 64, 256])
+def test_busca_binaria_encontra_todas_as_chaves(ordem):
+    """
+    Verifica se a busca encontra cada chave no nó e índice corretos e se inserções e
+    remoções baseadas na busca binária mantêm as propriedades da árvore.
+    """
+    arvore = ArvoreB(ordem)
+    chaves = random.Random(7).sample(range(100_000), 3_000)
+    for chave in chaves:
+        arvore.inserir(chave)
+    for chave in chaves[::3]:
+        arvore.remover(chave)
+
+    removidas = set(chaves[::3])
+    for chave in chaves:
+        resultado = arvore.buscar(chave)
+        if chave in removidas:
+            assert resultado is None
+        else:
+            no, indice = resultado
+            assert no.chaves[indice] == chave
+    assert arvore._verificarPropriedades(arvore.raiz)
+
+
+# --- Testes para o modo de produção (contratos desligados) ---
+
+def test_modo_producao_remove_contratos():
+    """
+    Verifica se, com ARVOREB_CONTRATOS=0, os decoradores do icontract não envolvem os métodos.
+    """
+    codigo = (
+        "from arvoreB import ArvoreB\n"
+        "from noArvoreB import NoArvoreB\n"
+        "assert not hasattr(ArvoreB.inserir, '__wrapped__')\n"
+        "assert not hasattr(ArvoreB.remover, '__wrapped__')\n"
+        "assert not hasattr(NoArvoreB.buscar, '__wrapped__')\n"
+    )
+    ambiente = dict(os.environ, ARVOREB_CONTRATOS="0")
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               env=ambiente, capture_output=True, text=True)
+
+    assert resultado.returncode == 0, resultado.stderr
+
+def test_modo_verificado_e_o_padrao():
+    """
+    Verifica se, sem a variável ARVOREB_CONTRATOS, os contratos são verificados.
+    """
+    codigo = (
+        "from arvoreB import ArvoreB\n"
+        "from contratos import CONTRATOS_HABILITADOS\n"
+        "assert CONTRATOS_HABILITADOS\n"
+        "assert hasattr(ArvoreB.inserir, '__wrapped__')\n"
+    )
+    ambiente = {nome: valor for nome, valor in os.environ.items() if nome != "ARVOREB_CONTRATOS"}
+    resultado = subprocess.run([sys.executable, "-c", codigo], cwd=os.path.dirname(os.path.abspath(__file__)),
+                               env=ambiente, capture_output=True, text=True)
+
+    assert resultado.returncode == 0, resultado.stderr
+
+
+# --- Testes para o mapa ordenado (chaves com valores) ---
+
+def _conferirValores(arvore, referencia):
+    """
+    Confere se cada chave da árvore tem o mesmo valor do dicionário de referência.
+    """
+    assert len(arvore) == len(referencia)
+    for chave, valor in referencia.items():
+        assert arvore[chave] == valor
+
+@pytest.mark.parametrize("ordem", [2, 3, 8])
+def test_mapa_acompanha_dicionario(ordem):
+    """
+    Executa operações aleatórias na árvore e em um dicionário, garantindo que os valores
+    acompanham as chaves em divisões, fusões e empréstimos.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB(ordem)
+    referencia = {}
+
+    for _ in range(3_000):
+        chave = aleatorio.randrange(300)
+        operacao = aleatorio.random()
+        if operacao < 0.5:
+            assert arvore.put(chave, f"v{chave}-{operacao}") == (chave not in referencia)
+            referencia[chave] = f"v{chave}-{operacao}"
+        elif operacao < 0.8:
+            assert arvore.pop(chave, None) == referencia.pop(chave, None)
+        else:
+            assert (chave in arvore) == (chave in referencia)
+            assert arvore.get(chave) == referencia.get(chave)
+
+    _conferirValores(arvore, referencia)
+    assert arvore._verificarPropriedades(arvore.raiz)
+
+def test_mapa_inserir_e_remover_com_valores(arvore_vazia_ordem_3):
+    """
+    Verifica a interface de mapa combinada com `inserir` e `remover`.
+    """
+    arvore = arvore_vazia_ordem_3
+    for chave in range(50):
+        arvore.inserir(chave, chave * 10)
+    arvore[7] = "sete"
+    del arvore[8]
+    arvore.remover(9)
+
+    assert arvore[7] == "sete"
+    assert 8 not in arvore and 9 not in arvore
+    assert len(arvore) == 48
+    with pytest.raises(KeyError):
+        arvore[8]
+    with pytest.raises(KeyError):
+        arvore.pop(9)
+
+def test_put_em_chave_existente_nao_divide_raiz():
+    """
+    Garante que atualizar uma chave da raiz cheia não divide a raiz.
+    """
+    arvore = ArvoreB(ordem=2)
+    for chave in [10, 20, 30]:
+        arvore.put(chave, chave)
+
+    assert arvore.put(20, "novo") is False
+    assert arvore.raiz.folha and arvore.raiz.chaves == [10, 20, 30]
+    assert arvore.raiz.valores == [10, "novo", 30]
+
+def test_carga_em_lote_com_valores():
+    """
+    Verifica a carga em lote a partir de pares (chave, valor).
+    """
+    ordenada = ArvoreB.from_sorted(((chave, -chave) for chave in range(500)), ordem=4, com_valores=True)
+    desordenada = ArvoreB.from_unsorted([(3, "a"), (1, "b"), (3, "c")], ordem=2, com_valores=True)
+
+    _conferirValores(ordenada, {chave: -chave for chave in range(500)})
+    _conferirValores(desordenada, {1: "b", 3: "c"})
+
+
+# --- Testes para a iteração em ordem e consultas por intervalo ---
+
+@pytest.fixture
+def arvore_aleatoria_ordem_3():
+    """
+    Retorna uma árvore B de ordem 3 com chaves pares aleatórias e o conjunto dessas chaves.
+    """
+    chaves = random.Random(3).sample(range(0, 2_000, 2), 400)
+    arvore = ArvoreB(ordem=3)
+    for chave in chaves:
+        arvore.inserir(chave, -chave)
+    return arvore, sorted(chaves)
+
+def test_iteracao_em_ordem_e_reversa(arvore_aleatoria_ordem_3):
+    """
+    Verifica se a iteração produz as chaves em ordem crescente e decrescente.
+    """
+    arvore, chaves = arvore_aleatoria_ordem_3
+
+    assert list(arvore) == chaves
+    assert list(reversed(arvore)) == chaves[::-1]
+    assert list(ArvoreB(ordem=2)) == []
+
+@pytest.mark.parametrize("inicio, fim", [(None, None), (0, 100), (101, 555), (554, 556), (1_990, None), (None, 7), (50, 50), (3_000, 4_000)])
+def test_intervalo(arvore_aleatoria_ordem_3, inicio, fim):
+    """
+    Compara o intervalo [inicio, fim) com a filtragem da lista ordenada de chaves.
+    """
+    arvore, chaves = arvore_aleatoria_ordem_3
+    esperado = [chave for chave in chaves if (inicio is None or chave >= inicio) and (fim is None or chave < fim)]
+
+    assert list(arvore.intervalo(inicio, fim)) == esperado
+    assert list(arvore.intervalo(inicio, fim, com_valores=True)) == [(chave, -chave) for chave in esperado]
+
+def test_seek_consome_apenas_o_necessario(arvore_aleatoria_ordem_3):
+    """
+    Verifica se o cursor parte da primeira chave maior ou igual à procurada.
+    """
+    arvore, chaves = arvore_aleatoria_ordem_3
+    posicao = chaves[100]
+
+    assert list(itertools.islice(arvore.seek(posicao), 5)) == chaves[100:105]
+    assert list(itertools.islice(arvore.seek(posicao + 1), 5)) == chaves[101:106]
+
+
+# --- Testes para a representação compacta dos nós ---
+
+def test_arvore_compacta_acompanha_dicionario():
+    """
+    Executa operações aleatórias em uma árvore compacta e confere chaves, valores e propriedades.
+    """
+    aleatorio = random.Random(6)
+    arvore = ArvoreB(ordem=3, compacto=True)
+    referencia = {}
+
+    for _ in range(3_000):
+        chave = aleatorio.randrange(-500, 500)
+        if aleatorio.random() < 0.6:
+            arvore.put(chave, str(chave))
+            referencia[chave] = str(chave)
+        else:
+            assert arvore.pop(chave, None) == referencia.pop(chave, None)
+
+    _conferirValores(arvore, referencia)
+    assert list(arvore) == sorted(referencia)
+    assert arvore._verificarPropriedades(arvore.raiz)
+    assert arvore._todasFolhasNaMesmaProfundidade()
+
+def test_arvore_compacta_usa_slots_e_array():
+    """
+    Verifica se os nós compactos não têm `__dict__` e guardam as chaves em um array.
+    """
+    arvore = ArvoreB.from_sorted(range(100), ordem=4, compacto=True)
+
+    assert isinstance(arvore.raiz, NoArvoreBCompacto)
+    assert not hasattr(arvore.raiz, "__dict__")
+    assert isinstance(arvore.raiz.chaves, array)
+    assert arvore._verificarPropriedades(arvore.raiz)
+    with pytest.raises(OverflowError):
+        arvore.put(2 ** 64)
+    with pytest.raises(OverflowError):
+        arvore.inserir_muitos([-1, 50, 150, 2 ** 64])
+    assert list(arvore) == list(range(100))
+
+def test_nos_compactos_sem_valores_nao_guardam_lista():
+    """
+    Verifica se os nós compactos de uma árvore sem valores guardam só a quantidade deles,
+    e se a lista de um nó é criada quando ele recebe o primeiro valor.
+    """
+    arvore = ArvoreB.from_sorted(range(200), ordem=4, compacto=True)
+    arvore.inserir_muitos(range(200, 300))
+    for chave in range(0, 300, 7):
+        arvore.remover(chave)
+    for no, _ in arvore._percorrer(None):
+        assert no.valores.lista is None and len(no.valores) == len(no.chaves)
+
+    arvore.put(1, "um")
+    no, indice = arvore.raiz.buscar(1)
+    assert no.valores.lista is not None and no.valores[indice] == "um"
+    assert no.valores == [None] * indice + ["um"] + [None] * (len(no.chaves) - indice - 1)
+    assert arvore.get(1) == "um" and arvore.get(2, "ausente") is None
+    assert arvore._verificarPropriedades(arvore.raiz)
+
+
+# --- Testes para as operações em lote ---
+
+@pytest.mark.parametrize("ordem", [2, 3, 16])
+def test_insercao_em_lote_equivale_a_put(ordem):
+    """
+    Compara lotes aleatórios (com repetições) com chamadas sucessivas de `put`.
+    """
+    aleatorio = random.Random(ordem)
+    em_lote = ArvoreB(ordem)
+    sequencial = ArvoreB(ordem)
+
+    for tamanho in [1, 10, 1_000, 50, 5_000]:
+        chaves = [aleatorio.randrange(8_000) for _ in range(tamanho)]
+        valores = [aleatorio.random() for _ in range(tamanho)]
+
+        assert em_lote.inserir_muitos(chaves, valores) == [sequencial.put(c, v) for c, v in zip(chaves, valores)]
+        assert em_lote._verificarPropriedades(em_lote.raiz)
+        assert em_lote._todasFolhasNaMesmaProfundidade()
+        assert list(em_lote.intervalo(com_valores=True)) == list(sequencial.intervalo(com_valores=True))
+        assert len(em_lote) == len(sequencial)
+
+def test_busca_em_lote_preserva_ordem_original(arvore_aleatoria_ordem_3):
+    """
+    Verifica se a busca em lote devolve o mesmo que `buscar`, na ordem original do lote.
+    """
+    arvore, chaves = arvore_aleatoria_ordem_3
+    consultas = array("q", [5, chaves[10], 3_000, chaves[0], chaves[-1], chaves[10], -1])
+
+    for consulta, resultado in zip(consultas, arvore.buscar_muitos(consultas)):
+        esperado = arvore.buscar(consulta)
+        if esperado is None:
+            assert resultado is None
+        else:
+            assert resultado[0] is esperado[0] and resultado[1] == esperado[1]
+    assert ArvoreB(ordem=2).buscar_muitos([1, 2]) == [None, None]
+
+
+# --- Testes para a validação incremental e completa ---
+
+@pytest.mark.parametrize("ordem", [2, 5])
+def test_validacao_incremental_acompanha_operacoes(ordem):
+    """
+    Verifica se a altura mantida e a validação de cada escrita acompanham operações
+    aleatórias, e se a validação completa não encontra erros.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB.from_sorted(range(0, 300, 2), ordem)
+    arvore.validacaoIncremental = True
+
+    for _ in range(3_000):
+        chave = aleatorio.randrange(1_000)
+        if aleatorio.random() < 0.55:
+            arvore.put(chave)
+        else:
+            arvore.pop(chave, None)
+    arvore.inserir_muitos(aleatorio.sample(range(2_000), 500))
+    # Um trecho longo, removido como intervalo, e chaves avulsas, removidas uma a uma.
+    arvore.remover_muitos(list(arvore)[10:60] + aleatorio.sample(range(2_000), 20))
+
+    relatorio = arvore.validar()
+    assert relatorio.valida, relatorio.erros
+    assert relatorio.altura == arvore._altura
+    assert relatorio.quantidadeChaves == len(arvore)
+    assert arvore._verificarPropriedades(arvore.raiz)
+
+def test_validacao_encontra_no_corrompido():
+    """
+    Verifica se um nó corrompido é apontado pelo relatório da validação completa e pela
+    validação incremental da próxima escrita que passa por ele.
+    """
+    arvore = ArvoreB(ordem=3, validacao_incremental=True)
+    for chave in range(100):
+        arvore.inserir(chave)
+
+    folha = arvore.raiz
+    while not folha.folha:
+        folha = folha.filhos[-1]
+    folha.chaves[0], folha.chaves[1] = folha.chaves[1], folha.chaves[0]
+
+    relatorio = arvore.validar()
+    assert not relatorio
+    assert len(relatorio.erros) == 1
+    assert relatorio.erros[0].profundidade == arvore._altura
+    assert "fora de ordem" in relatorio.erros[0].mensagem
+
+    with pytest.raises(ErroDeValidacao):
+        arvore.put(1_000)
+
+# --- Testes para as estatísticas de ordem ---
+
+@pytest.mark.parametrize("ordem, compacto", [(2, False), (3, True), (16, False)])
+def test_rank_select_e_contagem_acompanham_lista_ordenada(ordem, compacto):
+    """
+    Compara `rank`, `select` e `count_range` com uma lista ordenada, depois de inserções,
+    remoções e inserções em lote que dividem, fundem e redistribuem nós.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB.from_unsorted(aleatorio.sample(range(5_000), 700), ordem, fill_factor=0.6, compacto=compacto)
+    for _ in range(2_000):
+        chave = aleatorio.randrange(5_000)
+        if aleatorio.random() < 0.5:
+            arvore.put(chave)
+        else:
+            arvore.pop(chave, None)
+    arvore.inserir_muitos(aleatorio.sample(range(5_000, 9_000), 1_500))
+
+    chaves = list(arvore)
+    assert arvore.validar().valida
+    assert arvore.raiz.total == len(arvore) == len(chaves)
+    for indice in list(range(0, len(chaves), 7)) + [-1, -len(chaves)]:
+        assert arvore.select(indice) == chaves[indice]
+    for consulta in [-1, 0, chaves[0], chaves[100], chaves[100] + 1, 4_999, 5_000, chaves[-1], 10_000]:
+        assert arvore.rank(consulta) == sum(1 for chave in chaves if chave < consulta)
+    assert arvore.count_range(1_000, 7_000) == len(list(arvore.intervalo(1_000, 7_000)))
+    assert arvore.count_range(None, 3_000) == arvore.rank(3_000)
+    assert arvore.count_range(7_000, 1_000) == 0
+    with pytest.raises(IndexError):
+        arvore.select(len(chaves))
+    with pytest.raises(IndexError):
+        ArvoreB(ordem=2).select(0)
+
+# --- Testes para a remoção em lote e por intervalo ---
+
+@pytest.mark.parametrize("ordem, compacto", [(2, False), (3, True), (5, False), (16, True)])
+def test_remocao_por_intervalo_e_em_lote_acompanham_lista_ordenada(ordem, compacto):
+    """
+    Remove intervalos e lotes aleatórios, de tamanhos variados, e compara a árvore com uma
+    lista ordenada, conferindo as propriedades, a altura e os totais após cada operação.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB.from_unsorted(aleatorio.sample(range(20_000), 4_000), ordem, compacto=compacto)
+    arvore.inserir_muitos(aleatorio.sample(range(20_000, 30_000), 1_000))
+    referencia = list(arvore)
+
+    for passo in range(120):
+        if passo % 2 == 0:
+            inicio = aleatorio.choice([None, aleatorio.randrange(-10, 30_000)])
+            largura = aleatorio.choice([0, 1, 5, 50, 700])
+            fim = aleatorio.choice([None, (inicio or 0) + largura * 6])
+            esperado = [chave for chave in referencia
+                        if (inicio is not None and chave < inicio) or (fim is not None and chave >= fim)]
+            assert arvore.remover_intervalo(inicio, fim) == len(referencia) - len(esperado)
+            referencia = esperado
+        else:
+            lote = aleatorio.sample(range(30_000), aleatorio.choice([1, 10, 300]))
+            if referencia:
+                indice = aleatorio.randrange(len(referencia))
+                lote += referencia[indice:indice + 200] + lote[:3]
+            presentes = set(referencia)
+            esperado = []
+            for chave in lote:
+                esperado.append(chave in presentes)
+                presentes.discard(chave)
+            assert arvore.remover_muitos(lote) == esperado
+            referencia = sorted(presentes)
+        if not referencia:
+            arvore.inserir_muitos(aleatorio.sample(range(30_000), 3_000))
+            referencia = list(arvore)
+
+        relatorio = arvore.validar()
+        assert relatorio.valida, relatorio.erros
+        assert list(arvore) == referencia
+        assert arvore.raiz.total == len(arvore)
+
+def test_remocao_de_intervalo_inteiro_e_contiguo():
+    """
+    Remove blocos grandes e contíguos, inclusive a árvore inteira, e confere que a árvore
+    continua utilizável depois.
+    """
+    arvore = ArvoreB.from_sorted(range(100_000), ordem=8)
+    arvore.validacaoIncremental = True
+    assert arvore.remover_intervalo(10_000, 90_000) == 80_000
+    assert arvore.validar().valida
+    assert arvore.count_range() == 20_000
+    assert arvore.select(10_000) == 90_000
+    assert arvore.remover_intervalo(50, 50) == 0
+    assert arvore.remover_intervalo() == 20_000
+    assert len(arvore) == 0 and list(arvore) == []
+    assert arvore.validar().valida
+
+    arvore.inserir_muitos(range(10))
+    assert arvore.remover_muitos([3, 3, 9, 11]) == [True, False, True, False]
+    assert list(arvore) == [0, 1, 2, 4, 5, 6, 7, 8]
+    assert arvore.validar().valida
+
+# --- Testes para as métricas ---
+
+def test_metricas_contam_divisoes_fusoes_e_buscas():
+    """
+    Confere as contagens estruturais com as propriedades da árvore, o histograma de nós
+    visitados por busca e a duração das operações, que são medidas apenas no nível externo.
+    """
+    arvore = ArvoreB(ordem=2)
+    metricas = arvore.ativarMetricas()
+    for chave in range(500):
+        arvore.put(chave)
+
+    # Cada divisão cria um nó, e cada divisão da raiz cria também a nova raiz.
+    assert arvore.validar().quantidadeNos == 1 + metricas.divisoes + arvore._altura
+    assert metricas.fusoes == metricas.emprestimosDoAnterior == metricas.emprestimosDoProximo == 0
+
+    arvore.buscar(-1)
+    for chave in range(0, 500, 5):
+        arvore.buscar(chave)
+    instantaneo = metricas.instantaneo()
+    assert sum(instantaneo["nos_visitados"].values()) == 101
+    assert max(instantaneo["nos_visitados"]) == arvore._altura + 1
+    assert instantaneo["operacoes"]["put"]["chamadas"] == 500
+    assert instantaneo["operacoes"]["buscar"]["chamadas"] == 101
+
+    # A busca feita pelo contrato de `inserir` faz parte da própria inserção.
+    arvore.inserir(1_000)
+    arvore.remover(1_000)
+    instantaneo = metricas.instantaneo()
+    assert instantaneo["operacoes"]["buscar"]["chamadas"] == 101
+    assert instantaneo["operacoes"]["inserir"]["chamadas"] == instantaneo["operacoes"]["remover"]["chamadas"] == 1
+
+    for chave in range(500):
+        arvore.pop(chave)
+    assert metricas.fusoes > 0 and metricas.emprestimosDoAnterior + metricas.emprestimosDoProximo > 0
+    assert instantaneo["operacoes"]["inserir"]["maximo_ns"] >= instantaneo["operacoes"]["inserir"]["media_ns"] > 0
+
+def test_metricas_notificam_ouvintes_e_podem_ser_desativadas():
+    """
+    Verifica os eventos recebidos pelos ouvintes e se, desativadas, as métricas deixam os
+    métodos originais da classe.
+    """
+    arvore = ArvoreB.from_sorted(range(100), ordem=2)
+    eventos = []
+    metricas = arvore.ativarMetricas()
+    metricas.assinar(lambda tipo, nome, valor: eventos.append((tipo, nome)))
+
+    arvore.buscar(50)
+    arvore.inserir_muitos(range(100, 110))
+    arvore.put(110)
+    assert ("busca", "buscar") in eventos and ("operacao", "put") in eventos
+    assert ("estrutura", "divisoes") in eventos
+
+    arvore.desativarMetricas()
+    assert arvore.metricas is None and "buscar" not in vars(arvore)
+    quantidade = len(eventos)
+    arvore.put(111)
+    assert len(eventos) == quantidade
+
+    metricas.zerar()
+    assert metricas.instantaneo()["operacoes"] == {} and metricas.divisoes == 0
+
+# --- Testes para a gravação e a carga ---
+
+@pytest.mark.parametrize("chaves, compacto", [
+    (range(0, 3_000, 3), False),
+    (range(-100, 100), True),
+    (range(2 ** 40, 2 ** 40 + 5_000, 7), True),
+    ([-2 ** 63, 0, 2 ** 63 - 1], False),
+    (["ana", "bia", "caio", "davi"], False),
+    ([], False),
+])
+def test_dump_e_load_preservam_a_arvore(tmp_path, chaves, compacto):
+    """
+    Grava e carrega árvores com chaves de larguras diferentes (e não inteiras), com e sem
+    valores, e confere as chaves, os valores, as propriedades e as estatísticas de ordem.
+    """
+    caminho = str(tmp_path / "arvore.arvs")
+    arvore = ArvoreB.from_sorted(chaves, ordem=3, compacto=compacto)
+    arvore.dump(caminho)
+    carregada = ArvoreB.load(caminho)
+    assert carregada.compacto == compacto and carregada.ordem == 3
+    assert list(carregada) == list(chaves)
+    assert carregada.validar().valida
+    if len(carregada):
+        assert carregada.select(len(carregada) // 2) == list(chaves)[len(carregada) // 2]
+
+    arvore = ArvoreB.from_sorted([(chave, ("valor", chave)) for chave in chaves], ordem=5, com_valores=True)
+    arvore.dump(caminho)
+    carregada = ArvoreB.load(caminho, compacto=False)
+    assert list(carregada.intervalo(com_valores=True)) == list(arvore.intervalo(com_valores=True))
+    carregada.put("zzz" if isinstance(chaves, list) and chaves and isinstance(chaves[0], str) else 2 ** 62)
+    assert carregada.validar().valida
+
+def test_formato_usa_a_menor_largura_e_recusa_outras_versoes(tmp_path):
+    """
+    Verifica se chaves pequenas ocupam um byte cada e se arquivos de outra versão do
+    formato, ou truncados, são recusados.
+    """
+    caminho = str(tmp_path / "arvore.arvs")
+    ArvoreB.from_sorted(range(100), ordem=2).dump(caminho)
+    pequena = os.path.getsize(caminho)
+    ArvoreB.from_sorted(range(2 ** 40, 2 ** 40 + 100), ordem=2).dump(caminho)
+    assert os.path.getsize(caminho) - pequena == 7 * 100
+
+    with open(caminho, "rb") as arquivo:
+        dados = arquivo.read()
+    for alterado in (dados[:4] + struct.pack("<H", 1) + dados[6:], dados[:-4]):
+        with open(caminho, "wb") as arquivo:
+            arquivo.write(alterado)
+        with pytest.raises(ValueError):
+            ArvoreB.load(caminho)
+
+# --- Testes para a inserção sem repetidas ---
+
+@pytest.mark.parametrize("ordem, compacto", [(2, False), (3, True), (8, False)])
+def test_inserir_se_ausente_acompanha_dicionario(ordem, compacto):
+    """
+    Insere um fluxo com muitas chaves repetidas e compara com `dict.setdefault`: a primeira
+    ocorrência é inserida e as seguintes não alteram o valor nem a estrutura da árvore.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB(ordem, compacto=compacto, validacao_incremental=True)
+    referencia = {}
+    for passo in range(3_000):
+        chave = aleatorio.randrange(600)
+        assert arvore.inserir_se_ausente(chave, passo) == (chave not in referencia)
+        referencia.setdefault(chave, passo)
+        if passo % 7 == 0:
+            removida = aleatorio.randrange(600)
+            assert arvore.pop(removida, None) == referencia.pop(removida, None)
+
+    assert list(arvore.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert arvore.validar().valida
+
+    metricas = arvore.ativarMetricas()
+    for chave in list(referencia):
+        assert not arvore.inserir_se_ausente(chave, "outro")
+    assert metricas.divisoes == 0
+    assert all(arvore[chave] == valor for chave, valor in referencia.items())
+
+# --- Testes para chaves genéricas ---
+
+@pytest.mark.parametrize("chaves", [
+    [-2 ** 70, -70_000, -256, -255, -1, 0, 1, 255, 256, 70_000, 2 ** 70],
+    ["", "\x00", "\x00a", "a", "a\x00", "ab", "b", "ção"],
+    [b"", b"\x00", b"\x00\xff", b"\x01", b"a"],
+    [-1.5, -0.0, 0.5, 2.0, float("inf")],
+    [(), (0,), (0, ""), (0, "a"), (0, "a", (1, 2)), (0, "a", (1, 3)), (0, "a\x00"), (0, "b"), (1,), (1, "")],
+])
+def test_codificar_chave_preserva_ordem(chaves):
+    """
+    A ordem dos bytes codificados é a ordem das chaves, inclusive para prefixos, bytes
+    nulos e tuplas aninhadas.
+    """
+    codificadas = [codificarChave(chave) for chave in chaves]
+    assert codificadas == sorted(codificadas)
+    assert len(set(codificadas)) == len(chaves)
+
+
+@pytest.mark.parametrize("key, gerar, compacto", [
+    (None, lambda aleatorio: f"chave-{aleatorio.randrange(2_000):04}", False),
+    (str.casefold, lambda aleatorio: aleatorio.choice("aA") + str(aleatorio.randrange(2_000)), False),
+    (codificarChave, lambda aleatorio: (aleatorio.choice("xyz"), aleatorio.randrange(700)), False),
+    (empacotarInteiros((8, 16)), lambda aleatorio: (aleatorio.randrange(3), aleatorio.randrange(700)), True),
+])
+def test_chaves_genericas_acompanham_dicionario(key, gerar, compacto, tmp_path):
+    """
+    Com chaves de texto e tuplas, com ou sem `key`, a árvore se comporta como um dicionário
+    ordenado por `key`: as operações recebem e devolvem as chaves originais.
+    """
+    ordenar = key or (lambda chave: chave)
+    aleatorio = random.Random(19)
+    arvore = ArvoreB(3, compacto=compacto, key=key)
+    referencia = {}
+    for passo in range(2_000):
+        chave = gerar(aleatorio)
+        if aleatorio.random() < 0.25:
+            assert arvore.pop(chave, None) == referencia.pop(ordenar(chave), (None, None))[1]
+        else:
+            arvore[chave] = passo
+            referencia[ordenar(chave)] = (chave, passo)
+
+    esperado = [referencia[traduzida] for traduzida in sorted(referencia)]
+    assert list(arvore.intervalo(com_valores=True)) == esperado
+    assert list(reversed(arvore)) == [chave for chave, _ in reversed(esperado)]
+    chaves = [chave for chave, _ in esperado]
+    assert arvore.select(10) == chaves[10] and arvore.rank(chaves[10]) == 10
+    assert list(arvore.intervalo(chaves[5], chaves[15])) == chaves[5:15]
+    assert arvore.count_range(chaves[5], chaves[15]) == 10
+    assert all(arvore[chave] == valor for chave, valor in esperado)
+    assert arvore.buscar_muitos(chaves[:3])[0] is not None
+    assert arvore.validar().valida
+
+    metricas = arvore.ativarMetricas()
+    assert arvore.remover_intervalo(chaves[5], chaves[15]) == 10
+    assert arvore.remover_muitos([chaves[0], chaves[0]]) == [True, False]
+    assert arvore.inserir_se_ausente(chaves[0], "novo") and arvore[chaves[0]] == "novo"
+    assert metricas.operacoes["remover_intervalo"]["chamadas"] == 1
+    arvore.desativarMetricas()
+    with pytest.raises(KeyError):
+        arvore.pop(chaves[5])
+
+    caminho = str(tmp_path / "arvore")
+    arvore.dump(caminho)
+    carregada = ArvoreB.load(caminho, key=key)
+    assert list(carregada.intervalo(com_valores=True)) == list(arvore.intervalo(com_valores=True))
+
+    construida = ArvoreB.from_unsorted(reversed(chaves), 4, key=key)
+    assert list(construida) == chaves and construida.validar().valida
+
+
+def test_empacotar_inteiros_rejeita_elementos_fora_da_largura():
+    empacotar = empacotarInteiros((4, 4))
+    assert empacotar((1, 2)) < empacotar((1, 3)) < empacotar((2, 0))
+    with pytest.raises(ValueError):
+        empacotar((16, 0))
+    with pytest.raises(ValueError):
+        empacotar((1,))
+
+
+# --- Testes para o dedo e a inserção crescente ---
+
+def contarNos(no):
+    return 1 + sum(contarNos(filho) for filho in no.filhos)
+
+
+@pytest.mark.parametrize("ordem, compacto, dedo, crescente", [
+    (2, False, True, False), (3, True, True, True), (5, False, False, True), (8, True, True, True)])
+def test_dedo_e_insercao_crescente_acompanham_dicionario(ordem, compacto, dedo, crescente):
+    """
+    Mistura inserções quase em ordem crescente com buscas, remoções e operações em lote e
+    compara com um dicionário, verificando que o dedo nunca aponta para uma folha antiga e
+    que a borda direita aberta pela inserção crescente é fechada antes das remoções.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreB(ordem, compacto=compacto, dedo=dedo, insercao_crescente=crescente)
+    referencia = {}
+    proxima = 0
+    for passo in range(4_000):
+        sorteio = aleatorio.random()
+        if sorteio < 0.6:
+            proxima += aleatorio.randrange(1, 3)
+            chave = proxima if aleatorio.random() < 0.8 else aleatorio.randrange(proxima + 1)
+            assert arvore.put(chave, passo) == (chave not in referencia)
+            referencia[chave] = passo
+        elif sorteio < 0.8:
+            chave = aleatorio.randrange(proxima + 1)
+            assert (arvore.buscar(chave) is not None) == (chave in referencia)
+        elif sorteio < 0.9:
+            chave = aleatorio.randrange(proxima + 1)
+            assert arvore.pop(chave, None) == referencia.pop(chave, None)
+        elif sorteio < 0.95:
+            inicio = aleatorio.randrange(proxima + 1)
+            removidas = [chave for chave in range(inicio, inicio + 8) if chave in referencia]
+            assert arvore.remover_intervalo(inicio, inicio + 8) == len(removidas)
+            for chave in removidas:
+                del referencia[chave]
+        else:
+            chaves = [aleatorio.randrange(proxima + 5) for _ in range(5)]
+            arvore.inserir_muitos(chaves, [passo] * len(chaves))
+            referencia.update(dict.fromkeys(chaves, passo))
+
+    assert list(arvore.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert len(arvore) == len(referencia)
+    assert arvore.validar().valida
+
+
+@pytest.mark.parametrize("ordem", [2, 4, 16])
+def test_insercao_crescente_deixa_os_nos_cheios(ordem):
+    """
+    Com chaves em ordem crescente, a inserção crescente deixa cheios todos os nós fora da
+    borda direita, usando cerca de metade dos nós da divisão ao meio.
+    """
+    quantidade = 5_000
+    ao_meio = ArvoreB(ordem)
+    crescente = ArvoreB(ordem, insercao_crescente=True, dedo=True)
+    for chave in range(quantidade):
+        ao_meio.inserir(chave)
+        crescente.inserir(chave)
+
+    assert list(crescente) == list(range(quantidade))
+    assert crescente.rank(quantidade // 2) == quantidade // 2
+    assert contarNos(crescente.raiz) * 1.6 < contarNos(ao_meio.raiz)
+    assert crescente.validar().valida
+    assert crescente.select(-1) == quantidade - 1
+
+def test_metricas_contam_uma_folha_nas_buscas_pelo_dedo():
+    """
+    Verifica se as buscas respondidas na folha do dedo contam um único nó visitado nas
+    métricas, e se as que descem a partir da raiz contam a descida inteira.
+    """
+    arvore = ArvoreB(3, dedo=True)
+    for chave in range(10_000):
+        arvore.put(chave)
+    metricas = arvore.ativarMetricas()
+    acertos = arvore._dedoAcertos
+    for chave in range(5_000, 5_010):
+        assert arvore.buscar(chave) is not None
+
+    assert metricas.nosVisitados.get(1, 0) == arvore._dedoAcertos - acertos > 0
+    assert sum(metricas.nosVisitados.values()) == 10
+    assert all(visitados == 1 or visitados > 2 for visitados in metricas.nosVisitados)
+
+
+# --- Testes para o filtro de Bloom e o cache de buscas ---
+
+@pytest.mark.parametrize("opcoes", [
+    {"filtro": True}, {"cache": 16}, {"filtro": True, "cache": 64, "dedo": True},
+    {"filtro": True, "cache": 8, "compacto": True}, {"filtro": True, "cache": 8, "key": codificarChave}])
+def test_filtro_e_cache_acompanham_dicionario(opcoes):
+    """
+    Mistura buscas, inserções e remoções (uma a uma, por intervalo e em lote) e compara com
+    um dicionário: o filtro nunca descarta uma chave presente e o cache nunca devolve a
+    posição de uma chave que saiu da árvore ou de um nó que foi desligado.
+    """
+    aleatorio = random.Random(22)
+    arvore = ArvoreB(3, **opcoes)
+    referencia = {}
+    for passo in range(6_000):
+        chave = aleatorio.randrange(2_000)
+        sorteio = aleatorio.random()
+        if sorteio < 0.35:
+            arvore[chave] = passo
+            referencia[chave] = passo
+        elif sorteio < 0.7:
+            assert arvore.get(chave) == referencia.get(chave)
+            assert (chave in arvore) == (chave in referencia)
+        elif sorteio < 0.85:
+            assert arvore.pop(chave, None) == referencia.pop(chave, None)
+        elif sorteio < 0.9:
+            if chave not in referencia:
+                arvore.inserir(chave, passo)
+                referencia[chave] = passo
+        elif sorteio < 0.95:
+            removidas = [outra for outra in referencia if chave <= outra < chave + 40]
+            assert arvore.remover_intervalo(chave, chave + 40) == len(removidas)
+            for outra in removidas:
+                del referencia[outra]
+        else:
+            lote = [aleatorio.randrange(2_000) for _ in range(30)]
+            esperado = [referencia.pop(outra, None) is not None for outra in lote]
+            assert arvore.remover_muitos(lote) == esperado
+
+    assert list(arvore.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert arvore.validar().valida
+    if arvore.filtro is not None:
+        contadores = arvore.filtro.instantaneo()
+        assert contadores["descartadas"] > 0 and contadores["reconstrucoes"] > 0
+        assert contadores["descartadas"] + contadores["falsos_positivos"] <= contadores["consultas"]
+    if arvore.cache is not None:
+        assert arvore.cache.acertos > 0 and len(arvore.cache) <= arvore.cache.capacidade
+
+
+def test_filtro_descarta_ausentes_e_cache_acerta_repetidas():
+    arvore = ArvoreB(8, filtro=True, cache=100)
+    for chave in range(0, 20_000, 2):
+        arvore.inserir(chave)
+    assert arvore.filtro.reconstrucoes > 0
+
+    # Zera as consultas feitas pela pré-condição de `inserir`.
+    arvore.filtro.zerar()
+    assert all(arvore.buscar(chave) is None for chave in range(1, 20_000, 2))
+    contadores = arvore.filtro.instantaneo()
+    assert contadores["taxa_falsos_positivos"] < 0.03
+    assert contadores["descartadas"] + contadores["falsos_positivos"] == 10_000
+
+    for _ in range(5):
+        for chave in range(0, 200, 2):
+            assert arvore.buscar(chave) is not None
+    assert arvore.cache.instantaneo()["acertos"] == 400
+
+    # As métricas contam 0 nós para as buscas descartadas pelo filtro e 1 para os acertos
+    # do cache.
+    metricas = arvore.ativarMetricas()
+    descartadas, acertos = arvore.filtro.descartadas, arvore.cache.acertos
+    for chave in range(1, 2_000, 2):
+        arvore.buscar(chave)
+    for chave in range(0, 200, 2):
+        arvore.buscar(chave)
+    assert metricas.nosVisitados.get(0, 0) == arvore.filtro.descartadas - descartadas > 0
+    assert metricas.nosVisitados.get(1, 0) == arvore.cache.acertos - acertos == 100
+    assert sum(metricas.nosVisitados.values()) == 1_100
+    assert all(visitados == arvore._altura + 1 for visitados in metricas.nosVisitados if visitados > 1)
+    arvore.desativarMetricas()
+
+    # A árvore esvaziada por outra (como na costura de partições) troca de raiz, e as
+    # posições guardadas, de nós que agora pertencem à outra árvore, são descartadas.
+    outra = ArvoreB(8)
+    outra._concatenar(-1, None, arvore)
+    arvore.put(1)
+    assert arvore.buscar(0) is None and arvore.buscar(1) is not None
@@ -0,0 +1,124 @@
+import random
+import threading
+import pytest
+from arvoreBConcorrente import ArvoreBConcorrente
+
+# --- Testes para a cópia na escrita ---
+
+@pytest.mark.parametrize("compacto", [False, True])
+def test_escritas_acompanham_dicionario(compacto):
+    """
+    Verifica se a árvore concorrente se comporta como a árvore comum e se cada instantâneo
+    continua igual ao estado do momento em que foi obtido.
+    """
+    aleatorio = random.Random(10)
+    arvore = ArvoreBConcorrente.from_sorted(range(0, 600, 3), ordem=2, compacto=compacto)
+    referencia = dict.fromkeys(range(0, 600, 3))
+    instantaneos = []
+
+    for passo in range(3_000):
+        chave = aleatorio.randrange(600)
+        if aleatorio.random() < 0.5:
+            arvore.put(chave, passo)
+            referencia[chave] = passo
+        else:
+            assert arvore.pop(chave, "ausente") == referencia.pop(chave, "ausente")
+        if passo % 500 == 0:
+            instantaneos.append((arvore.instantaneo(), sorted(referencia.items())))
+
+    arvore.inserir_muitos(range(600, 700))
+    referencia.update(dict.fromkeys(range(600, 700)))
+    instantaneos.append((arvore.instantaneo(), sorted(referencia.items())))
+    assert arvore.remover_intervalo(100, 250) == sum(1 for chave in referencia if 100 <= chave < 250)
+    assert arvore.remover_muitos([20, 21, 22]) == [chave in referencia for chave in (20, 21, 22)]
+    referencia = {chave: valor for chave, valor in referencia.items()
+                  if not 100 <= chave < 250 and chave not in (20, 21, 22)}
+    assert arvore.inserir_se_ausente(150, "novo") and not arvore.inserir_se_ausente(150, "outro")
+    referencia[150] = "novo"
+
+    assert list(arvore.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert len(arvore) == len(referencia)
+    assert arvore._verificarPropriedades(arvore.raiz)
+    for instantaneo, esperado in instantaneos:
+        assert list(instantaneo.intervalo(com_valores=True)) == esperado
+        assert len(instantaneo) == len(esperado)
+        assert instantaneo._verificarPropriedades(instantaneo.raiz)
+
+def test_escrita_com_erro_e_descartada():
+    """
+    Verifica se uma escrita interrompida por uma exceção não altera a árvore.
+    """
+    arvore = ArvoreBConcorrente(ordem=2, compacto=True)
+    arvore.inserir_muitos(range(50))
+    antes = arvore.instantaneo()
+
+    with pytest.raises(OverflowError):
+        arvore.inserir_muitos([60, 70, 2 ** 70])
+
+    assert arvore.instantaneo() is antes
+    assert list(arvore) == list(range(50))
+    with pytest.raises(TypeError):
+        antes.put(80)
+
+def test_leitores_concorrentes_veem_versoes_consistentes():
+    """
+    Teste de estresse: threads leitoras percorrem a árvore enquanto outra thread a modifica.
+    O escritor insere e remove sempre pares de chaves (2k, 2k+1) em uma única operação de
+    lote, então toda versão consistente tem apenas pares completos.
+    """
+    arvore = ArvoreBConcorrente(ordem=2)
+    parar = threading.Event()
+    falhas = []
+
+    def escritor():
+        aleatorio = random.Random(3)
+        presentes = set()
+        for _ in range(4_000):
+            par = aleatorio.randrange(500)
+            if par in presentes:
+                # As duas remoções aninhadas fazem parte de uma única escrita.
+                arvore._escrever(lambda: (arvore.pop(2 * par), arvore.pop(2 * par + 1)))
+                presentes.discard(par)
+            else:
+                arvore.inserir_muitos([2 * par, 2 * par + 1])
+                presentes.add(par)
+        parar.set()
+
+    def leitor(semente):
+        aleatorio = random.Random(semente)
+        try:
+            while not parar.is_set():
+                instantaneo = arvore.instantaneo()
+                chaves = list(instantaneo)
+                assert chaves == sorted(chaves) and len(chaves) == len(instantaneo)
+                assert all(chaves[i] + 1 == chaves[i + 1] for i in range(0, len(chaves), 2))
+                par = aleatorio.randrange(500)
+                assert (instantaneo.buscar(2 * par) is None) == (instantaneo.buscar(2 * par + 1) is None)
+        except AssertionError as erro:
+            falhas.append(erro)
+            parar.set()
+
+    leitores = [threading.Thread(target=leitor, args=(semente,)) for semente in range(4)]
+    thread_escritor = threading.Thread(target=escritor)
+    for thread in leitores + [thread_escritor]:
+        thread.start()
+    for thread in leitores + [thread_escritor]:
+        thread.join()
+
+    assert not falhas
+    assert arvore._verificarPropriedades(arvore.raiz)
+
+
+def test_chaves_com_key_e_instantaneos():
+    """
+    Com `key`, as escritas passam pela cópia na escrita com as chaves traduzidas, e os
+    instantâneos devolvem as chaves originais.
+    """
+    arvore = ArvoreBConcorrente.from_sorted([("a", 2), ("a", 1), ("b", 1)], ordem=2, key=lambda chave: (chave[0], -chave[1]))
+    antes = arvore.instantaneo()
+    arvore[("c", 0)] = "c"
+    assert arvore.pop(("a", 1)) is None
+    assert list(arvore) == [("a", 2), ("b", 1), ("c", 0)]
+    assert list(antes) == [("a", 2), ("a", 1), ("b", 1)]
+    assert ("a", 1) in antes and ("c", 0) not in antes
+    assert arvore.instantaneo()[("c", 0)] == "c"
@@ -0,0 +1,72 @@
+import random
+import pytest
+import icontract
+from arvoreBMais import ArvoreBMais
+from contratos import CONTRATOS_HABILITADOS
+
+# --- Testes para a Árvore B+ ---
+
+@pytest.mark.parametrize("ordem", [2, 3, 8])
+def test_arvore_b_mais_acompanha_dicionario(ordem):
+    """
+    Aplica inserções e remoções aleatórias e compara a árvore (e o encadeamento das
+    folhas) com um dicionário de referência.
+    """
+    aleatorio = random.Random(ordem)
+    arvore = ArvoreBMais(ordem)
+    referencia = {}
+
+    for passo in range(4_000):
+        chave = aleatorio.randrange(800)
+        if aleatorio.random() < 0.55:
+            assert arvore.put(chave, passo) == (chave not in referencia)
+            referencia[chave] = passo
+        else:
+            assert arvore.pop(chave, "ausente") == referencia.pop(chave, "ausente")
+        if passo % 250 == 0:
+            assert arvore._verificarPropriedades()
+
+    assert arvore._verificarPropriedades()
+    assert len(arvore) == len(referencia)
+    assert list(arvore.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert all(arvore[chave] == valor for chave, valor in referencia.items())
+    assert 800 not in arvore
+
+    for chave in list(referencia):
+        del arvore[chave]
+    assert len(arvore) == 0 and list(arvore) == []
+    assert arvore._verificarPropriedades()
+
+@pytest.mark.parametrize("fill_factor", [0.5, 1.0])
+@pytest.mark.parametrize("quantidade", [1, 5, 33, 1_000])
+def test_carga_em_lote_e_intervalos(fill_factor, quantidade):
+    """
+    Verifica a carga em lote e as varreduras de intervalo pelo encadeamento das folhas.
+    """
+    chaves = list(range(0, 3 * quantidade, 3))
+    arvore = ArvoreBMais.from_sorted(chaves, ordem=3, fill_factor=fill_factor)
+
+    assert arvore._verificarPropriedades()
+    assert list(arvore) == chaves
+    for inicio, fim in [(None, None), (0, 10), (4, 3 * quantidade // 2), (7, 7), (3 * quantidade, None)]:
+        esperado = [chave for chave in chaves if (inicio is None or chave >= inicio) and (fim is None or chave < fim)]
+        assert list(arvore.intervalo(inicio, fim)) == esperado
+
+    arvore.inserir(-1)
+    arvore.remover(chaves[-1])
+    assert arvore._verificarPropriedades()
+    assert arvore.buscar(-1) is not None and arvore.buscar(chaves[-1]) is None
+    with pytest.raises(ValueError):
+        ArvoreBMais.from_sorted([2, 1], ordem=3)
+
+@pytest.mark.skipif(not CONTRATOS_HABILITADOS, reason="Contratos desligados por ARVOREB_CONTRATOS.")
+def test_precondicoes_da_arvore_b_mais():
+    """
+    Garante que inserir uma chave existente e remover uma ausente violam os contratos.
+    """
+    arvore = ArvoreBMais.from_sorted(range(0, 30, 3), ordem=3)
+
+    with pytest.raises(icontract.errors.ViolationError):
+        arvore.inserir(3)
+    with pytest.raises(icontract.errors.ViolationError):
+        arvore.remover(4)
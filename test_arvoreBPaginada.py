@@ -0,0 +1,171 @@
+import random
+import struct
+import pytest
+from arvoreBPaginada import ArvoreBPaginada, tamanhoDaPagina
+
+# --- Fixtures dos estado base dos testes ---
+
+@pytest.fixture
+def caminho(tmp_path):
+    """
+    Retorna o caminho de um arquivo de páginas ainda inexistente.
+    """
+    return str(tmp_path / "arvore.arvb")
+
+def contarPaginasLivres(armazenamento):
+    """
+    Conta as páginas da lista de páginas livres do armazenamento.
+    """
+    livres = 0
+    pagina = armazenamento._listaLivre
+    while pagina:
+        livres += 1
+        (pagina,) = struct.unpack_from("<Q", armazenamento._mapa, pagina * armazenamento.tamanhoPagina)
+    return livres
+
+# --- Testes para a Árvore B paginada ---
+
+def test_operacoes_persistem_entre_aberturas(caminho):
+    """
+    Executa operações aleatórias com um cache pequeno, reabrindo o arquivo a cada rodada,
+    e confere as chaves e as propriedades da árvore.
+    """
+    aleatorio = random.Random(1)
+    referencia = set()
+
+    for _ in range(4):
+        with ArvoreBPaginada(caminho, ordem=3, capacidade_cache=4) as arvore:
+            assert list(arvore) == sorted(referencia)
+            assert len(arvore) == len(referencia)
+            for _ in range(1_000):
+                chave = aleatorio.randrange(500)
+                if aleatorio.random() < 0.6:
+                    arvore.put(chave)
+                    referencia.add(chave)
+                elif chave in referencia:
+                    arvore.remover(chave)
+                    referencia.discard(chave)
+
+            assert arvore._verificarPropriedades(arvore.raiz)
+            assert arvore._todasFolhasNaMesmaProfundidade()
+
+def test_busca_le_apenas_o_caminho(caminho):
+    """
+    Verifica se uma busca com o cache frio lê do arquivo apenas as páginas do caminho.
+    """
+    with ArvoreBPaginada(caminho, ordem=4) as arvore:
+        for chave in range(2_000):
+            arvore.inserir(chave)
+        altura = 1
+        no = arvore.raiz
+        while not no.folha:
+            no = no.filhos[0]
+            altura += 1
+
+    with ArvoreBPaginada(caminho) as arvore:
+        faltas = arvore.armazenamento.faltas
+        assert arvore.buscar(1_234) is not None
+        assert arvore.armazenamento.faltas - faltas == altura - 1
+
+def test_paginas_liberadas_sao_reutilizadas(caminho):
+    """
+    Garante que as páginas liberadas por fusões são reaproveitadas, sem crescer o arquivo.
+    """
+    with ArvoreBPaginada(caminho, ordem=2) as arvore:
+        for chave in range(300):
+            arvore.inserir(chave)
+        paginas = arvore.armazenamento._numeroPaginas
+        for chave in range(300):
+            arvore.remover(chave)
+        for chave in range(300):
+            arvore.inserir(chave)
+
+        assert arvore.armazenamento._numeroPaginas == paginas
+
+def test_validacoes_do_arquivo(caminho):
+    """
+    Verifica as validações de ordem e de valores da árvore paginada.
+    """
+    with pytest.raises(ValueError):
+        ArvoreBPaginada(caminho)
+    with ArvoreBPaginada(caminho, ordem=3) as arvore:
+        with pytest.raises(TypeError):
+            arvore.put(1, "valor")
+    with pytest.raises(ValueError):
+        ArvoreBPaginada(caminho, ordem=4)
+    assert tamanhoDaPagina(3) == 16 + 5 * 8 + 6 * 8
+
+def test_insercao_em_lote_persiste(caminho):
+    """
+    Verifica se a inserção em lote grava os nós divididos no arquivo.
+    """
+    chaves = random.Random(8).sample(range(10_000), 2_000)
+    with ArvoreBPaginada(caminho, ordem=3, capacidade_cache=8) as arvore:
+        arvore.inserir_muitos(chaves[:1_000])
+        arvore.inserir_muitos(chaves)
+
+    with ArvoreBPaginada(caminho) as arvore:
+        assert list(arvore) == sorted(chaves)
+        assert arvore._verificarPropriedades(arvore.raiz)
+        assert all(resultado is not None for resultado in arvore.buscar_muitos(chaves))
+        assert arvore.validar().valida
+        assert arvore.select(1_000) == sorted(chaves)[1_000]
+
+def test_remocao_por_intervalo_libera_paginas(caminho):
+    """
+    Verifica se a remoção por intervalo e em lote persiste e devolve as páginas das
+    subárvores desligadas à lista de páginas livres.
+    """
+    with ArvoreBPaginada(caminho, ordem=3, capacidade_cache=8) as arvore:
+        arvore.inserir_muitos(range(5_000))
+        assert arvore.remover_intervalo(1_000, 4_000) == 3_000
+        assert arvore.remover_muitos([0, 2, 3, 4, 4_999, 7_000]) == [True, True, True, True, True, False]
+        assert arvore.validar().valida
+
+        # Toda página, exceto a do cabeçalho, está na árvore ou na lista de páginas livres.
+        armazenamento = arvore.armazenamento
+        assert 1 + arvore.validar().quantidadeNos + contarPaginasLivres(armazenamento) == armazenamento._numeroPaginas
+
+    with ArvoreBPaginada(caminho) as arvore:
+        esperado = [1] + list(range(5, 1_000)) + list(range(4_000, 4_999))
+        assert list(arvore) == esperado
+        assert arvore.validar().valida
+        assert arvore.inserir_se_ausente(2_000) and not arvore.inserir_se_ausente(2_000)
+        assert arvore.validar().valida
+
+@pytest.mark.parametrize("fill_factor", [0.5, 1.0])
+@pytest.mark.parametrize("quantidade", [0, 1, 6, 40, 3_000])
+def test_carga_em_lote_monta_as_paginas(caminho, fill_factor, quantidade):
+    """
+    Verifica se `from_sorted` monta a árvore diretamente no arquivo, sem deixar páginas
+    perdidas pelo ajuste da espinha direita, e se a árvore persiste ao ser reaberta.
+    """
+    chaves = list(range(0, 2 * quantidade, 2))
+    with ArvoreBPaginada.from_sorted(caminho, chaves, ordem=2, fill_factor=fill_factor,
+                                     capacidade_cache=4) as arvore:
+        assert list(arvore) == chaves
+        relatorio = arvore.validar()
+        assert relatorio.valida, relatorio.erros
+        armazenamento = arvore.armazenamento
+        assert 1 + relatorio.quantidadeNos + contarPaginasLivres(armazenamento) == armazenamento._numeroPaginas
+
+    with ArvoreBPaginada(caminho) as arvore:
+        assert list(arvore) == chaves and len(arvore) == quantidade
+        assert arvore.validar().valida
+        arvore.inserir(1)
+        assert arvore.validar().valida
+
+    with pytest.raises(ValueError):
+        ArvoreBPaginada.from_sorted(caminho, [5, 7], ordem=2)
+    with pytest.raises(TypeError):
+        ArvoreBPaginada.load(caminho)
+
+def test_carga_em_lote_sem_ordem(caminho):
+    """
+    Verifica `from_unsorted` e a recusa de chaves fora de ordem por `from_sorted`.
+    """
+    chaves = random.Random(4).choices(range(-500, 500), k=800)
+    with ArvoreBPaginada.from_unsorted(caminho, chaves, ordem=3) as arvore:
+        assert list(arvore) == sorted(set(chaves))
+    with pytest.raises(ValueError):
+        ArvoreBPaginada.from_sorted(caminho + ".2", [2, 1], ordem=3)
@@ -0,0 +1,119 @@
+import random
+import pytest
+from arvoreB import ArvoreB
+from arvoreBParticionada import ArvoreBParticionada
+
+# --- Testes para as árvores particionadas ---
+
+def test_construcao_e_operacoes_encaminhadas():
+    """
+    Constrói as partições e verifica se as operações sobre chaves, intervalos e lotes se
+    comportam como em um dicionário ordenado.
+    """
+    aleatorio = random.Random(20)
+    referencia = {chave: -chave for chave in aleatorio.sample(range(100_000), 5_000)}
+    arvore = ArvoreBParticionada.construir(referencia.items(), 4, particoes=4, com_valores=True)
+    assert len(arvore.limites) == 3
+    assert all(len(particao) > 0 and particao.validar().valida for particao in arvore.particoes)
+
+    for passo in range(2_000):
+        chave = aleatorio.randrange(100_000)
+        if passo % 3 == 0:
+            assert arvore.pop(chave, None) == referencia.pop(chave, None)
+        else:
+            arvore[chave] = passo
+            referencia[chave] = passo
+
+    ordenadas = sorted(referencia)
+    assert len(arvore) == len(referencia)
+    assert list(arvore) == ordenadas
+    assert list(reversed(arvore)) == ordenadas[::-1]
+    assert list(arvore.intervalo(20_000, 70_000, com_valores=True)) == [
+        (chave, referencia[chave]) for chave in ordenadas if 20_000 <= chave < 70_000]
+    assert arvore.count_range(20_000, 70_000) == sum(1 for chave in ordenadas if 20_000 <= chave < 70_000)
+    assert arvore.rank(ordenadas[3_000]) == 3_000 and arvore.select(3_000) == ordenadas[3_000]
+    assert arvore.select(-1) == ordenadas[-1]
+
+    lote = [ordenadas[0], -1, ordenadas[-1]]
+    assert [resultado is not None for resultado in arvore.buscar_muitos(lote)] == [True, False, True]
+    assert arvore.inserir_muitos([-1, ordenadas[0]], ["a", "b"]) == [True, False]
+    assert arvore.remover_muitos([-1, -2]) == [True, False]
+    assert arvore.remover_intervalo(None, ordenadas[10]) == 10
+
+@pytest.mark.parametrize("quantidade", [0, 1, 3, 10, 1_001])
+def test_construcao_corta_a_entrada_ordenada_em_fatias(quantidade):
+    """
+    Verifica se as partições são fatias contíguas de tamanhos iguais da entrada ordenada,
+    com ou sem a ordenação pela própria construção, e se entradas fora de ordem são
+    recusadas quando declaradas ordenadas.
+    """
+    chaves = list(range(0, 2 * quantidade, 2))
+    embaralhadas = random.Random(quantidade).sample(chaves, len(chaves)) * 2
+    for arvore in (ArvoreBParticionada.construir(chaves, 3, particoes=4, ordenadas=True),
+                   ArvoreBParticionada.construir(embaralhadas, 3, particoes=4)):
+        assert list(arvore) == chaves
+        assert len(arvore.particoes) == min(4, max(quantidade, 1))
+        tamanhos = [len(particao) for particao in arvore.particoes]
+        assert max(tamanhos) - min(tamanhos) <= 1
+        assert all(particao.validar().valida for particao in arvore.particoes)
+
+    with pytest.raises(ValueError):
+        ArvoreBParticionada.construir([1, 2, 3, 2, 5, 6], 3, particoes=2, ordenadas=True)
+    with pytest.raises(ValueError):
+        ArvoreBParticionada.construir([1, 2, 3, 3, 5, 6], 3, particoes=2, ordenadas=True)
+
+@pytest.mark.parametrize("compacto", [False, True])
+def test_construcao_em_paralelo_equivale_a_serial(compacto):
+    """
+    Constrói as partições em um pool de processos, com a entrada ordenada e fora de ordem,
+    com repetições e valores, e compara com a construção no próprio processo.
+    """
+    aleatorio = random.Random(7)
+    pares = [(aleatorio.randrange(20_000), passo) for passo in range(12_000)]
+    esperado = sorted(dict(pares).items())
+    for entrada, ordenadas in ((pares, False), (esperado, True)):
+        arvore = ArvoreBParticionada.construir(entrada, 4, particoes=5, com_valores=True, compacto=compacto,
+                                               ordenadas=ordenadas, processos=2)
+        assert list(arvore.intervalo(com_valores=True)) == esperado
+        assert len(arvore.particoes) == 5
+        assert all(particao.compacto == compacto and particao.validar().valida for particao in arvore.particoes)
+
+    chaves = [chave for chave, _ in pares]
+    serial = ArvoreBParticionada.construir(chaves, 3, particoes=3)
+    paralela = ArvoreBParticionada.construir(chaves, 3, particoes=3, processos=3)
+    assert list(paralela) == list(serial) and paralela.costurar().validar().valida
+    assert list(ArvoreBParticionada.construir([], 3, particoes=3, processos=2)) == []
+
+    with pytest.raises(ValueError):
+        ArvoreBParticionada.construir([1, 3, 2, 4, 5, 6], 3, particoes=2, ordenadas=True, processos=2)
+    with pytest.raises(ValueError):
+        ArvoreBParticionada.construir([1, 2], 3, particoes=2, processos=0)
+
+
+@pytest.mark.parametrize("ordem", [2, 3, 5])
+def test_costurar_particoes_de_alturas_diferentes(ordem):
+    """
+    Costura partições de tamanhos (e alturas) bem diferentes, inclusive vazias e com uma
+    única chave, e verifica se o resultado é uma Árvore B válida com todas as chaves.
+    """
+    aleatorio = random.Random(ordem)
+    for _ in range(30):
+        tamanhos = [aleatorio.choice([0, 1, 2, 10, 100, 2_000]) for _ in range(aleatorio.randint(1, 6))]
+        arvore = ArvoreBParticionada([10_000 * i for i in range(1, len(tamanhos))], ordem)
+        for indice, tamanho in enumerate(tamanhos):
+            arvore.inserir_muitos(range(10_000 * indice, 10_000 * indice + tamanho))
+        esperado = list(arvore)
+
+        costurada = arvore.costurar()
+        assert list(costurada) == esperado and len(costurada) == len(esperado)
+        assert costurada.validar().valida
+        assert len(arvore) == 0
+
+
+def test_concatenar_arvore_mais_alta_a_direita():
+    esquerda = ArvoreB.from_sorted(range(5), 2)
+    direita = ArvoreB.from_sorted(range(10, 5_000), 2)
+    esquerda._concatenar(7, "sete", direita)
+    assert list(esquerda) == [0, 1, 2, 3, 4, 7, *range(10, 5_000)]
+    assert esquerda[7] == "sete" and len(direita) == 0
+    assert esquerda.validar().valida
@@ -0,0 +1,116 @@
+import os
+import random
+import pytest
+from arvoreBRegistrada import ArvoreBRegistrada
+
+# --- Fixtures dos estado base dos testes ---
+
+@pytest.fixture
+def diretorio(tmp_path):
+    """
+    Retorna o diretório, ainda vazio, dos arquivos da árvore registrada.
+    """
+    return str(tmp_path / "arvore")
+
+def _operacoesAleatorias(arvore, referencia, semente, quantidade=1_500):
+    """
+    Aplica operações aleatórias à árvore e ao dicionário de referência.
+    """
+    aleatorio = random.Random(semente)
+    for _ in range(quantidade):
+        chave = aleatorio.randrange(400)
+        if aleatorio.random() < 0.6:
+            arvore.put(chave, ("valor", chave, semente))
+            referencia[chave] = ("valor", chave, semente)
+        else:
+            arvore.pop(chave, None)
+            referencia.pop(chave, None)
+
+# --- Testes para o registro de escrita e os instantâneos ---
+
+def test_recuperacao_apenas_pelo_registro(diretorio):
+    """
+    Verifica se, sem instantâneos, o estado sincronizado é recuperado reaplicando o registro,
+    mesmo sem fechar a árvore (término inesperado).
+    """
+    referencia = {}
+    arvore = ArvoreBRegistrada(diretorio, ordem=3)
+    _operacoesAleatorias(arvore, referencia, semente=1)
+    arvore.inserir_muitos([1_000, 1_001], ["a", "b"])
+    referencia.update({1_000: "a", 1_001: "b"})
+    arvore.sincronizar()
+
+    recuperada = ArvoreBRegistrada(diretorio, ordem=3)
+    assert list(recuperada.intervalo(com_valores=True)) == sorted(referencia.items())
+    assert len(recuperada) == len(referencia)
+    assert recuperada._verificarPropriedades(recuperada.raiz)
+
+def test_recuperacao_com_instantaneo_e_cauda(diretorio):
+    """
+    Verifica a recuperação a partir do último instantâneo mais o segmento seguinte a ele, e
+    se os arquivos anteriores ao instantâneo são removidos.
+    """
+    referencia = {}
+    with ArvoreBRegistrada(diretorio, ordem=4, instantaneo_a_cada=500) as arvore:
+        _operacoesAleatorias(arvore, referencia, semente=2)
+
+    arquivos = sorted(os.listdir(diretorio))
+    assert len(arquivos) == 2 and arquivos[0].startswith("instantaneo")
+
+    with ArvoreBRegistrada(diretorio, ordem=4, compacto=True) as recuperada:
+        assert list(recuperada.intervalo(com_valores=True)) == sorted(referencia.items())
+        _operacoesAleatorias(recuperada, referencia, semente=3)
+        recuperada.instantaneo()
+
+    with ArvoreBRegistrada(diretorio, ordem=4) as recuperada:
+        assert list(recuperada.intervalo(com_valores=True)) == sorted(referencia.items())
+
+def test_final_corrompido_do_registro_e_descartado(diretorio):
+    """
+    Simula uma gravação interrompida no meio de um registro e verifica se as operações
+    completas são recuperadas e se novas operações continuam legíveis depois.
+    """
+    with ArvoreBRegistrada(diretorio, ordem=2, tamanho_grupo=1) as arvore:
+        for chave in range(10):
+            arvore.inserir(chave, chave)
+
+    (segmento,) = [nome for nome in os.listdir(diretorio) if nome.endswith(".wal")]
+    with open(os.path.join(diretorio, segmento), "ab") as arquivo:
+        arquivo.write(b"\x01\x02\x03")
+
+    with ArvoreBRegistrada(diretorio, ordem=2) as arvore:
+        assert list(arvore) == list(range(10))
+        arvore.remover(3)
+
+    with ArvoreBRegistrada(diretorio, ordem=2) as arvore:
+        assert list(arvore) == [0, 1, 2, 4, 5, 6, 7, 8, 9]
+
+def test_operacoes_nao_sincronizadas_ficam_pendentes(diretorio):
+    """
+    Garante que, com grupos grandes, as operações só chegam ao disco ao sincronizar.
+    """
+    arvore = ArvoreBRegistrada(diretorio, ordem=2, tamanho_grupo=1_000, intervalo_sincronizacao=3_600)
+    arvore.put(1)
+    assert len(ArvoreBRegistrada(diretorio, ordem=2)) == 0
+
+    arvore.sincronizar()
+    assert len(ArvoreBRegistrada(diretorio, ordem=2)) == 1
+
+def test_remocao_por_intervalo_e_reaplicada(diretorio):
+    """
+    Verifica se remoções por intervalo e em lote são registradas e reaplicadas na
+    recuperação.
+    """
+    arvore = ArvoreBRegistrada(diretorio, ordem=3)
+    arvore.inserir_muitos(range(1_000), [("valor", chave) for chave in range(1_000)])
+    assert arvore.remover_intervalo(100, 900) == 800
+    assert arvore.remover_intervalo(None, 10) == 10
+    arvore.remover_muitos([10, 11, 12, 950, 2_000])
+    assert arvore.inserir_se_ausente(500, "novo") and not arvore.inserir_se_ausente(13, "outro")
+    arvore.sincronizar()
+
+    recuperada = ArvoreBRegistrada(diretorio, ordem=3)
+    esperado = list(range(13, 100)) + [500] + [chave for chave in range(900, 1_000) if chave != 950]
+    assert list(recuperada) == esperado
+    assert recuperada[13] == ("valor", 13) and recuperada[500] == "novo"
+    assert recuperada.validar().valida
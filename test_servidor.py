@@ -0,0 +1,225 @@
+import asyncio
+import os
+import random
+import tempfile
+import pytest
+from arvoreB import ArvoreB
+from cliente import ClienteArvoreB
+from protocolo import (ERRO, INSERIR, INTERVALO, OK, ErroDeProtocolo, ErroRemoto, codificarQuadro,
+                       codificarValor, decodificarValor, decodificarValores, lerQuadro)
+from servidor import ServidorArvoreB
+
+# --- Testes para o protocolo ---
+
+def test_valores_sobrevivem_a_codificacao():
+    """
+    Verifica se todos os tipos aceitos voltam iguais da codificação e se tipos desconhecidos
+    ou dados truncados são recusados.
+    """
+    valores = [None, True, False, 0, -1, 2 ** 63 - 1, -2 ** 63, 2 ** 100, -3 ** 90, 1.5, "",
+               "árvore", b"", b"\x00\xff", (), (1, ("a", None), b"x")]
+    quadro = codificarQuadro(7, INSERIR, valores)
+    assert decodificarValores(bytes(quadro[9:])) == valores
+
+    with pytest.raises(TypeError):
+        codificarValor([1, 2], bytearray())
+    saida = bytearray()
+    codificarValor("texto", saida)
+    with pytest.raises(ErroDeProtocolo):
+        decodificarValor(bytes(saida[:-1]), 0)
+    with pytest.raises(ErroDeProtocolo):
+        decodificarValor(b"\xee", 0)
+
+def test_ler_quadro_recusa_tamanho_invalido():
+    """
+    Verifica se um quadro com tamanho acima do máximo é recusado sem ser lido.
+    """
+    async def ler(dados):
+        leitor = asyncio.StreamReader()
+        leitor.feed_data(dados)
+        leitor.feed_eof()
+        return await lerQuadro(leitor)
+
+    assert asyncio.run(ler(b"")) is None
+    quadro = bytes(codificarQuadro(3, INSERIR, [1, 2]))
+    assert asyncio.run(ler(quadro)) == (3, INSERIR, quadro[9:])
+    with pytest.raises(ErroDeProtocolo):
+        asyncio.run(ler(b"\xff\xff\xff\xff" + bytes(5)))
+    with pytest.raises(asyncio.IncompleteReadError):
+        asyncio.run(ler(quadro[:-1]))
+
+# --- Testes para o servidor e o cliente ---
+
+@pytest.mark.parametrize("lote_maximo", [1, 256])
+def test_clientes_concorrentes_acompanham_dicionario(lote_maximo):
+    """
+    Verifica se vários clientes, cada um com muitos pedidos em andamento, veem a árvore
+    servida como um dicionário: cada corrotina trabalha em chaves próprias, então os
+    resultados de cada uma são determinados pela ordem das suas operações.
+    """
+    async def trabalhar(cliente, semente):
+        aleatorio = random.Random(semente)
+        referencia = {}
+        for passo in range(400):
+            chave = (semente, aleatorio.randrange(60))
+            sorteio = aleatorio.random()
+            if sorteio < 0.4:
+                assert await cliente.put(chave, passo) == (chave not in referencia)
+                referencia[chave] = passo
+            elif sorteio < 0.7:
+                assert await cliente.get(chave, "ausente") == referencia.get(chave, "ausente")
+            else:
+                assert await cliente.pop(chave, "ausente") == referencia.pop(chave, "ausente")
+        return referencia
+
+    async def principal():
+        async with ServidorArvoreB(ArvoreB(4), lote_maximo=lote_maximo, em_voo_por_conexao=8) as servidor:
+            await servidor.iniciar()
+            host, porta = servidor.endereco
+            clientes = [await ClienteArvoreB.conectar(host, porta, conexoes=2, em_voo_por_conexao=4)
+                        for _ in range(3)]
+            referencias = await asyncio.gather(*(trabalhar(clientes[semente % 3], semente)
+                                                 for semente in range(12)))
+            esperado = sorted(item for referencia in referencias for item in referencia.items())
+
+            chaves = [chave for chave, _ in esperado] + [(99, 0)]
+            assert await clientes[0].buscar_muitos(chaves) == [(True, valor) for _, valor in esperado] + [(False, None)]
+            assert await clientes[1].intervalo() == esperado
+            assert await clientes[2].intervalo((3,), (7,)) == [par for par in esperado if (3,) <= par[0] < (7,)]
+            assert await clientes[0].intervalo(limite=5) == esperado[:5]
+            assert list(servidor.arvore.intervalo(com_valores=True)) == esperado
+            assert servidor.arvore._verificarPropriedades(servidor.arvore.raiz)
+
+            estatisticas = await clientes[0].estatisticas()
+            assert estatisticas["conexoes"] == 6
+            assert estatisticas["pedidos"] >= 12 * 400
+            if lote_maximo == 1:
+                assert estatisticas["lotes"] == estatisticas["pedidos"]
+            for cliente in clientes:
+                await cliente.fechar()
+
+    asyncio.run(principal())
+
+def test_intervalo_pagina_chaves_demais():
+    """
+    Verifica se o cliente junta as páginas de um intervalo maior que uma página sem repetir
+    as chaves das bordas.
+    """
+    async def principal():
+        arvore = ArvoreB(8)
+        arvore.inserir_muitos(range(2_500), [chave * 2 for chave in range(2_500)])
+        async with ServidorArvoreB(arvore) as servidor:
+            await servidor.iniciar()
+            async with await ClienteArvoreB.conectar(*servidor.endereco, conexoes=1) as cliente:
+                assert await cliente.intervalo() == [(chave, chave * 2) for chave in range(2_500)]
+                assert await cliente.intervalo(10, limite=1_500) == [(chave, chave * 2) for chave in range(10, 1_510)]
+
+    asyncio.run(principal())
+
+def test_erros_sao_respondidos_sem_derrubar_a_conexao():
+    """
+    Verifica se pedidos inválidos recebem erro e se a conexão continua atendendo os demais,
+    inclusive em um lote com uma chave de tipo incomparável.
+    """
+    async def principal():
+        async with ServidorArvoreB(ArvoreB(4)) as servidor:
+            await servidor.iniciar()
+            async with await ClienteArvoreB.conectar(*servidor.endereco, conexoes=1) as cliente:
+                await cliente.put(1, "um")
+                with pytest.raises(ErroRemoto):
+                    await cliente.put("texto", 2)
+                with pytest.raises(ErroRemoto):
+                    await cliente._conexao().pedir(INSERIR, (1,))
+                with pytest.raises(ErroRemoto):
+                    await cliente._conexao().pedir(INTERVALO, (None, None, 0))
+                with pytest.raises(TypeError):
+                    await cliente.put(1, [1])
+
+                resultados = await asyncio.gather(*(cliente.put(chave, chave) for chave in (2, "x", 3)),
+                                                  return_exceptions=True)
+                assert resultados[0] is True and resultados[2] is True
+                assert isinstance(resultados[1], ErroRemoto)
+                assert await cliente.intervalo() == [(1, "um"), (2, 2), (3, 3)]
+
+    asyncio.run(principal())
+
+@pytest.mark.skipif(not hasattr(asyncio, "start_unix_server"), reason="Sem sockets Unix.")
+def test_socket_unix_e_fechamento():
+    """
+    Verifica o atendimento por socket Unix e se, ao fechar o servidor, os pedidos de um
+    cliente conectado falham em vez de esperar para sempre.
+    """
+    async def principal():
+        with tempfile.TemporaryDirectory() as diretorio:
+            caminho = os.path.join(diretorio, "arvore.sock")
+            servidor = ServidorArvoreB(ArvoreB(4))
+            await servidor.iniciar(caminho=caminho)
+            cliente = await ClienteArvoreB.conectar(caminho=caminho, conexoes=1)
+            assert await cliente.put("a", 1) and await cliente.get("a") == 1
+
+            await servidor.fechar()
+            with pytest.raises(ConnectionError):
+                await cliente.get("a")
+            await cliente.fechar()
+
+    asyncio.run(principal())
+
+def test_cliente_que_nao_le_para_de_ser_lido():
+    """
+    Verifica a contrapressão: um cliente que envia pedidos sem ler as respostas deixa de
+    ser lido, sem impedir que os outros clientes sejam atendidos.
+    """
+    async def principal():
+        async with ServidorArvoreB(ArvoreB(8), em_voo_por_conexao=16, pendentes_maximo=32) as servidor:
+            await servidor.iniciar()
+            leitor, escritor = await asyncio.open_connection(*servidor.endereco)
+            quadro = bytes(codificarQuadro(1, INSERIR, [1, "x" * 1_000]))
+
+            async def inundar():
+                while True:
+                    escritor.write(quadro)
+                    await escritor.drain()
+
+            inundacao = asyncio.create_task(inundar())
+            executados = -1
+            while servidor.pedidos != executados:
+                executados = servidor.pedidos
+                await asyncio.sleep(0.2)
+            assert not inundacao.done()
+
+            async with await ClienteArvoreB.conectar(*servidor.endereco, conexoes=1) as cliente:
+                assert await cliente.put(5, "ok") and await cliente.get(5) == "ok"
+            inundacao.cancel()
+            escritor.transport.abort()
+
+    asyncio.run(principal())
+
+class _ConexaoFalsa:
+    """
+    Conexão que apenas guarda as respostas, para executar lotes sem a rede.
+    """
+
+    def __init__(self):
+        self.respostas = {}
+
+    def responder(self, identificador, estado, resultados):
+        self.respostas[identificador] = (estado, resultados)
+
+def test_erro_no_meio_de_um_lote_de_insercoes():
+    """
+    Verifica se uma chave incomparável ou que os nós não aceitam (um inteiro grande demais
+    para a árvore compacta) faz só o seu pedido falhar, e se as demais chaves do trecho
+    são inseridas uma única vez.
+    """
+    servidor = ServidorArvoreB(ArvoreB(2, compacto=True))
+    conexao = _ConexaoFalsa()
+    servidor._executarLote([(conexao, 1, INSERIR, [5, None]), (conexao, 2, INSERIR, ["x", None]),
+                            (conexao, 3, INSERIR, [6, None])])
+    assert conexao.respostas == {1: (OK, [True]), 2: (ERRO, conexao.respostas[2][1]), 3: (OK, [True])}
+
+    lote = [(conexao, identificador, INSERIR, [chave, None])
+            for identificador, chave in enumerate([*range(10, 40), 2 ** 70], start=10)]
+    servidor._executarLote(lote)
+    assert all(conexao.respostas[identificador] == (OK, [True]) for identificador in range(10, 40))
+    assert conexao.respostas[40][0] == ERRO and "OverflowError" in conexao.respostas[40][1][0]
+    assert list(servidor.arvore) == [5, 6, *range(10, 40)]
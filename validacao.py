@@ -0,0 +1,213 @@
+from typing import Any, List, Optional
+
+
+class ErroDeValidacao(AssertionError):
+    """
+    Exceção lançada pela validação incremental quando uma operação deixa a árvore em um
+    estado que viola as propriedades da Árvore B.
+    """
+
+
+class ErroValidacao:
+    """
+    Uma propriedade violada, encontrada pela validação completa.
+
+    Atributos:
+        profundidade (int): A profundidade do nó onde o erro foi encontrado (0 é a raiz).
+        chaves (List[Any]): As chaves do nó, para identificá-lo.
+        mensagem (str): A descrição da propriedade violada.
+    """
+
+    def __init__(self, profundidade: int, chaves: List[Any], mensagem: str):
+        self.profundidade = profundidade
+        self.chaves = chaves
+        self.mensagem = mensagem
+
+    def __repr__(self) -> str:
+        return f"ErroValidacao(profundidade={self.profundidade}, mensagem={self.mensagem!r})"
+
+
+class RelatorioValidacao:
+    """
+    O resultado da validação completa de uma árvore.
+
+    Atributos:
+        erros (List[ErroValidacao]): As propriedades violadas, na ordem em que foram encontradas.
+        altura (int): A profundidade das folhas (0 se a raiz é folha), ou -1 se a árvore é vazia.
+        quantidadeChaves (int): O número de chaves encontradas.
+        quantidadeNos (int): O número de nós visitados.
+        quantidadeFolhas (int): O número de folhas visitadas.
+    """
+
+    def __init__(self) -> None:
+        self.erros: List[ErroValidacao] = []
+        self.altura = -1
+        self.quantidadeChaves = 0
+        self.quantidadeNos = 0
+        self.quantidadeFolhas = 0
+
+    @property
+    def valida(self) -> bool:
+        """
+        Indica se nenhuma propriedade foi violada.
+        """
+        return not self.erros
+
+    def __bool__(self) -> bool:
+        return self.valida
+
+    def __repr__(self) -> str:
+        return (f"RelatorioValidacao(valida={self.valida}, altura={self.altura}, "
+                f"chaves={self.quantidadeChaves}, nos={self.quantidadeNos}, erros={len(self.erros)})")
+
+
+def _problemaNo(no: Any, ordem: int, raiz: bool, inferior: Any, superior: Any) -> Optional[str]:
+    """
+    Verifica as propriedades locais de um nó: número de chaves, valores e filhos, total de
+    chaves da subárvore, ordem das chaves e limites herdados dos separadores dos ancestrais.
+
+    Argumentos:
+        no (NoArvoreB): O nó a ser verificado.
+        ordem (int): A ordem da árvore.
+        raiz (bool): Se o nó é a raiz, que pode ter menos de t-1 chaves.
+        inferior (Any): A chave que todas as do nó devem superar, ou None se não houver.
+        superior (Any): A chave que todas as do nó devem anteceder, ou None se não houver.
+
+    Retorna:
+        Optional[str]: A descrição do primeiro problema encontrado, ou None.
+    """
+    chaves = no.chaves
+    quantidade = len(chaves)
+    if quantidade > 2 * ordem - 1:
+        return f"O nó tem {quantidade} chaves, mais que o máximo de {2 * ordem - 1}."
+    if not raiz and quantidade < ordem - 1:
+        return f"O nó tem {quantidade} chaves, menos que o mínimo de {ordem - 1}."
+    if len(no.valores) != quantidade:
+        return f"O nó tem {len(no.valores)} valores para {quantidade} chaves."
+    if not no.folha and len(no.filhos) != quantidade + 1:
+        return f"O nó interno tem {len(no.filhos)} filhos para {quantidade} chaves."
+    total = quantidade if no.folha else quantidade + sum(filho.total for filho in no.filhos)
+    if no.total != total:
+        return f"O nó informa {no.total} chaves na sua subárvore, mas ela tem {total}."
+    for i in range(1, quantidade):
+        if not chaves[i - 1] < chaves[i]:
+            return f"As chaves {chaves[i - 1]!r} e {chaves[i]!r} estão fora de ordem."
+    if quantidade:
+        if inferior is not None and not inferior < chaves[0]:
+            return f"A chave {chaves[0]!r} não é maior que o separador {inferior!r}."
+        if superior is not None and not chaves[-1] < superior:
+            return f"A chave {chaves[-1]!r} não é menor que o separador {superior!r}."
+    return None
+
+
+def validarArvore(arvore: Any) -> RelatorioValidacao:
+    """
+    Valida a árvore inteira em uma única passada, sem recursão e sem imprimir nada.
+
+    Cada nó é visitado uma vez, com os limites herdados dos separadores dos seus ancestrais,
+    o que basta para garantir a ordem global das chaves. Também confere se todas as folhas
+    estão na mesma profundidade e se a altura e o número de chaves mantidos pela árvore
+    correspondem aos encontrados.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore a ser validada.
+
+    Retorna:
+        RelatorioValidacao: O relatório com as propriedades violadas e as contagens.
+    """
+    relatorio = RelatorioValidacao()
+    if arvore.raiz is None:
+        if arvore._tamanho != 0:
+            relatorio.erros.append(ErroValidacao(0, [], f"A árvore vazia informa {arvore._tamanho} chaves."))
+        return relatorio
+
+    # Cada elemento da pilha é um nó, sua profundidade e os limites das suas chaves.
+    pilha = [(arvore.raiz, 0, None, None)]
+    while pilha:
+        no, profundidade, inferior, superior = pilha.pop()
+        relatorio.quantidadeNos += 1
+        relatorio.quantidadeChaves += len(no.chaves)
+
+        problema = _problemaNo(no, arvore.ordem, no is arvore.raiz, inferior, superior)
+        if problema is not None:
+            relatorio.erros.append(ErroValidacao(profundidade, list(no.chaves), problema))
+            # Sem a quantidade certa de filhos, os limites de cada um não são confiáveis.
+            if not no.folha and len(no.filhos) != len(no.chaves) + 1:
+                continue
+
+        if no.folha:
+            relatorio.quantidadeFolhas += 1
+            if relatorio.altura == -1:
+                relatorio.altura = profundidade
+            elif profundidade != relatorio.altura:
+                relatorio.erros.append(ErroValidacao(profundidade, list(no.chaves),
+                                                     f"A folha está na profundidade {profundidade}, "
+                                                     f"mas a primeira estava na {relatorio.altura}."))
+            continue
+
+        # Empilha da direita para a esquerda, para visitar as folhas em ordem crescente.
+        for i in range(len(no.filhos) - 1, -1, -1):
+            pilha.append((no.filhos[i], profundidade + 1,
+                          no.chaves[i - 1] if i > 0 else inferior,
+                          no.chaves[i] if i < len(no.chaves) else superior))
+
+    if relatorio.altura != arvore._altura:
+        relatorio.erros.append(ErroValidacao(0, list(arvore.raiz.chaves),
+                                             f"A árvore informa altura {arvore._altura}, "
+                                             f"mas as folhas estão na profundidade {relatorio.altura}."))
+    if relatorio.quantidadeChaves != arvore._tamanho:
+        relatorio.erros.append(ErroValidacao(0, list(arvore.raiz.chaves),
+                                             f"A árvore informa {arvore._tamanho} chaves, "
+                                             f"mas contém {relatorio.quantidadeChaves}."))
+    return relatorio
+
+
+def validarCaminho(arvore: Any, chave: Any) -> None:
+    """
+    Valida apenas os nós que uma operação sobre `chave` pode ter alterado: os do caminho da
+    raiz até a folha onde a chave está (ou estaria) e, em cada nível, os irmãos vizinhos do
+    nó do caminho, que participam de divisões, empréstimos e fusões.
+
+    O custo é O(t log n), contra O(n) da validação completa, e permite verificar a árvore
+    continuamente, após cada operação.
+
+    Argumentos:
+        arvore (ArvoreB): A árvore a ser validada.
+        chave (Any): A chave da operação que acabou de ser executada.
+
+    Exceções:
+        ErroDeValidacao: Se algum dos nós verificados violar as propriedades da Árvore B.
+    """
+    no = arvore.raiz
+    if no is None:
+        return
+    if arvore._tamanho < 0 or (arvore._tamanho == 0) != (len(no.chaves) == 0):
+        raise ErroDeValidacao(f"A árvore informa {arvore._tamanho} chaves, mas sua raiz tem {len(no.chaves)}.")
+
+    profundidade = 0
+    inferior = superior = None
+    while True:
+        problema = _problemaNo(no, arvore.ordem, profundidade == 0, inferior, superior)
+        if problema is not None:
+            raise ErroDeValidacao(f"Profundidade {profundidade}: {problema}")
+        if no.folha:
+            if profundidade != arvore._altura:
+                raise ErroDeValidacao(f"A folha está na profundidade {profundidade}, "
+                                      f"mas a árvore informa altura {arvore._altura}.")
+            return
+
+        i = no._posicao(chave)
+        for vizinho in (i - 1, i + 1):
+            if 0 <= vizinho < len(no.filhos):
+                problema = _problemaNo(no.filhos[vizinho], arvore.ordem, False,
+                                       no.chaves[vizinho - 1] if vizinho > 0 else inferior,
+                                       no.chaves[vizinho] if vizinho < len(no.chaves) else superior)
+                if problema is not None:
+                    raise ErroDeValidacao(f"Profundidade {profundidade + 1}: {problema}")
+
+        if i > 0:
+            inferior = no.chaves[i - 1]
+        if i < len(no.chaves):
+            superior = no.chaves[i]
+        no = no.filhos[i]
+        profundidade += 1